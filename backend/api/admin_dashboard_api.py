@@ -3,18 +3,19 @@ Admin Dashboard API - Live KPIs, System Status, User Monitoring
 PC-based web dashboard endpoints for administrators
 """
 
+import asyncio
 import logging
-import os
 import time
 from datetime import datetime, timedelta
 from typing import Any, Optional
 
-import psutil
 from fastapi import APIRouter, Depends, HTTPException, Query, status
 from pydantic import BaseModel
 
 from backend.auth.dependencies import require_admin
 from backend.db.runtime import get_db
+from backend.services.kpi_store import KPIStore
+from backend.services.system_metrics import system_metrics_sampler
 
 logger = logging.getLogger(__name__)
 
@@ -75,106 +76,6 @@ class PerformanceMetric(BaseModel):
 
 
 # Helper Functions
-async def calculate_total_stock_value(db) -> float:
-    """Calculate total stock value from ERP items."""
-    try:
-        pipeline = [
-            {"$match": {"stock_qty": {"$exists": True}}},
-            {
-                "$group": {
-                    "_id": None,
-                    "total_value": {
-                        "$sum": {"$multiply": ["$stock_qty", {"$ifNull": ["$price", 0]}]}
-                    },
-                }
-            },
-        ]
-        result = await db.erp_items.aggregate(pipeline).to_list(1)
-        return result[0]["total_value"] if result else 0.0
-    except Exception as e:
-        logger.error(f"Error calculating total stock value: {e}")
-        return 0.0
-
-
-async def calculate_verified_value(db) -> float:
-    """Calculate value of verified stock."""
-    try:
-        pipeline = [
-            {"$match": {"status": "verified"}},
-            {
-                "$group": {
-                    "_id": None,
-                    "total_value": {
-                        "$sum": {"$multiply": ["$verified_qty", {"$ifNull": ["$price", 0]}]}
-                    },
-                }
-            },
-        ]
-        result = await db.verification_records.aggregate(pipeline).to_list(1)
-        return result[0]["total_value"] if result else 0.0
-    except Exception as e:
-        logger.error(f"Error calculating verified value: {e}")
-        return 0.0
-
-
-async def calculate_completion_percentage(db) -> float:
-    """Calculate verification completion percentage."""
-    try:
-        total_items = await db.erp_items.count_documents({})
-        if total_items == 0:
-            return 0.0
-
-        verified_items = await db.verification_records.count_documents({"status": "verified"})
-        return round((verified_items / total_items) * 100, 2)
-    except Exception as e:
-        logger.error(f"Error calculating completion: {e}")
-        return 0.0
-
-
-async def count_active_sessions(db) -> int:
-    """Count currently active verification sessions."""
-    try:
-        return await db.verification_sessions.count_documents(
-            {"status": {"$in": ["active", "in_progress"]}}
-        )
-    except Exception as e:
-        logger.error(f"Error counting sessions: {e}")
-        return 0
-
-
-async def count_active_users(db) -> int:
-    """Count users with recent activity (last 30 minutes)."""
-    try:
-        cutoff = datetime.utcnow() - timedelta(minutes=30)
-        return await db.user_presence.count_documents({"last_seen": {"$gte": cutoff}})
-    except Exception as e:
-        logger.error(f"Error counting active users: {e}")
-        return 0
-
-
-async def count_pending_variances(db) -> int:
-    """Count variances pending supervisor review."""
-    try:
-        return await db.verification_records.count_documents(
-            {"status": "pending_review", "variance": {"$ne": 0}}
-        )
-    except Exception as e:
-        logger.error(f"Error counting variances: {e}")
-        return 0
-
-
-async def count_items_verified_today(db) -> int:
-    """Count items verified today."""
-    try:
-        today_start = datetime.utcnow().replace(hour=0, minute=0, second=0, microsecond=0)
-        return await db.verification_records.count_documents(
-            {"created_at": {"$gte": today_start}, "status": "verified"}
-        )
-    except Exception as e:
-        logger.error(f"Error counting today's verifications: {e}")
-        return 0
-
-
 async def check_mongodb_connection(db) -> str:
     """Check MongoDB connection status."""
     try:
@@ -200,20 +101,13 @@ async def check_sqlserver_connection() -> str:
 
 
 def get_memory_usage() -> float:
-    """Get current memory usage in MB."""
-    try:
-        process = psutil.Process(os.getpid())
-        return round(process.memory_info().rss / 1024 / 1024, 2)
-    except Exception:
-        return 0.0
+    """Get current memory usage in MB (latest background sample)."""
+    return system_metrics_sampler.snapshot()["memory_mb"]
 
 
 def get_cpu_usage() -> float:
-    """Get current CPU usage percentage."""
-    try:
-        return psutil.cpu_percent(interval=0.1)
-    except Exception:
-        return 0.0
+    """Get current CPU usage percentage (latest background sample)."""
+    return system_metrics_sampler.snapshot()["cpu_percent"]
 
 
 def get_uptime() -> int:
@@ -227,17 +121,26 @@ async def get_dashboard_kpis(current_user: dict = Depends(require_admin)):
     """
     Get live KPIs for admin dashboard.
     Includes total stock value, verified value, completion percentage, etc.
+    Served from the materialized KPI document maintained by KPIStore.
     """
-    db = get_db()
+    try:
+        kpis = await KPIStore(get_db()).get_kpis()
+    except Exception as e:
+        logger.error(f"Error reading dashboard KPIs: {e}")
+        kpis = {}
+    total_items = kpis.get("total_items") or 0
+    verified_items = kpis.get("verified_items") or 0
 
     return KPIResponse(
-        total_stock_value=await calculate_total_stock_value(db),
-        verified_stock_value=await calculate_verified_value(db),
-        verification_percentage=await calculate_completion_percentage(db),
-        active_sessions=await count_active_sessions(db),
-        active_users=await count_active_users(db),
-        pending_variances=await count_pending_variances(db),
-        items_verified_today=await count_items_verified_today(db),
+        total_stock_value=kpis.get("total_stock_value") or 0.0,
+        verified_stock_value=kpis.get("verified_stock_value") or 0.0,
+        verification_percentage=(
+            round((verified_items / total_items) * 100, 2) if total_items else 0.0
+        ),
+        active_sessions=kpis.get("active_sessions") or 0,
+        active_users=kpis.get("active_users") or 0,
+        pending_variances=kpis.get("pending_variances") or 0,
+        items_verified_today=kpis.get("items_verified_today") or 0,
         timestamp=datetime.utcnow().isoformat(),
     )
 
@@ -458,9 +361,11 @@ async def get_dashboard_summary(current_user: dict = Depends(require_admin)):
     db = get_db()
 
     # Parallel fetch of all dashboard data
-    kpis = await get_dashboard_kpis(current_user)
-    system_status = await get_system_status(current_user)
-    active_users = await get_active_users(current_user)
+    kpis, system_status, active_users = await asyncio.gather(
+        get_dashboard_kpis(current_user),
+        get_system_status(current_user),
+        get_active_users(current_user),
+    )
 
     # Get recent error count
     cutoff = datetime.utcnow() - timedelta(hours=1)
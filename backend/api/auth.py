@@ -1,3 +1,4 @@
+import asyncio
 import logging
 import os
 from datetime import datetime, timedelta
@@ -7,6 +8,7 @@ from fastapi import APIRouter, Depends, HTTPException, Request
 
 from backend.api.schemas import ApiResponse, PinLogin, TokenResponse, UserLogin, UserRegister
 from backend.auth.dependencies import auth_deps, get_current_user
+from backend.auth.user_cache import invalidate_user, token_version_claims
 from backend.config import settings
 from backend.db.runtime import get_db
 from backend.error_messages import get_error_message
@@ -16,10 +18,12 @@ from backend.exceptions import (
     DatabaseConnectionError,
     NotFoundError,
     RateLimitError,
+    ServiceOverloadedError,
 )
+from backend.services.hashing_service import hashing_service
 from backend.services.runtime import get_cache_service, get_refresh_token_service
 from backend.utils.api_utils import result_to_response, sanitize_for_logging
-from backend.utils.auth_utils import create_access_token, get_password_hash, verify_password
+from backend.utils.auth_utils import create_access_token
 from backend.utils.result import Fail, Ok, Result
 
 logger = logging.getLogger(__name__)
@@ -110,14 +114,22 @@ async def generate_auth_tokens(
             minutes=getattr(settings, "ACCESS_TOKEN_EXPIRE_MINUTES", 15)
         )
         access_token = create_access_token(
-            {"sub": user["username"], "role": user.get("role", "staff")},
+            {
+                "sub": user["username"],
+                "role": user.get("role", "staff"),
+                **token_version_claims(user),
+            },
             secret_key=auth_deps.secret_key,
             algorithm=auth_deps.algorithm,
             expires_delta=access_token_expires,
         )
 
         # Generate refresh token using service
-        refresh_payload = {"sub": user["username"], "role": user.get("role", "staff")}
+        refresh_payload = {
+            "sub": user["username"],
+            "role": user.get("role", "staff"),
+            **token_version_claims(user),
+        }
         refresh_token = refresh_token_service.create_refresh_token(refresh_payload)
         refresh_token_expires = datetime.utcnow() + timedelta(
             days=getattr(settings, "REFRESH_TOKEN_EXPIRE_DAYS", 30)
@@ -210,7 +222,7 @@ async def register(user: UserRegister):
             )
 
         # Create user
-        hashed_password = get_password_hash(user.password)
+        hashed_password = await hashing_service.hash(user.password)
         user_dict = {
             "username": user.username,
             "hashed_password": hashed_password,
@@ -307,7 +319,7 @@ async def _check_login_rate_limit(client_ip: str) -> Optional[Result[Any, Except
     return None
 
 
-def _validate_user_password(
+async def _validate_user_password(
     credentials: UserLogin, user: dict[str, Any]
 ) -> Result[bool, Exception]:
     hashed_pwd = user.get("hashed_password") or user.get("password")
@@ -316,8 +328,10 @@ def _validate_user_password(
         return Fail(AuthenticationError("User account is corrupted. Please contact support."))
 
     try:
-        if verify_password(credentials.password, hashed_pwd):
+        if await hashing_service.verify(credentials.password, hashed_pwd, shed=True):
             return Ok(True)
+    except ServiceOverloadedError as e:
+        return Fail(e)
     except Exception as e:
         logger.error(f"Password verification exception: {e}")
 
@@ -365,7 +379,9 @@ async def login(credentials: UserLogin, request: Request) -> Result[dict[str, An
 
         # Verify password
         logger.info("Verifying password...")
-        pwd_result = _validate_user_password(credentials, user)
+        pwd_result = await _validate_user_password(credentials, user)
+        if isinstance(pwd_result._error, ServiceOverloadedError):
+            return pwd_result
         if pwd_result.is_err:
             return await _handle_login_failure(
                 credentials.username,
@@ -418,33 +434,100 @@ async def _find_user_by_fast_lookup(
     if not found_user:
         return None
     # Verify secure hash to protect against SHA-256 collision
-    if not verify_password(pin, found_user.get("pin_hash", "")):
+    if not await hashing_service.verify(pin, found_user.get("pin_hash", ""), shed=True):
         logger.warning(f"Hash collision or data corruption for user {found_user.get('username')}")
         return None
     return found_user
 
 
+async def _check_legacy_pin_scan_rate_limit(client_ip: str) -> Optional[Result[Any, Exception]]:
+    """
+    Cap legacy PIN scans per IP; each one costs a KDF run per unmigrated user.
+
+    Counted separately from login attempts and not cleared on success.
+    """
+    if os.getenv("RATE_LIMIT_ENABLED", "true").lower() != "true":
+        return None
+
+    cache_service = get_cache_service()
+    namespace = "pin_legacy_scans"
+    try:
+        scans = int((await cache_service.get(namespace, client_ip)) or 0)
+    except (ValueError, TypeError):
+        scans = 0
+
+    max_scans = int(getattr(settings, "PIN_LEGACY_SCAN_MAX_ATTEMPTS", 3))
+    ttl_seconds = int(getattr(settings, "RATE_LIMIT_TTL_SECONDS", 300))
+    if scans >= max_scans:
+        logger.warning(f"Legacy PIN scan limit exceeded for IP {client_ip}: {scans} scans")
+        return Fail(
+            RateLimitError(
+                f"Too many PIN attempts. Please try again in {ttl_seconds // 60} minutes.",
+                retry_after=ttl_seconds,
+            )
+        )
+
+    await cache_service.set(namespace, client_ip, scans + 1, ttl=ttl_seconds)
+    return None
+
+
 async def _find_user_by_legacy_scan(
     db: Any, pin: str, lookup_hash: str
 ) -> Optional[dict[str, Any]]:
-    """Find user via O(N) legacy PIN scan with opportunistic migration."""
-    users_with_pin = await db.users.find({"pin_hash": {"$exists": True}}).to_list(length=1000)
-    for user in users_with_pin:
-        if verify_password(pin, user.get("pin_hash", "")):
-            # Opportunistic migration for next time
-            try:
-                await db.users.update_one(
-                    {"_id": user["_id"]}, {"$set": {"pin_lookup_hash": lookup_hash}}
-                )
-                logger.info(f"Migrated user {user['username']} to fast PIN lookup")
-            except Exception as e:
-                logger.warning(f"Failed to migrate user to fast PIN lookup: {e}")
-            return user
-    return None
+    """
+    Find a not-yet-migrated user by PIN, migrating them on match.
+
+    Pages through every user without a pin_lookup_hash in _id order,
+    PIN_LEGACY_SCAN_BATCH_SIZE at a time, verifying each page a hashing
+    pool's width at a time, so no unmigrated user is out of reach and memory
+    stays bounded.
+    """
+    page_size = int(getattr(settings, "PIN_LEGACY_SCAN_BATCH_SIZE", 50))
+    if page_size <= 0:
+        return None
+
+    query: dict[str, Any] = {"pin_hash": {"$exists": True}, "pin_lookup_hash": None}
+    pool_width = hashing_service.max_workers
+    last_id = None
+    while True:
+        page_query = query if last_id is None else {**query, "_id": {"$gt": last_id}}
+        page = (
+            await db.users.find(page_query, {"pin_hash": 1})
+            .sort("_id", 1)
+            .to_list(length=page_size)
+        )
+        for start in range(0, len(page), pool_width):
+            batch = page[start : start + pool_width]
+            matches = await asyncio.gather(
+                *(hashing_service.verify(pin, doc.get("pin_hash", ""), shed=True) for doc in batch)
+            )
+            match = next((doc for doc, matched in zip(batch, matches) if matched), None)
+            if match is not None:
+                return await _migrate_legacy_pin_user(db, match["_id"], lookup_hash)
+        if len(page) < page_size:
+            return None
+        last_id = page[-1]["_id"]
+
+
+async def _migrate_legacy_pin_user(
+    db: Any, user_id: Any, lookup_hash: str
+) -> Optional[dict[str, Any]]:
+    """Load the matched user and store its lookup hash for next time."""
+    user = await db.users.find_one({"_id": user_id})
+    if not user:
+        return None
+    try:
+        await db.users.update_one({"_id": user_id}, {"$set": {"pin_lookup_hash": lookup_hash}})
+        logger.info(f"Migrated user {user['username']} to fast PIN lookup")
+    except Exception as e:
+        logger.warning(f"Failed to migrate user to fast PIN lookup: {e}")
+    return user
 
 
-async def _find_user_by_pin(db: Any, pin: str) -> Optional[dict[str, Any]]:
-    """Find user by PIN using fast lookup with legacy fallback."""
+async def _find_user_by_pin(
+    db: Any, pin: str, client_ip: str
+) -> Result[Optional[dict[str, Any]], Exception]:
+    """Find user by PIN using fast lookup with a rate-limited legacy fallback."""
     from backend.utils.crypto_utils import get_pin_lookup_hash
 
     lookup_hash = get_pin_lookup_hash(pin)
@@ -452,11 +535,14 @@ async def _find_user_by_pin(db: Any, pin: str) -> Optional[dict[str, Any]]:
     # Strategy 1: O(1) Fast Lookup
     found_user = await _find_user_by_fast_lookup(db, pin, lookup_hash)
     if found_user:
-        return found_user
+        return Ok(found_user)
 
-    # Strategy 2: O(N) Legacy Fallback
+    # Strategy 2: paged scan of users still missing a lookup hash
+    rate_limit_fail = await _check_legacy_pin_scan_rate_limit(client_ip)
+    if rate_limit_fail:
+        return rate_limit_fail
     logger.debug("Fast lookup failed, falling back to legacy scan...")
-    return await _find_user_by_legacy_scan(db, pin, lookup_hash)
+    return Ok(await _find_user_by_legacy_scan(db, pin, lookup_hash))
 
 
 @router.post("/auth/login-pin", response_model=ApiResponse[TokenResponse])
@@ -490,7 +576,10 @@ async def login_with_pin(
 
         # Find user by PIN
         logger.info("Searching for user by PIN...")
-        found_user = await _find_user_by_pin(db, pin)
+        found_result = await _find_user_by_pin(db, pin, client_ip)
+        if found_result.is_err:
+            return found_result
+        found_user = found_result.unwrap()
 
         if not found_user:
             logger.warning(f"No user found with matching PIN from IP: {client_ip}")
@@ -557,7 +646,7 @@ async def _migrate_legacy_password(db: Any, user: dict[str, Any], password: str)
             await db.users.update_one(
                 {"_id": user["_id"]},
                 {
-                    "$set": {"hashed_password": get_password_hash(password)},
+                    "$set": {"hashed_password": await hashing_service.hash(password)},
                     "$unset": {"password": ""},
                 },
             )
@@ -687,7 +776,7 @@ async def change_pin(
         if "hashed_password" not in user:
             # Legacy or weird state
             raise HTTPException(status_code=400, detail="Cannot verify password")
-        if not verify_password(current_password, user["hashed_password"]):
+        if not await hashing_service.verify(current_password, user["hashed_password"]):
             raise HTTPException(
                 status_code=400,
                 detail={
@@ -706,7 +795,7 @@ async def change_pin(
                     "message": "No PIN is currently set. Use password to set a new PIN.",
                 },
             )
-        if not verify_password(current_pin, user["pin_hash"]):
+        if not await hashing_service.verify(current_pin, user["pin_hash"]):
             raise HTTPException(
                 status_code=400,
                 detail={
@@ -740,7 +829,7 @@ async def change_pin(
     # Update PIN
     from backend.utils.crypto_utils import get_pin_lookup_hash
 
-    new_pin_hash = get_password_hash(new_pin)
+    new_pin_hash = await hashing_service.hash(new_pin)
     pin_lookup_hash = get_pin_lookup_hash(new_pin)
 
     await db.users.update_one(
@@ -754,6 +843,7 @@ async def change_pin(
         },
     )
 
+    invalidate_user(current_user["username"])
     logger.info(f"PIN changed for user: {current_user['username']}")
 
     return {
@@ -807,7 +897,7 @@ async def change_password(
             },
         )
 
-    if not verify_password(current_password, user["hashed_password"]):
+    if not await hashing_service.verify(current_password, user["hashed_password"]):
         raise HTTPException(
             status_code=400,
             detail={
@@ -817,12 +907,13 @@ async def change_password(
         )
 
     # Update password
-    new_password_hash = get_password_hash(new_password)
+    new_password_hash = await hashing_service.hash(new_password)
     await db.users.update_one(
         {"username": current_user["username"]},
         {"$set": {"hashed_password": new_password_hash, "updated_at": datetime.now()}},
     )
 
+    invalidate_user(current_user["username"])
     logger.info(f"Password changed for user: {current_user['username']}")
 
     return {
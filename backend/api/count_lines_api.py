@@ -6,11 +6,18 @@ from typing import Any, Optional
 
 from bson import ObjectId
 from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from pymongo import ReturnDocument
 
 from backend.api.schemas import CountLineCreate
 from backend.auth.dependencies import get_current_user
 from backend.db.runtime import get_db
 from backend.services.activity_log import ActivityLogService
+from backend.services.session_stats_service import (
+    SessionStatsService,
+    approval_transition_delta,
+    count_line_counters,
+    increment_session_counters,
+)
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
@@ -242,32 +249,8 @@ async def create_count_line(
 
     await db.count_lines.insert_one(count_line)
 
-    # Update session stats atomically using aggregation
-    try:
-        pipeline: list[dict[str, Any]] = [
-            {"$match": {"session_id": line_data.session_id}},
-            {
-                "$group": {
-                    "_id": None,
-                    "total_items": {"$sum": 1},
-                    "total_variance": {"$sum": "$variance"},
-                }
-            },
-        ]
-        stats = await db.count_lines.aggregate(pipeline).to_list(1)
-        if stats:
-            await db.sessions.update_one(
-                {"id": line_data.session_id},
-                {
-                    "$set": {
-                        "total_items": stats[0]["total_items"],
-                        "total_variance": stats[0]["total_variance"],
-                    }
-                },
-            )
-    except Exception as e:
-        logger.error(f"Failed to update session stats: {str(e)}")
-        # Non-critical error, continue execution
+    # Update session stats atomically in O(1); drift is repaired by reconciliation
+    await increment_session_counters(db, line_data.session_id, count_line_counters(count_line))
 
     # Log high-risk correction
     if risk_flags and _activity_log_service:
@@ -412,7 +395,7 @@ async def approve_count_line(
         if ObjectId.is_valid(line_id):
             query["$or"].append({"_id": ObjectId(line_id)})
 
-        result = await db.count_lines.update_one(
+        previous = await db.count_lines.find_one_and_update(
             query,
             {
                 "$set": {
@@ -425,11 +408,19 @@ async def approve_count_line(
                     "verified_at": datetime.utcnow(),
                 }
             },
+            projection={"session_id": 1, "approval_status": 1},
+            return_document=ReturnDocument.BEFORE,
         )
 
-        if result.matched_count == 0:
+        if previous is None:
             raise HTTPException(status_code=404, detail="Count line not found")
 
+        await increment_session_counters(
+            db,
+            previous.get("session_id"),
+            approval_transition_delta(previous.get("approval_status"), "APPROVED"),
+        )
+
         return {"success": True, "message": "Count line approved"}
     except Exception as e:
         logger.error(f"Error approving count line {line_id}: {str(e)}")
@@ -452,7 +443,7 @@ async def reject_count_line(
         if ObjectId.is_valid(line_id):
             query["$or"].append({"_id": ObjectId(line_id)})
 
-        result = await db.count_lines.update_one(
+        previous = await db.count_lines.find_one_and_update(
             query,
             {
                 "$set": {
@@ -463,11 +454,19 @@ async def reject_count_line(
                     "verified": False,
                 }
             },
+            projection={"session_id": 1, "approval_status": 1},
+            return_document=ReturnDocument.BEFORE,
         )
 
-        if result.matched_count == 0:
+        if previous is None:
             raise HTTPException(status_code=404, detail="Count line not found")
 
+        await increment_session_counters(
+            db,
+            previous.get("session_id"),
+            approval_transition_delta(previous.get("approval_status"), "REJECTED"),
+        )
+
         return {"success": True, "message": "Count line rejected"}
     except Exception as e:
         logger.error(f"Error rejecting count line {line_id}: {str(e)}")
@@ -525,27 +524,12 @@ async def _find_count_line(db, line_id: str) -> Optional[dict]:
         return None
 
 
-async def _recalculate_session_stats(db, session_id: str) -> None:
-    """Re-calculate session stats after line deletion."""
-    try:
-        pipeline: list[dict[str, Any]] = [
-            {"$match": {"session_id": session_id}},
-            {
-                "$group": {
-                    "_id": None,
-                    "total_items": {"$sum": 1},
-                    "total_variance": {"$sum": "$variance"},
-                }
-            },
-        ]
-        stats = await db.count_lines.aggregate(pipeline).to_list(1)
-        update_data = {
-            "total_items": stats[0]["total_items"] if stats else 0,
-            "total_variance": stats[0]["total_variance"] if stats else 0,
-        }
-        await db.sessions.update_one({"id": session_id}, {"$set": update_data})
-    except Exception as e:
-        logger.error(f"Failed to update session stats after delete: {str(e)}")
+async def _decrement_session_stats(db, count_line: dict) -> None:
+    """Remove a deleted line's contribution from its session's counters."""
+    counters = count_line_counters(count_line)
+    await increment_session_counters(
+        db, count_line["session_id"], {field: -value for field, value in counters.items()}
+    )
 
 
 async def _log_delete_activity(
@@ -591,7 +575,7 @@ async def delete_count_line(
         if result.deleted_count == 0:
             raise HTTPException(status_code=404, detail="Count line not found")
 
-        await _recalculate_session_stats(db, count_line["session_id"])
+        await _decrement_session_stats(db, count_line)
         await _log_delete_activity(count_line, line_id, current_user, request)
 
         return {"success": True, "message": "Count line deleted successfully"}
@@ -603,6 +587,21 @@ async def delete_count_line(
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.post("/sessions/{session_id}/stats/reconcile")
+async def reconcile_session_stats(
+    session_id: str,
+    current_user: dict = Depends(get_current_user),
+):
+    """Re-aggregate a session's counters from its count lines and repair drift."""
+    _require_supervisor(current_user)
+    db = _get_db_client()
+
+    result = await SessionStatsService(db).reconcile_session(session_id)
+    if result is None:
+        raise HTTPException(status_code=404, detail="Session not found")
+    return result
+
+
 @router.get("/sessions/{session_id}/items/{item_code}/scan-status")
 async def check_item_scan_status(
     session_id: str,
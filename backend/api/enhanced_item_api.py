@@ -18,9 +18,15 @@ from backend.api.erp_api import _normalize_barcode_input
 
 # Import from auth module to avoid circular imports
 from backend.auth.dependencies import get_current_user_async as get_current_user
+from backend.auth.dependencies import get_current_user_from_claims
 
 # Import other dependencies directly
 # Import services and database
+from backend.services.item_lookup_index import (
+    LOOKUP_FIELDS,
+    item_lookup_index,
+    normalize_lookup_key,
+)
 from backend.services.monitoring_service import MonitoringService
 from backend.services.sql_sync_service import SQLSyncService
 
@@ -96,7 +102,7 @@ async def get_item_by_barcode_enhanced(
     request: Request,
     force_source: Optional[str] = Query(None, description="Force data source: mongodb, or cache"),
     include_metadata: bool = Query(True, description="Include response metadata"),
-    current_user: dict = Depends(get_current_user),
+    current_user: dict = Depends(get_current_user_from_claims),
 ):
     """
     Enhanced barcode lookup with multiple data sources, caching, and performance monitoring
@@ -104,10 +110,6 @@ async def get_item_by_barcode_enhanced(
     start_time = time.time()
 
     try:
-        # Log request for monitoring
-        if monitoring_service:
-            monitoring_service.track_request("enhanced_barcode_lookup", request)
-
         # Validate barcode format and normalize input
         normalized_barcode = _validate_barcode_format(barcode)
 
@@ -206,22 +208,52 @@ async def get_item_by_barcode_enhanced(
         )
 
 
+async def _find_item_in_mongo(barcode: str) -> Optional[dict]:
+    """
+    Resolve a scanned code through the in-process lookup index
+
+    A hit costs one exact query on item_code; a miss falls back to the
+    multi-field MongoDB lookup and adds the item to the index. A hit whose
+    document no longer carries the scanned code is stale: it is evicted and
+    resolved through the fallback instead. Codes the fallback cannot find
+    are remembered briefly, so repeated scans of them skip the $regex query.
+    """
+    item_code = item_lookup_index.resolve(barcode)
+    if item_code:
+        item = await db.erp_items.find_one({"item_code": item_code})
+        scanned_key = normalize_lookup_key(barcode)
+        if item and any(
+            normalize_lookup_key(item.get(field)) == scanned_key for field in LOOKUP_FIELDS
+        ):
+            return item
+        item_lookup_index.remove_item(item_code)
+    elif item_lookup_index.is_known_miss(barcode):
+        return None
+
+    regex_match = {"$regex": f"^{re.escape(barcode)}$", "$options": "i"}
+    item = await db.erp_items.find_one(
+        {
+            "$or": [
+                {"barcode": barcode},
+                {"autobarcode": barcode},
+                {"manual_barcode": barcode},
+                {"item_code": barcode},
+                {"item_code": regex_match},
+            ]
+        }
+    )
+    if item:
+        item_lookup_index.index_item(item)
+    else:
+        item_lookup_index.record_miss(barcode)
+    return item
+
+
 async def _fetch_from_specific_source(barcode: str, source: str) -> tuple[Optional[dict], str]:
     """Fetch item from a specific data source"""
 
     if source == "mongodb":
-        regex_match = {"$regex": f"^{re.escape(barcode)}$", "$options": "i"}
-        item = await db.erp_items.find_one(
-            {
-                "$or": [
-                    {"barcode": barcode},
-                    {"autobarcode": barcode},
-                    {"manual_barcode": barcode},
-                    {"item_code": barcode},
-                    {"item_code": regex_match},
-                ]
-            }
-        )
+        item = await _find_item_in_mongo(barcode)
         return item, "mongodb"
 
     elif source == "cache":
@@ -253,18 +285,7 @@ async def _fetch_with_fallback_strategy(barcode: str) -> tuple[Optional[dict], s
 
     # Strategy 2: MongoDB (primary app database)
     try:
-        regex_match = {"$regex": f"^{re.escape(barcode)}$", "$options": "i"}
-        mongo_item = await db.erp_items.find_one(
-            {
-                "$or": [
-                    {"barcode": barcode},
-                    {"autobarcode": barcode},
-                    {"manual_barcode": barcode},
-                    {"item_code": barcode},
-                    {"item_code": regex_match},
-                ]
-            }
-        )
+        mongo_item = await _find_item_in_mongo(barcode)
         if mongo_item:
             # Convert ObjectId to string for JSON serialization
             mongo_item["_id"] = str(mongo_item["_id"])
@@ -6,7 +6,7 @@ from fastapi import APIRouter, Depends, HTTPException, Query, Request
 from motor.motor_asyncio import AsyncIOMotorDatabase
 
 from backend.api.schemas import ERPItem
-from backend.auth.dependencies import get_current_user
+from backend.auth.dependencies import get_current_user, get_current_user_from_claims
 from backend.error_messages import get_error_message
 from backend.services.cache_service import CacheService
 
@@ -121,7 +121,9 @@ def _normalize_barcode_input(
 
 
 @router.get("/erp/items/barcode/{barcode}", response_model=ERPItem)
-async def get_item_by_barcode(barcode: str, current_user: dict = Depends(get_current_user)):
+async def get_item_by_barcode(
+    barcode: str, current_user: dict = Depends(get_current_user_from_claims)
+):
     """
     Get item details by barcode from MongoDB.
     """
@@ -6,7 +6,9 @@ Endpoints for managing scheduled exports
 from datetime import datetime
 from typing import Any, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, Response, status
+from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.responses import StreamingResponse
+from gridfs.errors import NoFile
 from pydantic import BaseModel
 
 from backend.auth.permissions import Permission, require_permission
@@ -260,14 +262,19 @@ async def list_export_results(
     if schedule_id:
         query["schedule_id"] = ObjectId(schedule_id)
 
-    cursor = export_service.db.export_results.find(query).sort("created_at", -1).limit(limit)
+    # Never load payloads here; legacy results still carry inline file_content
+    cursor = (
+        export_service.db.export_results.find(query, {"file_content": 0})
+        .sort("created_at", -1)
+        .limit(limit)
+    )
     results = await cursor.to_list(length=limit)
 
-    # Remove file_content from list (too large)
     for result in results:
         result["id"] = str(result.pop("_id"))
-        result["has_content"] = bool(result.get("file_content"))
-        result.pop("file_content", None)
+        result["has_content"] = bool(result.get("file_id") or result.get("size_bytes"))
+        if result.get("file_id"):
+            result["file_id"] = str(result["file_id"])
 
     return {"success": True, "data": {"results": results, "total": len(results)}}
 
@@ -295,7 +302,20 @@ async def download_export_result(
             },
         )
 
-    file_content = result.get("file_content", "")
+    try:
+        content = await export_service.open_export_result(result)
+    except NoFile:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail={
+                "success": False,
+                "error": {
+                    "message": "Export file is missing from storage",
+                    "code": "RESULT_FILE_NOT_FOUND",
+                },
+            },
+        )
+
     file_extension = result.get("file_extension", "csv")
     schedule_name = result.get("schedule_name", "export")
     created_at = result.get("created_at", datetime.utcnow())
@@ -307,8 +327,8 @@ async def download_export_result(
     # Determine content type
     content_type = "text/csv" if file_extension == "csv" else "application/json"
 
-    return Response(
-        content=file_content,
+    return StreamingResponse(
+        content,
         media_type=content_type,
         headers={"Content-Disposition": f'attachment; filename="{filename}"'},
     )
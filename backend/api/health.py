@@ -163,6 +163,8 @@ def _gather_system_resources() -> dict[str, Any]:
 
     import psutil
 
+    from backend.services.system_metrics import system_metrics_sampler
+
     process = psutil.Process(os.getpid())
 
     try:
@@ -184,7 +186,7 @@ def _gather_system_resources() -> dict[str, Any]:
 
     return {
         "memory_mb": round(process.memory_info().rss / 1024 / 1024, 2),
-        "cpu_percent": round(process.cpu_percent(interval=0.1), 2),
+        "cpu_percent": system_metrics_sampler.snapshot()["process_cpu_percent"],
         "threads": process.num_threads(),
         "uptime_seconds": uptime_seconds,
         "disk": {
@@ -391,6 +393,8 @@ async def detailed_health_check() -> dict[str, Any]:
     """
     from backend.config import settings
     from backend.core.globals import database_health_service
+    from backend.core.websocket_manager import manager as websocket_manager
+    from backend.services.log_sink import log_sink
 
     resources = _gather_system_resources()
     mongo_pool_info = _build_mongo_pool_info()
@@ -407,6 +411,8 @@ async def detailed_health_check() -> dict[str, Any]:
         "version": getattr(settings, "APP_VERSION", "1.0.0"),
         "resources": resources,
         "connection_pools": {"mongodb": mongo_pool_info},
+        "websockets": websocket_manager.get_stats(),
+        "log_sink": log_sink.get_stats(),
     }
 
     return health_data
@@ -73,6 +73,7 @@ enterprise_security_service: Any = None
 
 # Phase 1-3: New Services
 # Utils
+from backend.auth.user_cache import token_version_claims  # noqa: E402
 from backend.utils.api_utils import result_to_response  # noqa: E402
 from backend.utils.api_utils import sanitize_for_logging  # noqa: E402
 from backend.utils.auth_utils import get_password_hash  # noqa: E402
@@ -560,11 +561,19 @@ async def generate_auth_tokens(
             minutes=getattr(settings, "ACCESS_TOKEN_EXPIRE_MINUTES", 15)
         )
         access_token = create_access_token(
-            {"sub": user["username"], "role": user.get("role", "staff")}
+            {
+                "sub": user["username"],
+                "role": user.get("role", "staff"),
+                **token_version_claims(user),
+            }
         )
 
         # Generate refresh token using service
-        refresh_payload = {"sub": user["username"], "role": user.get("role", "staff")}
+        refresh_payload = {
+            "sub": user["username"],
+            "role": user.get("role", "staff"),
+            **token_version_claims(user),
+        }
         refresh_token = refresh_token_service.create_refresh_token(refresh_payload)
         refresh_token_expires = datetime.utcnow() + timedelta(
             days=getattr(settings, "REFRESH_TOKEN_EXPIRE_DAYS", 30)
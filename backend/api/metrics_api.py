@@ -89,13 +89,16 @@ async def get_metrics_stats():
 
     import psutil
 
+    from backend.services.system_metrics import system_metrics_sampler
+
     db = get_db()
+    system_metrics = system_metrics_sampler.snapshot()
 
     stats = {
         "timestamp": time.time(),
         "system": {
-            "cpu_percent": psutil.cpu_percent(interval=1),
-            "memory_percent": psutil.virtual_memory().percent,
+            "cpu_percent": system_metrics["cpu_percent"],
+            "memory_percent": system_metrics["memory_percent"],
             "disk_percent": psutil.disk_usage("/").percent,
         },
         "mongodb": {"status": "unknown"},
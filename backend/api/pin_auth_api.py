@@ -14,8 +14,8 @@ from backend.api.auth import (
 )
 from backend.auth.dependencies import get_current_user
 from backend.db.runtime import get_db
+from backend.services.hashing_service import hashing_service
 from backend.services.pin_auth_service import PINAuthService
-from backend.utils.auth_utils import verify_password
 
 router = APIRouter()
 
@@ -41,7 +41,9 @@ async def change_pin(
 
     # Verify current password before allowing PIN change
     hashed_password = current_user.get("hashed_password")
-    if not hashed_password or not verify_password(request.current_password, hashed_password):
+    if not hashed_password or not await hashing_service.verify(
+        request.current_password, hashed_password
+    ):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Current password is incorrect",
@@ -12,6 +12,7 @@ from pydantic import BaseModel, Field
 
 from backend.auth.dependencies import get_current_user_async as get_current_user
 from backend.db.runtime import get_db
+from backend.services.kpi_store import increment_kpis, session_status_delta, set_session_status
 from backend.services.lock_manager import get_lock_manager
 from backend.services.pubsub_service import get_pubsub_service
 from backend.services.redis_service import get_redis
@@ -246,6 +247,7 @@ async def claim_rack(
         }
 
         await db.verification_sessions.insert_one(session_doc)
+        await increment_kpis(db, session_status_delta(None, "active"))
 
         # Create session lock in Redis
         await lock_manager.create_session_lock(session_id, user_id, rack_id, ttl=3600)
@@ -335,14 +337,8 @@ async def release_rack(
 
     # Update session status
     if rack["session_id"]:
-        await db.verification_sessions.update_one(
-            {"session_id": rack["session_id"]},
-            {
-                "$set": {
-                    "status": "completed",
-                    "completed_at": time.time(),
-                }
-            },
+        await set_session_status(
+            db, rack["session_id"], {"status": "completed", "completed_at": time.time()}
         )
 
     # Broadcast update
@@ -389,9 +385,7 @@ async def pause_rack(
 
     # Update session
     if rack["session_id"]:
-        await db.verification_sessions.update_one(
-            {"session_id": rack["session_id"]}, {"$set": {"status": "paused"}}
-        )
+        await set_session_status(db, rack["session_id"], {"status": "paused"})
 
     # Broadcast update
     await pubsub_service.publish_rack_update(rack_id, "paused", {"user_id": user_id})
@@ -442,14 +436,8 @@ async def resume_rack(
 
     # Update session
     if rack["session_id"]:
-        await db.verification_sessions.update_one(
-            {"session_id": rack["session_id"]},
-            {
-                "$set": {
-                    "status": "active",
-                    "last_heartbeat": time.time(),
-                }
-            },
+        await set_session_status(
+            db, rack["session_id"], {"status": "active", "last_heartbeat": time.time()}
         )
 
     # Broadcast update
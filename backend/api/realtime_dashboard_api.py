@@ -4,7 +4,6 @@ Server-Sent Events (SSE) and WebSocket endpoints for live data updates
 """
 
 import asyncio
-import json
 import logging
 from datetime import datetime
 from typing import Any, Optional
@@ -22,6 +21,7 @@ from backend.services.advanced_report_service import (
     ReportFilters,
     SortOrder,
 )
+from backend.services.dashboard_publisher import DashboardPublisher
 from backend.utils.tracing import trace_dashboard_query, trace_span
 
 logger = logging.getLogger(__name__)
@@ -394,59 +394,73 @@ async def get_filter_options(
 # ==========================================
 
 
+async def _compute_stream_payload(params: dict[str, Any]) -> dict[str, Any]:
+    """Verified items page shown by the SSE dashboard stream."""
+    service = AdvancedReportService(get_db())
+    with trace_span("sse_data_fetch"):
+        return await service.generate_verified_items_report(
+            ReportConfig(
+                report_type="verified_items",
+                filters=parse_filters(params.get("filters")),
+                page=params["page"],
+                page_size=params["page_size"],
+                include_aggregations=True,
+            )
+        )
+
+
+async def _count_lines_write_marker() -> Optional[int]:
+    """
+    Total write operations the server has applied to count_lines.
+
+    Changes whenever any worker inserts, updates or deletes a count line, so an
+    unchanged value means the dashboard would compute the same result.
+    """
+    stats = await (
+        get_db().count_lines.aggregate([{"$collStats": {"latencyStats": {}}}]).to_list(None)
+    )
+    if not stats:
+        return None
+    return sum(s["latencyStats"]["writes"]["ops"] for s in stats)
+
+
+dashboard_publisher = DashboardPublisher(
+    compute=_compute_stream_payload,
+    change_probe=_count_lines_write_marker,
+)
+
+
 @realtime_dashboard_router.get("/stream")
 async def dashboard_stream(
     page: int = Query(default=1, ge=1),
     page_size: int = Query(default=50, ge=10, le=200),
     refresh_interval: int = Query(default=10, ge=5, le=300),
+    warehouse: Optional[str] = Query(default=None),
+    session_id: Optional[str] = Query(default=None),
+    verified: Optional[bool] = Query(default=None),
     current_user: dict = Depends(require_role("staff", "supervisor", "admin")),
 ):
-    """Server-Sent Events stream for real-time dashboard updates."""
-
-    async def event_generator():
-        db = get_db()
-        service = AdvancedReportService(db)
-
-        while True:
-            try:
-                with trace_span("sse_data_fetch"):
-                    config = ReportConfig(
-                        report_type="verified_items",
-                        page=page,
-                        page_size=page_size,
-                        include_aggregations=True,
-                    )
-                    result = await service.generate_verified_items_report(config)
-
-                # Format as SSE
-                data = json.dumps(
-                    {
-                        "type": "data",
-                        "payload": result,
-                        "timestamp": datetime.utcnow().isoformat(),
-                    }
-                )
-                yield f"data: {data}\n\n"
-
-                await asyncio.sleep(refresh_interval)
-
-            except asyncio.CancelledError:
-                logger.info("SSE stream cancelled")
-                break
-            except Exception as e:
-                logger.error(f"SSE stream error: {e}")
-                error_data = json.dumps(
-                    {
-                        "type": "error",
-                        "message": str(e),
-                        "timestamp": datetime.utcnow().isoformat(),
-                    }
-                )
-                yield f"data: {error_data}\n\n"
-                await asyncio.sleep(5)
+    """
+    Server-Sent Events stream for real-time dashboard updates.
+
+    Clients watching the same page and filters share one computation per tick.
+    The first event is ``data`` with the full payload; after that only ``delta``
+    events carrying the changed fields (``changes``) and deleted paths
+    (``removed``) are sent, and nothing at all while count_lines is unchanged.
+    """
+    filters = {
+        key: value
+        for key, value in {
+            "warehouse": warehouse,
+            "session_id": session_id,
+            "verified": verified,
+        }.items()
+        if value is not None
+    }
+    params = {"page": page, "page_size": page_size, "filters": filters}
 
     return StreamingResponse(
-        event_generator(),
+        dashboard_publisher.subscribe(params, refresh_interval),
         media_type="text/event-stream",
         headers={
             "Cache-Control": "no-cache",
@@ -3,10 +3,9 @@ Report Generation API - Multiple report types with filtering and export
 Supports Stock Summary, Variance, User Activity, Session History, and Audit Trail reports
 """
 
-import csv
-import io
 import json
 import logging
+from collections.abc import AsyncIterator
 from datetime import date, datetime
 from typing import Any, Optional
 
@@ -16,6 +15,7 @@ from pydantic import BaseModel, Field
 
 from backend.auth.dependencies import get_current_user, require_role
 from backend.db.runtime import get_db
+from backend.services.reporting.export_engine import gzip_stream, stream_csv, stream_xlsx
 
 logger = logging.getLogger(__name__)
 
@@ -68,6 +68,8 @@ class ReportRequest(BaseModel):
     filters: Optional[ReportFilter] = None
     format: str = Field(default="json", pattern="^(json|csv|xlsx)$")
     include_summary: bool = True
+    # Exports only: gzip the streamed file and download it as .gz
+    gzip: bool = False
 
 
 class ReportSummary(BaseModel):
@@ -119,22 +121,8 @@ def _format_xlsx_cell_value(value: Any) -> Any:
     return value
 
 
-def _write_xlsx_headers(ws: Any, headers: list[str]) -> None:
-    """Write header row to Excel worksheet."""
-    for col, header in enumerate(headers, 1):
-        ws.cell(row=1, column=col, value=header)
-
-
-def _write_xlsx_data(ws: Any, data: list[dict], headers: list[str]) -> None:
-    """Write data rows to Excel worksheet."""
-    for row_idx, row in enumerate(data, 2):
-        for col_idx, header in enumerate(headers, 1):
-            value = row.get(header)
-            ws.cell(row=row_idx, column=col_idx, value=_format_xlsx_cell_value(value))
-
-
-async def generate_stock_summary(db, filters: ReportFilter) -> list[dict]:
-    """Generate stock summary report data."""
+def build_stock_summary_pipeline(filters: ReportFilter) -> list[dict[str, Any]]:
+    """Build stock summary report aggregation pipeline."""
     query: dict[str, Any] = {}
 
     if filters.warehouse:
@@ -174,11 +162,16 @@ async def generate_stock_summary(db, filters: ReportFilter) -> list[dict]:
         {"$limit": 10000},
     ]
 
-    return await db.erp_items.aggregate(pipeline).to_list(10000)
+    return pipeline
 
 
-async def generate_variance_report(db, filters: ReportFilter) -> list[dict]:
-    """Generate variance report data."""
+async def generate_stock_summary(db, filters: ReportFilter) -> list[dict]:
+    """Generate stock summary report data."""
+    return await db.erp_items.aggregate(build_stock_summary_pipeline(filters)).to_list(10000)
+
+
+def build_variance_report_pipeline(filters: ReportFilter) -> list[dict[str, Any]]:
+    """Build variance report aggregation pipeline."""
     query: dict[str, Any] = {"variance": {"$ne": 0}}
 
     if filters.warehouse:
@@ -236,11 +229,18 @@ async def generate_variance_report(db, filters: ReportFilter) -> list[dict]:
         {"$limit": 10000},
     ]
 
-    return await db.verification_records.aggregate(pipeline).to_list(10000)
+    return pipeline
 
 
-async def generate_user_activity_report(db, filters: ReportFilter) -> list[dict]:
-    """Generate user activity report data."""
+async def generate_variance_report(db, filters: ReportFilter) -> list[dict]:
+    """Generate variance report data."""
+    return await db.verification_records.aggregate(build_variance_report_pipeline(filters)).to_list(
+        10000
+    )
+
+
+def build_user_activity_pipeline(filters: ReportFilter) -> list[dict[str, Any]]:
+    """Build user activity report aggregation pipeline."""
     query: dict[str, Any] = {}
 
     if filters.user_id:
@@ -290,11 +290,16 @@ async def generate_user_activity_report(db, filters: ReportFilter) -> list[dict]
         {"$limit": 1000},
     ]
 
-    return await db.audit_logs.aggregate(pipeline).to_list(1000)
+    return pipeline
 
 
-async def generate_session_history_report(db, filters: ReportFilter) -> list[dict]:
-    """Generate session history report data."""
+async def generate_user_activity_report(db, filters: ReportFilter) -> list[dict]:
+    """Generate user activity report data."""
+    return await db.audit_logs.aggregate(build_user_activity_pipeline(filters)).to_list(1000)
+
+
+def build_session_history_pipeline(filters: ReportFilter) -> list[dict[str, Any]]:
+    """Build session history report aggregation pipeline."""
     query: dict[str, Any] = {}
 
     if filters.status:
@@ -363,11 +368,18 @@ async def generate_session_history_report(db, filters: ReportFilter) -> list[dic
         {"$limit": 5000},
     ]
 
-    return await db.verification_sessions.aggregate(pipeline).to_list(5000)
+    return pipeline
 
 
-async def generate_audit_trail_report(db, filters: ReportFilter) -> list[dict]:
-    """Generate audit trail report data."""
+async def generate_session_history_report(db, filters: ReportFilter) -> list[dict]:
+    """Generate session history report data."""
+    return await db.verification_sessions.aggregate(
+        build_session_history_pipeline(filters)
+    ).to_list(5000)
+
+
+def build_audit_trail_pipeline(filters: ReportFilter) -> list[dict[str, Any]]:
+    """Build audit trail report aggregation pipeline."""
     query: dict[str, Any] = {}
 
     if filters.user_id:
@@ -406,7 +418,12 @@ async def generate_audit_trail_report(db, filters: ReportFilter) -> list[dict]:
         {"$limit": 10000},
     ]
 
-    return await db.audit_logs.aggregate(pipeline).to_list(10000)
+    return pipeline
+
+
+async def generate_audit_trail_report(db, filters: ReportFilter) -> list[dict]:
+    """Generate audit trail report data."""
+    return await db.audit_logs.aggregate(build_audit_trail_pipeline(filters)).to_list(10000)
 
 
 # Report Generator Dispatch
@@ -418,6 +435,86 @@ REPORT_GENERATORS = {
     "audit_trail": generate_audit_trail_report,
 }
 
+REPORT_PIPELINES = {
+    "stock_summary": build_stock_summary_pipeline,
+    "variance_report": build_variance_report_pipeline,
+    "user_activity": build_user_activity_pipeline,
+    "session_history": build_session_history_pipeline,
+    "audit_trail": build_audit_trail_pipeline,
+}
+
+# Cursor batch size for streamed exports
+EXPORT_BATCH_SIZE = 500
+
+
+async def stream_report_rows(
+    db, report_type: str, filters: ReportFilter
+) -> AsyncIterator[dict[str, Any]]:
+    """Yield report rows straight from the aggregation cursor."""
+    collection = db[REPORT_TYPES[report_type]["collection"]]
+    pipeline = REPORT_PIPELINES[report_type](filters)
+    cursor = collection.aggregate(pipeline, allowDiskUse=True, batchSize=EXPORT_BATCH_SIZE)
+    async for row in cursor:
+        yield row
+
+
+async def _continue_rows(
+    first: dict[str, Any], rows: AsyncIterator[dict[str, Any]], report_type: str
+) -> AsyncIterator[dict[str, Any]]:
+    """Re-attach the peeked first row and log failures once streaming has begun."""
+    yield first
+    try:
+        async for row in rows:
+            yield row
+    except Exception as e:
+        logger.error(f"Error streaming {report_type} export: {e}")
+        raise
+
+
+async def _open_report_rows(request: ReportRequest) -> AsyncIterator[dict[str, Any]]:
+    """
+    Start a report cursor and fetch its first row.
+
+    Errors and empty results surface as HTTP errors here, before the
+    streaming response has sent any headers.
+    """
+    if request.report_type not in REPORT_TYPES:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid report type")
+
+    rows = stream_report_rows(get_db(), request.report_type, request.filters or ReportFilter())
+    try:
+        first = await rows.__anext__()
+    except StopAsyncIteration:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="No data found for the specified filters",
+        )
+    except Exception as e:
+        logger.error(f"Error generating report: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to generate report",
+        )
+
+    return _continue_rows(first, rows, request.report_type)
+
+
+def _export_response(
+    request: ReportRequest, body: AsyncIterator[bytes], extension: str, media_type: str
+) -> StreamingResponse:
+    """Wrap an export stream in a download response, gzipped on request."""
+    filename = f"{request.report_type}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.{extension}"
+    if request.gzip:
+        body = gzip_stream(body)
+        filename = f"{filename}.gz"
+        media_type = "application/gzip"
+
+    return StreamingResponse(
+        body,
+        media_type=media_type,
+        headers={"Content-Disposition": f"attachment; filename={filename}"},
+    )
+
 
 # API Endpoints
 @report_generation_router.get("/types")
@@ -480,49 +577,11 @@ async def export_report_csv(
     current_user: dict = Depends(require_role("admin", "supervisor")),
 ):
     """
-    Export report as CSV file.
+    Export report as CSV file, streamed from the database cursor.
     """
-    if request.report_type not in REPORT_TYPES:
-        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid report type")
-
-    db = get_db()
-    filters = request.filters or ReportFilter()
-
-    # Generate report data
-    generator = REPORT_GENERATORS[request.report_type]
-    try:
-        data = await generator(db, filters)
-    except Exception as e:
-        logger.error(f"Error generating report: {e}")
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Failed to generate report",
-        )
-
-    if not data:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="No data found for the specified filters",
-        )
-
-    # Create CSV
-    output = io.StringIO()
-    writer = csv.DictWriter(output, fieldnames=data[0].keys())
-    writer.writeheader()
-
-    for row in data:
-        sanitized_row = {k: sanitize_for_csv(v) for k, v in row.items()}
-        writer.writerow(sanitized_row)
-
-    output.seek(0)
-
-    filename = f"{request.report_type}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
-
-    return StreamingResponse(
-        iter([output.getvalue()]),
-        media_type="text/csv",
-        headers={"Content-Disposition": f"attachment; filename={filename}"},
-    )
+    rows = await _open_report_rows(request)
+    body = stream_csv(rows, format_value=sanitize_for_csv)
+    return _export_response(request, body, "csv", "text/csv")
 
 
 @report_generation_router.post("/export/xlsx")
@@ -531,56 +590,27 @@ async def export_report_xlsx(
     current_user: dict = Depends(require_role("admin", "supervisor")),
 ):
     """
-    Export report as Excel XLSX file.
+    Export report as Excel XLSX file, built in write-only mode.
     """
     try:
-        import openpyxl
+        import openpyxl  # noqa: F401
     except ImportError:
         raise HTTPException(
             status_code=status.HTTP_501_NOT_IMPLEMENTED,
             detail="Excel export not available. Install openpyxl package.",
         )
 
-    if request.report_type not in REPORT_TYPES:
-        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid report type")
-
-    db = get_db()
-    filters = request.filters or ReportFilter()
-
-    generator = REPORT_GENERATORS[request.report_type]
-    try:
-        data = await generator(db, filters)
-    except Exception as e:
-        logger.error(f"Error generating report: {e}")
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Failed to generate report",
-        )
-
-    if not data:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="No data found for the specified filters",
-        )
-
-    wb = openpyxl.Workbook()
-    ws = wb.active
-    ws.title = REPORT_TYPES[request.report_type]["name"][:31]
-
-    headers = list(data[0].keys())
-    _write_xlsx_headers(ws, headers)
-    _write_xlsx_data(ws, data, headers)
-
-    output = io.BytesIO()
-    wb.save(output)
-    output.seek(0)
-
-    filename = f"{request.report_type}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx"
-
-    return StreamingResponse(
-        iter([output.getvalue()]),
-        media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-        headers={"Content-Disposition": f"attachment; filename={filename}"},
+    rows = await _open_report_rows(request)
+    body = stream_xlsx(
+        rows,
+        title=REPORT_TYPES[request.report_type]["name"],
+        format_value=_format_xlsx_cell_value,
+    )
+    return _export_response(
+        request,
+        body,
+        "xlsx",
+        "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
     )
 
 
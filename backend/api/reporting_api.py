@@ -7,6 +7,7 @@ import logging
 from typing import Any, Optional
 
 from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, Field
 
 from backend.auth.dependencies import get_current_user_async as get_current_user
@@ -235,28 +236,34 @@ async def export_snapshot(
     if not snapshot:
         raise HTTPException(status_code=404, detail="Snapshot not found")
 
-    # Export
+    filename = export_engine.get_export_filename(snapshot, format)
+    headers = {"Content-Disposition": f"attachment; filename={filename}"}
+
+    # CSV and XLSX are streamed; JSON stays a single document
     if format == "csv":
-        content = export_engine.export_to_csv(snapshot)
-        media_type = "text/csv"
+        return StreamingResponse(
+            export_engine.stream_csv(snapshot, rows=snapshot_engine.iter_rows(snapshot)),
+            media_type="text/csv",
+            headers=headers,
+        )
     elif format == "xlsx":
-        content = export_engine.export_to_xlsx(snapshot)
-        media_type = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+        try:
+            import openpyxl  # noqa: F401
+        except ImportError:
+            raise HTTPException(status_code=501, detail="openpyxl is required for XLSX export")
+        return StreamingResponse(
+            export_engine.stream_xlsx(snapshot, rows=snapshot_engine.iter_rows(snapshot)),
+            media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+            headers=headers,
+        )
     elif format == "json":
+        rows = [row async for row in snapshot_engine.iter_rows(snapshot)]
+        snapshot = {**snapshot, "row_data": rows}
         content = export_engine.export_to_json(snapshot)
-        media_type = "application/json"
+        return Response(content=content, media_type="application/json", headers=headers)
     else:
         raise HTTPException(status_code=400, detail="Invalid format")
 
-    # Generate filename
-    filename = export_engine.get_export_filename(snapshot, format)
-
-    return Response(
-        content=content,
-        media_type=media_type,
-        headers={"Content-Disposition": f"attachment; filename={filename}"},
-    )
-
 
 @router.post("/compare")
 async def compare_snapshots(
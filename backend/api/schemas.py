@@ -222,6 +222,8 @@ class Session(BaseModel):
     reconciled_at: Optional[datetime] = None
     total_items: int = 0
     total_variance: float = 0
+    approved_items: int = 0
+    rejected_items: int = 0
     notes: Optional[str] = None
 
     @field_validator("status", mode="before")
@@ -15,6 +15,7 @@ from backend.api.response_models import PaginatedResponse
 from backend.api.schemas import Session, SessionCreate
 from backend.auth.dependencies import get_current_user_async as get_current_user
 from backend.db.runtime import get_db
+from backend.services.kpi_store import set_session_status
 from backend.services.lock_manager import get_lock_manager
 from backend.services.redis_service import get_redis
 
@@ -422,9 +423,7 @@ async def update_session_status(
         raise HTTPException(status_code=403, detail="Not your session")
 
     # Update status
-    await db.verification_sessions.update_one(
-        {"session_id": session_id}, {"$set": {"status": status}}
-    )
+    await set_session_status(db, session_id, {"status": status})
 
     return {"success": True, "id": session_id, "status": status}
 
@@ -468,15 +467,7 @@ async def complete_session(
         )
 
     # Update session
-    await db.verification_sessions.update_one(
-        {"session_id": session_id},
-        {
-            "$set": {
-                "status": "CLOSED",
-                "completed_at": time.time(),
-            }
-        },
-    )
+    await set_session_status(db, session_id, {"status": "CLOSED", "completed_at": time.time()})
 
     # Delete session lock from Redis
     await lock_manager.delete_session(session_id)
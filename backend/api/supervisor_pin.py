@@ -7,7 +7,7 @@ from pydantic import BaseModel
 from backend.auth.dependencies import get_current_user
 from backend.db.runtime import get_db
 from backend.services.activity_log import ActivityLogService
-from backend.utils.auth_utils import verify_password
+from backend.services.hashing_service import hashing_service
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
@@ -42,7 +42,7 @@ async def verify_supervisor_pin(
         raise HTTPException(status_code=403, detail="User is not a supervisor")
 
     # 3. Verify PIN
-    # We reuse verify_password for PINs since they are hashed the same way
+    # PINs are hashed the same way as passwords
     stored_pin_hash = supervisor.get("pin_hash")
     if not stored_pin_hash:
         raise HTTPException(
@@ -50,7 +50,7 @@ async def verify_supervisor_pin(
             detail="Supervisor PIN not set. Please contact administrator.",
         )
 
-    if not verify_password(request.pin, stored_pin_hash):
+    if not await hashing_service.verify(request.pin, stored_pin_hash):
         logger.warning(f"Failed PIN attempt for supervisor {request.supervisor_username}")
         raise HTTPException(status_code=401, detail="Invalid PIN")
 
@@ -14,12 +14,20 @@ from typing import Any, Optional
 from bson import ObjectId
 from fastapi import APIRouter, Depends, HTTPException
 from pydantic import BaseModel, ConfigDict, Field
+from pymongo import UpdateOne
+from pymongo.errors import BulkWriteError
 
 from backend.api.schemas import Session
 from backend.auth.dependencies import get_current_user_async as get_current_user
 from backend.db.runtime import get_db
 from backend.middleware.security import batch_rate_limiter
 from backend.services.circuit_breaker import get_circuit_breaker
+from backend.services.kpi_store import (
+    VERIFICATION_KPI_PROJECTION,
+    increment_kpis,
+    merge_deltas,
+    verification_record_delta,
+)
 from backend.services.lock_manager import LockManager, get_lock_manager
 from backend.services.redis_service import get_redis
 from backend.services.sync_conflicts_service import SyncConflictsService
@@ -133,16 +141,47 @@ class BatchSyncResponse(BaseModel):
 
 # Sync Logic
 
+# MongoDB duplicate key error code
+DUPLICATE_KEY_ERROR = 11000
+
+
+async def prefetch_serial_owners(records: list[SyncRecord], db) -> dict[str, dict[str, Any]]:
+    """
+    Resolve every serial number in the batch with a single $in query
+
+    Returns:
+        Mapping of serial number to the existing item_serials document
+    """
+    serials = list(dict.fromkeys(serial for record in records for serial in record.serial_numbers))
+    if not serials:
+        return {}
+
+    owners: dict[str, dict[str, Any]] = {}
+    cursor = db.item_serials.find({"serial_number": {"$in": serials}})
+    async for doc in cursor:
+        owners.setdefault(doc["serial_number"], doc)
+    return owners
+
+
+async def prefetch_rack_lock_owners(
+    records: list[SyncRecord], lock_manager: LockManager
+) -> dict[str, Optional[str]]:
+    """Fetch the lock owner of every rack in the batch with one MGET"""
+    rack_ids = [record.rack_id for record in records if record.rack_id]
+    if not rack_ids:
+        return {}
+    return await lock_manager.get_rack_lock_owners(rack_ids)
+
 
 async def validate_record(
     record: SyncRecord,
-    db,
-    lock_manager: LockManager,
+    serial_owners: dict[str, dict[str, Any]],
+    rack_lock_owners: dict[str, Optional[str]],
     sync_service: SyncConflictsService = None,
     user_id: Optional[str] = None,
 ) -> Optional[SyncConflict]:
     """
-    Validate a single record before syncing
+    Validate a single record before syncing, against prefetched serials and rack locks
 
     Returns:
         SyncConflict if validation fails, None if valid
@@ -150,7 +189,7 @@ async def validate_record(
     # Check for duplicate serial numbers
     if record.serial_numbers:
         for serial in record.serial_numbers:
-            existing = await db.item_serials.find_one({"serial_number": serial})
+            existing = serial_owners.get(serial)
             if existing and existing.get("client_record_id") != record.client_record_id:
                 conflict_id = None
                 if sync_service and user_id:
@@ -195,7 +234,7 @@ async def validate_record(
 
     # Check rack lock (if rack_id provided)
     if record.rack_id:
-        owner = await lock_manager.get_rack_lock_owner(record.rack_id)
+        owner = rack_lock_owners.get(record.rack_id)
         if owner and owner != record.session_id:
             return SyncConflict(
                 client_record_id=record.client_record_id,
@@ -207,71 +246,146 @@ async def validate_record(
     return None
 
 
-async def sync_single_record(record: SyncRecord, db, user_id: str) -> tuple[bool, Optional[str]]:
+def build_verification_doc(record: SyncRecord, user_id: str) -> dict[str, Any]:
+    """Build the verification_records document for a synced record"""
+    return {
+        "client_record_id": record.client_record_id,
+        "session_id": record.session_id,
+        "rack_id": record.rack_id,
+        "floor": record.floor,
+        "item_code": record.item_code,
+        "verified_qty": record.verified_qty,
+        "damage_qty": record.damage_qty,
+        "serial_numbers": record.serial_numbers,
+        "mfg_date": record.mfg_date,
+        "mrp": record.mrp,
+        "uom": record.uom,
+        "category": record.category,
+        "subcategory": record.subcategory,
+        "item_condition": record.item_condition,
+        "evidence_photos": record.evidence_photos,
+        "status": record.status,
+        "created_at": record.created_at,
+        "updated_at": record.updated_at,
+        "sync_status": "synced",
+        "synced_by": user_id,
+        "synced_at": time.time(),
+    }
+
+
+def claim_serials(
+    record: SyncRecord, serial_owners: dict[str, dict[str, Any]]
+) -> list[dict[str, Any]]:
     """
-    Sync a single record to database
+    Build item_serials documents for an accepted record
 
-    Returns:
-        (success: bool, error_message: Optional[str])
+    The documents are also registered in ``serial_owners`` so later records in
+    the same batch see them exactly as if they had already been inserted.
     """
-    try:
-        # Prepare document
+    serial_docs = []
+    for serial in record.serial_numbers:
         doc = {
-            "client_record_id": record.client_record_id,
+            "_id": ObjectId(),
+            "serial_number": serial,
+            "item_code": record.item_code,
             "session_id": record.session_id,
             "rack_id": record.rack_id,
-            "floor": record.floor,
-            "item_code": record.item_code,
-            "verified_qty": record.verified_qty,
-            "damage_qty": record.damage_qty,
-            "serial_numbers": record.serial_numbers,
-            "mfg_date": record.mfg_date,
-            "mrp": record.mrp,
-            "uom": record.uom,
-            "category": record.category,
-            "subcategory": record.subcategory,
-            "item_condition": record.item_condition,
-            "evidence_photos": record.evidence_photos,
-            "status": record.status,
-            "created_at": record.created_at,
-            "updated_at": record.updated_at,
-            "sync_status": "synced",
-            "synced_by": user_id,
-            "synced_at": time.time(),
+            "client_record_id": record.client_record_id,
+            "created_at": time.time(),
         }
+        serial_owners.setdefault(serial, doc)
+        serial_docs.append(doc)
+    return serial_docs
 
-        # Upsert record
-        await db.verification_records.update_one(
-            {"client_record_id": record.client_record_id}, {"$set": doc}, upsert=True
-        )
 
-        # Insert serial numbers
-        if record.serial_numbers:
-            serial_docs = [
-                {
-                    "serial_number": serial,
-                    "item_code": record.item_code,
-                    "session_id": record.session_id,
-                    "rack_id": record.rack_id,
-                    "client_record_id": record.client_record_id,
-                    "created_at": time.time(),
-                }
-                for serial in record.serial_numbers
-            ]
-
-            # Insert with ignore duplicates
-            try:
-                await db.item_serials.insert_many(serial_docs, ordered=False)
-            except Exception as e:
-                # Ignore duplicate key errors
-                if "duplicate key" not in str(e).lower():
-                    raise
-
-        return True, None
+async def load_previous_records(db, record_ids: list[str]) -> dict[str, dict[str, Any]]:
+    """KPI-relevant fields of the records a batch is about to overwrite"""
+    cursor = db.verification_records.find(
+        {"client_record_id": {"$in": record_ids}}, VERIFICATION_KPI_PROJECTION
+    )
+    return {doc["client_record_id"]: doc async for doc in cursor}
 
+
+async def write_records(
+    records: list[SyncRecord],
+    serial_docs: dict[str, list[dict[str, Any]]],
+    db,
+    user_id: str,
+) -> dict[str, str]:
+    """
+    Write all accepted records with one bulk_write and one insert_many
+
+    Returns:
+        Mapping of client_record_id to error message for records that failed
+    """
+    failed: dict[str, str] = {}
+    if not records:
+        return failed
+
+    # A repeated client_record_id is upserted once with its last version (last write wins)
+    latest_docs = {
+        record.client_record_id: build_verification_doc(record, user_id) for record in records
+    }
+    record_ids = list(latest_docs)
+    try:
+        previous_records: Optional[dict[str, dict[str, Any]]] = await load_previous_records(
+            db, record_ids
+        )
+    except Exception as e:
+        # Dashboard KPIs for this batch are left to the periodic recompute
+        logger.warning(f"Could not load previous verification records: {str(e)}")
+        previous_records = None
+
+    operations = [
+        UpdateOne({"client_record_id": record_id}, {"$set": doc}, upsert=True)
+        for record_id, doc in latest_docs.items()
+    ]
+    try:
+        await db.verification_records.bulk_write(operations, ordered=False)
+    except BulkWriteError as e:
+        for write_error in e.details.get("writeErrors", []):
+            failed[record_ids[write_error["index"]]] = write_error.get("errmsg", str(e))
     except Exception as e:
-        logger.error(f"Error syncing record {record.client_record_id}: {str(e)}")
-        return False, str(e)
+        return dict.fromkeys(record_ids, str(e))
+
+    if previous_records is not None:
+        # $set upserts keep fields the batch does not send, so diff against the merged record
+        await increment_kpis(
+            db,
+            merge_deltas(
+                [
+                    verification_record_delta(
+                        previous_records.get(record_id),
+                        {**previous_records.get(record_id, {}), **latest_docs[record_id]},
+                    )
+                    for record_id in record_ids
+                    if record_id not in failed
+                ]
+            ),
+        )
+
+    # Insert serial numbers of successfully written records, ignoring duplicates
+    serial_batch = [
+        (record_id, doc)
+        for record_id in record_ids
+        if record_id not in failed
+        for doc in serial_docs.get(record_id, [])
+    ]
+    if serial_batch:
+        try:
+            await db.item_serials.insert_many([doc for _, doc in serial_batch], ordered=False)
+        except BulkWriteError as e:
+            for write_error in e.details.get("writeErrors", []):
+                if write_error.get("code") != DUPLICATE_KEY_ERROR:
+                    record_id = serial_batch[write_error["index"]][0]
+                    failed.setdefault(record_id, write_error.get("errmsg", str(e)))
+        except Exception as e:
+            for record_id, _ in serial_batch:
+                failed.setdefault(record_id, str(e))
+
+    for record_id, error_msg in failed.items():
+        logger.error(f"Error syncing record {record_id}: {error_msg}")
+    return failed
 
 
 @router.post("/batch", response_model=BatchSyncResponse)
@@ -294,7 +408,7 @@ async def sync_batch(
 
     # Rate limiting check
     user_id = current_user.get("username", str(current_user.get("_id", "unknown")))
-    is_allowed, rate_info = batch_rate_limiter.is_allowed(user_id)
+    is_allowed, rate_info = await batch_rate_limiter.is_allowed(user_id)
     if not is_allowed:
         raise HTTPException(
             status_code=429,
@@ -355,27 +469,39 @@ async def sync_batch(
     errors = []
 
     try:
-        # Validate all records first
+        # Resolve all serials and rack locks up front instead of per record
+        serial_owners = await prefetch_serial_owners(request.records, db)
+        rack_lock_owners = await prefetch_rack_lock_owners(request.records, lock_manager)
+
+        # Validate records in order; accepted serials are visible to later records
+        accepted: list[SyncRecord] = []
+        serial_docs: dict[str, list[dict[str, Any]]] = {}
         for record in request.records:
             conflict = await validate_record(
-                record, db, lock_manager, sync_service, current_user["username"]
+                record, serial_owners, rack_lock_owners, sync_service, current_user["username"]
             )
             if conflict:
                 conflicts.append(conflict)
             else:
-                # Sync valid record
-                success, error_msg = await sync_single_record(record, db, current_user["username"])
-
-                if success:
-                    ok_records.append(record.client_record_id)
-                else:
-                    errors.append(
-                        SyncError(
-                            client_record_id=record.client_record_id,
-                            error_type="sync_error",
-                            message=error_msg or "Unknown error",
-                        )
+                accepted.append(record)
+                serial_docs.setdefault(record.client_record_id, []).extend(
+                    claim_serials(record, serial_owners)
+                )
+
+        # Sync valid records in one round of batched writes
+        failed = await write_records(accepted, serial_docs, db, current_user["username"])
+        for record in accepted:
+            error_msg = failed.get(record.client_record_id)
+            if error_msg is None:
+                ok_records.append(record.client_record_id)
+            else:
+                errors.append(
+                    SyncError(
+                        client_record_id=record.client_record_id,
+                        error_type="sync_error",
+                        message=error_msg or "Unknown error",
                     )
+                )
 
         # Record success in circuit breaker
         await circuit_breaker.record_success()
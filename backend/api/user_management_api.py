@@ -12,9 +12,11 @@ from pydantic import BaseModel, EmailStr, Field
 
 from backend.auth.dependencies import get_current_user, require_admin
 from backend.auth.permissions import ROLE_PERMISSIONS, Permission
+from backend.auth.user_cache import TOKEN_VERSION_FIELD, invalidate_user
 from backend.db.runtime import get_db
+from backend.services.hashing_service import hashing_service
 from backend.utils.api_utils import sanitize_for_logging
-from backend.utils.auth_utils import get_password_hash
+from backend.utils.crypto_utils import get_pin_lookup_hash
 
 logger = logging.getLogger(__name__)
 
@@ -169,6 +171,15 @@ def _user_to_detail(user: dict[str, Any]) -> UserDetailResponse:
     )
 
 
+def _revokes_sessions(existing: dict[str, Any], update: dict[str, Any]) -> bool:
+    """Whether an admin edit should invalidate every token already issued to the user"""
+    return (
+        "hashed_password" in update
+        or update.get("is_active") is False
+        or ("role" in update and update["role"] != existing.get("role"))
+    )
+
+
 # ============================================================================
 # API Endpoints
 # ============================================================================
@@ -349,7 +360,7 @@ async def create_user(
         "username": request.username,
         "email": request.email,
         "full_name": request.full_name,
-        "hashed_password": get_password_hash(request.password),
+        "hashed_password": await hashing_service.hash(request.password),
         "role": request.role,
         "is_active": True,
         "permissions": request.permissions or [],
@@ -360,10 +371,13 @@ async def create_user(
 
     # Add PIN if provided
     if request.pin:
-        user_doc["pin_hash"] = get_password_hash(request.pin)
+        user_doc["pin_hash"] = await hashing_service.hash(request.pin)
+        user_doc["pin_lookup_hash"] = get_pin_lookup_hash(request.pin)
 
     result = await db.users.insert_one(user_doc)
     user_doc["_id"] = result.inserted_id
+    # A previously deleted user of the same name may still be cached
+    invalidate_user(request.username)
 
     logger.info(
         "User created: %s by %s",
@@ -444,10 +458,11 @@ async def update_user(
         update["full_name"] = request.full_name
 
     if request.password is not None:
-        update["hashed_password"] = get_password_hash(request.password)
+        update["hashed_password"] = await hashing_service.hash(request.password)
 
     if request.pin is not None:
-        update["pin_hash"] = get_password_hash(request.pin)
+        update["pin_hash"] = await hashing_service.hash(request.pin)
+        update["pin_lookup_hash"] = get_pin_lookup_hash(request.pin)
 
     if request.role is not None:
         # Prevent admin from demoting themselves
@@ -500,7 +515,11 @@ async def update_user(
     if request.disabled_permissions is not None:
         update["disabled_permissions"] = request.disabled_permissions
 
-    await db.users.update_one({"_id": oid}, {"$set": update})
+    operations: dict[str, Any] = {"$set": update}
+    if _revokes_sessions(existing, update):
+        operations["$inc"] = {TOKEN_VERSION_FIELD: 1}
+    await db.users.update_one({"_id": oid}, operations)
+    invalidate_user(existing["username"])
 
     # Fetch updated user
     updated = await db.users.find_one({"_id": oid})
@@ -585,6 +604,7 @@ async def delete_user(
         )
 
     await db.users.delete_one({"_id": oid})
+    invalidate_user(existing["username"])
 
     logger.info(
         "User deleted: %s by %s",
@@ -632,7 +652,7 @@ async def bulk_user_action(
             elif request.action == "deactivate":
                 await db.users.update_one(
                     {"_id": oid},
-                    {"$set": {"is_active": False}},
+                    {"$set": {"is_active": False}, "$inc": {TOKEN_VERSION_FIELD: 1}},
                 )
             elif request.action == "delete":
                 await db.users.delete_one({"_id": oid})
@@ -640,11 +660,12 @@ async def bulk_user_action(
                 if request.role:
                     await db.users.update_one(
                         {"_id": oid},
-                        {"$set": {"role": request.role}},
+                        {"$set": {"role": request.role}, "$inc": {TOKEN_VERSION_FIELD: 1}},
                     )
                 else:
                     failed_ids.append(user_id)
                     continue
+            invalidate_user(user["username"])
 
             success_count += 1
 
@@ -761,11 +782,13 @@ async def reset_user_password(
         {"_id": oid},
         {
             "$set": {
-                "hashed_password": get_password_hash(new_password),
+                "hashed_password": await hashing_service.hash(new_password),
                 "updated_at": datetime.utcnow(),
-            }
+            },
+            "$inc": {TOKEN_VERSION_FIELD: 1},
         },
     )
+    invalidate_user(user["username"])
 
     logger.info(
         "Password reset for user: %s by %s",
@@ -821,11 +844,13 @@ async def reset_user_pin(
         {"_id": oid},
         {
             "$set": {
-                "pin_hash": get_password_hash(new_pin),
+                "pin_hash": await hashing_service.hash(new_pin),
+                "pin_lookup_hash": get_pin_lookup_hash(new_pin),
                 "updated_at": datetime.utcnow(),
             }
         },
     )
+    invalidate_user(user["username"])
 
     logger.info(
         "PIN reset for user: %s by %s",
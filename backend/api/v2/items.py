@@ -15,6 +15,7 @@ from backend.api.response_models import ApiResponse, PaginatedResponse
 from backend.auth.dependencies import get_current_user_async as get_current_user
 from backend.db.runtime import get_db
 from backend.services.ai_search import ai_search_service
+from backend.services.item_vector_index import item_vector_index
 
 # Add project root to path for direct execution (debugging)
 # This allows the file to be run directly for testing/debugging
@@ -155,6 +156,30 @@ async def get_items_v2(
         )
 
 
+async def _semantic_matches(db: Any, query: str, limit: int, rerank_pool: int) -> list[dict]:
+    """
+    Top semantic matches for a query.
+
+    Uses the precomputed item vector index across the full catalogue. Until it
+    holds embeddings, falls back to reranking the first ``rerank_pool`` items.
+    """
+    if item_vector_index.is_ready:
+        matches = await item_vector_index.search(query, top_k=limit)
+        item_codes = [item_code for item_code, _score in matches]
+        if not item_codes:
+            return []
+        items = await db.erp_items.find({"item_code": {"$in": item_codes}}).to_list(
+            length=len(item_codes)
+        )
+        items_by_code = {item.get("item_code"): item for item in items}
+        return [items_by_code[code] for code in item_codes if code in items_by_code]
+
+    candidates = await db.erp_items.find({}).limit(rerank_pool).to_list(length=rerank_pool)
+    if not candidates:
+        return []
+    return await asyncio.to_thread(ai_search_service.search_rerank, query, candidates, top_k=limit)
+
+
 @router.get("/semantic", response_model=ApiResponse[PaginatedResponse[ItemResponse]])
 async def search_items_semantic(
     query: str = Query(..., min_length=2, description="Semantic search query"),
@@ -167,27 +192,16 @@ async def search_items_semantic(
     """
     try:
         db = get_db()
-        # 1. Fetch a broad set of candidates (e.g., all active items or recent ones)
-        # In a real vector DB, we'd query the vector index.
-        # Here, we'll fetch items and rely on the service to rerank/filter.
-        # For performance, we might limit to top 500 or use a text index if available.
-
-        # Fetching top 500 items for re-ranking context
-        # This is a compromise for "Local AI" without a Vector DB
-        items_cursor = db.erp_items.find({}).limit(500)
-        candidates = await items_cursor.to_list(length=500)
+        # 1. Similarity search over the precomputed item embeddings
+        results = await _semantic_matches(db, query, limit, rerank_pool=500)
 
-        if not candidates:
+        if not results:
             return ApiResponse.success_response(
                 data=PaginatedResponse.create([], 0, 1, limit),
                 message="No items available for semantic search",
             )
 
-        # 2. Perform Semantic Reranking
-        # The service will encode the query and candidates, then sort by similarity
-        results = ai_search_service.search_rerank(query, candidates, top_k=limit)
-
-        # 3. Convert to Response
+        # 2. Convert to Response
         item_responses = [
             ItemResponse(
                 id=str(item["_id"]),
@@ -301,10 +315,7 @@ async def identify_item(
             mock_query = "Biscuit"
 
         # Use Semantic Search to find matches for the "Recognized" term
-        items_cursor = db.erp_items.find({}).limit(200)
-        candidates = await items_cursor.to_list(length=200)
-
-        results = ai_search_service.search_rerank(mock_query, candidates, top_k=5)
+        results = await _semantic_matches(db, mock_query, 5, rerank_pool=200)
 
         # Convert to response
         item_responses = [
@@ -6,6 +6,7 @@ Exports authentication dependencies
 from .dependencies import (
     get_current_user,
     get_current_user_async,
+    get_current_user_from_claims,
     init_auth_dependencies,
     require_permissions,
 )
@@ -13,6 +14,7 @@ from .dependencies import (
 __all__ = [
     "get_current_user",
     "get_current_user_async",
+    "get_current_user_from_claims",
     "init_auth_dependencies",
     "require_permissions",
 ]
@@ -11,6 +11,7 @@ from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 from motor.motor_asyncio import AsyncIOMotorDatabase
 
 from .jwt_provider import jwt
+from .user_cache import TOKEN_VERSION_CLAIM, TOKEN_VERSION_FIELD, token_version_of, user_cache
 
 logger = logging.getLogger(__name__)
 
@@ -44,6 +45,8 @@ class AuthDependencies:
 
             # In development or testing, allow re-initialization (update references)
             logger.info("AuthDependencies re-initializing (updating db/keys)")
+            # Cached users belong to the previous database
+            user_cache.clear()
             self._db = db
             self._secret_key = secret_key
             self._algorithm = algorithm
@@ -159,6 +162,44 @@ class UserRepository:
         return await auth_deps.db.users.find_one({"username": username})
 
 
+async def _load_user(payload: dict[str, Any]) -> dict[str, Any]:
+    """Load the token's user from the database and cache it for later requests"""
+    from backend.error_messages import get_error_message
+
+    username = payload["sub"]
+    token_version = payload.get(TOKEN_VERSION_CLAIM, 0)
+    user = await UserRepository.get_user_by_username(username)
+
+    if user is None:
+        error = get_error_message("AUTH_USER_NOT_FOUND", {"username": username})
+        raise HTTPException(
+            status_code=error["status_code"],
+            detail=error,
+        )
+
+    # The user's sessions were revoked after this token was issued
+    if token_version_of(user) != token_version:
+        error = get_error_message("AUTH_TOKEN_INVALID")
+        raise HTTPException(
+            status_code=error["status_code"],
+            detail=error,
+        )
+
+    user_cache.set(username, token_version, user)
+    return user
+
+
+def _unexpected_auth_error(e: Exception) -> HTTPException:
+    logger.error(f"Unexpected error in get_current_user: {e}")
+    from backend.error_messages import get_error_message
+
+    error = get_error_message("AUTH_TOKEN_INVALID")
+    return HTTPException(
+        status_code=error["status_code"],
+        detail=error,
+    )
+
+
 async def get_current_user(
     request: Request,
     credentials: Optional[HTTPAuthorizationCredentials] = Depends(auth_deps.security),
@@ -172,34 +213,54 @@ async def get_current_user(
         token = JWTValidator.extract_token(request, credentials)
         payload = JWTValidator.decode_token(token)
 
-        # Retrieve user from database
-        username = payload["sub"]
-        user = await UserRepository.get_user_by_username(username)
+        # Cache entries are keyed by token version, so revoked tokens always miss
+        user = user_cache.get(payload["sub"], payload.get(TOKEN_VERSION_CLAIM, 0))
+        if user is not None:
+            return user
 
-        if user is None:
-            from backend.error_messages import get_error_message
-
-            error = get_error_message("AUTH_USER_NOT_FOUND", {"username": username})
-            raise HTTPException(
-                status_code=error["status_code"],
-                detail=error,
-            )
-
-        return user
+        return await _load_user(payload)
 
     except HTTPException:
         # Re-raise HTTP exceptions as-is
         raise
     except Exception as e:
         # Catch any unexpected errors and convert to auth error
-        logger.error(f"Unexpected error in get_current_user: {e}")
-        from backend.error_messages import get_error_message
+        raise _unexpected_auth_error(e)
 
-        error = get_error_message("AUTH_TOKEN_INVALID")
-        raise HTTPException(
-            status_code=error["status_code"],
-            detail=error,
-        )
+
+async def get_current_user_from_claims(
+    request: Request,
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(auth_deps.security),
+) -> dict[str, Any]:
+    """
+    Get the caller for read-only endpoints, trusting fresh signed claims
+    Returns the cached user if present, else a minimal user built from the
+    claims of a recently issued token, else falls back to a database lookup.
+    Only the username, role and token version are guaranteed to be present.
+    """
+    try:
+        token = JWTValidator.extract_token(request, credentials)
+        payload = JWTValidator.decode_token(token)
+
+        username = payload["sub"]
+        token_version = payload.get(TOKEN_VERSION_CLAIM, 0)
+        user = user_cache.get(username, token_version)
+        if user is not None:
+            return user
+
+        if user_cache.trusts_claims(username, payload.get("iat")):
+            return {
+                "username": username,
+                "role": payload.get("role", "staff"),
+                TOKEN_VERSION_FIELD: token_version,
+            }
+
+        return await _load_user(payload)
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise _unexpected_auth_error(e)
 
 
 # Alias for backward compatibility - both names point to same function
@@ -8,6 +8,8 @@ from enum import Enum
 from fastapi import Depends, HTTPException, status
 from motor.motor_asyncio import AsyncIOMotorDatabase
 
+from .user_cache import invalidate_user
+
 
 # Permission definitions
 class Permission(str, Enum):
@@ -218,6 +220,7 @@ async def add_permissions_to_user(
     result = await db.users.update_one(
         {"username": username}, {"$addToSet": {"permissions": {"$each": permissions}}}
     )
+    invalidate_user(username)
     return result.modified_count > 0
 
 
@@ -228,6 +231,7 @@ async def remove_permissions_from_user(
     result = await db.users.update_one(
         {"username": username}, {"$pull": {"permissions": {"$in": permissions}}}
     )
+    invalidate_user(username)
     return result.modified_count > 0
 
 
@@ -239,6 +243,7 @@ async def disable_permissions_for_user(
         {"username": username},
         {"$addToSet": {"disabled_permissions": {"$each": permissions}}},
     )
+    invalidate_user(username)
     return result.modified_count > 0
 
 
@@ -250,4 +255,5 @@ async def enable_permissions_for_user(
         {"username": username},
         {"$pull": {"disabled_permissions": {"$in": permissions}}},
     )
+    invalidate_user(username)
     return result.modified_count > 0
@@ -0,0 +1,124 @@
+"""
+Authenticated User Cache
+Short-lived, per-process cache of user documents for get_current_user, keyed
+by username and token version so a revoked token never hits a cached entry
+"""
+
+import time
+from collections import OrderedDict
+from typing import Any, Optional
+
+from backend.config import settings
+
+# users.<field> bumped to revoke every token issued before the change
+TOKEN_VERSION_FIELD = "token_version"
+# Access/refresh token claim carrying the user's token version at issue time
+TOKEN_VERSION_CLAIM = "tv"
+
+
+def token_version_of(user: dict[str, Any]) -> int:
+    """Current token version of a user document (0 for users that predate it)"""
+    return int(user.get(TOKEN_VERSION_FIELD) or 0)
+
+
+def token_version_claims(user: dict[str, Any]) -> dict[str, int]:
+    """Claims to embed in tokens issued for ``user``"""
+    return {TOKEN_VERSION_CLAIM: token_version_of(user)}
+
+
+class UserCache:
+    """
+    TTL cache of authenticated user documents
+
+    Entries live for ``ttl`` seconds, so changes made by another worker become
+    visible within that window; changes made through this process call
+    ``invalidate`` and take effect immediately. ``invalidate`` also records when
+    the user changed, which ``trusts_claims`` uses to stop trusting signed
+    claims from tokens issued before that change.
+    """
+
+    def __init__(self, ttl: float = 30.0, max_size: int = 1024, claims_max_age: float = 60.0):
+        self.ttl = ttl
+        self.max_size = max_size
+        self.claims_max_age = claims_max_age
+        self._entries: OrderedDict[tuple[str, int], tuple[float, dict[str, Any]]] = OrderedDict()
+        self._invalidated_at: dict[str, float] = {}
+        self._stats = {"hits": 0, "misses": 0, "invalidations": 0, "claims_trusted": 0}
+
+    def get(self, username: str, token_version: int) -> Optional[dict[str, Any]]:
+        """Cached user for this username and token version, or None"""
+        key = (username, token_version)
+        entry = self._entries.get(key)
+        if entry is None or entry[0] <= time.monotonic():
+            if entry is not None:
+                del self._entries[key]
+            self._stats["misses"] += 1
+            return None
+        self._entries.move_to_end(key)
+        self._stats["hits"] += 1
+        # Handlers are free to mutate current_user; never hand out the cached dict
+        return dict(entry[1])
+
+    def set(self, username: str, token_version: int, user: dict[str, Any]) -> None:
+        if self.ttl <= 0:
+            return
+        key = (username, token_version)
+        self._entries[key] = (time.monotonic() + self.ttl, dict(user))
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, username: str) -> None:
+        """Drop every cached version of a user after it changed"""
+        for key in [key for key in self._entries if key[0] == username]:
+            del self._entries[key]
+        now = time.time()
+        self._invalidated_at[username] = now
+        # Invalidations only matter while a token issued before them is still trusted
+        cutoff = now - self.claims_max_age
+        for name in [name for name, at in self._invalidated_at.items() if at < cutoff]:
+            del self._invalidated_at[name]
+        self._stats["invalidations"] += 1
+
+    def trusts_claims(self, username: str, issued_at: Optional[float]) -> bool:
+        """
+        Whether a token's signed claims are fresh enough to stand in for the user
+
+        The claims were read from the user document when the token was issued,
+        so a token younger than ``claims_max_age`` (and not older than a known
+        change to the user) is no staler than a cache entry.
+        """
+        if issued_at is None or self.claims_max_age <= 0:
+            return False
+        if time.time() - issued_at > self.claims_max_age:
+            return False
+        invalidated_at = self._invalidated_at.get(username)
+        if invalidated_at is not None and issued_at <= invalidated_at:
+            return False
+        self._stats["claims_trusted"] += 1
+        return True
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._invalidated_at.clear()
+
+    def get_stats(self) -> dict[str, Any]:
+        lookups = self._stats["hits"] + self._stats["misses"]
+        return {
+            **self._stats,
+            "size": len(self._entries),
+            "hit_rate": round(self._stats["hits"] / lookups, 4) if lookups else 0.0,
+        }
+
+
+user_cache = UserCache(
+    ttl=getattr(settings, "AUTH_USER_CACHE_TTL", 30.0),
+    max_size=getattr(settings, "AUTH_USER_CACHE_MAX_SIZE", 1024),
+    claims_max_age=getattr(settings, "AUTH_TRUSTED_CLAIMS_MAX_AGE", 60.0),
+)
+
+
+def invalidate_user(username: Optional[str]) -> None:
+    """Forget the cached copy of a user; call after any write to the user document"""
+    if username:
+        user_cache.invalidate(username)
@@ -6,7 +6,7 @@ Type-safe configuration with validation using Pydantic
 
 import logging
 import os
-from typing import Optional
+from typing import Literal, Optional
 
 try:
     from pydantic_settings import BaseSettings as PydanticBaseSettings  # type: ignore[no-redef]
@@ -168,6 +168,11 @@ class Settings(PydanticBaseSettings):
     JWT_ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = Field(15, ge=1)
     REFRESH_TOKEN_EXPIRE_DAYS: int = Field(30, ge=1)
+    # Authenticated-user cache; entries are also dropped on user/permission/PIN changes
+    AUTH_USER_CACHE_TTL: float = Field(30.0, ge=0)  # 0 disables the cache
+    AUTH_USER_CACHE_MAX_SIZE: int = Field(1024, ge=1)
+    # Read-only endpoints trust signed token claims younger than this (0 disables)
+    AUTH_TRUSTED_CLAIMS_MAX_AGE: float = Field(60.0, ge=0)
 
     # Session Management
     SESSION_TIMEOUT_MINUTES: int = Field(480, ge=1)  # 8 hours
@@ -237,6 +242,14 @@ class Settings(PydanticBaseSettings):
     # Caching
     REDIS_URL: Optional[str] = None
     CACHE_TTL: int = Field(3600, ge=0)
+    CACHE_MEMORY_MAX_ITEMS: int = Field(1000, ge=1)  # In-memory fallback tier
+    CACHE_MEMORY_MAX_BYTES: Optional[int] = Field(None, ge=1)
+
+    # Search ("index" = in-process n-gram index, "regex" = MongoDB $regex scan)
+    SEARCH_ENGINE: Literal["index", "regex"] = "index"
+    SEMANTIC_INDEX_ENABLED: bool = True
+    SEMANTIC_INDEX_REFRESH_INTERVAL: int = Field(60, ge=5)
+    SEMANTIC_INDEX_PRUNE_INTERVAL: int = Field(3600, ge=60)
 
     # Rate Limiting
     RATE_LIMIT_PER_MINUTE: int = Field(100, ge=1)
@@ -249,12 +262,24 @@ class Settings(PydanticBaseSettings):
     )
     RATE_LIMIT_MAX_ATTEMPTS: int = Field(5, ge=1)
     RATE_LIMIT_TTL_SECONDS: int = Field(300, ge=1)
+    # Users without a pin_lookup_hash loaded per page of the legacy PIN scan; 0 retires the scan
+    PIN_LEGACY_SCAN_BATCH_SIZE: int = Field(50, ge=0)
+    # Legacy PIN scans allowed per IP within RATE_LIMIT_TTL_SECONDS
+    PIN_LEGACY_SCAN_MAX_ATTEMPTS: int = Field(3, ge=1)
 
     # Sync Services
     ERP_SYNC_ENABLED: bool = True
     ERP_SYNC_INTERVAL: int = Field(3600, ge=60)  # 1 hour
     CHANGE_DETECTION_SYNC_ENABLED: bool = True
     CHANGE_DETECTION_INTERVAL: int = Field(300, ge=60)  # 5 minutes
+    SESSION_STATS_RECONCILE_INTERVAL: int = Field(900, ge=60)  # 15 minutes
+    DASHBOARD_KPI_RECOMPUTE_INTERVAL: int = Field(600, ge=60)  # 10 minutes
+    DASHBOARD_KPI_REFRESH_INTERVAL: int = Field(30, ge=5)  # active users / verified today
+    SYSTEM_METRICS_SAMPLE_INTERVAL: float = Field(5.0, gt=0)
+    # Buffered activity/audit/error log writes (flushed with insert_many)
+    LOG_SINK_BATCH_SIZE: int = Field(200, ge=1)
+    LOG_SINK_FLUSH_INTERVAL: float = Field(1.0, gt=0)
+    LOG_SINK_MAX_BUFFER_SIZE: int = Field(10000, ge=1)  # entries beyond this are dropped
 
     @field_validator("ERP_SYNC_INTERVAL", "CHANGE_DETECTION_INTERVAL")
     @classmethod
@@ -404,6 +429,21 @@ except Exception as e:
             self.MAX_OVERFLOW = int(os.getenv("MAX_OVERFLOW", 5))
             self.REDIS_URL = os.getenv("REDIS_URL")
             self.CACHE_TTL = int(os.getenv("CACHE_TTL", 3600))
+            self.CACHE_MEMORY_MAX_ITEMS = int(os.getenv("CACHE_MEMORY_MAX_ITEMS", 1000))
+            cache_memory_max_bytes = os.getenv("CACHE_MEMORY_MAX_BYTES")
+            self.CACHE_MEMORY_MAX_BYTES = (
+                int(cache_memory_max_bytes) if cache_memory_max_bytes else None
+            )
+            self.SEARCH_ENGINE = os.getenv("SEARCH_ENGINE", "index")
+            self.SEMANTIC_INDEX_ENABLED = (
+                os.getenv("SEMANTIC_INDEX_ENABLED", "true").lower() == "true"
+            )
+            self.SEMANTIC_INDEX_REFRESH_INTERVAL = int(
+                os.getenv("SEMANTIC_INDEX_REFRESH_INTERVAL", 60)
+            )
+            self.SEMANTIC_INDEX_PRUNE_INTERVAL = int(
+                os.getenv("SEMANTIC_INDEX_PRUNE_INTERVAL", 3600)
+            )
             self.RATE_LIMIT_PER_MINUTE = int(os.getenv("RATE_LIMIT_PER_MINUTE", 100))
             self.RATE_LIMIT_BURST = int(os.getenv("RATE_LIMIT_BURST", 20))
             self.MAX_CONCURRENT = int(os.getenv("MAX_CONCURRENT", 50))
@@ -417,6 +457,8 @@ except Exception as e:
             # New settings for rate limiting and CORS
             self.RATE_LIMIT_MAX_ATTEMPTS = int(os.getenv("RATE_LIMIT_MAX_ATTEMPTS", 5))
             self.RATE_LIMIT_TTL_SECONDS = int(os.getenv("RATE_LIMIT_TTL_SECONDS", 300))
+            self.PIN_LEGACY_SCAN_BATCH_SIZE = int(os.getenv("PIN_LEGACY_SCAN_BATCH_SIZE", 50))
+            self.PIN_LEGACY_SCAN_MAX_ATTEMPTS = int(os.getenv("PIN_LEGACY_SCAN_MAX_ATTEMPTS", 3))
             self.CORS_ALLOW_ORIGINS = os.getenv("CORS_ALLOW_ORIGINS")
             self.APP_NAME = os.getenv("APP_NAME", "Stock Count API")
             self.APP_VERSION = os.getenv("APP_VERSION", "1.0.0")
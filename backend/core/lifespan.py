@@ -34,10 +34,12 @@ from backend.api.sync_status_api import set_auto_sync_manager
 from backend.auth.dependencies import init_auth_dependencies
 from backend.config import settings
 from backend.core import globals as g
+from backend.core.websocket_manager import manager as websocket_manager
 from backend.db.indexes import create_indexes
 from backend.db.initialization import init_default_users
 from backend.db.migrations import MigrationManager
 from backend.db.runtime import set_client, set_db
+from backend.middleware.security import batch_rate_limiter
 
 # Services
 from backend.services.activity_log import ActivityLogService
@@ -45,12 +47,19 @@ from backend.services.activity_log import ActivityLogService
 # Auto-sync manager
 from backend.services.auto_sync_manager import AutoSyncManager
 from backend.services.batch_operations import BatchOperationsService
+from backend.services.broadcast_bus import RedisBroadcastBus
 from backend.services.cache_service import CacheService
 from backend.services.database_health import DatabaseHealthService
 from backend.services.database_optimizer import DatabaseOptimizer
 from backend.services.error_log import ErrorLogService
 from backend.services.errors import DatabaseError
+from backend.services.hashing_service import hashing_service
+from backend.services.item_lookup_index import item_lookup_index
+from backend.services.item_search_index import item_search_index
+from backend.services.item_vector_index import item_vector_index
+from backend.services.kpi_store import KPIStore
 from backend.services.lock_manager import get_lock_manager
+from backend.services.log_sink import log_sink
 from backend.services.mdns_service import start_mdns, stop_mdns
 from backend.services.monitoring_service import MonitoringService
 from backend.services.pubsub_service import get_pubsub_service
@@ -59,8 +68,10 @@ from backend.services.redis_service import close_redis, init_redis
 from backend.services.refresh_token import RefreshTokenService
 from backend.services.runtime import set_cache_service, set_refresh_token_service
 from backend.services.scheduled_export_service import ScheduledExportService
+from backend.services.session_stats_service import SessionStatsService
 from backend.services.sync_conflicts_service import SyncConflictsService
-from backend.sql_server_connector import SQLServerConnector
+from backend.services.system_metrics import system_metrics_sampler
+from backend.sql_server_connector import SQLServerConnector, sql_executor
 from backend.utils.port_detector import PortDetector, save_backend_info
 
 # Enterprise Imports
@@ -93,6 +104,8 @@ if not logger.handlers:
 # Global service instances
 scheduled_export_service = None
 sync_conflicts_service = None
+session_stats_service = None
+kpi_store = None
 
 # Setup logging
 logger = setup_logging(
@@ -264,6 +277,8 @@ if (
 cache_service = CacheService(
     redis_url=getattr(settings, "REDIS_URL", None),
     default_ttl=getattr(settings, "CACHE_TTL", 3600),
+    max_memory_size=getattr(settings, "CACHE_MEMORY_MAX_ITEMS", 1000),
+    max_memory_bytes=getattr(settings, "CACHE_MEMORY_MAX_BYTES", None),
 )
 
 # Rate limiter
@@ -357,6 +372,14 @@ async def lifespan(app: FastAPI):  # noqa: C901
         await pubsub_service.start()
         logger.info("✓ Pub/Sub service started")
 
+        # Relay WebSocket broadcasts to every worker
+        await websocket_manager.attach_bus(RedisBroadcastBus(pubsub_service))
+        logger.info("✓ WebSocket broadcasts bridged over Redis pub/sub")
+
+        # Share batch-sync rate limits across workers
+        batch_rate_limiter.attach_redis(redis_service.client)
+        logger.info("✓ Batch rate limiter using Redis")
+
         # Initialize lock manager (will be used by APIs)
         get_lock_manager(redis_service)
         logger.info("✓ Lock manager initialized")
@@ -463,6 +486,35 @@ async def lifespan(app: FastAPI):  # noqa: C901
         # Catch-all for migration errors (index creation failures, etc.)
         logger.warning(f"Migration error (may be due to MongoDB unavailability): {str(e)}")
 
+    # Warm the in-process barcode lookup index for the scanner hot path
+    try:
+        indexed = await item_lookup_index.warm(db)
+        logger.info(f"OK: Item lookup index warmed ({indexed} items)")
+    except Exception as e:
+        logger.warning(f"Item lookup index warm-up failed, lookups fall back to MongoDB: {str(e)}")
+
+    # Warm the n-gram search index; SearchService uses $regex until it is ready
+    try:
+        indexed = await item_search_index.warm(db)
+        logger.info(f"OK: Item search index warmed ({indexed} items)")
+    except Exception as e:
+        logger.warning(f"Item search index warm-up failed, search falls back to regex: {str(e)}")
+
+    # Restore persisted item embeddings; new or changed items are encoded in the background
+    if getattr(settings, "SEMANTIC_INDEX_ENABLED", True):
+        try:
+            restored = await item_vector_index.load(db)
+            item_vector_index.refresh_interval = getattr(
+                settings, "SEMANTIC_INDEX_REFRESH_INTERVAL", 60
+            )
+            item_vector_index.prune_interval = getattr(
+                settings, "SEMANTIC_INDEX_PRUNE_INTERVAL", 3600
+            )
+            item_vector_index.start()
+            logger.info(f"OK: Item vector index loaded ({restored} embeddings)")
+        except Exception as e:
+            logger.warning(f"Item vector index load failed, semantic search is limited: {str(e)}")
+
     # Initialize auto-sync manager (monitors SQL Server and auto-syncs when available)
     global auto_sync_manager
     try:
@@ -539,7 +591,7 @@ async def lifespan(app: FastAPI):  # noqa: C901
         logger.error(f"Failed to initialize auth dependencies: {str(e)}")
 
     # Initialize new feature services
-    global scheduled_export_service, sync_conflicts_service
+    global scheduled_export_service, sync_conflicts_service, session_stats_service, kpi_store
     try:
         # Scheduled export service
         scheduled_export_service = ScheduledExportService(db)
@@ -548,6 +600,35 @@ async def lifespan(app: FastAPI):  # noqa: C901
     except Exception as e:
         logger.error(f"Failed to start scheduled export service: {str(e)}")
 
+    try:
+        # Session counters are maintained with $inc; reconcile periodically to repair drift
+        session_stats_service = SessionStatsService(
+            db, reconcile_interval=getattr(settings, "SESSION_STATS_RECONCILE_INTERVAL", 900)
+        )
+        session_stats_service.start()
+        logger.info("✓ Session stats reconciliation started")
+    except Exception as e:
+        logger.error(f"Failed to start session stats reconciliation: {str(e)}")
+
+    try:
+        # Dashboard KPIs are maintained with $inc; refresh windowed counts and recompute
+        kpi_store = KPIStore(
+            db,
+            recompute_interval=getattr(settings, "DASHBOARD_KPI_RECOMPUTE_INTERVAL", 600),
+            refresh_interval=getattr(settings, "DASHBOARD_KPI_REFRESH_INTERVAL", 30),
+        )
+        kpi_store.start()
+        logger.info("✓ Dashboard KPI store started")
+    except Exception as e:
+        logger.error(f"Failed to start dashboard KPI store: {str(e)}")
+
+    # CPU/memory are sampled off the event loop; handlers read the latest sample
+    system_metrics_sampler.interval = getattr(settings, "SYSTEM_METRICS_SAMPLE_INTERVAL", 5.0)
+    system_metrics_sampler.start()
+
+    # Activity/audit/error logs are buffered and written in batches off the request path
+    log_sink.start()
+
     # Initialize enrichment service
     if EnrichmentService is not None and init_enrichment_api is not None:
         try:
@@ -688,6 +769,10 @@ async def lifespan(app: FastAPI):  # noqa: C901
         services_running.append("Scheduled Export")
     if sync_conflicts_service:
         services_running.append("Sync Conflicts")
+    if session_stats_service:
+        services_running.append("Session Stats")
+    if kpi_store:
+        services_running.append("Dashboard KPIs")
     if monitoring_service:
         services_running.append("Monitoring")
     if database_health_service:
@@ -713,7 +798,7 @@ async def lifespan(app: FastAPI):  # noqa: C901
         from backend.services.search_service import init_search_service
 
         database = get_db()
-        init_search_service(database)
+        init_search_service(database, engine=getattr(settings, "SEARCH_ENGINE", "index"))
         logger.info("✓ Search service initialized successfully")
     except Exception as e:
         logger.error(f"❌ Failed to initialize search service: {e}")
@@ -835,6 +920,51 @@ async def lifespan(app: FastAPI):  # noqa: C901
 
         shutdown_tasks.append(stop_export_service())
 
+    # Stop session stats reconciliation
+    if session_stats_service:
+
+        async def stop_session_stats():
+            try:
+                await session_stats_service.stop()
+                logger.info("✓ Session stats reconciliation stopped")
+            except Exception as e:
+                logger.error(f"Error stopping session stats reconciliation: {str(e)}")
+
+        shutdown_tasks.append(stop_session_stats())
+
+    # Stop dashboard KPI refresh
+    if kpi_store:
+
+        async def stop_kpi_store():
+            try:
+                await kpi_store.stop()
+                logger.info("✓ Dashboard KPI store stopped")
+            except Exception as e:
+                logger.error(f"Error stopping dashboard KPI store: {str(e)}")
+
+        shutdown_tasks.append(stop_kpi_store())
+
+    system_metrics_sampler.stop()
+
+    # Drain buffered log entries before the MongoDB client closes
+    async def stop_log_sink():
+        try:
+            await log_sink.stop()
+            logger.info("✓ Log sink drained")
+        except Exception as e:
+            logger.error(f"Error draining log sink: {str(e)}")
+
+    shutdown_tasks.append(stop_log_sink())
+
+    # Stop item embedding refresh
+    async def stop_vector_index():
+        try:
+            await item_vector_index.stop()
+        except Exception as e:
+            logger.error(f"Error stopping item vector index refresh: {str(e)}")
+
+    shutdown_tasks.append(stop_vector_index())
+
     # Stop database health monitoring
     async def stop_health_monitoring():
         try:
@@ -859,6 +989,8 @@ async def lifespan(app: FastAPI):  # noqa: C901
     # Phase 1: Stop Pub/Sub and Redis services
     async def stop_redis_services():
         try:
+            await websocket_manager.detach_bus()
+            batch_rate_limiter.detach_redis()
             if pubsub_service:
                 await pubsub_service.stop()
                 logger.info("✓ Pub/Sub service stopped")
@@ -891,6 +1023,17 @@ async def lifespan(app: FastAPI):  # noqa: C901
         except Exception as e:
             logger.error(f"Error closing connection pool: {str(e)}")
 
+    # Close SQL Server connector pool and executor lanes (blocking operations)
+    try:
+        sql_connector.disconnect()
+        sql_executor.shutdown(wait=False)
+        logger.info("✓ SQL Server connector closed")
+    except Exception as e:
+        logger.error(f"Error closing SQL Server connector: {str(e)}")
+
+    # Stop the password/PIN hashing pool
+    hashing_service.shutdown(wait=False)
+
     # Close MongoDB connection
     try:
         client.close()
@@ -1,17 +1,110 @@
+import asyncio
+import json
 import logging
-from typing import Optional
+import time
+import uuid
+from typing import Any, Optional
 
 from fastapi import WebSocket
 
 logger = logging.getLogger(__name__)
 
+# Messages a connection may have pending before it is evicted as too slow
+DEFAULT_SEND_QUEUE_SIZE = 100
+# Seconds a single send may take before the connection is evicted
+DEFAULT_SEND_TIMEOUT = 5.0
+# Close code sent to evicted consumers ("try again later")
+SLOW_CONSUMER_CLOSE_CODE = 1013
+
+
+def _encode(message: dict) -> str:
+    """Serialize a message once, in the same compact form as send_json."""
+    return json.dumps(message, separators=(",", ":"), ensure_ascii=False, default=str)
+
+
+class _ConnectionSender:
+    """Bounded send queue for one WebSocket, drained by its own task."""
+
+    def __init__(self, websocket: WebSocket, manager: "WebSocketManager"):
+        self.websocket = websocket
+        self.manager = manager
+        self.queue: asyncio.Queue[tuple[str, float]] = asyncio.Queue(
+            maxsize=manager.send_queue_size
+        )
+        self.sent = 0
+        self.last_send_ms = 0.0
+        self.max_lag_ms = 0.0
+        self.task = asyncio.create_task(self._run())
+
+    def offer(self, text: str) -> bool:
+        """Queue a message without waiting; False if the consumer is too far behind."""
+        try:
+            self.queue.put_nowait((text, time.monotonic()))
+            return True
+        except asyncio.QueueFull:
+            return False
+
+    def lag_ms(self) -> float:
+        """Age of the oldest message still waiting to be sent."""
+        if self.queue.empty():
+            return 0.0
+        _, enqueued_at = self.queue._queue[0]  # type: ignore[attr-defined]
+        return (time.monotonic() - enqueued_at) * 1000
+
+    async def _run(self) -> None:
+        while True:
+            text, enqueued_at = await self.queue.get()
+            try:
+                started = time.monotonic()
+                self.max_lag_ms = max(self.max_lag_ms, (started - enqueued_at) * 1000)
+                await asyncio.wait_for(
+                    self.websocket.send_text(text), timeout=self.manager.send_timeout
+                )
+                self.last_send_ms = (time.monotonic() - started) * 1000
+                self.sent += 1
+            except asyncio.TimeoutError:
+                self.manager._evict(self.websocket, "send timed out")
+            except Exception as e:
+                self.manager._evict(self.websocket, f"send failed: {e}")
+            finally:
+                self.queue.task_done()
+
+    def stop(self) -> None:
+        self.task.cancel()
+        # Release anyone waiting in flush() on messages that will never be sent
+        while not self.queue.empty():
+            self.queue.get_nowait()
+            self.queue.task_done()
+
 
 class WebSocketManager:
-    def __init__(self):
+    def __init__(
+        self,
+        send_queue_size: int = DEFAULT_SEND_QUEUE_SIZE,
+        send_timeout: float = DEFAULT_SEND_TIMEOUT,
+    ):
         # active_connections: { user_id: [WebSocket, ...] }
         self.active_connections: dict[str, list[WebSocket]] = {}
         # session_connections: { session_id: [WebSocket, ...] }
         self.session_connections: dict[str, list[WebSocket]] = {}
+        self.send_queue_size = max(1, send_queue_size)
+        self.send_timeout = send_timeout
+        self._senders: dict[WebSocket, _ConnectionSender] = {}
+        self._stats = {"messages": 0, "deliveries": 0, "evicted": 0, "remote_messages": 0}
+        # Cross-worker bus (services.broadcast_bus); None means this process only
+        self.worker_id = uuid.uuid4().hex
+        self._bus: Optional[Any] = None
+
+    async def attach_bus(self, bus: Any) -> None:
+        """Relay broadcasts through a bus so every worker fans them out."""
+        await self.detach_bus()
+        await bus.subscribe(self._on_bus_envelope)
+        self._bus = bus
+
+    async def detach_bus(self) -> None:
+        if self._bus is not None:
+            bus, self._bus = self._bus, None
+            await bus.unsubscribe(self._on_bus_envelope)
 
     async def connect(
         self,
@@ -50,22 +143,105 @@ class WebSocketManager:
             if not self.session_connections[session_id]:
                 del self.session_connections[session_id]
 
+        sender = self._senders.pop(websocket, None)
+        if sender:
+            sender.stop()
+
         logger.info(f"WebSocket disconnected: user={user_id}, session={session_id}")
 
     async def send_personal_message(self, message: dict, user_id: str):
-        if user_id in self.active_connections:
-            for connection in self.active_connections[user_id]:
-                await connection.send_json(message)
+        await self._broadcast("user", user_id, message)
 
     async def broadcast_to_session(self, message: dict, session_id: str):
-        if session_id in self.session_connections:
-            for connection in self.session_connections[session_id]:
-                await connection.send_json(message)
+        await self._broadcast("session", session_id, message)
 
     async def broadcast_all(self, message: dict):
-        for user_connections in self.active_connections.values():
-            for connection in user_connections:
-                await connection.send_json(message)
+        await self._broadcast("all", None, message)
+
+    async def _broadcast(self, scope: str, key: Optional[str], message: dict) -> None:
+        """Fan out locally, then hand the encoded message to the other workers."""
+        text = _encode(message)
+        self._fan_out(text, self._local_targets(scope, key))
+        if self._bus is None:
+            return
+        envelope = {"origin": self.worker_id, "scope": scope, "key": key, "text": text}
+        try:
+            await self._bus.publish(envelope)
+        except Exception as e:
+            logger.warning(f"Cross-worker broadcast failed, delivered locally only: {e}")
+
+    async def _on_bus_envelope(self, envelope: dict[str, Any]) -> None:
+        # Our own broadcasts were already fanned out before publishing
+        if envelope.get("origin") == self.worker_id:
+            return
+        self._stats["remote_messages"] += 1
+        self._fan_out(envelope["text"], self._local_targets(envelope["scope"], envelope["key"]))
+
+    def _local_targets(self, scope: str, key: Optional[str]) -> list[WebSocket]:
+        if scope == "user":
+            return self.active_connections.get(key, [])
+        if scope == "session":
+            return self.session_connections.get(key, [])
+        return [conn for conns in self.active_connections.values() for conn in conns]
+
+    async def flush(self) -> None:
+        """Wait until every queued message has been sent or dropped."""
+        await asyncio.gather(*(sender.queue.join() for sender in list(self._senders.values())))
+
+    def get_stats(self) -> dict[str, Any]:
+        """Fan-out totals plus per-connection queue depth and lag."""
+        return {
+            **self._stats,
+            "cross_worker": self._bus is not None,
+            "connections": len(self._senders),
+            "per_connection": [
+                {
+                    "connection_id": id(websocket),
+                    "queue_depth": sender.queue.qsize(),
+                    "lag_ms": round(sender.lag_ms(), 2),
+                    "max_lag_ms": round(sender.max_lag_ms, 2),
+                    "last_send_ms": round(sender.last_send_ms, 2),
+                    "sent": sender.sent,
+                }
+                for websocket, sender in self._senders.items()
+            ],
+        }
+
+    def _fan_out(self, text: str, connections: list[WebSocket]) -> None:
+        """Queue an encoded message for every connection; never waits on a send."""
+        if not connections:
+            return
+        self._stats["messages"] += 1
+        # Copy: evicting a connection mutates the registries
+        for websocket in list(dict.fromkeys(connections)):
+            sender = self._senders.get(websocket)
+            if sender is None:
+                sender = self._senders[websocket] = _ConnectionSender(websocket, self)
+            if sender.offer(text):
+                self._stats["deliveries"] += 1
+            else:
+                self._evict(websocket, f"send queue full ({self.send_queue_size})")
+
+    def _evict(self, websocket: WebSocket, reason: str) -> None:
+        """Drop a slow or dead consumer from every registry and close it."""
+        if websocket not in self._senders:
+            return
+        self._stats["evicted"] += 1
+        for registry in (self.active_connections, self.session_connections):
+            for key in [k for k, conns in registry.items() if websocket in conns]:
+                registry[key].remove(websocket)
+                if not registry[key]:
+                    del registry[key]
+        self._senders.pop(websocket).stop()
+        logger.warning(f"Evicted WebSocket consumer: {reason}")
+        asyncio.create_task(self._close_quietly(websocket))
+
+    @staticmethod
+    async def _close_quietly(websocket: WebSocket) -> None:
+        try:
+            await websocket.close(code=SLOW_CONSUMER_CLOSE_CODE)
+        except Exception:
+            pass
 
 
 manager = WebSocketManager()
@@ -95,6 +95,10 @@ INDEXES: dict[str, list[tuple[list[tuple[str, Union[int, str]]], dict]]] = {
         # Query hash for deduplication
         ([("query_hash", 1)], {"name": "idx_query_hash", "sparse": True}),
     ],
+    # Report Snapshot Rows Collection (paged snapshot data)
+    "report_snapshot_rows": [
+        ([("snapshot_id", 1), ("page", 1)], {"unique": True, "name": "idx_snapshot_page"}),
+    ],
     # Report Compare Jobs Collection
     "report_compare_jobs": [
         # Job ID
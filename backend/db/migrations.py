@@ -50,8 +50,23 @@ class MigrationManager:
 
         await self._create_index_safe(self.db.users, "username", unique=True, name="users.username")
         await self._create_index_safe(self.db.users, "role", name="users.role")
+        # PIN login resolves users by lookup hash; also serves the legacy-scan filter on null
+        await self._create_index_safe(
+            self.db.users, "pin_lookup_hash", name="users.pin_lookup_hash"
+        )
         logger.info("✓ Users indexes created")
 
+        # The lookup hash derives from the plaintext PIN, so it cannot be backfilled
+        # from pin_hash; these users migrate on their next PIN login or PIN reset
+        pending = await self.db.users.count_documents(
+            {"pin_hash": {"$exists": True}, "pin_lookup_hash": None}
+        )
+        if pending:
+            logger.warning(
+                f"{pending} user(s) have a PIN without pin_lookup_hash and rely on the "
+                "legacy PIN scan until their next PIN login or PIN reset"
+            )
+
     async def _cleanup_duplicate_users(self, username: str) -> None:
         """Remove duplicate users, keeping the oldest one."""
         users = await self.db.users.find({"username": username}).to_list(None)
@@ -184,6 +199,14 @@ class MigrationManager:
         except Exception as e:
             logger.warning(f"Error creating item variances indexes: {str(e)}")
 
+        # Persisted item embeddings for semantic search
+        await self._create_index_safe(
+            self.db.item_embeddings,
+            [("item_code", 1), ("model", 1)],
+            unique=True,
+            name="item_embeddings.item_code_model",
+        )
+
         # ERP config and sync metadata
         await self.db.erp_config.create_index([("_id", 1)])
         logger.info("✓ ERP config indexes created")
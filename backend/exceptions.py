@@ -189,3 +189,16 @@ class RateLimitError(StockVerifyException):
             status_code=429,
         )
         self.retry_after = retry_after
+
+
+class ServiceOverloadedError(StockVerifyException):
+    """Request shed because a bounded resource is saturated"""
+
+    def __init__(self, message: str = "Service overloaded", retry_after: Optional[int] = None):
+        super().__init__(
+            message=message,
+            error_code="SERVICE_OVERLOADED",
+            details={"retry_after": retry_after} if retry_after else {},
+            status_code=503,
+        )
+        self.retry_after = retry_after
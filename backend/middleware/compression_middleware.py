@@ -1,20 +1,67 @@
 """
 Modern Response Compression Middleware (2024/2025 Best Practice)
 High-performance compression for API responses
+
+The single compression stage of the middleware stack: brotli or zstd when the
+client accepts them and the library is installed, gzip otherwise. Bodies are
+compressed as they stream through instead of being buffered and re-encoded.
 """
 
-import gzip
 import logging
-from collections.abc import Callable
+import zlib
+from typing import Callable, Optional
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.requests import Request
-from starlette.responses import Response
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
 
 logger = logging.getLogger(__name__)
 
 
-class CompressionMiddleware(BaseHTTPMiddleware):
+class _GzipEncoder:
+    def __init__(self, level: int):
+        # wbits=31 writes a gzip header and trailer around the deflate stream
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.compress(data)
+
+    def finish(self) -> bytes:
+        return self._compressor.flush()
+
+
+class _BrotliEncoder:
+    def __init__(self, quality: int):
+        self._compressor = brotli.Compressor(quality=quality)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.process(data)
+
+    def finish(self) -> bytes:
+        return self._compressor.finish()
+
+
+class _ZstdEncoder:
+    def __init__(self, level: int):
+        self._compressor = zstandard.ZstdCompressor(level=level).compressobj()
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.compress(data)
+
+    def finish(self) -> bytes:
+        return self._compressor.flush()
+
+
+class CompressionMiddleware:
     """
     Automatic response compression for faster API responses
     Reduces bandwidth usage and improves client performance
@@ -22,88 +69,154 @@ class CompressionMiddleware(BaseHTTPMiddleware):
 
     def __init__(
         self,
-        app,
+        app: ASGIApp,
         minimum_size: int = 1024,  # Compress responses > 1KB
         compressible_types: list = None,
+        gzip_level: int = 6,
+        brotli_quality: int = 4,
+        zstd_level: int = 3,
     ):
-        super().__init__(app)
+        self.app = app
         self.minimum_size = minimum_size
         self.compressible_types = compressible_types or [
             "application/json",
             "application/javascript",
             "text/html",
             "text/css",
+            "text/csv",
             "text/plain",
             "text/xml",
             "application/xml",
         ]
 
-    async def dispatch(self, request: Request, call_next: Callable) -> Response:
-        """Process request with compression"""
-        response = await call_next(request)
-
-        # Check if compression is appropriate
-        if not self._should_compress(request, response):
-            return response
+        # Server preference order among the encodings we can produce
+        self.encoders: dict[str, Callable[[], object]] = {}
+        if brotli is not None:
+            self.encoders["br"] = lambda: _BrotliEncoder(brotli_quality)
+        if zstandard is not None:
+            self.encoders["zstd"] = lambda: _ZstdEncoder(zstd_level)
+        self.encoders["gzip"] = lambda: _GzipEncoder(gzip_level)
 
-        # Get response body
-        if hasattr(response, "body"):
-            body = response.body
-        else:
-            return response  # Can't compress streaming responses
-
-        # Check minimum size
-        if len(body) < self.minimum_size:
-            return response
-
-        # Compress body
-        try:
-            compressed_body = gzip.compress(body, compresslevel=6)
-
-            # Only compress if it actually reduces size
-            if len(compressed_body) >= len(body):
-                return response
-
-            # Create compressed response
-            # Convert headers to dict properly
-            response_headers = {}
-            for key, value in response.headers.items():
-                response_headers[key] = value
-
-            compressed_response = Response(
-                content=compressed_body,
-                status_code=response.status_code,
-                headers=response_headers,
-                media_type=response.media_type,
-            )
-            compressed_response.headers["Content-Encoding"] = "gzip"
-            compressed_response.headers["Content-Length"] = str(len(compressed_body))
-            compressed_response.headers["Vary"] = "Accept-Encoding"
-
-            return compressed_response
-
-        except Exception as e:
-            logger.warning(f"Compression failed: {str(e)}")
-            return response
-
-    def _should_compress(self, request: Request, response: Response) -> bool:
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """Process request with compression"""
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        encoding = self._negotiate(Headers(scope=scope).get("accept-encoding", ""))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        responder = _CompressionResponder(self, encoding, send)
+        await self.app(scope, receive, responder.send)
+
+    def _negotiate(self, accept_encoding: str) -> Optional[str]:
+        """Pick the preferred encoding the client accepts (q > 0)"""
+        accepted = set()
+        for part in accept_encoding.lower().split(","):
+            coding, _, params = part.strip().partition(";")
+            q = params.strip()
+            if q.startswith("q="):
+                try:
+                    if float(q[2:]) <= 0:
+                        continue
+                except ValueError:
+                    continue
+            accepted.add(coding.strip())
+
+        for encoding in self.encoders:
+            if encoding in accepted or "*" in accepted:
+                return encoding
+        return None
+
+    def _should_compress(self, message: Message) -> bool:
         """Check if response should be compressed"""
-        # Check Accept-Encoding header
-        accept_encoding = request.headers.get("Accept-Encoding", "")
-        if "gzip" not in accept_encoding:
+        # Check status code (don't compress errors)
+        if message["status"] >= 400:
             return False
 
-        # Check if already compressed
-        if response.headers.get("Content-Encoding"):
-            return False
+        headers = Headers(raw=message["headers"])
 
-        # Check content type
-        content_type = response.headers.get("Content-Type", "")
-        if not any(ct in content_type for ct in self.compressible_types):
+        # Check if already compressed
+        if headers.get("content-encoding"):
             return False
 
-        # Check status code (don't compress errors)
-        if response.status_code >= 400:
+        # Check content type; event streams must reach the client one event at a time
+        content_type = headers.get("content-type", "")
+        if "text/event-stream" in content_type:
             return False
-
-        return True
+        return any(ct in content_type for ct in self.compressible_types)
+
+
+class _CompressionResponder:
+    """Wraps ``send`` for one response, compressing its body as it passes through"""
+
+    def __init__(self, middleware: CompressionMiddleware, encoding: str, send: Send):
+        self.middleware = middleware
+        self.encoding = encoding
+        self._send = send
+        self.start_message: Optional[Message] = None
+        self.encoder = None
+        self.passthrough = False
+
+    async def send(self, message: Message) -> None:
+        message_type = message["type"]
+
+        if message_type == "http.response.start":
+            # Hold the start message until the first body chunk shows its size
+            self.start_message = message
+            self.passthrough = not self.middleware._should_compress(message)
+            if self.passthrough:
+                await self._send(message)
+            return
+
+        if self.passthrough or message_type != "http.response.body":
+            await self._send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+
+        if self.encoder is None:
+            if not more_body:
+                await self._send_whole(body)
+                return
+
+            # Streaming response: length is unknown, so compress from the first chunk
+            self.encoder = self.middleware.encoders[self.encoding]()
+            self._set_encoding_headers(length=None)
+            await self._send(self.start_message)
+
+        chunk = self.encoder.compress(body)
+        if not more_body:
+            chunk += self.encoder.finish()
+        if chunk or not more_body:
+            await self._send({"type": "http.response.body", "body": chunk, "more_body": more_body})
+
+    async def _send_whole(self, body: bytes) -> None:
+        """Single-message body: compress only when it is big enough and actually shrinks"""
+        compressed = None
+        if len(body) >= self.middleware.minimum_size:
+            try:
+                encoder = self.middleware.encoders[self.encoding]()
+                compressed = encoder.compress(body) + encoder.finish()
+            except Exception as e:
+                logger.warning(f"Compression failed: {str(e)}")
+
+        if compressed is not None and len(compressed) < len(body):
+            self._set_encoding_headers(length=len(compressed))
+            body = compressed
+
+        await self._send(self.start_message)
+        await self._send({"type": "http.response.body", "body": body, "more_body": False})
+
+    def _set_encoding_headers(self, length: Optional[int]) -> None:
+        headers = MutableHeaders(scope=self.start_message)
+        headers["Content-Encoding"] = self.encoding
+        headers.add_vary_header("Accept-Encoding")
+        if length is None:
+            if "content-length" in headers:
+                del headers["content-length"]
+        else:
+            headers["Content-Length"] = str(length)
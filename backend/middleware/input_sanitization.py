@@ -4,19 +4,44 @@ Sanitizes input to prevent XSS and injection attacks
 """
 
 import html
+import json
 import logging
 import re
 from typing import Any, Optional
 
 from fastapi import status
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.requests import Request
+from starlette.datastructures import Headers, QueryParams
 from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
 logger = logging.getLogger(__name__)
 
 
-class InputSanitizationMiddleware(BaseHTTPMiddleware):
+async def _buffer_body(receive: Receive) -> tuple[bytes, Receive]:
+    """Read the whole request body and return a receive callable that replays it"""
+    chunks = []
+    more_body = True
+    while more_body:
+        message = await receive()
+        if message["type"] != "http.request":
+            break  # Client disconnected; the app sees that on its next receive()
+        chunks.append(message.get("body", b""))
+        more_body = message.get("more_body", False)
+
+    body = b"".join(chunks)
+    replayed = False
+
+    async def replay() -> Message:
+        nonlocal replayed
+        if not replayed:
+            replayed = True
+            return {"type": "http.request", "body": body, "more_body": False}
+        return await receive()
+
+    return body, replay
+
+
+class InputSanitizationMiddleware:
     """
     Input Sanitization Middleware
     Sanitizes user input to prevent XSS and injection attacks
@@ -48,25 +73,23 @@ class InputSanitizationMiddleware(BaseHTTPMiddleware):
 
     def __init__(
         self,
-        app,
+        app: ASGIApp,
         sanitize_json: bool = True,
         sanitize_query: bool = True,
         sanitize_headers: bool = False,  # Usually headers are safe
         log_violations: bool = True,
         block_violations: bool = True,
     ):
-        super().__init__(app)
+        self.app = app
         self.sanitize_json = sanitize_json
         self.sanitize_query = sanitize_query
         self.sanitize_headers = sanitize_headers
         self.log_violations = log_violations
         self.block_violations = block_violations
 
-    async def _sanitize_query_params(
-        self, request: Request, request_id: str
-    ) -> Optional[JSONResponse]:
-        if self.sanitize_query and request.query_params:
-            for key, value in request.query_params.items():
+    def _sanitize_query_params(self, scope: Scope, request_id: str) -> Optional[JSONResponse]:
+        if self.sanitize_query and scope.get("query_string"):
+            for key, value in QueryParams(scope["query_string"]).items():
                 if self._is_dangerous(str(value)):
                     if self.log_violations:
                         logger.warning(
@@ -84,13 +107,11 @@ class InputSanitizationMiddleware(BaseHTTPMiddleware):
                         )
         return None
 
-    async def _sanitize_json_body(
-        self, request: Request, request_id: str
-    ) -> Optional[JSONResponse]:
-        if self.sanitize_json and request.method in ["POST", "PUT", "PATCH"]:
+    def _sanitize_json_body(self, body: bytes, request_id: str) -> Optional[JSONResponse]:
+        if body:
             try:
-                body = await request.json()
-                if self._contains_dangerous_input(body):
+                data = json.loads(body)
+                if self._contains_dangerous_input(data):
                     if self.log_violations:
                         logger.warning(
                             f"Potential injection attack detected in request body "
@@ -109,9 +130,9 @@ class InputSanitizationMiddleware(BaseHTTPMiddleware):
                 pass
         return None
 
-    def _sanitize_headers(self, request: Request, request_id: str) -> Optional[JSONResponse]:
+    def _sanitize_headers(self, headers: Headers, request_id: str) -> Optional[JSONResponse]:
         if self.sanitize_headers:
-            for header_name, header_value in request.headers.items():
+            for header_name, header_value in headers.items():
                 if self._is_dangerous(str(header_value)):
                     if self.log_violations:
                         logger.warning(
@@ -129,28 +150,40 @@ class InputSanitizationMiddleware(BaseHTTPMiddleware):
                         )
         return None
 
-    async def dispatch(self, request: Request, call_next):
+    def _inspects_body(self, scope: Scope, headers: Headers) -> bool:
+        """JSON bodies only, matching what FastAPI would parse as JSON"""
+        if not self.sanitize_json or scope["method"] not in ("POST", "PUT", "PATCH"):
+            return False
+        content_type = headers.get("content-type", "")
+        return not content_type or "json" in content_type
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
         """Process request with input sanitization"""
-        request_id = getattr(request.state, "request_id", "unknown")
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request_id = scope.get("state", {}).get("request_id", "unknown")
+        headers = Headers(scope=scope)
 
         # Check query parameters
-        response = await self._sanitize_query_params(request, request_id)
-        if response:
-            return response
+        response = self._sanitize_query_params(scope, request_id)
 
-        # Check request body (if JSON)
-        response = await self._sanitize_json_body(request, request_id)
-        if response:
-            return response
+        # Check request body (if JSON); it is read once here and replayed downstream
+        if response is None and self._inspects_body(scope, headers):
+            body, receive = await _buffer_body(receive)
+            response = self._sanitize_json_body(body, request_id)
 
         # Check headers if enabled
-        response = self._sanitize_headers(request, request_id)
-        if response:
-            return response
+        if response is None:
+            response = self._sanitize_headers(headers, request_id)
+
+        if response is not None:
+            await response(scope, receive, send)
+            return
 
         # Process request
-        response = await call_next(request)
-        return response
+        await self.app(scope, receive, send)
 
     def _is_dangerous(self, value: str) -> bool:
         """Check if value contains dangerous patterns"""
@@ -1,22 +1,21 @@
 import ipaddress
 import logging
-from typing import Callable
+from typing import Optional
 
-from fastapi import Request, Response
-from starlette.middleware.base import BaseHTTPMiddleware
 from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Receive, Scope, Send
 
 logger = logging.getLogger(__name__)
 
 
-class LANEnforcementMiddleware(BaseHTTPMiddleware):
+class LANEnforcementMiddleware:
     """
     Middleware to enforce LAN-only access.
     Allows access if the client IP is private (RFC 1918) or loopback.
     """
 
-    def __init__(self, app):
-        super().__init__(app)
+    def __init__(self, app: ASGIApp):
+        self.app = app
         # Paths that are always allowed (e.g., health checks, docs)
         self.allowed_paths = {
             "/health",
@@ -27,13 +26,22 @@ class LANEnforcementMiddleware(BaseHTTPMiddleware):
             "/metrics",
         }
 
-    async def dispatch(self, request: Request, call_next: Callable) -> Response:
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
         # Skip check for allowed paths
-        if request.url.path in self.allowed_paths:
-            return await call_next(request)
+        if scope["type"] != "http" or scope["path"] in self.allowed_paths:
+            await self.app(scope, receive, send)
+            return
 
-        client_ip = request.client.host if request.client else None
+        client = scope.get("client")
+        response = self._reject(client[0] if client else None)
+        if response is not None:
+            await response(scope, receive, send)
+            return
 
+        await self.app(scope, receive, send)
+
+    def _reject(self, client_ip: Optional[str]) -> Optional[JSONResponse]:
+        """403 response for clients outside the local network, None if allowed"""
         if not client_ip:
             logger.warning("Request rejected: No client IP found")
             return JSONResponse(
@@ -65,4 +73,4 @@ class LANEnforcementMiddleware(BaseHTTPMiddleware):
                 content={"code": "NETWORK_NOT_ALLOWED", "message": "Invalid network address"},
             )
 
-        return await call_next(request)
+        return None
@@ -3,13 +3,15 @@ Session Context Logging Middleware
 Adds user and session context to all log messages for protected endpoints
 """
 
+import base64
+import json
 import logging
 import time
 from contextvars import ContextVar
 from typing import Any, Optional
 
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.requests import Request
+from starlette.datastructures import Headers
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
 logger = logging.getLogger(__name__)
 
@@ -35,7 +37,7 @@ class SessionContextFilter(logging.Filter):
         return True
 
 
-class SessionContextLoggingMiddleware(BaseHTTPMiddleware):
+class SessionContextLoggingMiddleware:
     """
     Middleware that extracts user and session context from JWT tokens
     and makes it available for logging throughout the request lifecycle
@@ -43,11 +45,11 @@ class SessionContextLoggingMiddleware(BaseHTTPMiddleware):
 
     def __init__(
         self,
-        app,
+        app: ASGIApp,
         exclude_paths: Optional[list[str]] = None,
         log_request_body: bool = False,
     ):
-        super().__init__(app)
+        self.app = app
         self.exclude_paths = exclude_paths or [
             "/health",
             "/api/health",
@@ -57,22 +59,27 @@ class SessionContextLoggingMiddleware(BaseHTTPMiddleware):
         ]
         self.log_request_body = log_request_body
 
-    async def dispatch(self, request: Request, call_next):
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
         """Process request with session context logging"""
-        start_time = time.time()
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start_time = time.perf_counter()
 
         # Skip excluded paths
-        path = request.url.path
+        path = scope["path"]
         if any(path.startswith(excluded) for excluded in self.exclude_paths):
-            return await call_next(request)
+            await self.app(scope, receive, send)
+            return
 
         # Extract request ID if available
-        request_id = getattr(request.state, "request_id", None)
+        request_id = scope.get("state", {}).get("request_id")
         if request_id:
             current_request_id.set(request_id)
 
         # Try to extract user info from JWT token
-        user_info = await self._extract_user_context(request)
+        user_info = self._extract_user_context(Headers(scope=scope))
         if user_info:
             current_user_id.set(user_info.get("user_id"))
             current_username.set(user_info.get("username"))
@@ -80,42 +87,45 @@ class SessionContextLoggingMiddleware(BaseHTTPMiddleware):
                 current_session_id.set(user_info.get("session_id"))
 
         # Log request start with context
-        self._log_request_start(request, user_info)
+        self._log_request_start(scope, user_info)
 
-        # Process request
-        response = await call_next(request)
+        # Unhandled exceptions never send a response start; report them as 500
+        status_code = 500
 
-        # Calculate duration
-        duration_ms = (time.time() - start_time) * 1000
+        async def send_capturing_status(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
 
-        # Log request completion
-        self._log_request_complete(request, response, duration_ms, user_info)
+        try:
+            # Process request
+            await self.app(scope, receive, send_capturing_status)
+        finally:
+            # Calculate duration
+            duration_ms = (time.perf_counter() - start_time) * 1000
 
-        # Clear context vars after request
-        self._clear_context()
+            # Log request completion
+            self._log_request_complete(scope, status_code, duration_ms, user_info)
 
-        return response
+            # Clear context vars after request
+            self._clear_context()
 
-    async def _extract_user_context(self, request: Request) -> Optional[dict[str, Any]]:
+    def _extract_user_context(self, headers: Headers) -> Optional[dict[str, Any]]:
         """Extract user context from JWT token without full validation"""
-        auth_header = request.headers.get("Authorization", "")
+        auth_header = headers.get("Authorization", "")
 
         if not auth_header.startswith("Bearer "):
             return None
 
         try:
             token = auth_header.split(" ")[1]
-            # Decode JWT payload without verification (just for logging context)
-            # We use base64 decode to avoid import issues with jwt
-            import base64
-            import json
-
             # JWT format: header.payload.signature
             parts = token.split(".")
             if len(parts) != 3:
                 return None
 
-            # Decode payload (add padding if needed)
+            # Decode payload without verification (just for logging context)
             payload_b64 = parts[1]
             padding = 4 - len(payload_b64) % 4
             if padding != 4:
@@ -134,11 +144,11 @@ class SessionContextLoggingMiddleware(BaseHTTPMiddleware):
             # If we can't decode, just continue without context
             return None
 
-    def _log_request_start(self, request: Request, user_info: Optional[dict[str, Any]]) -> None:
+    def _log_request_start(self, scope: Scope, user_info: Optional[dict[str, Any]]) -> None:
         """Log request start with context"""
-        method = request.method
-        path = request.url.path
-        query = str(request.url.query) if request.url.query else ""
+        method = scope["method"]
+        path = scope["path"]
+        query = scope.get("query_string", b"").decode("latin-1")
 
         user_context = ""
         if user_info and user_info.get("username"):
@@ -154,15 +164,14 @@ class SessionContextLoggingMiddleware(BaseHTTPMiddleware):
 
     def _log_request_complete(
         self,
-        request: Request,
-        response,
+        scope: Scope,
+        status: int,
         duration_ms: float,
         user_info: Optional[dict[str, Any]],
     ) -> None:
         """Log request completion with duration"""
-        method = request.method
-        path = request.url.path
-        status = response.status_code
+        method = scope["method"]
+        path = scope["path"]
 
         # Determine log level based on status code
         if status >= 500:
@@ -4,77 +4,85 @@ Performance Middleware - Track request performance and add caching headers
 
 import logging
 import time
-from collections.abc import Callable
 
-from fastapi import Request, Response
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.types import ASGIApp
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
-try:
-    from services.monitoring_service import MonitoringService
-except ImportError:
-    # Fallback if services not in path
-    import sys
-    from pathlib import Path
-
-    sys.path.insert(0, str(Path(__file__).parent.parent))
-    from services.monitoring_service import MonitoringService
+from backend.services.monitoring_service import MonitoringService
 
 logger = logging.getLogger(__name__)
 
+# Label for requests no route matched (404s, scanners), so they share one series
+UNMATCHED_ROUTE = "<unmatched>"
+
+
+def route_template(scope: Scope) -> str:
+    """Matched route template (``/api/count-lines/{line_id}``) rather than the raw path"""
+    route = scope.get("route")
+    if route is None:
+        return UNMATCHED_ROUTE
+    return getattr(route, "path_format", None) or getattr(route, "path", UNMATCHED_ROUTE)
 
-class PerformanceMiddleware(BaseHTTPMiddleware):
+
+class PerformanceMiddleware:
     """Middleware to track request performance"""
 
     def __init__(self, app: ASGIApp, monitoring: MonitoringService):
-        super().__init__(app)
+        self.app = app
         self.monitoring = monitoring
 
-    async def dispatch(self, request: Request, call_next: Callable) -> Response:
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
         """Process request and track performance"""
-        start_time = time.time()
-
-        # Get endpoint path
-        endpoint = request.url.path
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start_time = time.perf_counter()
+        status_code = 500
+
+        async def send_with_timing(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                duration = time.perf_counter() - start_time
+
+                # Add performance headers
+                headers = MutableHeaders(scope=message)
+                headers["X-Response-Time"] = f"{duration:.3f}s"
+                request_id = Headers(scope=scope).get("X-Request-ID")
+                if request_id and "x-request-id" not in headers:
+                    headers["X-Request-ID"] = request_id
+            await send(message)
 
         try:
             # Process request
-            response = await call_next(request)
-
-            # Calculate duration
-            duration = time.time() - start_time
-
-            # Track request
-            self.monitoring.track_request(
-                endpoint=endpoint,
-                method=request.method,
-                status_code=response.status_code,
-                duration=duration,
-            )
-
-            # Add performance headers
-            response.headers["X-Response-Time"] = f"{duration:.3f}s"
-            response.headers["X-Request-ID"] = request.headers.get("X-Request-ID", "unknown")
-
-            return response
-
+            await self.app(scope, receive, send_with_timing)
         except Exception as e:
-            duration = time.time() - start_time
+            duration = time.perf_counter() - start_time
 
             # Track error
             self.monitoring.track_error(
-                endpoint=endpoint,
+                endpoint=route_template(scope),
                 error=e,
                 context={
-                    "method": request.method,
+                    "method": scope["method"],
                     "duration": duration,
                 },
             )
 
             raise
 
+        # Track request under its route template; routing has filled in the scope by now.
+        # Duration covers the full body, so streamed responses are timed end to end.
+        self.monitoring.track_request(
+            endpoint=route_template(scope),
+            method=scope["method"],
+            status_code=status_code,
+            duration=time.perf_counter() - start_time,
+        )
+
 
-class CacheMiddleware(BaseHTTPMiddleware):
+class CacheMiddleware:
     """Middleware to add cache headers for GET requests"""
 
     def __init__(
@@ -82,7 +90,7 @@ class CacheMiddleware(BaseHTTPMiddleware):
         app: ASGIApp,
         default_cache_max_age: int = 300,  # 5 minutes
     ):
-        super().__init__(app)
+        self.app = app
         self.default_cache_max_age = default_cache_max_age
 
         # Endpoints that should not be cached
@@ -92,18 +100,19 @@ class CacheMiddleware(BaseHTTPMiddleware):
             "/api/count-lines",
         }
 
-    async def dispatch(self, request: Request, call_next: Callable) -> Response:
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
         """Add cache headers to response"""
-        response = await call_next(request)
-
-        # Only cache successful GET requests
-        if (
-            request.method == "GET"
-            and response.status_code == 200
-            and request.url.path not in self.no_cache_paths
-        ):
-            # Add cache headers
-            response.headers["Cache-Control"] = f"public, max-age={self.default_cache_max_age}"
-            response.headers["ETag"] = f'"{hash(request.url.path)}"'
-
-        return response
+        path = scope.get("path", "")
+        if scope["type"] != "http" or scope["method"] != "GET" or path in self.no_cache_paths:
+            await self.app(scope, receive, send)
+            return
+
+        async def send_with_cache_headers(message: Message) -> None:
+            # Only cache successful GET requests
+            if message["type"] == "http.response.start" and message["status"] == 200:
+                headers = MutableHeaders(scope=message)
+                headers["Cache-Control"] = f"public, max-age={self.default_cache_max_age}"
+                headers["ETag"] = f'"{hash(path)}"'
+            await send(message)
+
+        await self.app(scope, receive, send_with_cache_headers)
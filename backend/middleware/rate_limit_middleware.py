@@ -4,22 +4,25 @@ Rate Limit Middleware - Enforce rate limiting on API endpoints
 
 import logging
 import os
-from collections.abc import Callable
 from typing import Optional
 
-from fastapi import HTTPException, Request, status
+from fastapi import status
 from jwt import decode as jwt_decode
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.types import ASGIApp
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
 from backend.services.rate_limiter import RateLimiter
 
 logger = logging.getLogger(__name__)
 
 
-class RateLimitMiddleware(BaseHTTPMiddleware):
+class RateLimitMiddleware:
     """Middleware to enforce rate limiting"""
 
+    # Public endpoints (health, login, register) are never rate limited
+    PUBLIC_PATHS = frozenset({"/api/health", "/api/auth/login", "/api/auth/register"})
+
     def __init__(
         self,
         app: ASGIApp,
@@ -27,7 +30,7 @@ class RateLimitMiddleware(BaseHTTPMiddleware):
         enabled: bool = True,
         jwt_secret: Optional[str] = None,
     ):
-        super().__init__(app)
+        self.app = app
         self.rate_limiter = rate_limiter
         self.enabled = enabled
         # SECURITY: Require JWT_SECRET from environment, no insecure fallback
@@ -38,19 +41,17 @@ class RateLimitMiddleware(BaseHTTPMiddleware):
                 "User-based rate limiting will fall back to IP-based limiting."
             )
 
-    async def dispatch(self, request: Request, call_next: Callable):
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
         """Check rate limit before processing request"""
-        if not self.enabled:
-            return await call_next(request)
+        if scope["type"] != "http" or not self.enabled or scope["path"] in self.PUBLIC_PATHS:
+            await self.app(scope, receive, send)
+            return
 
-        # Skip rate limiting for public endpoints (health, login, register)
-        public_paths = ["/api/health", "/api/auth/login", "/api/auth/register"]
-        if request.url.path in public_paths:
-            return await call_next(request)
+        headers = Headers(scope=scope)
 
         # Extract user ID from token if available, fallback to IP-based limiting
         user_id = None
-        auth_header = request.headers.get("Authorization")
+        auth_header = headers.get("Authorization")
         if auth_header and auth_header.startswith("Bearer ") and self.jwt_secret:
             try:
                 token = auth_header.split(" ")[1]
@@ -63,15 +64,13 @@ class RateLimitMiddleware(BaseHTTPMiddleware):
         # Fallback to IP-based limiting if no user ID
         if not user_id:
             # Use X-Forwarded-For header for proxied requests, otherwise client host
-            forwarded_for = request.headers.get("X-Forwarded-For")
+            forwarded_for = headers.get("X-Forwarded-For")
             client_ip = forwarded_for.split(",")[0].strip() if forwarded_for else None
-            user_id = client_ip or (request.client.host if request.client else "anonymous")
-
-        # Get endpoint
-        endpoint = request.url.path
+            client = scope.get("client")
+            user_id = client_ip or (client[0] if client else "anonymous")
 
         # Check rate limit
-        allowed, info = self.rate_limiter.is_allowed(user_id=user_id, endpoint=endpoint)
+        allowed, info = self.rate_limiter.is_allowed(user_id=user_id, endpoint=scope["path"])
 
         # Extract rate limit info
         limit = info.get("limit", self.rate_limiter.default_rate)
@@ -80,21 +79,23 @@ class RateLimitMiddleware(BaseHTTPMiddleware):
 
         if not allowed:
             retry_after = info.get("retry_after", 60)
-            raise HTTPException(
+            response = JSONResponse(
                 status_code=status.HTTP_429_TOO_MANY_REQUESTS,
-                detail={
-                    "success": False,
-                    "error": {
-                        "message": "Rate limit exceeded. Please try again later.",
-                        "code": "RATE_LIMIT_EXCEEDED",
-                        "category": "rate_limit",
-                        "details": {
-                            "limit": limit,
-                            "remaining": 0,
-                            "reset_in": reset_in,
-                            "retry_after": retry_after,
+                content={
+                    "detail": {
+                        "success": False,
+                        "error": {
+                            "message": "Rate limit exceeded. Please try again later.",
+                            "code": "RATE_LIMIT_EXCEEDED",
+                            "category": "rate_limit",
+                            "details": {
+                                "limit": limit,
+                                "remaining": 0,
+                                "reset_in": reset_in,
+                                "retry_after": retry_after,
+                            },
                         },
-                    },
+                    }
                 },
                 headers={
                     "Retry-After": str(retry_after),
@@ -103,13 +104,16 @@ class RateLimitMiddleware(BaseHTTPMiddleware):
                     "X-RateLimit-Reset": str(reset_in),
                 },
             )
-
-        # Process request
-        response = await call_next(request)
-
-        # Add rate limit headers to successful responses
-        response.headers["X-RateLimit-Limit"] = str(limit)
-        response.headers["X-RateLimit-Remaining"] = str(remaining)
-        response.headers["X-RateLimit-Reset"] = str(reset_in)
-
-        return response
+            await response(scope, receive, send)
+            return
+
+        async def send_with_limits(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                # Add rate limit headers to successful responses
+                response_headers = MutableHeaders(scope=message)
+                response_headers["X-RateLimit-Limit"] = str(limit)
+                response_headers["X-RateLimit-Remaining"] = str(remaining)
+                response_headers["X-RateLimit-Reset"] = str(reset_in)
+            await send(message)
+
+        await self.app(scope, receive, send_with_limits)
@@ -13,8 +13,8 @@ import logging
 import uuid
 from typing import Optional
 
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.requests import Request
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
 # Context variables for correlation IDs (async-safe, accessible anywhere)
 request_id_ctx: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar(
@@ -50,7 +50,7 @@ class CorrelationIDFilter(logging.Filter):
 logger = logging.getLogger(__name__)
 
 
-class RequestIDMiddleware(BaseHTTPMiddleware):
+class RequestIDMiddleware:
     """
     Request ID / Correlation ID Middleware
 
@@ -63,23 +63,29 @@ class RequestIDMiddleware(BaseHTTPMiddleware):
 
     def __init__(
         self,
-        app,
+        app: ASGIApp,
         request_id_header: str = "X-Request-ID",
         correlation_id_header: str = "X-Correlation-ID",
     ):
-        super().__init__(app)
+        self.app = app
         self.request_id_header = request_id_header
         self.correlation_id_header = correlation_id_header
 
-    async def dispatch(self, request: Request, call_next):
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
         """Process request with request and correlation IDs"""
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request_headers = Headers(scope=scope)
+
         # Get or generate request ID
-        request_id = request.headers.get(self.request_id_header.lower())
+        request_id = request_headers.get(self.request_id_header.lower())
         if not request_id:
             request_id = str(uuid.uuid4())
 
         # Get correlation ID from header (for distributed tracing) or use request ID
-        correlation_id = request.headers.get(self.correlation_id_header.lower())
+        correlation_id = request_headers.get(self.correlation_id_header.lower())
         if not correlation_id:
             correlation_id = request_id
 
@@ -87,26 +93,29 @@ class RequestIDMiddleware(BaseHTTPMiddleware):
         request_id_token = request_id_ctx.set(request_id)
         correlation_id_token = correlation_id_ctx.set(correlation_id)
 
+        async def send_with_ids(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                # Add IDs to response headers
+                headers = MutableHeaders(scope=message)
+                headers[self.request_id_header] = request_id
+                headers[self.correlation_id_header] = correlation_id
+            await send(message)
+
         try:
-            # Store in request state for backward compatibility
-            request.state.request_id = request_id
-            request.state.correlation_id = correlation_id
+            # Store in request state for backward compatibility (request.state reads scope["state"])
+            state = scope.setdefault("state", {})
+            state["request_id"] = request_id
+            state["correlation_id"] = correlation_id
 
             # Log request with IDs (only for non-health endpoints to reduce noise)
-            if not request.url.path.startswith("/health"):
+            if not scope["path"].startswith("/health"):
                 logger.debug(
-                    f"Request: {request.method} {request.url.path} "
+                    f"Request: {scope['method']} {scope['path']} "
                     f"[request_id={request_id}, correlation_id={correlation_id}]"
                 )
 
             # Process request
-            response = await call_next(request)
-
-            # Add IDs to response headers
-            response.headers[self.request_id_header] = request_id
-            response.headers[self.correlation_id_header] = correlation_id
-
-            return response
+            await self.app(scope, receive, send_with_ids)
         finally:
             # Reset context variables
             request_id_ctx.reset(request_id_token)
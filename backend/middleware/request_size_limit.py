@@ -6,14 +6,14 @@ Prevents DOS attacks via large request payloads
 import logging
 
 from fastapi import status
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.requests import Request
+from starlette.datastructures import Headers
 from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Receive, Scope, Send
 
 logger = logging.getLogger(__name__)
 
 
-class RequestSizeLimitMiddleware(BaseHTTPMiddleware):
+class RequestSizeLimitMiddleware:
     """
     Middleware to limit request payload size
     Prevents denial-of-service attacks via large requests
@@ -21,48 +21,59 @@ class RequestSizeLimitMiddleware(BaseHTTPMiddleware):
 
     def __init__(
         self,
-        app,
+        app: ASGIApp,
         max_size: int = 10 * 1024 * 1024,  # 10 MB default
         exempt_paths: list = None,
     ):
-        super().__init__(app)
+        self.app = app
         self.max_size = max_size
         self.exempt_paths = exempt_paths or ["/health"]
         logger.info(f"Request size limit: {max_size / (1024 * 1024):.1f} MB")
 
-    async def dispatch(self, request: Request, call_next):
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
         # Skip size check for exempt paths (like health checks)
-        if any(request.url.path.startswith(path) for path in self.exempt_paths):
-            return await call_next(request)
+        if scope["type"] != "http" or any(
+            scope["path"].startswith(path) for path in self.exempt_paths
+        ):
+            await self.app(scope, receive, send)
+            return
 
         # Check Content-Length header
-        content_length = request.headers.get("content-length")
+        content_length = Headers(scope=scope).get("content-length")
+        response = None
 
         if content_length:
             try:
                 content_length = int(content_length)
             except ValueError:
-                return JSONResponse(
+                response = JSONResponse(
                     status_code=status.HTTP_400_BAD_REQUEST,
                     content={
                         "detail": "Invalid Content-Length header",
                         "error": "INVALID_CONTENT_LENGTH",
                     },
                 )
+            else:
+                if content_length > self.max_size:
+                    client = scope.get("client")
+                    logger.warning(
+                        f"Request too large: {content_length} bytes (max: {self.max_size}) "
+                        f"from {client[0] if client else 'unknown'}"
+                    )
+                    response = JSONResponse(
+                        status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                        content={
+                            "detail": (
+                                f"Request payload too large. Maximum size: {self.max_size} bytes"
+                            ),
+                            "max_size_mb": round(self.max_size / (1024 * 1024), 2),
+                            "received_size_mb": round(content_length / (1024 * 1024), 2),
+                            "error": "REQUEST_TOO_LARGE",
+                        },
+                    )
 
-            if content_length > self.max_size:
-                logger.warning(
-                    f"Request too large: {content_length} bytes (max: {self.max_size}) "
-                    f"from {request.client.host if request.client else 'unknown'}"
-                )
-                return JSONResponse(
-                    status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
-                    content={
-                        "detail": f"Request payload too large. Maximum size: {self.max_size} bytes",
-                        "max_size_mb": round(self.max_size / (1024 * 1024), 2),
-                        "received_size_mb": round(content_length / (1024 * 1024), 2),
-                        "error": "REQUEST_TOO_LARGE",
-                    },
-                )
+        if response is not None:
+            await response(scope, receive, send)
+            return
 
-        return await call_next(request)
+        await self.app(scope, receive, send)
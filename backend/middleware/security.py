@@ -9,6 +9,8 @@ from collections import defaultdict
 from datetime import datetime, timedelta
 from typing import Any, Optional
 
+from backend.services.rate_limiter import DistributedRateLimiter
+
 logger = logging.getLogger(__name__)
 
 
@@ -201,50 +203,12 @@ class LoginRateLimiter:
             del self.attempts[ip_address]
 
 
-class BatchRateLimiter:
-    """
-    Rate limiter for batch sync operations.
-    Limits: 10 requests per minute per user.
-    """
-
-    def __init__(self, max_requests: int = 10, window_seconds: int = 60):
-        self.max_requests = max_requests
-        self.window = timedelta(seconds=window_seconds)
-        self.requests: dict[str, list] = defaultdict(list)
-
-    def is_allowed(self, user_id: str) -> tuple[bool, dict[str, Any]]:
-        """
-        Check if batch request is allowed for this user.
-        """
-        now = datetime.utcnow()
-
-        # Clean up old requests
-        self.requests[user_id] = [t for t in self.requests[user_id] if now - t < self.window]
-
-        current_count = len(self.requests[user_id])
-
-        if current_count >= self.max_requests:
-            oldest = min(self.requests[user_id])
-            reset_at = oldest + self.window
-            retry_after = int((reset_at - now).total_seconds())
-
-            return False, {
-                "limit": self.max_requests,
-                "remaining": 0,
-                "retry_after": max(retry_after, 1),
-            }
-
-        self.requests[user_id].append(now)
-
-        return True, {
-            "limit": self.max_requests,
-            "remaining": self.max_requests - current_count - 1,
-        }
-
-
 # Global instances
 login_rate_limiter = LoginRateLimiter()
-batch_rate_limiter = BatchRateLimiter()
+# 10 batch syncs per minute per user, shared across workers once Redis is attached
+batch_rate_limiter = DistributedRateLimiter(
+    default_rate=10, default_burst=10, key_prefix="ratelimit:batch_sync"
+)
 
 
 def get_client_ip(request) -> str:
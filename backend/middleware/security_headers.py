@@ -5,20 +5,28 @@ Implements OWASP security headers recommendations
 
 import logging
 
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.requests import Request
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
 logger = logging.getLogger(__name__)
 
 
-class SecurityHeadersMiddleware(BaseHTTPMiddleware):
+class SecurityHeadersMiddleware:
     """
     Security Headers Middleware
     Implements OWASP recommended security headers
     """
 
-    def __init__(self, app, **options):
-        super().__init__(app)
+    # Remove potentially dangerous headers
+    DANGEROUS_HEADERS = (
+        "Server",
+        "X-Powered-By",
+        "X-AspNet-Version",
+        "X-AspNetMvc-Version",
+    )
+
+    def __init__(self, app: ASGIApp, **options):
+        self.app = app
         self.options = options
 
         # Security headers configuration
@@ -82,29 +90,26 @@ class SecurityHeadersMiddleware(BaseHTTPMiddleware):
         # Remove None values
         self.headers = {k: v for k, v in self.headers.items() if v is not None}
 
-    async def dispatch(self, request: Request, call_next):
-        """Process request with security headers"""
-        response = await call_next(request)
-
-        # Add security headers to response
-        for header_name, header_value in self.headers.items():
-            # Skip HSTS for non-HTTPS connections
-            if header_name == "Strict-Transport-Security":
-                if request.url.scheme != "https":
-                    continue
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """Add security headers to the response start message"""
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
 
-            response.headers[header_name] = header_value
+        is_https = scope.get("scheme") == "https"
 
-        # Remove potentially dangerous headers
-        dangerous_headers = [
-            "Server",
-            "X-Powered-By",
-            "X-AspNet-Version",
-            "X-AspNetMvc-Version",
-        ]
+        async def send_with_headers(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(scope=message)
+                for header_name, header_value in self.headers.items():
+                    # Skip HSTS for non-HTTPS connections
+                    if header_name == "Strict-Transport-Security" and not is_https:
+                        continue
+                    headers[header_name] = header_value
 
-        for header in dangerous_headers:
-            if header in response.headers:
-                del response.headers[header]
+                for header in self.DANGEROUS_HEADERS:
+                    if header in headers:
+                        del headers[header]
+            await send(message)
 
-        return response
+        await self.app(scope, receive, send_with_headers)
@@ -9,15 +9,12 @@ from backend.config import settings
 logger = logging.getLogger(__name__)
 
 
-def _setup_gzip(app: FastAPI) -> None:
-    """Add GZip compression middleware."""
-    try:
-        from fastapi.middleware.gzip import GZipMiddleware
+def _setup_compression(app: FastAPI) -> None:
+    """Add the response compression middleware (brotli/zstd/gzip)."""
+    from backend.middleware.compression_middleware import CompressionMiddleware
 
-        app.add_middleware(GZipMiddleware, minimum_size=1000)
-        logger.info("✓ GZip middleware enabled")
-    except ImportError:
-        logger.warning("GZipMiddleware not available")
+    app.add_middleware(CompressionMiddleware, minimum_size=1000)
+    logger.info("✓ Compression middleware enabled")
 
 
 def _setup_trusted_hosts(app: FastAPI) -> None:
@@ -119,7 +116,7 @@ def _setup_lan_enforcement(app: FastAPI) -> None:
 
 def setup_middleware(app: FastAPI) -> None:
     """Configure all middleware for the application."""
-    _setup_gzip(app)
+    _setup_compression(app)
     _setup_trusted_hosts(app)
     _setup_cors(app)
     _setup_security_headers(app)
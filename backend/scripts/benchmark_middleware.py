@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Middleware Overhead Benchmark
+
+Measures the per-request cost of the middleware stack by driving a tiny app
+straight through ASGI (no sockets, no HTTP client), in three configurations:
+
+- bare:      the app with no middleware
+- base_http: the same number of layers built on BaseHTTPMiddleware, as the
+             stack was before it moved to pure ASGI (pass-through dispatch only)
+- asgi:      the current pure-ASGI stack
+
+Usage:
+    python backend/scripts/benchmark_middleware.py --requests 5000 --repeats 5
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import statistics
+import sys
+import time
+
+# Add repository root to path to import backend modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from fastapi import FastAPI
+from starlette.middleware.base import BaseHTTPMiddleware
+
+from backend.middleware.compression_middleware import CompressionMiddleware
+from backend.middleware.logging_middleware import SessionContextLoggingMiddleware
+from backend.middleware.performance_middleware import CacheMiddleware, PerformanceMiddleware
+from backend.middleware.request_id import RequestIDMiddleware
+from backend.middleware.request_size_limit import RequestSizeLimitMiddleware
+from backend.middleware.security_headers import SecurityHeadersMiddleware
+from backend.services.monitoring_service import MonitoringService
+
+ASGI_STACK = [
+    (CompressionMiddleware, {}),
+    (CacheMiddleware, {}),
+    (SecurityHeadersMiddleware, {}),
+    (SessionContextLoggingMiddleware, {}),
+    (RequestSizeLimitMiddleware, {}),
+    (RequestIDMiddleware, {}),
+    (PerformanceMiddleware, {"monitoring": MonitoringService()}),
+]
+
+
+class PassThroughMiddleware(BaseHTTPMiddleware):
+    async def dispatch(self, request, call_next):
+        return await call_next(request)
+
+
+def build_app(stack: str) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/api/count-lines/{line_id}")
+    async def get_line(line_id: str):
+        return {"id": line_id, "item_code": "A-100", "counted_qty": 3}
+
+    if stack == "asgi":
+        for middleware, options in ASGI_STACK:
+            app.add_middleware(middleware, **options)
+    elif stack == "base_http":
+        for _ in ASGI_STACK:
+            app.add_middleware(PassThroughMiddleware)
+    return app
+
+
+async def run(app: FastAPI, requests: int) -> float:
+    """Seconds per request for ``requests`` sequential GETs"""
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": "/api/count-lines/42",
+        "raw_path": b"/api/count-lines/42",
+        "root_path": "",
+        "query_string": b"",
+        "headers": [(b"host", b"localhost"), (b"accept-encoding", b"gzip")],
+        "client": ("127.0.0.1", 50000),
+        "server": ("localhost", 8001),
+    }
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        pass
+
+    # Warm up routing, middleware stack construction and caches
+    for _ in range(100):
+        await app(dict(scope), receive, send)
+
+    started = time.perf_counter()
+    for _ in range(requests):
+        await app(dict(scope), receive, send)
+    return (time.perf_counter() - started) / requests
+
+
+async def main(requests: int, repeats: int) -> None:
+    logging.disable(logging.CRITICAL)
+    results = {}
+    for stack in ("bare", "base_http", "asgi"):
+        app = build_app(stack)
+        samples = [await run(app, requests) for _ in range(repeats)]
+        results[stack] = statistics.median(samples) * 1_000_000
+
+    print(f"{len(ASGI_STACK)} middleware layers, {requests} requests x {repeats} repeats")
+    print(f"{'stack':<10} {'us/request':>12} {'overhead us':>12}")
+    for stack, per_request in results.items():
+        overhead = per_request - results["bare"]
+        print(f"{stack:<10} {per_request:>12.1f} {overhead:>12.1f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark per-request middleware overhead")
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--repeats", type=int, default=5)
+    args = parser.parse_args()
+    asyncio.run(main(args.requests, args.repeats))
@@ -60,15 +60,19 @@ from backend.api.user_management_api import user_management_router
 from backend.api.user_settings_api import router as user_settings_router
 from backend.api.variance_api import router as variance_router
 from backend.api.websocket_api import router as websocket_router
+from backend.auth.user_cache import token_version_claims
 from backend.config import settings
 from backend.core.lifespan import (  # client,
     activity_log_service,
     cache_service,
     db,
     lifespan,
+    monitoring_service,
     refresh_token_service,
 )
 from backend.error_messages import get_error_message
+from backend.middleware.compression_middleware import CompressionMiddleware
+from backend.middleware.performance_middleware import PerformanceMiddleware
 from backend.services.errors import (
     AuthenticationError,
     DatabaseError,
@@ -206,6 +210,11 @@ try:
 except Exception as e:
     logger.warning(f"Security headers middleware not available: {str(e)}")
 
+# Single compression stage (brotli/zstd/gzip) and per-route latency tracking, both pure
+# ASGI; performance is outermost so its timings cover the rest of the stack
+app.add_middleware(CompressionMiddleware)
+app.add_middleware(PerformanceMiddleware, monitoring=monitoring_service)
+
 # Create API router
 api_router = APIRouter()
 
@@ -628,11 +637,19 @@ async def generate_auth_tokens(
             minutes=getattr(settings, "ACCESS_TOKEN_EXPIRE_MINUTES", 15)
         )
         access_token = create_access_token(
-            {"sub": user["username"], "role": user.get("role", "staff")}
+            {
+                "sub": user["username"],
+                "role": user.get("role", "staff"),
+                **token_version_claims(user),
+            }
         )
 
         # Generate refresh token using service
-        refresh_payload = {"sub": user["username"], "role": user.get("role", "staff")}
+        refresh_payload = {
+            "sub": user["username"],
+            "role": user.get("role", "staff"),
+            **token_version_claims(user),
+        }
         refresh_token = refresh_token_service.create_refresh_token(refresh_payload)
         refresh_token_expires = datetime.utcnow() + timedelta(
             days=getattr(settings, "REFRESH_TOKEN_EXPIRE_DAYS", 30)
@@ -10,6 +10,8 @@ from typing import Any, Optional
 from motor.motor_asyncio import AsyncIOMotorDatabase
 from pydantic import BaseModel
 
+from backend.services.log_sink import write_log
+
 logger = logging.getLogger(__name__)
 
 
@@ -116,11 +118,10 @@ class ActivityLogService:
                 "error_message": error_message,
             }
 
-            result = await self.collection.insert_one(log_entry)
-            log_entry["id"] = str(result.inserted_id)
+            log_id = await write_log(self.collection, log_entry)
 
             logger.debug(f"Activity logged: {user} - {action} - {status}")
-            return str(result.inserted_id)
+            return log_id
         except Exception as e:
             logger.error(f"Failed to log activity: {str(e)}")
             # Don't raise - logging failures shouldn't break the app
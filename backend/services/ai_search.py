@@ -11,6 +11,16 @@ import numpy as np
 # Configure logging
 logger = logging.getLogger("ai_search")
 
+MODEL_NAME = "all-MiniLM-L6-v2"
+
+# Item fields that make up the embedded text
+EMBEDDING_FIELDS = ("item_name", "category", "subcategory")
+
+
+def embedding_text(item: dict[str, Any]) -> str:
+    """Text embedded for an item: name + category for better context"""
+    return " ".join(str(item.get(field) or "") for field in EMBEDDING_FIELDS)
+
 
 class AISearchService:
     _instance = None
@@ -38,9 +48,9 @@ class AISearchService:
         try:
             from sentence_transformers import SentenceTransformer
 
-            logger.info("Loading semantic search model (all-MiniLM-L6-v2)...")
+            logger.info(f"Loading semantic search model ({MODEL_NAME})...")
             # fast, lightweight model
-            self._model = SentenceTransformer("all-MiniLM-L6-v2")
+            self._model = SentenceTransformer(MODEL_NAME)
             logger.info("Semantic search model loaded successfully.")
         except ImportError:
             logger.error("sentence-transformers not installed. Semantic search disabled.")
@@ -63,6 +73,26 @@ class AISearchService:
             logger.error(f"Encoding error: {e}")
             return None
 
+    def encode_batch(self, texts: list[str], batch_size: int = 64) -> Optional[np.ndarray]:
+        """
+        Generate L2-normalized float32 embeddings for many strings (one row each).
+        """
+        self.initialize_model()
+        if self._model is None:
+            return None
+
+        try:
+            embeddings = self._model.encode(
+                texts,
+                batch_size=batch_size,
+                convert_to_numpy=True,
+                normalize_embeddings=True,
+            )
+            return np.ascontiguousarray(embeddings, dtype=np.float32)
+        except Exception as e:
+            logger.error(f"Batch encoding error: {e}")
+            return None
+
     def search_rerank(
         self, query: str, candidates: list[dict[str, Any]], top_k: int = 20
     ) -> list[dict[str, Any]]:
@@ -81,10 +111,7 @@ class AISearchService:
 
             # 2. Prepare Candidate Texts
             # Combine name + category for better context
-            candidate_texts = [
-                f"{item.get('item_name', '')} {item.get('category', '')} {item.get('subcategory', '')}"
-                for item in candidates
-            ]
+            candidate_texts = [embedding_text(item) for item in candidates]
 
             # 3. Encode Candidates (in batch)
             # Ideally we'd cache these, but for "reranking" small sets (e.g. 50-100), live encoding is OK.
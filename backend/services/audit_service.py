@@ -10,6 +10,7 @@ from typing import Any, Optional
 
 from backend.core.schemas.audit_log import AuditAction
 from backend.db.runtime import get_db
+from backend.services.log_sink import write_log
 
 logger = logging.getLogger(__name__)
 
@@ -63,14 +64,14 @@ class AuditService:
                 "timestamp": datetime.utcnow(),
             }
 
-            result = await db[cls.COLLECTION_NAME].insert_one(log_entry)
+            log_id = await write_log(db[cls.COLLECTION_NAME], log_entry)
 
             logger.info(
                 f"Audit log created: {action.value} by {username} "
                 f"(resource: {resource_type}/{resource_id})"
             )
 
-            return str(result.inserted_id)
+            return log_id or None
 
         except Exception as e:
             logger.error(f"Failed to create audit log: {e}")
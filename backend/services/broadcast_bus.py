@@ -0,0 +1,70 @@
+"""
+Broadcast Bus - Cross-worker delivery of WebSocket broadcasts
+Each worker publishes broadcast envelopes to the bus and fans out locally
+whatever it receives, so connections on any worker see every broadcast.
+"""
+
+import logging
+from collections.abc import Awaitable, Callable
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from backend.services.pubsub_service import PubSubService
+
+logger = logging.getLogger(__name__)
+
+BROADCAST_CHANNEL = "ws:broadcast"
+
+EnvelopeHandler = Callable[[dict[str, Any]], Awaitable[None]]
+
+
+class LocalBroadcastBus:
+    """
+    In-process bus delivering envelopes straight to every subscriber.
+
+    Used when Redis is unavailable and in tests, where several managers
+    sharing one bus stand in for several workers.
+    """
+
+    def __init__(self):
+        self._handlers: list[EnvelopeHandler] = []
+
+    async def subscribe(self, handler: EnvelopeHandler) -> None:
+        self._handlers.append(handler)
+
+    async def unsubscribe(self, handler: EnvelopeHandler) -> None:
+        self._handlers = [h for h in self._handlers if h != handler]
+
+    async def publish(self, envelope: dict[str, Any]) -> None:
+        for handler in list(self._handlers):
+            try:
+                await handler(envelope)
+            except Exception as e:
+                logger.error(f"Error in broadcast handler: {str(e)}")
+
+
+class RedisBroadcastBus:
+    """Bus backed by a Redis pub/sub channel shared by all workers."""
+
+    def __init__(self, pubsub_service: "PubSubService", channel: str = BROADCAST_CHANNEL):
+        self.pubsub = pubsub_service
+        self.channel = channel
+        self._handlers: dict[EnvelopeHandler, Callable] = {}
+
+    async def subscribe(self, handler: EnvelopeHandler) -> None:
+        async def on_message(channel: str, data: Any) -> None:
+            if isinstance(data, dict):
+                await handler(data)
+            else:
+                logger.warning(f"Ignoring malformed broadcast envelope on {channel}")
+
+        self._handlers[handler] = on_message
+        await self.pubsub.subscribe(self.channel, on_message)
+
+    async def unsubscribe(self, handler: EnvelopeHandler) -> None:
+        on_message = self._handlers.pop(handler, None)
+        if on_message:
+            await self.pubsub.unsubscribe(self.channel, on_message)
+
+    async def publish(self, envelope: dict[str, Any]) -> None:
+        await self.pubsub.publish(self.channel, envelope)
@@ -4,10 +4,13 @@ Falls back to in-memory cache if Redis unavailable
 """
 
 import asyncio
+import fnmatch
 import json
 import logging
+import marshal
 import threading
 import time
+from collections import OrderedDict
 from collections.abc import Callable
 from datetime import datetime
 from typing import Any, Optional
@@ -47,6 +50,98 @@ except ImportError:
             pass
 
 
+class MemoryCacheTier:
+    """
+    In-process LRU cache with per-entry TTL and an optional byte budget
+
+    Entries live in an OrderedDict kept in recency order, so get, set and
+    eviction are all O(1). Values must be JSON-compatible; they are stored
+    marshalled, which is several times cheaper to load than JSON and still
+    hands every reader its own copy.
+    """
+
+    def __init__(self, max_items: int = 1000, max_bytes: Optional[int] = None):
+        self.max_items = max_items
+        self.max_bytes = max_bytes
+        # key -> (marshalled value, expiry timestamp)
+        self._entries: OrderedDict[str, tuple[bytes, float]] = OrderedDict()
+        self._bytes = 0
+        self._stats = {"hits": 0, "misses": 0, "evictions": 0, "expirations": 0}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._entries
+
+    def keys(self) -> list[str]:
+        return list(self._entries)
+
+    def get(self, key: str) -> Optional[Any]:
+        entry = self._entries.get(key)
+        if entry is None:
+            self._stats["misses"] += 1
+            return None
+
+        payload, expiry = entry
+        if expiry <= time.time():
+            self._remove(key)
+            self._stats["expirations"] += 1
+            self._stats["misses"] += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self._stats["hits"] += 1
+        # Payloads are only ever produced by set() in this process
+        return marshal.loads(payload)  # nosec B302
+
+    def set(self, key: str, value: Any, ttl: int) -> bool:
+        """Store a JSON-compatible value; False if it alone exceeds the byte budget"""
+        payload = marshal.dumps(value)
+        if self.max_bytes is not None and len(payload) > self.max_bytes:
+            return False
+
+        self._remove(key)
+        self._entries[key] = (payload, time.time() + ttl)
+        self._bytes += len(payload)
+
+        while self._entries and (
+            len(self._entries) > self.max_items
+            or (self.max_bytes is not None and self._bytes > self.max_bytes)
+        ):
+            oldest_key = next(iter(self._entries))
+            self._remove(oldest_key)
+            self._stats["evictions"] += 1
+        return True
+
+    def delete(self, key: str) -> bool:
+        return self._remove(key)
+
+    def _remove(self, key: str) -> bool:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return False
+        self._bytes -= len(entry[0])
+        return True
+
+    def get_stats(self) -> dict[str, Any]:
+        lookups = self._stats["hits"] + self._stats["misses"]
+        return {
+            "items": len(self._entries),
+            "max_size": self.max_items,
+            "utilization": (
+                (len(self._entries) / self.max_items) * 100 if self.max_items > 0 else 0
+            ),
+            "memory_bytes": self._bytes,
+            "max_memory_bytes": self.max_bytes,
+            "hits": self._stats["hits"],
+            "misses": self._stats["misses"],
+            "hit_rate": round(self._stats["hits"] / lookups * 100, 2) if lookups else 0.0,
+            "evictions": self._stats["evictions"],
+            "expirations": self._stats["expirations"],
+        }
+
+
 class CacheService:
     """
     Cache service with Redis backend and in-memory fallback
@@ -61,11 +156,13 @@ class CacheService:
         default_ttl: int = 3600,  # 1 hour default
         max_memory_size: int = 1000,  # Max items in memory cache
         socket_timeout: int = 5,
+        max_memory_bytes: Optional[int] = None,  # Optional byte budget for memory cache
     ):
         self.default_ttl = default_ttl
         self.max_memory_size = max_memory_size
-        self._memory_cache: dict[str, tuple] = {}
+        self._memory_cache = MemoryCacheTier(max_memory_size, max_memory_bytes)
         self._lock = threading.Lock()
+        self._redis_stats = {"hits": 0, "misses": 0}
 
         # Try Redis connection
         if REDIS_AVAILABLE and redis_url:
@@ -102,21 +199,15 @@ class CacheService:
             try:
                 value = await self.redis_client.get(cache_key)
                 if value:
+                    self._redis_stats["hits"] += 1
                     return json.loads(value)
+                self._redis_stats["misses"] += 1
             except RedisError as e:
                 logger.error(f"Redis get error: {str(e)}")
                 return None
         else:
-            # In-memory cache
-            # No lock needed for simple dict access in async (single threaded event loop)
-            # But we check expiry
-            if cache_key in self._memory_cache:
-                value, expiry = self._memory_cache[cache_key]
-                if expiry > time.time():
-                    return json.loads(value)
-                else:
-                    # Expired, remove it
-                    del self._memory_cache[cache_key]
+            # In-memory cache (single threaded event loop, no lock needed)
+            return self._memory_cache.get(cache_key)
 
         return None
 
@@ -139,22 +230,8 @@ class CacheService:
                 logger.error(f"Redis set error: {str(e)}")
                 return False
         else:
-            # In-memory cache
-            # Evict if cache too large
-            if len(self._memory_cache) >= self.max_memory_size:
-                # Remove oldest entries
-                sorted_items = sorted(
-                    self._memory_cache.items(),
-                    key=lambda x: x[1][1],  # Sort by expiry
-                )
-                # Remove 20% of oldest items
-                remove_count = max(1, len(sorted_items) // 5)
-                for k, _ in sorted_items[:remove_count]:
-                    del self._memory_cache[k]
-
-            expiry = time.time() + ttl
-            self._memory_cache[cache_key] = (serialized, expiry)
-            return True
+            # In-memory cache: store the JSON-normalized value, evicting LRU entries
+            return self._memory_cache.set(cache_key, json.loads(serialized), ttl)
 
     async def delete(self, prefix: str, key: str) -> bool:
         """Delete value from cache"""
@@ -168,9 +245,7 @@ class CacheService:
                 logger.error(f"Redis delete error: {str(e)}")
                 return False
         else:
-            if cache_key in self._memory_cache:
-                del self._memory_cache[cache_key]
-                return True
+            return self._memory_cache.delete(cache_key)
 
         return False
 
@@ -191,7 +266,7 @@ class CacheService:
         else:
             keys_to_remove = [k for k in self._memory_cache.keys() if k.startswith(f"{prefix}:")]
             for k in keys_to_remove:
-                del self._memory_cache[k]
+                self._memory_cache.delete(k)
             return len(keys_to_remove)
 
         return 0
@@ -213,11 +288,9 @@ class CacheService:
 
             return 0
 
-        import fnmatch
-
         keys_to_remove = [k for k in self._memory_cache.keys() if fnmatch.fnmatch(k, pattern)]
         for k in keys_to_remove:
-            del self._memory_cache[k]
+            self._memory_cache.delete(k)
         return len(keys_to_remove)
 
     async def get_or_set(
@@ -249,6 +322,13 @@ class CacheService:
     async def get_stats(self) -> dict[str, Any]:
         """Get cache statistics"""
         if self.use_redis:
+            lookups = self._redis_stats["hits"] + self._redis_stats["misses"]
+            hit_stats = {
+                **self._redis_stats,
+                "hit_rate": (
+                    round(self._redis_stats["hits"] / lookups * 100, 2) if lookups else 0.0
+                ),
+            }
             try:
                 info = await self.redis_client.info()
                 return {
@@ -256,20 +336,12 @@ class CacheService:
                     "connected_clients": info.get("connected_clients", 0),
                     "used_memory": info.get("used_memory_human", "0"),
                     "keyspace": info.get("db0", {}),
+                    **hit_stats,
                 }
             except RedisError as e:
-                return {"backend": "redis", "error": str(e)}
+                return {"backend": "redis", "error": str(e), **hit_stats}
         else:
-            return {
-                "backend": "memory",
-                "items": len(self._memory_cache),
-                "max_size": self.max_memory_size,
-                "utilization": (
-                    (len(self._memory_cache) / self.max_memory_size) * 100
-                    if self.max_memory_size > 0
-                    else 0
-                ),
-            }
+            return {"backend": "memory", **self._memory_cache.get_stats()}
 
     # Aliases for compatibility if needed, but better to update callers
     get_async = get
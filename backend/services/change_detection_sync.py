@@ -3,20 +3,35 @@ Change Detection Sync Service
 Syncs specific fields (item_name, AutoBarcode, MRP) from Products table
 with change detection to only update changed items
 
+Changes are captured against a watermark persisted per table in MongoDB, so a
+restart resumes where the last run stopped instead of rescanning the table:
+
+- rowversion:    ``query_options.rowversion_column`` names a SQL Server
+                 rowversion column; only rows above the stored rowversion are read
+- modified_date: ``query_options.modified_date_column`` names a last-modified
+                 timestamp; only rows modified after the stored (time, key) are read
+- hash:          neither is configured; keys and a per-row HASHBYTES (or
+                 CHECKSUM) are read and full rows are pulled only for keys whose
+                 hash differs from the one stored at the last sync
+
+Every mode reads in keyset-paginated chunks and writes each chunk with one
+unordered bulk upsert.
+
 This module uses the Result pattern for error handling to make error states
 explicit and handle them in a functional way.
 """
 
 import asyncio
 import logging
+from collections.abc import AsyncIterator
 from datetime import datetime
 from typing import Any, Optional
 
 from motor.motor_asyncio import AsyncIOMotorDatabase
-from pymongo import UpdateMany
+from pymongo import UpdateOne
 
-from backend.sql_server_connector import SQLServerConnector
-from backend.utils.result import Fail, Ok, Result, result_function
+from backend.sql_server_connector import SQLServerConnector, sql_executor
+from backend.utils.result import Fail, Ok, Result
 
 from .errors import ConnectionError, DatabaseError, SyncConfigError, SyncError
 
@@ -26,6 +41,19 @@ logger = logging.getLogger(__name__)
 SyncResult = Result[dict[str, Any], SyncError]
 ProductData = dict[str, Any]
 SyncStats = dict[str, Any]
+CaptureConfig = dict[str, Any]
+# (changed rows, watermark progress to persist once they are written, rows examined)
+CaptureChunk = tuple[list[ProductData], dict[str, Any], int]
+
+CAPTURE_ROWVERSION = "rowversion"
+CAPTURE_MODIFIED_DATE = "modified_date"
+CAPTURE_HASH = "hash"
+
+# Product fields kept in sync, when the active mapping provides a column for them
+SYNCED_FIELDS = ("item_name", "barcode", "mrp")
+
+# Separates columns in the hashed string so ("ab", "c") and ("a", "bc") differ
+HASH_SEPARATOR = "CHAR(31)"
 
 
 class ChangeDetectionSyncService:
@@ -50,6 +78,9 @@ class ChangeDetectionSyncService:
         self._running = False
         self._task: asyncio.Task = None
         self._last_sync: Optional[datetime] = None
+        # ERP state as of this moment is in MongoDB (start of the last completed capture)
+        self._synced_through: Optional[datetime] = None
+        self._capture_mode: Optional[str] = None
 
         # Initialize statistics with proper typing
         self._sync_stats: SyncStats = {
@@ -62,19 +93,16 @@ class ChangeDetectionSyncService:
             "last_error": None,
             "last_success": None,
             "avg_process_time_ms": 0,
+            "last_lag_seconds": None,
+            "max_lag_seconds": 0.0,
         }
 
-    def _get_products_with_changes_query(
-        self, last_sync_time: Optional[datetime] = None
-    ) -> Result[str, SyncError]:
+    def _get_capture_config(self) -> Result[CaptureConfig, SyncError]:
         """
-        Get SQL query to fetch products that may have changed.
-
-        Args:
-            last_sync_time: The timestamp of the last successful sync.
+        Resolve the table, key, synced columns and capture mode from the mapping.
 
         Returns:
-            Result containing the SQL query string or an error.
+            Result containing the capture configuration or an error.
         """
         try:
             mapping = self.sql_connector.mapping
@@ -85,36 +113,234 @@ class ChangeDetectionSyncService:
             if not table_name:
                 return Fail(SyncConfigError("Items table not configured in mapping"))
 
-            columns = ", ".join(
-                [f"{col} as {alias}" for alias, col in mapping["items_columns"].items()]
-            )
+            options = mapping.get("query_options", {})
+            columns = mapping["items_columns"]
+            key_column = options.get("change_key_column") or columns.get("item_code")
+            if not key_column:
+                return Fail(SyncConfigError("No key column configured for change capture"))
 
-            query = f"""
-                SELECT {columns}
-                FROM {table_name}
-            """  # nosec
+            fields = {alias: columns[alias] for alias in SYNCED_FIELDS if columns.get(alias)}
+            if not fields:
+                return Fail(SyncConfigError("No synced product columns in mapping"))
 
-            # Add modified date filter if available
-            modified_column = mapping.get("query_options", {}).get("modified_date_column")
-            if modified_column and last_sync_time:
-                query += f" WHERE {modified_column} >= ?"
+            if options.get("rowversion_column"):
+                mode = CAPTURE_ROWVERSION
+            elif options.get("modified_date_column"):
+                mode = CAPTURE_MODIFIED_DATE
+            else:
+                mode = CAPTURE_HASH
 
-            return Ok(query)
+            return Ok(
+                {
+                    "name": table_name,
+                    "table": f"[{options.get('schema_name', 'dbo')}].[{table_name}]",
+                    "key_column": key_column,
+                    "fields": fields,
+                    "mode": mode,
+                    "rowversion_column": options.get("rowversion_column"),
+                    "modified_column": options.get("modified_date_column"),
+                    "hash_function": options.get("change_hash", "hashbytes").lower(),
+                }
+            )
 
         except Exception as e:
             return Fail(
-                DatabaseError(
-                    "Failed to generate products query",
-                    {"error": str(e), "last_sync_time": last_sync_time},
-                )
+                SyncConfigError("Failed to resolve change capture config", {"error": str(e)})
             )
-            # unreachable fallback query removed (after return)
+
+    @staticmethod
+    def _select_list(config: CaptureConfig) -> str:
+        columns = [f"{config['key_column']} AS item_code"]
+        columns.extend(f"{column} AS {alias}" for alias, column in config["fields"].items())
+        return ", ".join(columns)
+
+    def _get_products_with_changes_query(
+        self, config: CaptureConfig, first_chunk: bool = False
+    ) -> str:
+        """
+        SQL for the next keyset chunk of the configured capture mode.
+
+        Parameters, in order:
+            rowversion:    chunk size, last rowversion, upper rowversion
+            modified_date: chunk size, [last time, last time, last key,] upper time
+            hash:          chunk size[, last key]
+        """
+        table = config["table"]
+        key = config["key_column"]
+
+        if config["mode"] == CAPTURE_ROWVERSION:
+            rowversion = config["rowversion_column"]
+            return f"""
+                SELECT TOP (?) {self._select_list(config)},
+                    CAST({rowversion} AS BIGINT) AS row_version
+                FROM {table}
+                WHERE {rowversion} > CAST(CAST(? AS BIGINT) AS BINARY(8))
+                  AND {rowversion} <= CAST(CAST(? AS BIGINT) AS BINARY(8))
+                ORDER BY {rowversion}
+            """  # nosec
+
+        if config["mode"] == CAPTURE_MODIFIED_DATE:
+            modified = config["modified_column"]
+            after = "" if first_chunk else f"({modified} > ? OR ({modified} = ? AND {key} > ?)) AND"
+            return f"""
+                SELECT TOP (?) {self._select_list(config)}, {modified} AS modified_at
+                FROM {table}
+                WHERE {after} {modified} <= ?
+                ORDER BY {modified}, {key}
+            """  # nosec
+
+        columns = [
+            f"COALESCE(CAST({column} AS NVARCHAR(4000)), '')"
+            for column in config["fields"].values()
+        ]
+        if config["hash_function"] == "checksum":
+            row_hash = f"CHECKSUM({', '.join(config['fields'].values())})"
+        else:
+            separator = f", {HASH_SEPARATOR}, "
+            row_hash = f"HASHBYTES('SHA2_256', CONCAT({separator.join(columns)}, ''))"
+        after = "" if first_chunk else f"WHERE {key} > ?"
+        return f"""
+            SELECT TOP (?) {key} AS item_code, {row_hash} AS row_hash
+            FROM {table}
+            {after}
+            ORDER BY {key}
+        """  # nosec
+
+    def _get_products_by_keys_query(self, config: CaptureConfig, count: int) -> str:
+        """SQL for the full synced columns of ``count`` keys."""
+        placeholders = ", ".join("?" for _ in range(count))
+        return f"""
+            SELECT {self._select_list(config)}
+            FROM {config['table']}
+            WHERE {config['key_column']} IN ({placeholders})
+        """  # nosec
+
+    async def _query(self, query: str, params: list[Any]) -> list[ProductData]:
+        """Run a capture query on the bulk SQL lane."""
+        try:
+            return await sql_executor.run_bulk(self.sql_connector.execute_query, query, params)
+        except Exception as e:
+            raise DatabaseError("Failed to execute change capture query", {"error": str(e)})
+
+    async def _load_watermark(self, config: CaptureConfig) -> dict[str, Any]:
+        """Persisted capture position for the table; empty if none or the mode changed."""
+        watermark = await self.mongo_db.sync_watermarks.find_one({"_id": config["name"]})
+        if not watermark or watermark.get("mode") != config["mode"]:
+            return {}
+        return watermark
+
+    async def _save_watermark(self, config: CaptureConfig, fields: dict[str, Any]) -> None:
+        await self.mongo_db.sync_watermarks.update_one(
+            {"_id": config["name"]},
+            {"$set": {"mode": config["mode"], **fields, "updated_at": datetime.utcnow()}},
+            upsert=True,
+        )
+
+    async def _capture_by_rowversion(
+        self, config: CaptureConfig, watermark: dict[str, Any], force_full: bool
+    ) -> AsyncIterator[CaptureChunk]:
+        # Rows above MIN_ACTIVE_ROWVERSION may belong to open transactions and
+        # commit out of order; stopping below it means no row is ever skipped
+        bound = await self._query(
+            "SELECT CAST(MIN_ACTIVE_ROWVERSION() AS BIGINT) - 1 AS upper_bound", []
+        )
+        upper = bound[0]["upper_bound"]
+        last = 0 if force_full else watermark.get("rowversion", 0)
+
+        while last < upper:
+            rows = await self._query(
+                self._get_products_with_changes_query(config), [self.batch_size, last, upper]
+            )
+            if not rows:
+                break
+            last = rows[-1]["row_version"]
+            yield rows, {"rowversion": last}, len(rows)
+            if len(rows) < self.batch_size:
+                break
+
+    async def _capture_by_modified_date(
+        self, config: CaptureConfig, watermark: dict[str, Any], force_full: bool
+    ) -> AsyncIterator[CaptureChunk]:
+        bound = await self._query("SELECT GETDATE() AS upper_bound", [])
+        upper = bound[0]["upper_bound"]
+        last_time = None if force_full else watermark.get("modified_at")
+        last_key = watermark.get("modified_key")
+
+        while True:
+            if last_time is None:
+                query = self._get_products_with_changes_query(config, first_chunk=True)
+                params = [self.batch_size, upper]
+            else:
+                query = self._get_products_with_changes_query(config)
+                params = [self.batch_size, last_time, last_time, last_key, upper]
+
+            rows = await self._query(query, params)
+            if not rows:
+                break
+            last_time, last_key = rows[-1]["modified_at"], rows[-1]["item_code"]
+            yield rows, {"modified_at": last_time, "modified_key": last_key}, len(rows)
+            if len(rows) < self.batch_size:
+                break
+
+    async def _capture_by_hash(
+        self, config: CaptureConfig, watermark: dict[str, Any], force_full: bool
+    ) -> AsyncIterator[CaptureChunk]:
+        # An interrupted pass resumes after the last key it finished
+        last_key = None if force_full else watermark.get("resume_key")
+
+        while True:
+            if last_key is None:
+                query = self._get_products_with_changes_query(config, first_chunk=True)
+                params: list[Any] = [self.batch_size]
+            else:
+                query = self._get_products_with_changes_query(config)
+                params = [self.batch_size, last_key]
+
+            hashed = await self._query(query, params)
+            if not hashed:
+                break
+            last_key = hashed[-1]["item_code"]
+
+            hashes = {row["item_code"]: self._hash_value(row["row_hash"]) for row in hashed}
+            stored: dict[Any, Any] = {}
+            if not force_full:
+                cursor = self.mongo_db.sync_row_hashes.find(
+                    {"_id": {"$in": [self._hash_id(config, key) for key in hashes]}},
+                    {"hash": 1},
+                )
+                stored = {doc["_id"]: doc.get("hash") async for doc in cursor}
+
+            changed = [
+                key
+                for key, value in hashes.items()
+                if stored.get(self._hash_id(config, key)) != value
+            ]
+            rows: list[ProductData] = []
+            if changed:
+                rows = await self._query(
+                    self._get_products_by_keys_query(config, len(changed)), changed
+                )
+                for row in rows:
+                    row["row_hash"] = hashes.get(row["item_code"])
+
+            yield rows, {"resume_key": last_key}, len(hashed)
+            if len(hashed) < self.batch_size:
+                break
+
+    @staticmethod
+    def _hash_value(row_hash: Any) -> Any:
+        """HASHBYTES returns bytes, CHECKSUM an int; store both in a comparable form."""
+        return row_hash.hex() if isinstance(row_hash, (bytes, bytearray)) else row_hash
+
+    @staticmethod
+    def _hash_id(config: CaptureConfig, key: Any) -> str:
+        return f"{config['name']}:{key}"
 
     def _build_update_operations(
         self, changes: list[ProductData]
-    ) -> Result[list[dict[str, Any]], SyncError]:
+    ) -> Result[list[UpdateOne], SyncError]:
         """
-        Build MongoDB update operations for changed products.
+        Build MongoDB upsert operations for changed products.
 
         Args:
             changes: List of product changes to process.
@@ -126,27 +352,23 @@ class ChangeDetectionSyncService:
             return Ok([])
 
         try:
+            now = datetime.utcnow()
             operations = []
             for change in changes:
-                if not change.get("barcode"):
-                    logger.warning("Skipping product without barcode: %s", change)
+                if change.get("item_code") is None:
+                    logger.warning("Skipping product without key: %s", change)
                     continue
 
-                update_data = {
-                    "item_name": change.get("item_name"),
-                    "barcode": change.get("barcode"),  # AutoBarcode (6-digit)
-                    "mrp": change.get("mrp"),
-                    "last_updated": datetime.utcnow(),
-                }
+                update_data = {field: change.get(field) for field in SYNCED_FIELDS}
+                update_data["item_code"] = change["item_code"]
+                update_data["last_updated"] = now
 
                 # Remove None values
                 update_data = {k: v for k, v in update_data.items() if v is not None}
 
                 operations.append(
-                    UpdateMany(
-                        {"barcode": change["barcode"]},
-                        {"$set": update_data},
-                        upsert=False,  # Don't create new documents, only update existing
+                    UpdateOne(
+                        {"item_code": change["item_code"]}, {"$set": update_data}, upsert=True
                     )
                 )
 
@@ -160,33 +382,12 @@ class ChangeDetectionSyncService:
                 )
             )
 
-    @result_function(SyncError)
-    async def _fetch_changed_products(self) -> list[ProductData]:
-        """Fetch changed products from the database."""
-        query_result = self._get_products_with_changes_query(self._last_sync)
-        if query_result.is_err:
-            return query_result  # type: ignore
-
-        query = query_result.unwrap()
-        params = [self._last_sync] if self._last_sync else None
-
-        try:
-            # Execute query and return results
-            results = await self.sql_connector.execute_query(query, params)
-            return Ok(results or [])
-        except Exception as e:
-            return Fail(
-                DatabaseError(
-                    "Failed to execute products query",
-                    {"query": query, "error": str(e)},
-                )
-            )
-
-    @result_function(SyncError)
-    async def _apply_changes_to_mongodb(self, changes: list[ProductData]) -> dict[str, int]:
-        """Apply changes to MongoDB."""
+    async def _apply_changes_to_mongodb(
+        self, config: CaptureConfig, changes: list[ProductData]
+    ) -> Result[dict[str, int], SyncError]:
+        """Apply changes to MongoDB, then record the hashes they were captured with."""
         if not changes:
-            return Ok({"matched": 0, "modified": 0})
+            return Ok({"matched": 0, "modified": 0, "upserted": 0})
 
         operations_result = self._build_update_operations(changes)
         if operations_result.is_err:
@@ -194,10 +395,23 @@ class ChangeDetectionSyncService:
 
         operations = operations_result.unwrap()
         if not operations:
-            return Ok({"matched": 0, "modified": 0})
+            return Ok({"matched": 0, "modified": 0, "upserted": 0})
 
         try:
-            result = await self.mongo_db.products.bulk_write(operations)
+            result = await self.mongo_db.products.bulk_write(operations, ordered=False)
+
+            hash_operations = [
+                UpdateOne(
+                    {"_id": self._hash_id(config, change["item_code"])},
+                    {"$set": {"table": config["name"], "hash": change["row_hash"]}},
+                    upsert=True,
+                )
+                for change in changes
+                if change.get("row_hash") is not None
+            ]
+            if hash_operations:
+                await self.mongo_db.sync_row_hashes.bulk_write(hash_operations, ordered=False)
+
             return Ok(
                 {
                     "matched": result.matched_count,
@@ -213,60 +427,91 @@ class ChangeDetectionSyncService:
                 )
             )
 
-    async def _sync_changes(self) -> SyncResult:
+    async def _sync_changes(self, force_full: bool = False) -> SyncResult:
         """
         Perform a single sync of changed products.
 
+        Args:
+            force_full: Ignore the stored watermark and re-read every row.
+
         Returns:
             Result containing sync statistics or an error.
         """
         if not self.enabled:
             return Fail(SyncConfigError("Sync is disabled"))
 
-        logger.info("Starting change detection sync...")
-        start_time = datetime.utcnow()
-
-        try:
-            # Step 1: Fetch changed products
-            fetch_result = await self._fetch_changed_products()
-            if fetch_result.is_err:
-                return fetch_result
-
-            changed_products = fetch_result.unwrap()
-
-            if not changed_products:
-                logger.debug("No changed products found")
-                return self._finalize_sync(start_time, 0, 0)
-
-            # Step 2: Apply changes to MongoDB
-            update_result = await self._apply_changes_to_mongodb(changed_products)
-            if update_result.is_err:
-                return update_result
+        config_result = self._get_capture_config()
+        if config_result.is_err:
+            return config_result  # type: ignore
+        config = config_result.unwrap()
+        self._capture_mode = config["mode"]
 
-            stats = update_result.unwrap()
-
-            # Log results
-            logger.info(
-                "Updated products in MongoDB. Matched: %d, Modified: %d, Upserted: %d",
-                stats["matched"],
-                stats["modified"],
-                stats.get("upserted", 0),
-            )
+        logger.info("Starting change detection sync (%s capture)...", config["mode"])
+        start_time = datetime.utcnow()
+        items_checked = 0
+        items_updated = 0
 
-            # Update and return stats
-            return self._finalize_sync(start_time, len(changed_products), stats["modified"])
+        capture = {
+            CAPTURE_ROWVERSION: self._capture_by_rowversion,
+            CAPTURE_MODIFIED_DATE: self._capture_by_modified_date,
+            CAPTURE_HASH: self._capture_by_hash,
+        }[config["mode"]]
 
+        try:
+            watermark = await self._load_watermark(config)
+            synced_through = watermark.get("synced_through")
+
+            async for rows, progress, checked in capture(config, watermark, force_full):
+                items_checked += checked
+                update_result = await self._apply_changes_to_mongodb(config, rows)
+                if update_result.is_err:
+                    return update_result  # type: ignore
+
+                stats = update_result.unwrap()
+                items_updated += stats["modified"] + stats["upserted"]
+                # Advance the watermark only once the chunk is written
+                await self._save_watermark(config, progress)
+
+            end_time = datetime.utcnow()
+            completed = {"synced_through": start_time, "completed_at": end_time}
+            if config["mode"] == CAPTURE_HASH:
+                completed["resume_key"] = None
+            await self._save_watermark(config, completed)
+
+        except SyncError as e:
+            logger.error("Change detection sync failed: %s", e)
+            return Fail(e)
         except Exception as e:
             error = DatabaseError("Unexpected error during sync", {"error": str(e)})
             logger.exception("Error during change detection sync")
             return Fail(error)
 
+        # A change committed just after the previous capture started waits until
+        # this one completes, which bounds how stale MongoDB can have been
+        lag_seconds = None
+        if items_updated and synced_through:
+            lag_seconds = (end_time - synced_through).total_seconds()
+
+        if items_checked:
+            logger.info(
+                "Change detection sync: %d rows examined, %d products written",
+                items_checked,
+                items_updated,
+            )
+        self._synced_through = start_time
+        return self._finalize_sync(start_time, items_checked, items_updated, lag_seconds)
+
     def _finalize_sync(
-        self, start_time: datetime, items_checked: int, items_updated: int
+        self,
+        start_time: datetime,
+        items_checked: int,
+        items_updated: int,
+        lag_seconds: Optional[float] = None,
     ) -> SyncResult:
         """Update sync statistics and return results."""
         end_time = datetime.utcnow()
         duration_ms = int((end_time - start_time).total_seconds() * 1000)
+        self._last_sync = end_time
 
         # Update statistics
         self._sync_stats["total_syncs"] += 1
@@ -275,6 +520,11 @@ class ChangeDetectionSyncService:
         self._sync_stats["items_updated"] += items_updated
         self._sync_stats["last_sync"] = end_time.isoformat()
         self._sync_stats["last_success"] = end_time.isoformat()
+        if lag_seconds is not None:
+            self._sync_stats["last_lag_seconds"] = round(lag_seconds, 3)
+            self._sync_stats["max_lag_seconds"] = round(
+                max(self._sync_stats["max_lag_seconds"], lag_seconds), 3
+            )
 
         # Calculate average processing time
         total_syncs = self._sync_stats["total_syncs"]
@@ -289,6 +539,7 @@ class ChangeDetectionSyncService:
             "duration_ms": duration_ms,
             "items_checked": items_checked,
             "items_updated": items_updated,
+            "lag_seconds": lag_seconds,
             "timestamp": end_time.isoformat(),
         }
 
@@ -333,6 +584,34 @@ class ChangeDetectionSyncService:
                 self._sync_stats.get("last_error", "None"),
             )
 
+    async def sync_changed_items(self, force_full: bool = False) -> dict[str, Any]:
+        """
+        Run one change capture and record its outcome.
+
+        Args:
+            force_full: Ignore the stored watermark and re-read every row.
+
+        Returns:
+            Sync result, or ``{"status": "error", "error": ...}`` on failure.
+        """
+        result = await self._sync_changes(force_full=force_full)
+        if result.is_ok:
+            return result.unwrap()
+
+        message = result.match(ok=lambda _: "", err=str)
+        self._update_sync_stats(False, error=message)
+        return {"status": "error", "error": message, "timestamp": datetime.utcnow().isoformat()}
+
+    async def _run(self) -> None:
+        """Background capture loop"""
+        while self._running:
+            try:
+                await self.sync_changed_items()
+            except Exception as e:
+                logger.error(f"Change detection sync loop error: {str(e)}")
+
+            await asyncio.sleep(self.sync_interval)
+
     async def start(self) -> SyncResult:
         """
         Start the sync service.
@@ -393,6 +672,30 @@ class ChangeDetectionSyncService:
         """Trigger immediate change detection sync"""
         return await self.sync_changed_items(force_full=True)
 
+    def _get_next_sync_in(self) -> Optional[int]:
+        """Seconds until the background loop runs again (None when not scheduled)."""
+        if not self._running or self._last_sync is None:
+            return None
+        elapsed = (datetime.utcnow() - self._last_sync).total_seconds()
+        return max(0, int(self.sync_interval - elapsed))
+
+    def get_stats(self) -> dict[str, Any]:
+        """
+        Sync statistics plus the current ERP-to-MongoDB lag.
+
+        ``watermark_age_seconds`` keeps growing while captures fail or stall,
+        so it is the value to alert on; ``last_lag_seconds`` is the worst-case
+        delay of the changes written by the most recent capture.
+        """
+        watermark_age = None
+        if self._synced_through is not None:
+            watermark_age = round((datetime.utcnow() - self._synced_through).total_seconds(), 3)
+        return {
+            **self._sync_stats,
+            "capture_mode": self._capture_mode,
+            "watermark_age_seconds": watermark_age,
+        }
+
     def get_status(self) -> dict[str, Any]:
         """
         Get current status of the sync service.
@@ -410,7 +713,7 @@ class ChangeDetectionSyncService:
             "enabled": self.enabled,
             "last_sync": self._last_sync.isoformat() if self._last_sync else None,
             "next_sync_in": self._get_next_sync_in(),
-            "stats": self._sync_stats.copy(),  # Return a copy to prevent modification
+            "stats": self.get_stats(),
         }
 
         # Add additional calculated metrics
@@ -0,0 +1,201 @@
+"""
+Dashboard Publisher - Shared computation for live dashboard streams
+Each distinct dashboard config is computed once per tick and fanned out to
+every subscriber; after the first full payload, only changed fields are sent.
+"""
+
+import asyncio
+import json
+import logging
+from collections.abc import AsyncIterator, Awaitable, Callable
+from datetime import datetime
+from typing import Any, Optional
+
+logger = logging.getLogger(__name__)
+
+# Events a subscriber may have pending before it is resynced with a full payload
+DEFAULT_SUBSCRIBER_QUEUE_SIZE = 10
+# Seconds of silence after which a comment line keeps proxies from closing the stream
+DEFAULT_HEARTBEAT_SECONDS = 15.0
+# Keys that change on every computation without the data changing
+VOLATILE_KEYS = frozenset({"generated_at", "generation_time_ms", "timestamp"})
+
+ComputeFn = Callable[[dict[str, Any]], Awaitable[dict[str, Any]]]
+ChangeProbe = Callable[[], Awaitable[Optional[Any]]]
+
+
+def diff_payload(
+    old: dict[str, Any], new: dict[str, Any], ignore: frozenset = VOLATILE_KEYS
+) -> tuple[dict[str, Any], list[str]]:
+    """
+    Changed and removed fields between two JSON-compatible payloads.
+
+    Nested dicts are compared key by key; any other value (including lists)
+    is replaced whole. Returns ``(changes, removed)`` where ``changes`` mirrors
+    the payload's shape and ``removed`` holds dotted paths of deleted keys.
+    """
+    changes: dict[str, Any] = {}
+    removed: list[str] = []
+    for key, value in new.items():
+        if key in ignore:
+            continue
+        if key not in old:
+            changes[key] = value
+        elif isinstance(value, dict) and isinstance(old[key], dict):
+            nested_changes, nested_removed = diff_payload(old[key], value, ignore)
+            if nested_changes:
+                changes[key] = nested_changes
+            removed.extend(f"{key}.{path}" for path in nested_removed)
+        elif value != old[key]:
+            changes[key] = value
+    removed.extend(key for key in old if key not in new and key not in ignore)
+    return changes, removed
+
+
+def _sse(event: dict[str, Any]) -> str:
+    return f"data: {json.dumps(event, separators=(',', ':'))}\n\n"
+
+
+class _Feed:
+    """One distinct dashboard config and everyone watching it."""
+
+    def __init__(self, key: str, params: dict[str, Any]):
+        self.key = key
+        self.params = params
+        # { queue: requested refresh interval }
+        self.subscribers: dict[asyncio.Queue, float] = {}
+        self.payload: Optional[dict[str, Any]] = None
+        self.snapshot: Optional[str] = None
+        self.write_marker: Optional[Any] = None
+        self.task: Optional[asyncio.Task] = None
+
+    @property
+    def interval(self) -> float:
+        return min(self.subscribers.values(), default=DEFAULT_HEARTBEAT_SECONDS)
+
+
+class DashboardPublisher:
+    """
+    Computes dashboard payloads once per config per tick and shares them.
+
+    ``compute`` builds the payload for a config. ``change_probe`` returns a
+    value that changes whenever the underlying data is written (None when
+    unknown); ticks where it is unchanged skip the computation entirely.
+    """
+
+    def __init__(
+        self,
+        compute: ComputeFn,
+        change_probe: Optional[ChangeProbe] = None,
+        subscriber_queue_size: int = DEFAULT_SUBSCRIBER_QUEUE_SIZE,
+        heartbeat_seconds: float = DEFAULT_HEARTBEAT_SECONDS,
+    ):
+        self.compute = compute
+        self.change_probe = change_probe
+        self.subscriber_queue_size = max(1, subscriber_queue_size)
+        self.heartbeat_seconds = heartbeat_seconds
+        self._feeds: dict[str, _Feed] = {}
+        self._stats = {"computations": 0, "skipped_ticks": 0, "deltas": 0, "resyncs": 0}
+
+    async def subscribe(self, params: dict[str, Any], interval: float) -> AsyncIterator[str]:
+        """Yield SSE-formatted events for ``params`` until the consumer goes away."""
+        key = json.dumps(params, sort_keys=True, default=str)
+        feed = self._feeds.get(key)
+        if feed is None:
+            feed = self._feeds[key] = _Feed(key, params)
+
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.subscriber_queue_size)
+        feed.subscribers[queue] = interval
+        if feed.task is None:
+            feed.task = asyncio.create_task(self._run(feed))
+        elif feed.snapshot is not None:
+            # Late joiner: start from the current full payload, deltas follow
+            queue.put_nowait(feed.snapshot)
+
+        try:
+            while True:
+                try:
+                    yield await asyncio.wait_for(queue.get(), timeout=self.heartbeat_seconds)
+                except asyncio.TimeoutError:
+                    yield ": keep-alive\n\n"
+        finally:
+            feed.subscribers.pop(queue, None)
+            if not feed.subscribers:
+                self._feeds.pop(key, None)
+                if feed.task is not None:
+                    feed.task.cancel()
+
+    async def _run(self, feed: _Feed) -> None:
+        while feed.subscribers:
+            try:
+                await self._tick(feed)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Dashboard feed error: {e}")
+                self._offer(
+                    feed,
+                    _sse(
+                        {
+                            "type": "error",
+                            "message": str(e),
+                            "timestamp": datetime.utcnow().isoformat(),
+                        }
+                    ),
+                )
+            await asyncio.sleep(feed.interval)
+
+    async def _tick(self, feed: _Feed) -> None:
+        # Probe before computing: a write during the computation shows up next tick
+        marker = await self._probe()
+        if feed.payload is not None and marker is not None and marker == feed.write_marker:
+            self._stats["skipped_ticks"] += 1
+            return
+
+        payload = await self.compute(feed.params)
+        self._stats["computations"] += 1
+        # Normalize to JSON types so diffs compare what clients actually receive
+        payload = json.loads(json.dumps(payload, default=str))
+        feed.write_marker = marker
+        now = datetime.utcnow().isoformat()
+
+        previous, feed.payload = feed.payload, payload
+        feed.snapshot = _sse({"type": "data", "payload": payload, "timestamp": now})
+        if previous is None:
+            self._offer(feed, feed.snapshot)
+            return
+
+        changes, removed = diff_payload(previous, payload)
+        if changes or removed:
+            self._stats["deltas"] += 1
+            self._offer(
+                feed,
+                _sse({"type": "delta", "changes": changes, "removed": removed, "timestamp": now}),
+            )
+
+    async def _probe(self) -> Optional[Any]:
+        if self.change_probe is None:
+            return None
+        try:
+            return await self.change_probe()
+        except Exception as e:
+            logger.debug(f"Dashboard change probe failed, recomputing: {e}")
+            return None
+
+    def _offer(self, feed: _Feed, event: str) -> None:
+        """Queue an event for every subscriber; ones too far behind get a fresh snapshot."""
+        for queue in list(feed.subscribers):
+            try:
+                queue.put_nowait(event)
+            except asyncio.QueueFull:
+                while not queue.empty():
+                    queue.get_nowait()
+                queue.put_nowait(feed.snapshot or event)
+                self._stats["resyncs"] += 1
+
+    def get_stats(self) -> dict[str, Any]:
+        return {
+            **self._stats,
+            "feeds": len(self._feeds),
+            "subscribers": sum(len(feed.subscribers) for feed in self._feeds.values()),
+        }
@@ -11,6 +11,8 @@ from typing import Any, Optional
 from motor.motor_asyncio import AsyncIOMotorDatabase
 from pydantic import BaseModel, Field
 
+from backend.auth.user_cache import TOKEN_VERSION_FIELD, invalidate_user
+
 logger = logging.getLogger(__name__)
 
 
@@ -339,7 +341,8 @@ class DataGovernanceService:
                 logger.error(f"Erasure failed for {collection_name}: {e}")
                 results[collection_name] = -1
 
-        # Anonymize user record instead of deleting
+        # Anonymize user record instead of deleting, signing the user out everywhere
+        user = await self.db.users.find_one({"_id": subject_id}, {"username": 1})
         await self.db.users.update_one(
             {"_id": subject_id},
             {
@@ -349,9 +352,12 @@ class DataGovernanceService:
                     "full_name": "Deleted User",
                     "deleted_at": datetime.utcnow(),
                     "deletion_request_id": request_id,
-                }
+                },
+                "$inc": {TOKEN_VERSION_FIELD: 1},
             },
         )
+        if user:
+            invalidate_user(user.get("username"))
         results["user_anonymized"] = 1
 
         # Update request status
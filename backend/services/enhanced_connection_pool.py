@@ -311,6 +311,14 @@ class EnhancedSQLServerConnectionPool:
                 return
             self._checked_out.remove(conn_id)
 
+        if self._shutdown:
+            # Pool was closed while this connection was borrowed
+            self._close_quietly(conn)
+            with self._lock:
+                self._created -= 1
+                self._metrics.total_closed += 1
+            return
+
         # Check if connection is still valid before returning
         if self._is_connection_valid(conn):
             try:
@@ -440,7 +448,11 @@ class EnhancedSQLServerConnectionPool:
             }
 
     def close_all(self):
-        """Close all connections in the pool"""
+        """
+        Close all idle connections in the pool
+
+        Connections still checked out are closed when they are returned.
+        """
         self._shutdown = True
         closed_count = 0
 
@@ -453,8 +465,7 @@ class EnhancedSQLServerConnectionPool:
                 pass
 
         with self._lock:
-            self._checked_out.clear()
-            self._created = 0
+            self._created = len(self._checked_out)
             self._metrics.total_closed += closed_count
 
         logger.info(f"Closed {closed_count} connections from pool")
@@ -14,6 +14,8 @@ from typing import Any, Optional
 from motor.motor_asyncio import AsyncIOMotorDatabase
 from pydantic import BaseModel, Field
 
+from backend.services.log_sink import write_log
+
 logger = logging.getLogger(__name__)
 
 
@@ -263,12 +265,17 @@ class EnterpriseAuditService:
             }
 
             # Add hash chain for tamper detection
+            previous_hash = self._last_hash
             if self.enable_hash_chain:
-                entry["previous_hash"] = self._last_hash
-                entry["entry_hash"] = self._compute_hash(entry, self._last_hash)
+                entry["previous_hash"] = previous_hash
+                entry["entry_hash"] = self._compute_hash(entry, previous_hash)
                 self._last_hash = str(entry["entry_hash"])
 
-            result = await self.collection.insert_one(entry)
+            log_id = await write_log(self.collection, entry)
+            if not log_id:
+                # Dropped by the log sink (queued synchronously, so nothing chained on it
+                # yet): keep the chain pointing at the last stored entry
+                self._last_hash = previous_hash
 
             # Log security-critical events
             if severity in [AuditSeverity.ERROR, AuditSeverity.CRITICAL]:
@@ -277,7 +284,7 @@ class EnterpriseAuditService:
                     f"User: {actor_username} - IP: {actor_ip}"
                 )
 
-            return str(result.inserted_id)
+            return log_id
 
         except Exception as e:
             logger.error(f"Failed to create audit log: {e}")
@@ -11,6 +11,8 @@ from typing import Any, Optional
 from motor.motor_asyncio import AsyncIOMotorDatabase
 from pydantic import BaseModel
 
+from backend.services.log_sink import write_log
+
 logger = logging.getLogger(__name__)
 
 
@@ -166,8 +168,7 @@ class ErrorLogService:
                 "resolved": False,
             }
 
-            result = await self.collection.insert_one(log_entry)
-            log_entry["id"] = str(result.inserted_id)
+            log_id = await write_log(self.collection, log_entry)
 
             # Log to application logger based on severity
             log_level = {
@@ -181,13 +182,13 @@ class ErrorLogService:
                 log_level,
                 f"Error logged: {error_type} - {error_message}",
                 extra={
-                    "error_id": str(result.inserted_id),
+                    "error_id": log_id,
                     "endpoint": endpoint,
                     "user": user,
                 },
             )
 
-            return str(result.inserted_id)
+            return log_id
         except Exception as e:
             logger.error(f"Failed to log error: {str(e)}", exc_info=True)
             # Don't raise - error logging failures shouldn't break the app
@@ -0,0 +1,151 @@
+"""
+Hashing Service - runs password/PIN KDF work off the event loop
+bcrypt/argon2 hashes take 100-300ms of CPU each; running them inline in async
+handlers stalls every other request, so all auth paths go through a bounded
+thread pool (both libraries release the GIL while hashing)
+"""
+
+import asyncio
+import functools
+import logging
+import os
+import threading
+import time
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Optional, TypeVar
+
+from backend.exceptions import ServiceOverloadedError
+from backend.utils.auth_utils import get_password_hash, verify_password
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Concurrent KDF computations; argon2 uses 64 MB per hash, so keep this small
+DEFAULT_HASHING_WORKERS = min(4, os.cpu_count() or 1)
+
+# Sheddable calls (logins) are rejected once this many are waiting for a worker
+DEFAULT_HASHING_MAX_QUEUE = 32
+
+# Seconds a rejected client is told to wait before retrying
+SHED_RETRY_AFTER = 2
+
+
+class HashingService:
+    """
+    Bounded executor for password and PIN hashing.
+
+    Every call counts towards the queue depth. Login attempts pass
+    ``shed=True`` and fail fast with ServiceOverloadedError once the queue
+    is full, so a login storm at shift start degrades into quick 503s instead
+    of piling up behind minutes of bcrypt work. Other callers (password
+    changes, admin user management) always wait for a worker.
+    """
+
+    def __init__(
+        self,
+        max_workers: int = DEFAULT_HASHING_WORKERS,
+        max_queue: int = DEFAULT_HASHING_MAX_QUEUE,
+    ):
+        self.max_workers = max(1, max_workers)
+        self.max_queue = max_queue
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._stats = {
+            "submitted": 0,
+            "pending": 0,
+            "peak_queue_depth": 0,
+            "shed": 0,
+            "completed": 0,
+            "wait_time_ms": 0.0,
+            "run_time_ms": 0.0,
+        }
+
+    async def verify(self, plain: str, hashed: str, shed: bool = False) -> bool:
+        """Verify a password or PIN against its stored hash."""
+        return await self.run(verify_password, plain, hashed, shed=shed)
+
+    async def hash(self, plain: str, shed: bool = False) -> str:
+        """Hash a password or PIN with the configured context."""
+        return await self.run(get_password_hash, plain, shed=shed)
+
+    async def run(self, func: Callable[..., T], *args: Any, shed: bool = False, **kwargs: Any) -> T:
+        """Run any blocking KDF call on the hashing pool."""
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            queue_depth = max(0, self._stats["pending"] - self.max_workers)
+            if shed and queue_depth >= self.max_queue:
+                self._stats["shed"] += 1
+                logger.warning(
+                    f"Hashing queue full ({queue_depth} waiting); shedding login attempt"
+                )
+                raise ServiceOverloadedError(
+                    "Too many sign-in attempts in progress. Please retry shortly.",
+                    retry_after=SHED_RETRY_AFTER,
+                )
+            executor = self._get_executor()
+            self._stats["submitted"] += 1
+            self._stats["pending"] += 1
+            self._stats["peak_queue_depth"] = max(
+                self._stats["peak_queue_depth"], self._stats["pending"] - self.max_workers
+            )
+
+        submitted_at = time.perf_counter()
+        try:
+            return await loop.run_in_executor(
+                executor,
+                functools.partial(self._timed, func, submitted_at, *args, **kwargs),
+            )
+        finally:
+            with self._lock:
+                self._stats["pending"] -= 1
+
+    def _timed(self, func: Callable[..., T], submitted_at: float, *args: Any, **kwargs: Any) -> T:
+        started_at = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            finished_at = time.perf_counter()
+            with self._lock:
+                self._stats["completed"] += 1
+                self._stats["wait_time_ms"] += (started_at - submitted_at) * 1000
+                self._stats["run_time_ms"] += (finished_at - started_at) * 1000
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        # Created lazily so the pool comes back after a shutdown/restart cycle
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_workers, thread_name_prefix="hashing"
+            )
+        return self._executor
+
+    def get_stats(self) -> dict[str, Any]:
+        with self._lock:
+            completed = self._stats["completed"]
+            return {
+                "workers": self.max_workers,
+                "max_queue": self.max_queue,
+                "in_flight": min(self._stats["pending"], self.max_workers),
+                "queue_depth": max(0, self._stats["pending"] - self.max_workers),
+                "peak_queue_depth": self._stats["peak_queue_depth"],
+                "submitted": self._stats["submitted"],
+                "completed": completed,
+                "shed": self._stats["shed"],
+                "avg_wait_ms": (
+                    round(self._stats["wait_time_ms"] / completed, 2) if completed else 0.0
+                ),
+                "avg_run_ms": (
+                    round(self._stats["run_time_ms"] / completed, 2) if completed else 0.0
+                ),
+            }
+
+    def shutdown(self, wait: bool = False) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait, cancel_futures=True)
+
+
+# Shared pool for every password/PIN hash and verify made from async code
+hashing_service = HashingService()
@@ -0,0 +1,181 @@
+"""
+Item Lookup Index - in-process barcode / item-code resolution for the scanner hot path
+Maps normalized (trimmed, upper-cased) codes to item codes so a scan resolves
+with a dict lookup plus one exact, indexed MongoDB query instead of a
+case-insensitive $regex scan
+"""
+
+import logging
+import time
+from collections.abc import Iterable
+from datetime import datetime
+from typing import Any, Optional
+
+from motor.motor_asyncio import AsyncIOMotorDatabase
+
+logger = logging.getLogger(__name__)
+
+# Item fields a scanner may send, resolved in this order of precedence
+LOOKUP_FIELDS = (
+    "item_code",
+    "barcode",
+    "manual_barcode",
+    "autobarcode",
+    "unit2_barcode",
+    "unit_m_barcode",
+)
+
+# Seconds a code that matched no item is answered from memory instead of MongoDB
+DEFAULT_MISS_TTL = 30.0
+
+# Remembered misses are capped so scans of random codes cannot grow memory unbounded
+MAX_REMEMBERED_MISSES = 10_000
+
+
+def normalize_lookup_key(value: Any) -> Optional[str]:
+    """Normalize a scanned code; None when there is nothing to index"""
+    if value is None:
+        return None
+    key = str(value).strip().upper()
+    return key or None
+
+
+class ItemLookupIndex:
+    """
+    Normalized code -> item_code map kept in process memory
+
+    Warmed from erp_items at startup and kept current by SQLSyncService
+    writes; misses fall back to MongoDB and are read-repaired by the caller.
+    Codes MongoDB could not resolve either are remembered for ``miss_ttl``
+    seconds, or until an item carrying them is indexed.
+    """
+
+    def __init__(self, miss_ttl: float = DEFAULT_MISS_TTL):
+        self.miss_ttl = miss_ttl
+        self._by_key: dict[str, str] = {}
+        # item_code -> {field: normalized key}, so changed codes can be unindexed
+        self._keys_by_item: dict[str, dict[str, str]] = {}
+        # normalized key -> monotonic expiry of a remembered miss, oldest first
+        self._misses: dict[str, float] = {}
+        self._warmed_at: Optional[datetime] = None
+        self._stats = {"hits": 0, "misses": 0, "known_misses": 0, "lookup_time_ms": 0.0}
+
+    @property
+    def is_warm(self) -> bool:
+        return self._warmed_at is not None
+
+    def resolve(self, code: str) -> Optional[str]:
+        """Resolve a scanned barcode or item code to its item_code"""
+        start = time.perf_counter()
+        item_code = self._by_key.get(normalize_lookup_key(code) or "")
+        self._stats["lookup_time_ms"] += (time.perf_counter() - start) * 1000
+        if item_code is None:
+            self._stats["misses"] += 1
+        else:
+            self._stats["hits"] += 1
+        return item_code
+
+    def is_known_miss(self, code: str) -> bool:
+        """True while ``code`` is remembered as matching no item"""
+        key = normalize_lookup_key(code) or ""
+        expires_at = self._misses.get(key)
+        if expires_at is None:
+            return False
+        if expires_at <= time.monotonic():
+            del self._misses[key]
+            return False
+        self._stats["known_misses"] += 1
+        return True
+
+    def record_miss(self, code: str) -> None:
+        """Remember that ``code`` matched no item in MongoDB"""
+        key = normalize_lookup_key(code)
+        if not key or self.miss_ttl <= 0:
+            return
+        self._misses.pop(key, None)
+        if len(self._misses) >= MAX_REMEMBERED_MISSES:
+            del self._misses[next(iter(self._misses))]
+        self._misses[key] = time.monotonic() + self.miss_ttl
+
+    def index_item(self, item: dict[str, Any]) -> None:
+        """
+        Add or update an item's lookup keys
+
+        Only lookup fields present in ``item`` are touched, so partial
+        documents (e.g. a sync $set) keep the item's other codes indexed.
+        """
+        item_code = item.get("item_code")
+        if not item_code:
+            return
+        item_code = str(item_code)
+        keys = self._keys_by_item.setdefault(item_code, {})
+
+        for field in LOOKUP_FIELDS:
+            if field not in item:
+                continue
+            old_key = keys.pop(field, None)
+            if old_key and self._by_key.get(old_key) == item_code:
+                del self._by_key[old_key]
+            new_key = normalize_lookup_key(item[field])
+            if new_key:
+                keys[field] = new_key
+                self._misses.pop(new_key, None)
+
+        # Re-apply all keys so a field dropped above cannot hide one still in use
+        for field in reversed(LOOKUP_FIELDS):
+            key = keys.get(field)
+            if key and (field == "item_code" or key not in self._by_key):
+                self._by_key[key] = item_code
+
+    def index_items(self, items: Iterable[dict[str, Any]]) -> None:
+        for item in items:
+            self.index_item(item)
+
+    def remove_item(self, item_code: str) -> None:
+        """Drop every lookup key of an item"""
+        item_code = str(item_code)
+        for key in self._keys_by_item.pop(item_code, {}).values():
+            if self._by_key.get(key) == item_code:
+                del self._by_key[key]
+
+    async def warm(self, db: AsyncIOMotorDatabase, batch_size: int = 5000) -> int:
+        """Build the index from erp_items; returns the number of items indexed"""
+        start = time.perf_counter()
+        projection = {"_id": 0, **dict.fromkeys(LOOKUP_FIELDS, 1)}
+        self._by_key, self._keys_by_item = {}, {}
+        count = 0
+        async for item in db.erp_items.find({}, projection).batch_size(batch_size):
+            self.index_item(item)
+            count += 1
+
+        self._warmed_at = datetime.utcnow()
+        logger.info(
+            f"Item lookup index warmed: {count} items, {len(self._by_key)} keys "
+            f"in {(time.perf_counter() - start) * 1000:.0f}ms"
+        )
+        return count
+
+    def clear(self) -> None:
+        self._by_key.clear()
+        self._keys_by_item.clear()
+        self._misses.clear()
+        self._warmed_at = None
+
+    def get_stats(self) -> dict[str, Any]:
+        lookups = self._stats["hits"] + self._stats["misses"]
+        return {
+            "items": len(self._keys_by_item),
+            "keys": len(self._by_key),
+            "hits": self._stats["hits"],
+            "misses": self._stats["misses"],
+            "known_misses": self._stats["known_misses"],
+            "remembered_misses": len(self._misses),
+            "avg_lookup_us": (
+                round(self._stats["lookup_time_ms"] * 1000 / lookups, 3) if lookups else 0.0
+            ),
+            "warmed_at": self._warmed_at.isoformat() if self._warmed_at else None,
+        }
+
+
+# Global instance
+item_lookup_index = ItemLookupIndex()
@@ -0,0 +1,214 @@
+"""
+Item Search Index - in-process n-gram / prefix inverted index over erp_items
+Retrieves search candidates by trigram overlap (substring and typo-tolerant
+matches) or word prefix (short queries) and ranks them before any truncation,
+so results no longer depend on which documents a $regex scan reaches first
+"""
+
+import logging
+import math
+import re
+import time
+from collections import Counter
+from collections.abc import Iterable
+from datetime import datetime
+from typing import Any, Optional
+
+from motor.motor_asyncio import AsyncIOMotorDatabase
+
+logger = logging.getLogger(__name__)
+
+# Item fields covered by the index
+SEARCH_INDEX_FIELDS = ("item_name", "item_code", "barcode")
+
+# Gram size used for substring retrieval; shorter queries use the prefix index
+NGRAM_SIZE = 3
+
+# Share of query grams an item must contain to be a candidate (tolerates typos)
+MIN_GRAM_OVERLAP = 0.5
+
+_TOKEN_SPLIT = re.compile(r"[\W_]+")
+
+
+def normalize_search_text(value: Any) -> str:
+    """Lower-case, trimmed form of a field or query; empty for None"""
+    if value is None:
+        return ""
+    return str(value).strip().lower()
+
+
+def ngrams(text: str, size: int = NGRAM_SIZE) -> set[str]:
+    """Distinct character n-grams of ``text``"""
+    return {text[i : i + size] for i in range(len(text) - size + 1)}
+
+
+def word_prefixes(text: str, size: int = NGRAM_SIZE - 1) -> set[str]:
+    """Leading ``size`` characters of every word in ``text``"""
+    return {token[:size] for token in _TOKEN_SPLIT.split(text) if len(token) >= size}
+
+
+class ItemSearchIndex:
+    """
+    Inverted index from n-grams and word prefixes to item codes
+
+    Keeps only the fields needed for scoring; callers fetch full documents
+    for the page they return. Warmed from erp_items at startup and updated
+    incrementally by SQLSyncService writes.
+    """
+
+    def __init__(self):
+        # item_code -> {field: original value} used for scoring
+        self._docs: dict[str, dict[str, str]] = {}
+        # field -> gram -> item codes
+        self._grams: dict[str, dict[str, set[str]]] = {f: {} for f in SEARCH_INDEX_FIELDS}
+        # field -> word prefix -> item codes
+        self._prefixes: dict[str, dict[str, set[str]]] = {f: {} for f in SEARCH_INDEX_FIELDS}
+        self._warmed_at: Optional[datetime] = None
+        self._stats = {"queries": 0, "candidates": 0, "query_time_ms": 0.0}
+
+    @property
+    def is_warm(self) -> bool:
+        return self._warmed_at is not None
+
+    @staticmethod
+    def _add_postings(postings: dict[str, set[str]], keys: set[str], item_code: str) -> None:
+        for key in keys:
+            postings.setdefault(key, set()).add(item_code)
+
+    @staticmethod
+    def _remove_postings(postings: dict[str, set[str]], keys: set[str], item_code: str) -> None:
+        for key in keys:
+            codes = postings.get(key)
+            if codes is None:
+                continue
+            codes.discard(item_code)
+            if not codes:
+                del postings[key]
+
+    def _unindex_field(self, item_code: str, field: str, value: str) -> None:
+        text = normalize_search_text(value)
+        self._remove_postings(self._grams[field], ngrams(text), item_code)
+        self._remove_postings(self._prefixes[field], word_prefixes(text), item_code)
+
+    def index_item(self, item: dict[str, Any]) -> None:
+        """
+        Add or update an item
+
+        Only indexed fields present in ``item`` are touched, so partial
+        documents (e.g. a sync $set) keep the item's other fields searchable.
+        """
+        item_code = item.get("item_code")
+        if not item_code:
+            return
+        item_code = str(item_code)
+        doc = self._docs.setdefault(item_code, {})
+
+        for field in SEARCH_INDEX_FIELDS:
+            if field not in item:
+                continue
+            value = "" if item[field] is None else str(item[field])
+            old_value = doc.get(field)
+            if old_value == value:
+                continue
+            if old_value:
+                self._unindex_field(item_code, field, old_value)
+            doc[field] = value
+            text = normalize_search_text(value)
+            self._add_postings(self._grams[field], ngrams(text), item_code)
+            self._add_postings(self._prefixes[field], word_prefixes(text), item_code)
+
+        doc.setdefault("item_code", item_code)
+
+    def index_items(self, items: Iterable[dict[str, Any]]) -> None:
+        for item in items:
+            self.index_item(item)
+
+    def remove_item(self, item_code: str) -> None:
+        """Drop an item and all of its postings"""
+        item_code = str(item_code)
+        doc = self._docs.pop(item_code, None)
+        if not doc:
+            return
+        for field, value in doc.items():
+            if field in SEARCH_INDEX_FIELDS and value:
+                self._unindex_field(item_code, field, value)
+
+    def candidates(
+        self, query: str, fields: Optional[Iterable[str]] = None
+    ) -> list[dict[str, str]]:
+        """
+        Items matching ``query``, best gram overlap first
+
+        Queries of at least NGRAM_SIZE characters match on trigram overlap;
+        shorter ones match the start of a word.
+
+        Returns:
+            Scoring documents (item_code plus indexed fields) of every candidate
+        """
+        start = time.perf_counter()
+        text = normalize_search_text(query)
+        fields = [f for f in (fields or SEARCH_INDEX_FIELDS) if f in SEARCH_INDEX_FIELDS]
+
+        if len(text) >= NGRAM_SIZE:
+            keys, indexes = ngrams(text), self._grams
+        else:
+            keys, indexes = {text}, self._prefixes
+        required = max(1, math.ceil(len(keys) * MIN_GRAM_OVERLAP))
+
+        # An item's overlap is its best single field, so grams never add up across fields
+        overlap: dict[str, int] = {}
+        for field in fields:
+            postings = indexes[field]
+            counts: Counter[str] = Counter()
+            for key in keys:
+                counts.update(postings.get(key, ()))
+            for item_code, count in counts.items():
+                if count >= required and count > overlap.get(item_code, 0):
+                    overlap[item_code] = count
+
+        ranked = sorted(overlap, key=lambda code: (-overlap[code], code))
+        self._stats["queries"] += 1
+        self._stats["candidates"] += len(ranked)
+        self._stats["query_time_ms"] += (time.perf_counter() - start) * 1000
+        return [self._docs[code] for code in ranked]
+
+    async def warm(self, db: AsyncIOMotorDatabase, batch_size: int = 5000) -> int:
+        """Build the index from erp_items; returns the number of items indexed"""
+        start = time.perf_counter()
+        projection = {"_id": 0, **dict.fromkeys(SEARCH_INDEX_FIELDS, 1)}
+        self.clear()
+        count = 0
+        async for item in db.erp_items.find({}, projection).batch_size(batch_size):
+            self.index_item(item)
+            count += 1
+
+        self._warmed_at = datetime.utcnow()
+        logger.info(
+            f"Item search index warmed: {count} items, "
+            f"{sum(len(g) for g in self._grams.values())} grams "
+            f"in {(time.perf_counter() - start) * 1000:.0f}ms"
+        )
+        return count
+
+    def clear(self) -> None:
+        self._docs.clear()
+        for field in SEARCH_INDEX_FIELDS:
+            self._grams[field].clear()
+            self._prefixes[field].clear()
+        self._warmed_at = None
+
+    def get_stats(self) -> dict[str, Any]:
+        queries = self._stats["queries"]
+        return {
+            "items": len(self._docs),
+            "grams": sum(len(g) for g in self._grams.values()),
+            "prefixes": sum(len(p) for p in self._prefixes.values()),
+            "queries": queries,
+            "avg_candidates": round(self._stats["candidates"] / queries, 1) if queries else 0.0,
+            "avg_query_ms": (round(self._stats["query_time_ms"] / queries, 3) if queries else 0.0),
+            "warmed_at": self._warmed_at.isoformat() if self._warmed_at else None,
+        }
+
+
+# Global instance
+item_search_index = ItemSearchIndex()
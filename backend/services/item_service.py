@@ -1,9 +1,8 @@
-import asyncio
 import logging
 from typing import Any, Optional
 
 from backend.services.cache.redis_service import RedisCacheService
-from backend.sql_server_connector import SQLServerConnector
+from backend.sql_server_connector import SQLServerConnector, sql_executor
 
 logger = logging.getLogger(__name__)
 
@@ -24,10 +23,9 @@ class EnhancedItemService:
             return cached_item
 
         # Fetch from SQL Server
-        # Run synchronous SQL call in a separate thread to avoid blocking the event loop
+        # Run synchronous SQL call on the realtime lane to avoid blocking the event loop
         try:
-            loop = asyncio.get_event_loop()
-            item = await loop.run_in_executor(None, self.sql_connector.get_item_by_barcode, barcode)
+            item = await sql_executor.run_realtime(self.sql_connector.get_item_by_barcode, barcode)
 
             if item:
                 await self.cache_service.set(cache_key, item, self.CACHE_TTL)
@@ -49,8 +47,7 @@ class EnhancedItemService:
 
         # Fetch from SQL Server
         try:
-            loop = asyncio.get_event_loop()
-            item = await loop.run_in_executor(None, self.sql_connector.get_item_by_code, item_code)
+            item = await sql_executor.run_realtime(self.sql_connector.get_item_by_code, item_code)
 
             if item:
                 await self.cache_service.set(cache_key, item, self.CACHE_TTL)
@@ -0,0 +1,401 @@
+"""
+Item Vector Index - precomputed item embeddings for semantic search
+Embeddings are persisted in the item_embeddings collection and held in one
+contiguous float32 matrix, so a query costs one encode plus a single
+matrix-vector product over the whole catalogue
+"""
+
+import asyncio
+import hashlib
+import logging
+import time
+from collections.abc import Callable
+from datetime import datetime
+from itertools import islice
+from typing import Any, Optional
+
+import numpy as np
+from bson import Binary
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import UpdateOne
+
+from backend.services.ai_search import (
+    EMBEDDING_FIELDS,
+    MODEL_NAME,
+    ai_search_service,
+    embedding_text,
+)
+
+logger = logging.getLogger(__name__)
+
+EMBEDDINGS_COLLECTION = "item_embeddings"
+
+# Texts sent to the encoder per batch while (re-)embedding items
+DEFAULT_ENCODE_BATCH_SIZE = 256
+
+# Rows allocated up front; the matrix doubles when full
+INITIAL_CAPACITY = 1024
+
+Encoder = Callable[[list[str]], Optional[np.ndarray]]
+
+
+def text_hash(text: str) -> str:
+    """Fingerprint of an embedded text, used to detect stale embeddings"""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class ItemVectorIndex:
+    """
+    Item embeddings in a contiguous float32 matrix searched by dot product
+
+    Rows are L2-normalized, so ``matrix @ query`` is cosine similarity.
+    ``load`` restores persisted embeddings and queues items whose text has
+    changed; SQLSyncService queues renamed or recategorized items through
+    ``index_item``; the background loop encodes queued items in batches off
+    the event loop and persists them, and periodically prunes items that
+    have left erp_items.
+    """
+
+    def __init__(
+        self,
+        encoder: Optional[Encoder] = None,
+        model_name: str = MODEL_NAME,
+        refresh_interval: int = 60,
+        prune_interval: int = 3600,
+        batch_size: int = DEFAULT_ENCODE_BATCH_SIZE,
+    ):
+        self.encoder = encoder or ai_search_service.encode_batch
+        self.model_name = model_name
+        self.refresh_interval = refresh_interval
+        self.prune_interval = prune_interval
+        self.batch_size = max(1, batch_size)
+        self.db: Optional[AsyncIOMotorDatabase] = None
+
+        self._matrix: Optional[np.ndarray] = None
+        self._size = 0
+        # Row i of the matrix belongs to _item_codes[i]. Rows are appended in place;
+        # pruning swaps in a compacted copy instead of shifting rows under a search
+        self._item_codes: list[str] = []
+        self._rows: dict[str, int] = {}
+        # item_code -> embedding fields, so partial sync updates rebuild the full text
+        self._fields: dict[str, dict[str, Any]] = {}
+        self._hashes: dict[str, str] = {}
+        # item_code -> text waiting to be encoded
+        self._pending: dict[str, str] = {}
+
+        self._loaded_at: Optional[datetime] = None
+        self._pruned_at = 0.0
+        self._running = False
+        self._task: asyncio.Task = None
+        self._stats = {
+            "queries": 0,
+            "query_time_ms": 0.0,
+            "items_encoded": 0,
+            "items_pruned": 0,
+            "last_refresh": None,
+        }
+
+    @property
+    def is_ready(self) -> bool:
+        """True once at least one item can be searched"""
+        return self._size > 0
+
+    def index_item(self, item: dict[str, Any]) -> None:
+        """
+        Queue an item for re-embedding if its name or category changed
+
+        Only embedding fields present in ``item`` are applied, so partial
+        documents (e.g. a sync $set) keep the item's other fields.
+        """
+        item_code = item.get("item_code")
+        if not item_code or self._loaded_at is None:
+            # Before load, erp_items is read in full anyway
+            return
+        if not any(field in item for field in EMBEDDING_FIELDS):
+            return
+
+        item_code = str(item_code)
+        fields = self._fields.setdefault(item_code, dict.fromkeys(EMBEDDING_FIELDS))
+        fields.update({field: item[field] for field in EMBEDDING_FIELDS if field in item})
+        text = embedding_text(fields)
+        if self._hashes.get(item_code) == text_hash(text):
+            self._pending.pop(item_code, None)
+        else:
+            self._pending[item_code] = text
+
+    async def load(self, db: AsyncIOMotorDatabase, batch_size: int = 5000) -> int:
+        """
+        Restore persisted embeddings for every current item
+
+        Items without an up-to-date embedding are queued for encoding.
+
+        Returns:
+            Number of items restored from the persisted embeddings
+        """
+        start = time.perf_counter()
+        self.db = db
+        persisted: dict[str, dict[str, Any]] = {}
+        cursor = db[EMBEDDINGS_COLLECTION].find(
+            {"model": self.model_name}, {"_id": 0, "item_code": 1, "text_hash": 1, "embedding": 1}
+        )
+        async for doc in cursor.batch_size(batch_size):
+            persisted[doc["item_code"]] = doc
+
+        fields_by_code: dict[str, dict[str, Any]] = {}
+        hashes: dict[str, str] = {}
+        pending: dict[str, str] = {}
+        item_codes: list[str] = []
+        vectors: list[np.ndarray] = []
+        projection = {"_id": 0, "item_code": 1, **dict.fromkeys(EMBEDDING_FIELDS, 1)}
+        async for item in db.erp_items.find({}, projection).batch_size(batch_size):
+            item_code = item.get("item_code")
+            if not item_code:
+                continue
+            item_code = str(item_code)
+            fields = {field: item.get(field) for field in EMBEDDING_FIELDS}
+            fields_by_code[item_code] = fields
+            text = embedding_text(fields)
+            digest = text_hash(text)
+
+            doc = persisted.get(item_code)
+            vector = np.frombuffer(doc["embedding"], dtype=np.float32) if doc else None
+            if (
+                vector is not None
+                and doc.get("text_hash") == digest
+                and (not vectors or vector.shape == vectors[0].shape)
+            ):
+                item_codes.append(item_code)
+                vectors.append(vector)
+                hashes[item_code] = digest
+            else:
+                pending[item_code] = text
+
+        self._matrix = np.vstack(vectors) if vectors else None
+        self._size = len(vectors)
+        self._item_codes = item_codes
+        self._rows = {code: row for row, code in enumerate(item_codes)}
+        self._fields, self._hashes, self._pending = fields_by_code, hashes, pending
+        self._loaded_at = datetime.utcnow()
+        self._pruned_at = time.monotonic()
+
+        orphaned = [code for code in persisted if code not in fields_by_code]
+        if orphaned:
+            await self._delete_embeddings(orphaned)
+
+        logger.info(
+            f"Item vector index loaded: {self._size} embeddings restored, "
+            f"{len(pending)} queued for encoding in {(time.perf_counter() - start) * 1000:.0f}ms"
+        )
+        return self._size
+
+    def _set_row(self, item_code: str, vector: np.ndarray) -> bool:
+        if self._matrix is None:
+            self._matrix = np.zeros((INITIAL_CAPACITY, vector.shape[0]), dtype=np.float32)
+        if vector.shape[0] != self._matrix.shape[1]:
+            logger.warning(
+                f"Embedding for {item_code} has dimension {vector.shape[0]}, "
+                f"expected {self._matrix.shape[1]}; skipped"
+            )
+            return False
+
+        row = self._rows.get(item_code)
+        if row is None:
+            if self._size == self._matrix.shape[0]:
+                grown = np.zeros((self._size * 2, self._matrix.shape[1]), dtype=np.float32)
+                grown[: self._size] = self._matrix[: self._size]
+                self._matrix = grown
+            row = self._size
+            self._item_codes.append(item_code)
+            self._rows[item_code] = row
+            self._size += 1
+        self._matrix[row] = vector
+        return True
+
+    async def _persist(self, batch: list[tuple[str, str, np.ndarray]]) -> None:
+        if self.db is None:
+            return
+        now = datetime.utcnow()
+        operations = [
+            UpdateOne(
+                {"item_code": item_code, "model": self.model_name},
+                {
+                    "$set": {
+                        "text_hash": text_hash(text),
+                        "embedding": Binary(vector.tobytes()),
+                        "dim": int(vector.shape[0]),
+                        "updated_at": now,
+                    }
+                },
+                upsert=True,
+            )
+            for item_code, text, vector in batch
+        ]
+        try:
+            await self.db[EMBEDDINGS_COLLECTION].bulk_write(operations, ordered=False)
+        except Exception as e:
+            # The in-memory index is already current; the next load re-encodes these
+            logger.error(f"Failed to persist {len(operations)} item embeddings: {str(e)}")
+
+    async def _delete_embeddings(self, item_codes: list[str]) -> None:
+        try:
+            await self.db[EMBEDDINGS_COLLECTION].delete_many({"item_code": {"$in": item_codes}})
+        except Exception as e:
+            # Orphaned embeddings are never restored, and the next load retries the delete
+            logger.error(f"Failed to delete {len(item_codes)} item embeddings: {str(e)}")
+
+    def _drop_rows(self, item_codes: list[str]) -> None:
+        rows = [self._rows[code] for code in item_codes if code in self._rows]
+        if not rows:
+            return
+        keep = np.ones(self._size, dtype=bool)
+        keep[rows] = False
+        kept_codes = [code for code, kept in zip(self._item_codes, keep) if kept]
+        # Boolean indexing copies, so a search still holding the old matrix is unaffected
+        self._matrix = self._matrix[: self._size][keep] if kept_codes else None
+        self._item_codes = kept_codes
+        self._rows = {code: row for row, code in enumerate(kept_codes)}
+        self._size = len(kept_codes)
+
+    async def prune(self, batch_size: int = 5000) -> int:
+        """
+        Drop items that are no longer in erp_items
+
+        Their rows leave the matrix and their persisted embeddings are deleted.
+
+        Returns:
+            Number of items removed
+        """
+        if self.db is None or self._loaded_at is None:
+            return 0
+        # Items indexed while erp_items is being read are never pruned by this pass
+        known = set(self._fields) | set(self._rows)
+        current: set[str] = set()
+        async for item in self.db.erp_items.find({}, {"_id": 0, "item_code": 1}).batch_size(
+            batch_size
+        ):
+            if item.get("item_code"):
+                current.add(str(item["item_code"]))
+        self._pruned_at = time.monotonic()
+
+        removed = [code for code in known if code not in current]
+        if not removed:
+            return 0
+        self._drop_rows(removed)
+        for item_code in removed:
+            self._fields.pop(item_code, None)
+            self._hashes.pop(item_code, None)
+            self._pending.pop(item_code, None)
+        await self._delete_embeddings(removed)
+
+        self._stats["items_pruned"] += len(removed)
+        logger.info(f"Item vector index pruned: {len(removed)} items removed")
+        return len(removed)
+
+    async def refresh_pending(self) -> int:
+        """Encode queued items in batches and persist them; returns items encoded"""
+        encoded = 0
+        while self._pending:
+            item_codes = list(islice(self._pending, self.batch_size))
+            texts = [self._pending[code] for code in item_codes]
+            vectors = await asyncio.to_thread(self.encoder, texts)
+            if vectors is None:
+                logger.warning(f"Encoder unavailable; {len(self._pending)} items left queued")
+                break
+
+            batch = []
+            for item_code, text, vector in zip(item_codes, texts, vectors):
+                # An item changed again while encoding stays queued for its new text
+                if self._pending.get(item_code) == text:
+                    del self._pending[item_code]
+                if self._set_row(item_code, vector):
+                    self._hashes[item_code] = text_hash(text)
+                    batch.append((item_code, text, vector))
+            await self._persist(batch)
+            encoded += len(batch)
+
+        if encoded:
+            self._stats["items_encoded"] += encoded
+            self._stats["last_refresh"] = datetime.utcnow().isoformat()
+            logger.info(f"Item vector index refreshed: {encoded} items encoded")
+        return encoded
+
+    def _top_k(
+        self, query: str, matrix: np.ndarray, item_codes: list[str], top_k: int
+    ) -> list[tuple[str, float]]:
+        query_vectors = self.encoder([query])
+        if query_vectors is None:
+            return []
+        scores = matrix @ query_vectors[0]
+        k = min(top_k, scores.shape[0])
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        return [(item_codes[row], float(scores[row])) for row in top]
+
+    async def search(self, query: str, top_k: int = 20) -> list[tuple[str, float]]:
+        """
+        Most similar items across the full catalogue
+
+        Returns:
+            (item_code, cosine similarity) pairs, best first
+        """
+        if not self.is_ready or top_k < 1:
+            return []
+        start = time.perf_counter()
+        # Read together: appends never move rows and pruning replaces both at once
+        matrix, item_codes = self._matrix[: self._size], self._item_codes
+        results = await asyncio.to_thread(self._top_k, query, matrix, item_codes, top_k)
+        self._stats["queries"] += 1
+        self._stats["query_time_ms"] += (time.perf_counter() - start) * 1000
+        return results
+
+    async def _refresh_loop(self):
+        """Background embedding refresh loop"""
+        while self._running:
+            try:
+                await self.refresh_pending()
+                if time.monotonic() - self._pruned_at >= self.prune_interval:
+                    await self.prune()
+            except Exception as e:
+                logger.error(f"Item vector index refresh error: {str(e)}")
+
+            await asyncio.sleep(self.refresh_interval)
+
+    def start(self):
+        """Start background embedding refresh"""
+        if self._running:
+            logger.warning("Item vector index refresh already running")
+            return
+
+        self._running = True
+        self._task = asyncio.create_task(self._refresh_loop())
+        logger.info(f"Item vector index refresh started (interval: {self.refresh_interval}s)")
+
+    async def stop(self):
+        """Stop background embedding refresh"""
+        self._running = False
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        logger.info("Item vector index refresh stopped")
+
+    def get_stats(self) -> dict[str, Any]:
+        queries = self._stats["queries"]
+        return {
+            "items": self._size,
+            "dim": int(self._matrix.shape[1]) if self._matrix is not None else 0,
+            "pending": len(self._pending),
+            "items_encoded": self._stats["items_encoded"],
+            "items_pruned": self._stats["items_pruned"],
+            "queries": queries,
+            "avg_query_ms": (round(self._stats["query_time_ms"] / queries, 3) if queries else 0.0),
+            "last_refresh": self._stats["last_refresh"],
+            "loaded_at": self._loaded_at.isoformat() if self._loaded_at else None,
+            "running": self._running,
+        }
+
+
+# Global instance
+item_vector_index = ItemVectorIndex()
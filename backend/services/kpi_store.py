@@ -0,0 +1,335 @@
+"""
+KPI Store - Materialized admin dashboard KPIs
+Keeps one KPI document up to date with atomic $inc updates from the sync and
+verification write paths, refreshes time-windowed counts on a short interval
+and periodically recomputes everything from source to repair drift
+"""
+
+import asyncio
+import logging
+from datetime import datetime, timedelta
+from typing import Any, Optional
+
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import ReturnDocument
+
+logger = logging.getLogger(__name__)
+
+KPI_DOCUMENT_ID = "admin"
+
+# Counters maintained incrementally by write paths
+INCREMENTAL_KPI_FIELDS = (
+    "total_stock_value",
+    "total_items",
+    "verified_stock_value",
+    "verified_items",
+    "active_sessions",
+    "pending_variances",
+)
+
+# Counts over a sliding time window; no write marks the moment they change
+WINDOWED_KPI_FIELDS = ("active_users", "items_verified_today")
+
+ACTIVE_SESSION_STATUSES = ["active", "in_progress"]
+ACTIVE_USER_WINDOW = timedelta(minutes=30)
+
+# verification_records fields that determine a record's KPI contribution
+VERIFICATION_KPI_PROJECTION = {
+    "_id": 0,
+    "client_record_id": 1,
+    "status": 1,
+    "verified_qty": 1,
+    "price": 1,
+    "variance": 1,
+}
+
+# Stock values are float sums; smaller differences are rounding, not drift
+VALUE_TOLERANCE = 1e-6
+
+
+def verification_record_kpis(record: dict[str, Any]) -> dict[str, Any]:
+    """KPI contribution of a single verification_records document"""
+    status = record.get("status")
+    verified = status == "verified"
+    return {
+        "verified_items": 1 if verified else 0,
+        "verified_stock_value": (
+            (record.get("verified_qty") or 0) * (record.get("price") or 0) if verified else 0
+        ),
+        # Mirrors {"variance": {"$ne": 0}}, which also matches records without a variance
+        "pending_variances": 1 if status == "pending_review" and record.get("variance") != 0 else 0,
+    }
+
+
+def verification_record_delta(
+    previous: Optional[dict[str, Any]], current: dict[str, Any]
+) -> dict[str, Any]:
+    """KPI changes caused by writing ``current`` over ``previous`` (None for an insert)"""
+    after = verification_record_kpis(current)
+    if previous is None:
+        return after
+    before = verification_record_kpis(previous)
+    return {field: after[field] - before[field] for field in after}
+
+
+def merge_deltas(deltas: list[dict[str, Any]]) -> dict[str, Any]:
+    """Sum several KPI deltas into one $inc document"""
+    merged: dict[str, Any] = {}
+    for delta in deltas:
+        for field, value in delta.items():
+            merged[field] = merged.get(field, 0) + value
+    return merged
+
+
+def session_status_delta(
+    previous_status: Optional[str], new_status: Optional[str]
+) -> dict[str, int]:
+    """Active session count change for a session moving between statuses"""
+    step = (new_status in ACTIVE_SESSION_STATUSES) - (previous_status in ACTIVE_SESSION_STATUSES)
+    return {"active_sessions": step} if step else {}
+
+
+async def increment_kpis(db: AsyncIOMotorDatabase, delta: dict[str, Any]) -> None:
+    """Apply a KPI delta with a single atomic $inc"""
+    inc = {field: value for field, value in delta.items() if value}
+    if not inc:
+        return
+    try:
+        await db.dashboard_kpis.update_one(
+            {"_id": KPI_DOCUMENT_ID},
+            {"$inc": inc, "$set": {"updated_at": datetime.utcnow()}},
+            upsert=True,
+        )
+    except Exception as e:
+        # Non-critical: the periodic recompute repairs any drift
+        logger.error(f"Failed to update dashboard KPIs: {str(e)}")
+
+
+async def set_session_status(
+    db: AsyncIOMotorDatabase, session_id: str, fields: dict[str, Any]
+) -> Optional[dict[str, Any]]:
+    """
+    $set ``fields`` (including "status") on one verification session
+
+    The active session count moves by the transition this write actually
+    made, read atomically from the document it replaced, so concurrent
+    status changes cannot both count the same transition. Returns the
+    session as it was before the update, or None if it does not exist.
+    """
+    previous = await db.verification_sessions.find_one_and_update(
+        {"session_id": session_id},
+        {"$set": fields},
+        projection={"status": 1},
+        return_document=ReturnDocument.BEFORE,
+    )
+    if previous is not None:
+        await increment_kpis(db, session_status_delta(previous.get("status"), fields["status"]))
+    return previous
+
+
+async def _sum_stock_value(db: AsyncIOMotorDatabase) -> float:
+    pipeline: list[dict[str, Any]] = [
+        {"$match": {"stock_qty": {"$exists": True}}},
+        {
+            "$group": {
+                "_id": None,
+                "total_value": {"$sum": {"$multiply": ["$stock_qty", {"$ifNull": ["$price", 0]}]}},
+            }
+        },
+    ]
+    result = await db.erp_items.aggregate(pipeline).to_list(1)
+    return result[0]["total_value"] if result else 0.0
+
+
+async def _summarize_verification_records(db: AsyncIOMotorDatabase) -> dict[str, Any]:
+    pipeline: list[dict[str, Any]] = [
+        {"$match": {"status": {"$in": ["verified", "pending_review"]}}},
+        {
+            "$group": {
+                "_id": None,
+                "verified_items": {"$sum": {"$cond": [{"$eq": ["$status", "verified"]}, 1, 0]}},
+                "verified_stock_value": {
+                    "$sum": {
+                        "$cond": [
+                            {"$eq": ["$status", "verified"]},
+                            {"$multiply": ["$verified_qty", {"$ifNull": ["$price", 0]}]},
+                            0,
+                        ]
+                    }
+                },
+                "pending_variances": {
+                    "$sum": {
+                        "$cond": [
+                            {
+                                "$and": [
+                                    {"$eq": ["$status", "pending_review"]},
+                                    {"$ne": ["$variance", 0]},
+                                ]
+                            },
+                            1,
+                            0,
+                        ]
+                    }
+                },
+            }
+        },
+    ]
+    result = await db.verification_records.aggregate(pipeline).to_list(1)
+    summary = result[0] if result else {}
+    return {
+        "verified_items": summary.get("verified_items", 0),
+        "verified_stock_value": summary.get("verified_stock_value") or 0.0,
+        "pending_variances": summary.get("pending_variances", 0),
+    }
+
+
+async def _count_windowed(db: AsyncIOMotorDatabase) -> dict[str, int]:
+    now = datetime.utcnow()
+    today_start = now.replace(hour=0, minute=0, second=0, microsecond=0)
+    active_users, items_verified_today = await asyncio.gather(
+        db.user_presence.count_documents({"last_seen": {"$gte": now - ACTIVE_USER_WINDOW}}),
+        db.verification_records.count_documents(
+            {"created_at": {"$gte": today_start}, "status": "verified"}
+        ),
+    )
+    return {"active_users": active_users, "items_verified_today": items_verified_today}
+
+
+class KPIStore:
+    """
+    Maintains the materialized dashboard KPI document
+
+    Write paths keep the incremental counters current with ``increment_kpis``;
+    this store refreshes the time-windowed counts every ``refresh_interval``
+    seconds and recomputes every counter from source every
+    ``recompute_interval`` seconds (increments racing a recompute are repaired
+    by the next one).
+    """
+
+    def __init__(
+        self, db: AsyncIOMotorDatabase, recompute_interval: int = 600, refresh_interval: int = 30
+    ):
+        self.db = db
+        self.recompute_interval = recompute_interval
+        self.refresh_interval = refresh_interval
+        self._running = False
+        self._task: asyncio.Task = None
+        self._last_recompute: Optional[datetime] = None
+        self._stats = {"recomputes": 0, "refreshes": 0, "drift_repairs": 0, "last_recompute": None}
+
+    @property
+    def collection(self):
+        return self.db.dashboard_kpis
+
+    @staticmethod
+    def _find_drift(current: dict[str, Any], actual: dict[str, Any]) -> list[str]:
+        return [
+            field
+            for field in INCREMENTAL_KPI_FIELDS
+            if abs((current.get(field) or 0) - actual[field]) > VALUE_TOLERANCE
+        ]
+
+    async def recompute(self) -> dict[str, Any]:
+        """Recompute every KPI from source and overwrite the materialized document"""
+        (
+            total_stock_value,
+            total_items,
+            verification,
+            active_sessions,
+            windowed,
+            current,
+        ) = await asyncio.gather(
+            _sum_stock_value(self.db),
+            self.db.erp_items.count_documents({}),
+            _summarize_verification_records(self.db),
+            self.db.verification_sessions.count_documents(
+                {"status": {"$in": ACTIVE_SESSION_STATUSES}}
+            ),
+            _count_windowed(self.db),
+            self.collection.find_one({"_id": KPI_DOCUMENT_ID}),
+        )
+
+        now = datetime.utcnow()
+        kpis = {
+            "total_stock_value": total_stock_value,
+            "total_items": total_items,
+            **verification,
+            "active_sessions": active_sessions,
+            **windowed,
+            "updated_at": now,
+            "recomputed_at": now,
+        }
+        drift = self._find_drift(current, kpis) if current else []
+        if drift:
+            self._stats["drift_repairs"] += 1
+            logger.info(f"Dashboard KPI recompute corrected drifted counters: {drift}")
+
+        await self.collection.update_one({"_id": KPI_DOCUMENT_ID}, {"$set": kpis}, upsert=True)
+        self._last_recompute = now
+        self._stats["recomputes"] += 1
+        self._stats["last_recompute"] = now.isoformat()
+        return kpis
+
+    async def refresh_windowed(self) -> dict[str, int]:
+        """Refresh the counts that change with time rather than with writes"""
+        windowed = await _count_windowed(self.db)
+        await self.collection.update_one(
+            {"_id": KPI_DOCUMENT_ID},
+            {"$set": {**windowed, "updated_at": datetime.utcnow()}},
+            upsert=True,
+        )
+        self._stats["refreshes"] += 1
+        return windowed
+
+    async def get_kpis(self) -> dict[str, Any]:
+        """Read the materialized KPIs, computing them the first time"""
+        kpis = await self.collection.find_one({"_id": KPI_DOCUMENT_ID})
+        if not kpis or "recomputed_at" not in kpis:
+            kpis = await self.recompute()
+        return kpis
+
+    async def _run_once(self) -> None:
+        now = datetime.utcnow()
+        if self._last_recompute is None or (now - self._last_recompute) >= timedelta(
+            seconds=self.recompute_interval
+        ):
+            await self.recompute()
+        else:
+            await self.refresh_windowed()
+
+    async def _refresh_loop(self):
+        """Background refresh loop"""
+        while self._running:
+            try:
+                await self._run_once()
+            except Exception as e:
+                logger.error(f"Dashboard KPI refresh error: {str(e)}")
+
+            await asyncio.sleep(self.refresh_interval)
+
+    def start(self):
+        """Start background refresh"""
+        if self._running:
+            logger.warning("Dashboard KPI refresh already running")
+            return
+
+        self._running = True
+        self._task = asyncio.create_task(self._refresh_loop())
+        logger.info(
+            f"Dashboard KPI refresh started (refresh: {self.refresh_interval}s, "
+            f"recompute: {self.recompute_interval}s)"
+        )
+
+    async def stop(self):
+        """Stop background refresh"""
+        self._running = False
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        logger.info("Dashboard KPI refresh stopped")
+
+    def get_stats(self) -> dict[str, Any]:
+        return dict(self._stats)
@@ -122,6 +122,14 @@ class LockManager:
         lock_key = f"rack:lock:{rack_id}"
         return await self.redis.get(lock_key)
 
+    async def get_rack_lock_owners(self, rack_ids: list[str]) -> dict[str, Optional[str]]:
+        """Get current owners of several rack locks with a single MGET"""
+        unique_ids = list(dict.fromkeys(rack_ids))
+        if not unique_ids:
+            return {}
+        owners = await self.redis.mget(*(f"rack:lock:{rack_id}" for rack_id in unique_ids))
+        return dict(zip(unique_ids, owners))
+
     async def get_rack_lock_ttl(self, rack_id: str) -> int:
         """Get remaining TTL of rack lock (-1 if no expiry, -2 if doesn't exist)"""
         lock_key = f"rack:lock:{rack_id}"
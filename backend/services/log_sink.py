@@ -0,0 +1,158 @@
+"""
+Log Sink - Buffered writer for activity, audit and error logs
+Log documents are queued in memory and written with insert_many once a batch
+fills or the flush interval passes, so logging no longer adds a MongoDB
+round trip to the request that triggered it
+"""
+
+import asyncio
+import logging
+from collections import deque
+from typing import Any, Optional
+
+from bson import ObjectId
+from pymongo.errors import BulkWriteError
+
+from backend.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class LogSink:
+    """
+    Shared in-process queue for append-only log collections
+
+    Documents get their ``_id`` when queued so callers can still return it.
+    At most ``max_buffer_size`` documents are held across all collections;
+    beyond that new documents are dropped and counted rather than letting a
+    slow or unreachable database grow memory without bound. ``stop`` drains
+    whatever is still queued.
+    """
+
+    def __init__(
+        self, batch_size: int = 200, flush_interval: float = 1.0, max_buffer_size: int = 10000
+    ):
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_buffer_size = max_buffer_size
+        # collection name -> (collection, queued documents)
+        self._buffers: dict[str, tuple[Any, deque[dict[str, Any]]]] = {}
+        self._buffered = 0
+        self._running = False
+        self._task: Optional[asyncio.Task] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self._flush_lock = asyncio.Lock()
+        self._stats = {"enqueued": 0, "written": 0, "dropped": 0, "failed": 0, "flushes": 0}
+        self._dropped_by_collection: dict[str, int] = {}
+
+    @property
+    def running(self) -> bool:
+        return self._running
+
+    def enqueue(self, collection: Any, document: dict[str, Any]) -> bool:
+        """Queue a document for ``collection``; False if dropped because the buffer is full"""
+        name = collection.name
+        if self._buffered >= self.max_buffer_size:
+            self._stats["dropped"] += 1
+            self._dropped_by_collection[name] = self._dropped_by_collection.get(name, 0) + 1
+            return False
+
+        document.setdefault("_id", ObjectId())
+        _, queue = self._buffers.setdefault(name, (collection, deque()))
+        queue.append(document)
+        self._buffered += 1
+        self._stats["enqueued"] += 1
+        if len(queue) >= self.batch_size and self._wakeup is not None:
+            self._wakeup.set()
+        return True
+
+    async def _write_batch(self, collection: Any, batch: list[dict[str, Any]]) -> None:
+        try:
+            await collection.insert_many(batch, ordered=False)
+            self._stats["written"] += len(batch)
+        except BulkWriteError as e:
+            # Unordered: everything except the reported documents was written
+            failed = len(e.details.get("writeErrors", []))
+            self._stats["written"] += len(batch) - failed
+            self._stats["failed"] += failed
+            logger.error(f"Failed to write {failed} {collection.name} log entries: {str(e)}")
+        except Exception as e:
+            self._stats["failed"] += len(batch)
+            logger.error(f"Failed to write {len(batch)} {collection.name} log entries: {str(e)}")
+
+    async def flush(self) -> int:
+        """Write every queued document, one insert_many per collection and batch"""
+        written_before = self._stats["written"]
+        async with self._flush_lock:
+            for collection, queue in list(self._buffers.values()):
+                while queue:
+                    batch = [queue.popleft() for _ in range(min(self.batch_size, len(queue)))]
+                    self._buffered -= len(batch)
+                    await self._write_batch(collection, batch)
+            self._stats["flushes"] += 1
+        return self._stats["written"] - written_before
+
+    async def _flush_loop(self):
+        """Background flush loop"""
+        while self._running:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            if self._buffered:
+                try:
+                    await self.flush()
+                except Exception as e:
+                    logger.error(f"Log sink flush error: {str(e)}")
+
+    def start(self):
+        """Start buffering log writes"""
+        if self._running:
+            logger.warning("Log sink already running")
+            return
+
+        self._running = True
+        self._wakeup = asyncio.Event()
+        self._task = asyncio.create_task(self._flush_loop())
+        logger.info(
+            f"Log sink started (batch: {self.batch_size}, interval: {self.flush_interval}s, "
+            f"max buffer: {self.max_buffer_size})"
+        )
+
+    async def stop(self):
+        """Stop buffering and drain the queue; later log writes go straight to MongoDB"""
+        self._running = False
+        if self._task:
+            # Wake the loop and let it finish; cancelling mid-flush would lose the batch in flight
+            self._wakeup.set()
+            await self._task
+            self._task = None
+        await self.flush()
+        logger.info(f"Log sink stopped (written: {self._stats['written']})")
+
+    def get_stats(self) -> dict[str, Any]:
+        return {
+            **self._stats,
+            "buffered": self._buffered,
+            "dropped_by_collection": dict(self._dropped_by_collection),
+        }
+
+
+log_sink = LogSink(
+    batch_size=getattr(settings, "LOG_SINK_BATCH_SIZE", 200),
+    flush_interval=getattr(settings, "LOG_SINK_FLUSH_INTERVAL", 1.0),
+    max_buffer_size=getattr(settings, "LOG_SINK_MAX_BUFFER_SIZE", 10000),
+)
+
+
+async def write_log(collection: Any, document: dict[str, Any]) -> str:
+    """
+    Write a log document through the sink, or directly when it is not running
+
+    Returns the document id, or "" if the sink had to drop it.
+    """
+    if not log_sink.running:
+        result = await collection.insert_one(document)
+        return str(result.inserted_id)
+    return str(document["_id"]) if log_sink.enqueue(collection, document) else ""
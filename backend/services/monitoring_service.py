@@ -5,41 +5,119 @@ Provides Prometheus-compatible metrics
 """
 
 import logging
+import math
 import threading
-from collections import defaultdict, deque
+from collections import deque
 from datetime import datetime, timedelta
 from typing import Any, Optional
 
 logger = logging.getLogger(__name__)
 
+# Latency histogram layout: log-spaced buckets from 0.1ms to ~2 minutes, each
+# 2^(1/8) (~9%) wider than the last, so any percentile is within ~9% of exact
+HISTOGRAM_MIN_SECONDS = 0.0001
+HISTOGRAM_GROWTH = 2 ** (1 / 8)
+HISTOGRAM_BUCKETS = 162
+_INV_LOG_GROWTH = 1 / math.log(HISTOGRAM_GROWTH)
+BUCKET_UPPER_BOUNDS = [
+    HISTOGRAM_MIN_SECONDS * HISTOGRAM_GROWTH**i for i in range(HISTOGRAM_BUCKETS)
+]
+
+# Quantiles reported per route
+QUANTILES = (0.5, 0.95, 0.99)
+
+
+def _bucket_index(duration: float) -> int:
+    if duration <= HISTOGRAM_MIN_SECONDS:
+        return 0
+    index = math.ceil(math.log(duration / HISTOGRAM_MIN_SECONDS) * _INV_LOG_GROWTH)
+    return min(index, HISTOGRAM_BUCKETS - 1)
+
+
+def _escape_label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+class LatencyHistogram:
+    """
+    Fixed-memory latency histogram for one route.
+
+    Each instance is only written by a single thread (see MonitoringService
+    shards), so recording needs no lock.
+    """
+
+    __slots__ = ("counts", "count", "errors", "total", "max")
+
+    def __init__(self):
+        self.counts = [0] * HISTOGRAM_BUCKETS
+        self.count = 0
+        self.errors = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def record(self, duration: float, error: bool = False) -> None:
+        self.counts[_bucket_index(duration)] += 1
+        self.count += 1
+        self.total += duration
+        if duration > self.max:
+            self.max = duration
+        if error:
+            self.errors += 1
+
+    def merge(self, other: "LatencyHistogram") -> None:
+        for i, n in enumerate(other.counts):
+            if n:
+                self.counts[i] += n
+        self.count += other.count
+        self.errors += other.errors
+        self.total += other.total
+        self.max = max(self.max, other.max)
+
+    def percentile(self, q: float) -> float:
+        """Upper bound of the bucket holding the q-th observation, capped at max."""
+        if not self.count:
+            return 0.0
+        rank = max(1, math.ceil(q * self.count))
+        seen = 0
+        for i, n in enumerate(self.counts):
+            seen += n
+            if seen >= rank:
+                return min(BUCKET_UPPER_BOUNDS[i], self.max)
+        return self.max
+
+    def summary(self) -> dict[str, Any]:
+        return {
+            "count": self.count,
+            "errors": self.errors,
+            "total_time": self.total,
+            "avg_time": self.total / self.count if self.count else 0.0,
+            "p50": self.percentile(0.5),
+            "p95": self.percentile(0.95),
+            "p99": self.percentile(0.99),
+            "max": self.max,
+        }
+
 
 class MonitoringService:
     """
     Monitoring service for application metrics
     Tracks requests, errors, performance, and system health
+
+    Request latencies are kept per route template (``GET /api/count-lines/{line_id}``)
+    in fixed-size histograms. Every thread records into its own shard, so the
+    request path never takes a lock; readers merge the shards.
     """
 
     def __init__(self, history_size: int = 1000):
         self.history_size = history_size
 
-        # Metrics
-        self._request_count = 0
-        self._error_count = 0
-        self._total_response_time = 0.0
-        self._request_times: deque = deque(maxlen=history_size)
-
-        # Per-endpoint metrics
-        self._endpoint_metrics: dict[str, dict[str, Any]] = defaultdict(
-            lambda: {
-                "count": 0,
-                "errors": 0,
-                "total_time": 0.0,
-                "avg_time": 0.0,
-            }
-        )
+        # Per-thread shards: { (method, route): LatencyHistogram }
+        self._local = threading.local()
+        self._shards: list[dict[tuple[str, str], LatencyHistogram]] = []
 
         # Error tracking
         self._recent_errors: deque = deque(maxlen=100)
+        self._exception_counts: dict[str, int] = {}
 
         # System health
         self._health_status = {
@@ -49,8 +127,17 @@ class MonitoringService:
             "start_time": datetime.utcnow(),
         }
 
+        # Guards shard registration and error bookkeeping, never request recording
         self._lock = threading.Lock()
 
+    def _shard(self) -> dict[tuple[str, str], LatencyHistogram]:
+        shard = getattr(self._local, "shard", None)
+        if shard is None:
+            shard = self._local.shard = {}
+            with self._lock:
+                self._shards.append(shard)
+        return shard
+
     def track_request(
         self,
         endpoint: str,
@@ -58,142 +145,153 @@ class MonitoringService:
         status_code: int = 200,
         duration: float = 0.0,
     ):
-        """Track API request"""
+        """Track API request; ``endpoint`` should be the route template, not the raw path"""
+        shard = self._shard()
+        key = (method, endpoint)
+        histogram = shard.get(key)
+        if histogram is None:
+            histogram = shard[key] = LatencyHistogram()
+        histogram.record(duration, error=status_code >= 400)
+
+    def _merged(self) -> dict[tuple[str, str], LatencyHistogram]:
+        """Combine every shard into one histogram per route"""
+        merged: dict[tuple[str, str], LatencyHistogram] = {}
         with self._lock:
-            self._request_count += 1
-            self._total_response_time += duration
-            self._request_times.append(
-                {
-                    "endpoint": endpoint,
-                    "method": method,
-                    "status_code": status_code,
-                    "duration": duration,
-                    "timestamp": datetime.utcnow().isoformat(),
-                }
-            )
-
-            # Update endpoint metrics
-            endpoint_key = f"{method} {endpoint}"
-            metrics = self._endpoint_metrics[endpoint_key]
-            metrics["count"] += 1
-            metrics["total_time"] += duration
-            metrics["avg_time"] = metrics["total_time"] / metrics["count"]
-
-            if status_code >= 400:
-                metrics["errors"] += 1
-                self._error_count += 1
+            shards = list(self._shards)
+        for shard in shards:
+            # dict.copy() is atomic under the GIL, unlike iterating a live dict
+            for key, histogram in shard.copy().items():
+                target = merged.get(key)
+                if target is None:
+                    target = merged[key] = LatencyHistogram()
+                target.merge(histogram)
+        return merged
+
+    @staticmethod
+    def _overall(merged: dict[tuple[str, str], LatencyHistogram]) -> LatencyHistogram:
+        overall = LatencyHistogram()
+        for histogram in merged.values():
+            overall.merge(histogram)
+        return overall
 
     def track_error(
         self, endpoint: str, error: Exception, context: dict[str, Optional[Any]] = None
     ):
         """Track error occurrence"""
-        with self._lock:
-            self._error_count += 1
-
-            error_info = {
-                "endpoint": endpoint,
-                "error_type": type(error).__name__,
-                "error_message": str(error),
-                "context": context or {},
-                "timestamp": datetime.utcnow().isoformat(),
-            }
+        error_info = {
+            "endpoint": endpoint,
+            "error_type": type(error).__name__,
+            "error_message": str(error),
+            "context": context or {},
+            "timestamp": datetime.utcnow().isoformat(),
+        }
 
+        with self._lock:
             self._recent_errors.append(error_info)
+            # Unhandled exceptions never produce a response, so track_request doesn't see them
+            self._exception_counts[endpoint] = self._exception_counts.get(endpoint, 0) + 1
 
-            # Update endpoint error count
-            endpoint_key = f"ERROR {endpoint}"
-            if endpoint_key not in self._endpoint_metrics:
-                self._endpoint_metrics[endpoint_key] = {
-                    "count": 0,
-                    "errors": 0,
-                    "total_time": 0.0,
-                    "avg_time": 0.0,
-                }
-            self._endpoint_metrics[endpoint_key]["errors"] += 1
+    def _totals(self, merged: dict[tuple[str, str], LatencyHistogram]) -> dict[str, Any]:
+        overall = self._overall(merged)
+        with self._lock:
+            exceptions = sum(self._exception_counts.values())
+        errors = overall.errors + exceptions
+        return {
+            "overall": overall,
+            "requests": overall.count,
+            "errors": errors,
+            "error_rate": (errors / overall.count) * 100 if overall.count else 0.0,
+        }
+
+    def get_endpoint_metrics(self, endpoint: Optional[str] = None) -> dict[str, dict[str, Any]]:
+        """Per-route latency summaries, optionally limited to routes containing ``endpoint``"""
+        endpoints = {
+            f"{method} {route}": histogram.summary()
+            for (method, route), histogram in sorted(self._merged().items())
+            if endpoint is None or endpoint in route
+        }
+        with self._lock:
+            exception_counts = dict(self._exception_counts)
+        for route, count in exception_counts.items():
+            if endpoint is None or endpoint in route:
+                endpoints[f"ERROR {route}"] = {**LatencyHistogram().summary(), "errors": count}
+        return endpoints
 
     def get_metrics(self) -> dict[str, Any]:
         """Get current metrics"""
-        with self._lock:
-            uptime = (datetime.utcnow() - self._health_status["start_time"]).total_seconds()
-            avg_response_time = (
-                self._total_response_time / self._request_count if self._request_count > 0 else 0.0
-            )
+        uptime = (datetime.utcnow() - self._health_status["start_time"]).total_seconds()
+        totals = self._totals(self._merged())
+        overall = totals["overall"]
 
-            # Calculate p50, p95, p99 response times
-            if self._request_times:
-                sorted_times = sorted([r["duration"] for r in self._request_times], reverse=True)
-                p50_idx = int(len(sorted_times) * 0.5)
-                p95_idx = int(len(sorted_times) * 0.95)
-                p99_idx = int(len(sorted_times) * 0.99)
-
-                p50 = sorted_times[p50_idx] if p50_idx < len(sorted_times) else 0
-                p95 = sorted_times[p95_idx] if p95_idx < len(sorted_times) else 0
-                p99 = sorted_times[p99_idx] if p99_idx < len(sorted_times) else 0
-            else:
-                p50 = p95 = p99 = 0
-
-            error_rate = (
-                (self._error_count / self._request_count) * 100 if self._request_count > 0 else 0.0
-            )
+        with self._lock:
+            recent_errors = list(self._recent_errors)[-10:]  # Last 10 errors
+
+        return {
+            "requests": {
+                "total": totals["requests"],
+                "errors": totals["errors"],
+                "success_rate": 100.0 - totals["error_rate"],
+                "error_rate": totals["error_rate"],
+            },
+            "performance": {
+                "avg_response_time": overall.summary()["avg_time"],
+                "p50": overall.percentile(0.5),
+                "p95": overall.percentile(0.95),
+                "p99": overall.percentile(0.99),
+                "max": overall.max,
+            },
+            "uptime": {
+                "seconds": uptime,
+                "formatted": str(timedelta(seconds=int(uptime))),
+            },
+            "endpoints": self.get_endpoint_metrics(),
+            "recent_errors": recent_errors,
+        }
 
-            return {
-                "requests": {
-                    "total": self._request_count,
-                    "errors": self._error_count,
-                    "success_rate": 100.0 - error_rate,
-                    "error_rate": error_rate,
-                },
-                "performance": {
-                    "avg_response_time": avg_response_time,
-                    "p50": p50,
-                    "p95": p95,
-                    "p99": p99,
-                },
-                "uptime": {
-                    "seconds": uptime,
-                    "formatted": str(timedelta(seconds=int(uptime))),
-                },
-                "endpoints": dict(self._endpoint_metrics),
-                "recent_errors": list(self._recent_errors)[-10:],  # Last 10 errors
-            }
+    def get_stats(self) -> dict[str, Any]:
+        """Compact view for status pages"""
+        merged = self._merged()
+        totals = self._totals(merged)
+        return {
+            "requests": totals["requests"],
+            "errors": totals["errors"],
+            "error_rate": totals["error_rate"],
+            "routes": len(merged),
+            "shards": len(self._shards),
+        }
 
     def get_health(self) -> dict[str, Any]:
         """Get health status"""
-        with self._lock:
-            uptime = (datetime.utcnow() - self._health_status["start_time"]).total_seconds()
-
-            # Determine health status
-            error_rate = (
-                (self._error_count / self._request_count) * 100 if self._request_count > 0 else 0.0
-            )
-
-            if error_rate > 10:
-                status = "degraded"
-            elif error_rate > 5:
-                status = "warning"
-            else:
-                status = "healthy"
-
-            return {
-                "status": status,
-                "uptime": uptime,
-                "start_time": self._health_status["start_time"].isoformat(),
-                "last_check": datetime.utcnow().isoformat(),
-                "metrics": {
-                    "total_requests": self._request_count,
-                    "total_errors": self._error_count,
-                    "error_rate": error_rate,
-                },
-            }
+        uptime = (datetime.utcnow() - self._health_status["start_time"]).total_seconds()
+        totals = self._totals(self._merged())
+        error_rate = totals["error_rate"]
+
+        # Determine health status
+        if error_rate > 10:
+            status = "degraded"
+        elif error_rate > 5:
+            status = "warning"
+        else:
+            status = "healthy"
+
+        return {
+            "status": status,
+            "uptime": uptime,
+            "start_time": self._health_status["start_time"].isoformat(),
+            "last_check": datetime.utcnow().isoformat(),
+            "metrics": {
+                "total_requests": totals["requests"],
+                "total_errors": totals["errors"],
+                "error_rate": error_rate,
+            },
+        }
 
     def reset(self):
         """Reset all metrics"""
         with self._lock:
-            self._request_count = 0
-            self._error_count = 0
-            self._total_response_time = 0.0
-            self._request_times.clear()
-            self._endpoint_metrics.clear()
+            for shard in self._shards:
+                shard.clear()
+            self._exception_counts.clear()
             self._recent_errors.clear()
 
     def get_prometheus_metrics(self) -> str:
@@ -201,67 +299,87 @@ class MonitoringService:
         Get metrics in Prometheus text format
         https://prometheus.io/docs/instrumenting/exposition_formats/
         """
-        with self._lock:
-            lines = []
-
-            # Request count
-            lines.append("# HELP http_requests_total Total number of HTTP requests")
-            lines.append("# TYPE http_requests_total counter")
-            lines.append(f"http_requests_total {self._request_count}")
-            lines.append("")
-
-            # Error count
-            lines.append("# HELP http_requests_errors_total Total number of HTTP errors")
-            lines.append("# TYPE http_requests_errors_total counter")
-            lines.append(f"http_requests_errors_total {self._error_count}")
-            lines.append("")
-
-            # Average response time
-            avg_time = (
-                self._total_response_time / self._request_count if self._request_count > 0 else 0.0
+        merged = self._merged()
+        totals = self._totals(merged)
+        overall = totals["overall"]
+        lines = []
+
+        # Request count
+        lines.append("# HELP http_requests_total Total number of HTTP requests")
+        lines.append("# TYPE http_requests_total counter")
+        lines.append(f"http_requests_total {totals['requests']}")
+        lines.append("")
+
+        # Error count
+        lines.append("# HELP http_requests_errors_total Total number of HTTP errors")
+        lines.append("# TYPE http_requests_errors_total counter")
+        lines.append(f"http_requests_errors_total {totals['errors']}")
+        lines.append("")
+
+        # Average response time
+        avg_time = overall.total / overall.count if overall.count else 0.0
+        lines.append("# HELP http_request_duration_seconds Average HTTP request duration")
+        lines.append("# TYPE http_request_duration_seconds gauge")
+        lines.append(f"http_request_duration_seconds {avg_time:.6f}")
+        lines.append("")
+
+        routes = sorted(merged.items())
+
+        # Per-endpoint metrics
+        lines.append("# HELP http_requests_by_endpoint_total Requests by endpoint")
+        lines.append("# TYPE http_requests_by_endpoint_total counter")
+        for (method, route), histogram in routes:
+            safe_endpoint = _escape_label(f"{method} {route}")
+            lines.append(
+                f'http_requests_by_endpoint_total{{endpoint="{safe_endpoint}"}} {histogram.count}'
             )
-            lines.append("# HELP http_request_duration_seconds Average HTTP request duration")
-            lines.append("# TYPE http_request_duration_seconds gauge")
-            lines.append(f"http_request_duration_seconds {avg_time:.6f}")
-            lines.append("")
-
-            # Per-endpoint metrics
-            lines.append("# HELP http_requests_by_endpoint_total Requests by endpoint")
-            lines.append("# TYPE http_requests_by_endpoint_total counter")
-            for endpoint, metrics in self._endpoint_metrics.items():
-                # Escape labels
-                safe_endpoint = endpoint.replace('"', '\\"')
-                lines.append(
-                    f'http_requests_by_endpoint_total{{endpoint="{safe_endpoint}"}} {metrics["count"]}'
-                )
-            lines.append("")
+        lines.append("")
 
+        lines.append(
+            "# HELP http_request_duration_by_endpoint_seconds Average duration by endpoint"
+        )
+        lines.append("# TYPE http_request_duration_by_endpoint_seconds gauge")
+        for (method, route), histogram in routes:
+            safe_endpoint = _escape_label(f"{method} {route}")
+            avg = histogram.total / histogram.count if histogram.count else 0.0
             lines.append(
-                "# HELP http_request_duration_by_endpoint_seconds Average duration by endpoint"
+                f'http_request_duration_by_endpoint_seconds{{endpoint="{safe_endpoint}"}} {avg:.6f}'
             )
-            lines.append("# TYPE http_request_duration_by_endpoint_seconds gauge")
-            for endpoint, metrics in self._endpoint_metrics.items():
-                safe_endpoint = endpoint.replace('"', '\\"')
+        lines.append("")
+
+        # Latency quantiles per route template
+        lines.append("# HELP http_request_latency_seconds Request latency by route")
+        lines.append("# TYPE http_request_latency_seconds summary")
+        for (method, route), histogram in routes:
+            labels = f'method="{_escape_label(method)}",route="{_escape_label(route)}"'
+            for q in QUANTILES:
                 lines.append(
-                    f'http_request_duration_by_endpoint_seconds{{endpoint="{safe_endpoint}"}} {metrics["avg_time"]:.6f}'
+                    f'http_request_latency_seconds{{{labels},quantile="{q}"}} '
+                    f"{histogram.percentile(q):.6f}"
                 )
-            lines.append("")
-
-            # Uptime
-            uptime = (datetime.utcnow() - self._health_status["start_time"]).total_seconds()
-            lines.append("# HELP app_uptime_seconds Application uptime in seconds")
-            lines.append("# TYPE app_uptime_seconds counter")
-            lines.append(f"app_uptime_seconds {uptime:.0f}")
-            lines.append("")
-
-            # Error rate
-            error_rate = (
-                (self._error_count / self._request_count) if self._request_count > 0 else 0.0
-            )
-            lines.append("# HELP http_error_rate Error rate (errors/requests)")
-            lines.append("# TYPE http_error_rate gauge")
-            lines.append(f"http_error_rate {error_rate:.6f}")
-            lines.append("")
-
-            return "\n".join(lines)
-            # unreachable code removed
+            lines.append(f"http_request_latency_seconds_sum{{{labels}}} {histogram.total:.6f}")
+            lines.append(f"http_request_latency_seconds_count{{{labels}}} {histogram.count}")
+        lines.append("")
+
+        lines.append("# HELP http_request_latency_max_seconds Slowest request by route")
+        lines.append("# TYPE http_request_latency_max_seconds gauge")
+        for (method, route), histogram in routes:
+            labels = f'method="{_escape_label(method)}",route="{_escape_label(route)}"'
+            lines.append(f"http_request_latency_max_seconds{{{labels}}} {histogram.max:.6f}")
+        lines.append("")
+
+        # Uptime
+        uptime = (datetime.utcnow() - self._health_status["start_time"]).total_seconds()
+        lines.append("# HELP app_uptime_seconds Application uptime in seconds")
+        lines.append("# TYPE app_uptime_seconds counter")
+        lines.append(f"app_uptime_seconds {uptime:.0f}")
+        lines.append("")
+
+        # Error rate
+        error_rate = totals["error_rate"] / 100
+        lines.append("# HELP http_error_rate Error rate (errors/requests)")
+        lines.append("# TYPE http_error_rate gauge")
+        lines.append(f"http_error_rate {error_rate:.6f}")
+        lines.append("")
+
+        return "\n".join(lines)
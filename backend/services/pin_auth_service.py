@@ -10,6 +10,8 @@ from typing import Any
 from motor.motor_asyncio import AsyncIOMotorDatabase
 from passlib.context import CryptContext
 
+from backend.services.hashing_service import hashing_service
+
 logger = logging.getLogger(__name__)
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
@@ -48,7 +50,7 @@ class PINAuthService:
             if not self._validate_pin_format(pin):
                 raise ValueError("PIN must be 4-6 digits")
 
-            hashed_pin = pwd_context.hash(pin)
+            hashed_pin = await hashing_service.run(pwd_context.hash, pin)
 
             await self.collection.update_one(
                 {"user_id": user_id},
@@ -104,7 +106,7 @@ class PINAuthService:
                     )
 
             # Verify PIN
-            if pwd_context.verify(pin, pin_record.get("pin_hash", "")):
+            if await hashing_service.run(pwd_context.verify, pin, pin_record.get("pin_hash", "")):
                 # Reset failed attempts
                 await self.collection.update_one(
                     {"user_id": user_id},
@@ -11,6 +11,33 @@ from typing import Any, Optional
 
 logger = logging.getLogger(__name__)
 
+# Atomic token bucket: refill by elapsed time, take one token if available.
+# KEYS[1] bucket hash; ARGV: tokens/second, burst, now (seconds), ttl (ms)
+TOKEN_BUCKET_LUA = """
+local rate = tonumber(ARGV[1])
+local burst = tonumber(ARGV[2])
+local now = tonumber(ARGV[3])
+local bucket = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(bucket[1])
+local ts = tonumber(bucket[2])
+if tokens == nil or ts == nil then
+    tokens = burst
+    ts = now
+end
+tokens = math.min(burst, tokens + math.max(0, now - ts) * rate)
+local allowed = 0
+if tokens >= 1 then
+    tokens = tokens - 1
+    allowed = 1
+end
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'ts', tostring(now))
+redis.call('PEXPIRE', KEYS[1], ARGV[4])
+return {allowed, tostring(tokens)}
+"""
+
+# Locally remembered denials kept before expired ones are pruned
+_MAX_LOCAL_DENIALS = 10000
+
 
 class RateLimiter:
     """
@@ -156,6 +183,128 @@ class RateLimiter:
             }
 
 
+class DistributedRateLimiter:
+    """
+    Token bucket rate limiter shared by all workers through Redis
+
+    Each check runs TOKEN_BUCKET_LUA atomically, so N workers enforce one
+    limit instead of N. A denied key is remembered locally until its next
+    token is due, and repeat requests are rejected without a Redis round
+    trip. Until Redis is attached, or if it fails, checks fall back to a
+    per-process RateLimiter.
+    """
+
+    def __init__(
+        self,
+        default_rate: int = 100,  # requests per minute
+        default_burst: int = 20,  # burst allowance
+        per_user: bool = True,
+        per_endpoint: bool = False,
+        key_prefix: str = "ratelimit",
+        redis_client: Optional[Any] = None,
+    ):
+        self.default_rate = default_rate
+        self.default_burst = default_burst
+        self.key_prefix = key_prefix
+        self._local = RateLimiter(
+            default_rate=default_rate,
+            default_burst=default_burst,
+            per_user=per_user,
+            per_endpoint=per_endpoint,
+        )
+        self._redis: Optional[Any] = None
+        self._script: Optional[Any] = None
+        # bucket key -> monotonic time its next token is due (asyncio only, no lock)
+        self._denied_until: dict[str, float] = {}
+        self._stats = {"redis_checks": 0, "local_denials": 0, "fallbacks": 0}
+        if redis_client is not None:
+            self.attach_redis(redis_client)
+
+    def attach_redis(self, redis_client: Any) -> None:
+        """Use a Redis client (or anything with register_script) as shared state"""
+        self._redis = redis_client
+        self._script = redis_client.register_script(TOKEN_BUCKET_LUA)
+        logger.info(f"Rate limiter '{self.key_prefix}' using shared Redis buckets")
+
+    def detach_redis(self) -> None:
+        self._redis = None
+        self._script = None
+
+    async def is_allowed(
+        self,
+        user_id: Optional[str] = None,
+        endpoint: Optional[str] = None,
+        rate: Optional[int] = None,
+        burst: Optional[int] = None,
+    ) -> tuple[bool, dict[str, Any]]:
+        """
+        Check if request is allowed
+        Returns the same (is_allowed, info_dict) shape as RateLimiter.is_allowed
+        """
+        rate_limit = rate or self.default_rate
+        burst_limit = burst or self.default_burst
+        bucket_key = self._local._get_bucket_key(user_id, endpoint)
+
+        # Lock-free pre-check: no Redis call while this key is known to be empty
+        now = time.monotonic()
+        denied_until = self._denied_until.get(bucket_key)
+        if denied_until is not None:
+            if now < denied_until:
+                self._stats["local_denials"] += 1
+                return False, self._denied_info(rate_limit, burst_limit, 0.0, denied_until - now)
+            del self._denied_until[bucket_key]
+
+        if self._script is None:
+            return self._local.is_allowed(user_id, endpoint, rate, burst)
+
+        per_second = rate_limit / 60.0
+        ttl_ms = int(burst_limit / per_second * 1000) + 1000
+        try:
+            self._stats["redis_checks"] += 1
+            allowed, tokens = await self._script(
+                keys=[f"{self.key_prefix}:{bucket_key}"],
+                args=[per_second, burst_limit, time.time(), ttl_ms],
+            )
+        except Exception as e:
+            self._stats["fallbacks"] += 1
+            logger.warning(f"Shared rate limit check failed, using local bucket: {e}")
+            return self._local.is_allowed(user_id, endpoint, rate, burst)
+
+        tokens = float(tokens)
+        if int(allowed):
+            return True, {
+                "allowed": True,
+                "remaining": int(tokens),
+                "limit": rate_limit,
+                "reset_in": int((60.0 / rate_limit) * (burst_limit - tokens)),
+            }
+
+        wait = (1.0 - tokens) / per_second
+        if len(self._denied_until) >= _MAX_LOCAL_DENIALS:
+            self._denied_until = {k: t for k, t in self._denied_until.items() if t > now}
+        self._denied_until[bucket_key] = now + wait
+        return False, self._denied_info(rate_limit, burst_limit, tokens, wait)
+
+    @staticmethod
+    def _denied_info(rate: int, burst: int, tokens: float, wait: float) -> dict[str, Any]:
+        return {
+            "allowed": False,
+            "remaining": 0,
+            "limit": rate,
+            "reset_in": int((60.0 / rate) * (burst - tokens)),
+            "retry_after": int(max(1, wait + 0.999)),
+        }
+
+    def get_stats(self) -> dict[str, Any]:
+        """Get rate limiter statistics"""
+        return {
+            **self._stats,
+            "shared": self._script is not None,
+            "locally_denied_keys": len(self._denied_until),
+            "local_fallback": self._local.get_stats(),
+        }
+
+
 class ConcurrentRequestHandler:
     """
     Handle concurrent requests with queue management
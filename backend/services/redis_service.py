@@ -124,6 +124,10 @@ class RedisService:
         """Get value by key"""
         return await self.client.get(key)
 
+    async def mget(self, *keys: str) -> list[Optional[str]]:
+        """Get values for several keys in one round-trip"""
+        return await self.client.mget(*keys)  # type: ignore
+
     async def set(
         self,
         key: str,
@@ -11,6 +11,7 @@ from typing import Any, Optional
 from motor.motor_asyncio import AsyncIOMotorDatabase
 
 from backend.auth.jwt_provider import jwt
+from backend.auth.user_cache import TOKEN_VERSION_CLAIM, token_version_of
 
 logger = logging.getLogger(__name__)
 
@@ -32,9 +33,11 @@ class RefreshTokenService:
 
     def create_access_token(self, data: dict[str, Any]) -> str:
         """Create a short-lived access token"""
-        expire = datetime.utcnow() + self.access_token_expiry
+        issued_at = datetime.utcnow()
         to_encode = data.copy()
-        to_encode.update({"exp": expire, "type": "access"})
+        to_encode.update(
+            {"exp": issued_at + self.access_token_expiry, "iat": issued_at, "type": "access"}
+        )
         return jwt.encode(to_encode, self.secret_key, algorithm=self.algorithm)
 
     def create_refresh_token(self, data: dict[str, Any]) -> str:
@@ -199,8 +202,16 @@ class RefreshTokenService:
                     f"Failed to fetch user profile for refresh response: {str(fetch_error)}"
                 )
 
+        token_version = payload.get(TOKEN_VERSION_CLAIM, 0)
+        if user_profile and token_version_of(user_profile) != token_version:
+            # The user's sessions were revoked after this refresh token was issued
+            logger.warning("Refresh token predates a session revocation")
+            await self.revoke_token(refresh_token)
+            return None
+
         # Rotate refresh token (issue new one, store it, revoke old one)
-        new_refresh_token = self.create_refresh_token({"sub": username, "role": role})
+        claims = {"sub": username, "role": role, TOKEN_VERSION_CLAIM: token_version}
+        new_refresh_token = self.create_refresh_token(claims)
         new_refresh_expires_at = datetime.utcnow() + self.refresh_token_expiry
         if username:
             await self.store_refresh_token(
@@ -211,7 +222,7 @@ class RefreshTokenService:
         await self.revoke_token(refresh_token)
 
         # Create new access token
-        access_token = self.create_access_token({"sub": username, "role": role})
+        access_token = self.create_access_token(claims)
 
         expires_in_seconds = int(self.access_token_expiry.total_seconds())
 
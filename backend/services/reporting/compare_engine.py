@@ -5,10 +5,41 @@ Identifies differences, trends, and changes
 
 import logging
 import time
+from collections.abc import AsyncIterator
 from typing import Any, Optional
 
+from backend.services.reporting.snapshot_engine import SnapshotEngine
+
 logger = logging.getLogger(__name__)
 
+# Rows of each kind (added/removed/changed) kept in the comparison result
+ROW_DIFF_SAMPLE_SIZE = 100
+
+_EXHAUSTED = object()
+
+
+async def _last_per_key(
+    pairs: AsyncIterator[tuple[str, dict]],
+) -> AsyncIterator[tuple[str, dict]]:
+    """Collapse runs of equal keys to their last row (later rows win)."""
+    current: Any = _EXHAUSTED
+    async for key, row in pairs:
+        if current is not _EXHAUSTED and key != current[0]:
+            yield current
+        current = (key, row)
+    if current is not _EXHAUSTED:
+        yield current
+
+
+async def _next_entry(
+    entries: AsyncIterator[tuple[str, dict]],
+) -> Optional[tuple[str, dict]]:
+    """Next (key, row) pair, or None once the iterator is exhausted."""
+    try:
+        return await entries.__anext__()
+    except StopAsyncIteration:
+        return None
+
 
 class CompareEngine:
     """
@@ -17,6 +48,7 @@ class CompareEngine:
 
     def __init__(self, db):
         self.db = db
+        self.snapshot_engine = SnapshotEngine(db)
 
     async def compare_snapshots(
         self,
@@ -38,8 +70,8 @@ class CompareEngine:
             Comparison report
         """
         # Get snapshots
-        snapshot_a = await self.db.report_snapshots.find_one({"snapshot_id": snapshot_a_id})
-        snapshot_b = await self.db.report_snapshots.find_one({"snapshot_id": snapshot_b_id})
+        snapshot_a = await self.snapshot_engine.get_snapshot(snapshot_a_id)
+        snapshot_b = await self.snapshot_engine.get_snapshot(snapshot_b_id)
 
         if not snapshot_a:
             raise ValueError(f"Snapshot {snapshot_a_id} not found")
@@ -49,16 +81,19 @@ class CompareEngine:
         # Verify compatible snapshots (same collection and group_by)
         if snapshot_a["collection"] != snapshot_b["collection"]:
             raise ValueError("Snapshots must be from the same collection")
+        group_by_a = (snapshot_a.get("query_spec") or {}).get("group_by") or []
+        group_by_b = (snapshot_b.get("query_spec") or {}).get("group_by") or []
+        if group_by_a != group_by_b:
+            raise ValueError("Snapshots must use the same group_by")
 
         # Perform comparison
         start_time = time.time()
 
         comparison = {
             "summary_diff": self._compare_summaries(snapshot_a["summary"], snapshot_b["summary"]),
-            "row_diff": self._compare_rows(
-                snapshot_a.get("row_data", []),
-                snapshot_b.get("row_data", []),
-                snapshot_a.get("query_spec", {}).get("group_by", []),
+            "row_diff": await self._compare_rows(
+                self.snapshot_engine.iter_rows_by_key(snapshot_a),
+                self.snapshot_engine.iter_rows_by_key(snapshot_b),
             ),
             "metadata": {
                 "snapshot_a": {
@@ -140,77 +175,67 @@ class CompareEngine:
 
         return diff
 
-    def _compare_rows(
-        self, rows_a: list[dict], rows_b: list[dict], group_by: list[str]
+    async def _compare_rows(
+        self,
+        rows_a: AsyncIterator[tuple[str, dict]],
+        rows_b: AsyncIterator[tuple[str, dict]],
     ) -> dict[str, Any]:
         """
         Compare row-level data
+
+        Both inputs are (key, row) pairs sorted by key; they are merge-joined
+        so only the current row of each side is held in memory.
         """
-        # Create lookup dictionaries
-        lookup_a = self._create_row_lookup(rows_a, group_by)
-        lookup_b = self._create_row_lookup(rows_b, group_by)
-
-        # Find differences
-        added = []
-        removed = []
-        changed = []
-
-        # Check for added and changed
-        for key, row_b in lookup_b.items():
-            if key not in lookup_a:
-                added.append(row_b)
+        added: list[dict] = []
+        removed: list[dict] = []
+        changed: list[dict] = []
+        counts = {"added": 0, "removed": 0, "changed": 0, "unchanged": 0}
+
+        iter_a = _last_per_key(rows_a).__aiter__()
+        iter_b = _last_per_key(rows_b).__aiter__()
+        entry_a = await _next_entry(iter_a)
+        entry_b = await _next_entry(iter_b)
+
+        while entry_a is not None or entry_b is not None:
+            if entry_b is None or (entry_a is not None and entry_a[0] < entry_b[0]):
+                counts["removed"] += 1
+                if len(removed) < ROW_DIFF_SAMPLE_SIZE:
+                    removed.append(entry_a[1])
+                entry_a = await _next_entry(iter_a)
+            elif entry_a is None or entry_b[0] < entry_a[0]:
+                counts["added"] += 1
+                if len(added) < ROW_DIFF_SAMPLE_SIZE:
+                    added.append(entry_b[1])
+                entry_b = await _next_entry(iter_b)
             else:
-                row_a = lookup_a[key]
+                key, row_a = entry_a
+                row_b = entry_b[1]
                 if row_a != row_b:
-                    changed.append(
-                        {
-                            "key": key,
-                            "baseline": row_a,
-                            "comparison": row_b,
-                            "diff": self._calculate_row_diff(row_a, row_b),
-                        }
-                    )
-
-        # Check for removed
-        for key, row_a in lookup_a.items():
-            if key not in lookup_b:
-                removed.append(row_a)
+                    counts["changed"] += 1
+                    if len(changed) < ROW_DIFF_SAMPLE_SIZE:
+                        changed.append(
+                            {
+                                "key": key,
+                                "baseline": row_a,
+                                "comparison": row_b,
+                                "diff": self._calculate_row_diff(row_a, row_b),
+                            }
+                        )
+                else:
+                    counts["unchanged"] += 1
+                entry_a = await _next_entry(iter_a)
+                entry_b = await _next_entry(iter_b)
 
         return {
-            "added_count": len(added),
-            "removed_count": len(removed),
-            "changed_count": len(changed),
-            "unchanged_count": len(lookup_a) - len(removed) - len(changed),
-            "added": added[:100],  # Limit to first 100
-            "removed": removed[:100],
-            "changed": changed[:100],
+            "added_count": counts["added"],
+            "removed_count": counts["removed"],
+            "changed_count": counts["changed"],
+            "unchanged_count": counts["unchanged"],
+            "added": added,  # Limited to first ROW_DIFF_SAMPLE_SIZE
+            "removed": removed,
+            "changed": changed,
         }
 
-    def _create_row_lookup(self, rows: list[dict], group_by: list[str]) -> dict[str, dict]:
-        """
-        Create lookup dictionary keyed by group_by fields
-        """
-        lookup = {}
-
-        for row in rows:
-            # Create key from group_by fields
-            if group_by:
-                if "_id" in row and isinstance(row["_id"], dict):
-                    # Grouped data
-                    key_parts = [str(row["_id"].get(field, "")) for field in group_by]
-                else:
-                    # Ungrouped data
-                    key_parts = [str(row.get(field, "")) for field in group_by]
-
-                key = "|".join(key_parts)
-            else:
-                # No grouping, use entire row as key
-                key = str(row)
-
-            lookup[key] = row
-
-        return lookup
-
     def _calculate_row_diff(self, row_a: dict, row_b: dict) -> dict[str, Any]:
         """
         Calculate differences between two rows
@@ -3,17 +3,131 @@ Export Engine - Export snapshots to various formats
 Supports CSV, XLSX, and PDF exports
 """
 
+import asyncio
 import csv
 import io
 import logging
+import tempfile
+import zlib
+from collections.abc import AsyncIterable, AsyncIterator, Callable, Iterable
 from datetime import datetime
-from typing import TYPE_CHECKING, Any
+from typing import TYPE_CHECKING, Any, Optional, Union
 
 if TYPE_CHECKING:
     from openpyxl.worksheet.worksheet import Worksheet
 
 logger = logging.getLogger(__name__)
 
+# Bytes buffered before a streamed export yields a chunk to the response
+STREAM_CHUNK_SIZE = 64 * 1024
+
+Rows = Union[Iterable[dict[str, Any]], AsyncIterable[dict[str, Any]]]
+
+
+async def _aiter_rows(rows: Rows) -> AsyncIterator[dict[str, Any]]:
+    """Iterate plain or async row sources uniformly."""
+    if isinstance(rows, AsyncIterable):
+        async for row in rows:
+            yield row
+    else:
+        for row in rows:
+            yield row
+
+
+async def stream_csv(
+    rows: Rows,
+    headers: Optional[list[str]] = None,
+    preamble: Iterable[list[Any]] = (),
+    format_value: Callable[[Any], Any] = lambda value: value,
+    chunk_size: int = STREAM_CHUNK_SIZE,
+) -> AsyncIterator[bytes]:
+    """
+    Encode rows as CSV, yielding UTF-8 chunks of roughly chunk_size bytes.
+
+    Headers default to the keys of the first row. Only the current chunk is
+    held in memory, so any number of rows can be exported.
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for line in preamble:
+        writer.writerow(line)
+
+    async for row in _aiter_rows(rows):
+        if headers is None:
+            headers = list(row.keys())
+            writer.writerow(headers)
+        writer.writerow([format_value(row.get(h, "")) for h in headers])
+        if buffer.tell() >= chunk_size:
+            yield buffer.getvalue().encode("utf-8")
+            buffer.seek(0)
+            buffer.truncate(0)
+
+    if buffer.tell():
+        yield buffer.getvalue().encode("utf-8")
+
+
+async def stream_xlsx(
+    rows: Rows,
+    title: str = "Report",
+    headers: Optional[list[str]] = None,
+    preamble: Iterable[list[Any]] = (),
+    format_value: Callable[[Any], Any] = lambda value: value,
+    chunk_size: int = STREAM_CHUNK_SIZE,
+) -> AsyncIterator[bytes]:
+    """
+    Encode rows as an XLSX workbook built in openpyxl write-only mode.
+
+    Rows are flushed to a temporary file as they arrive; the finished
+    workbook is then read back in chunk_size pieces.
+
+    Requires: openpyxl
+    """
+    try:
+        from openpyxl import Workbook
+        from openpyxl.cell import WriteOnlyCell
+        from openpyxl.styles import Font
+    except ImportError:
+        raise ImportError("openpyxl is required for XLSX export")
+
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet(title=title[:31])
+    bold = Font(bold=True)
+
+    for line in preamble:
+        ws.append(line)
+
+    def header_row(names: list[str]) -> list[Any]:
+        cells = []
+        for name in names:
+            cell = WriteOnlyCell(ws, value=name)
+            cell.font = bold
+            cells.append(cell)
+        return cells
+
+    if headers is not None:
+        ws.append(header_row(headers))
+    async for row in _aiter_rows(rows):
+        if headers is None:
+            headers = list(row.keys())
+            ws.append(header_row(headers))
+        ws.append([format_value(row.get(h)) for h in headers])
+
+    with tempfile.TemporaryFile() as output:
+        await asyncio.to_thread(wb.save, output)
+        output.seek(0)
+        while chunk := output.read(chunk_size):
+            yield chunk
+
+
+async def gzip_stream(chunks: AsyncIterable[bytes], level: int = 6) -> AsyncIterator[bytes]:
+    """Gzip-compress a byte stream incrementally."""
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    async for chunk in chunks:
+        compressed = compressor.compress(chunk)
+        if compressed:
+            yield compressed
+    yield compressor.flush()
+
 
 def _xlsx_write_metadata(ws: "Worksheet", snapshot: dict[str, Any]) -> int:
     """Write metadata section to worksheet, return next row number."""
@@ -170,6 +284,59 @@ class ExportEngine:
         logger.info(f"✓ XLSX export created: {len(row_data)} rows")
         return xlsx_bytes
 
+    def _snapshot_preamble(
+        self, snapshot: dict[str, Any], include_summary: bool
+    ) -> list[list[Any]]:
+        """Metadata (and optional summary) rows written above snapshot data."""
+        lines: list[list[Any]] = [
+            ["Snapshot Report"],
+            ["Name:", snapshot.get("name", "Untitled")],
+            ["Created:", datetime.fromtimestamp(snapshot["created_at"]).isoformat()],
+            ["Created By:", snapshot.get("created_by", "Unknown")],
+            [],
+        ]
+        if include_summary and snapshot.get("summary"):
+            lines.append(["Summary"])
+            lines.extend([key, value] for key, value in snapshot["summary"].items())
+            lines.append([])
+        return lines
+
+    def stream_csv(
+        self,
+        snapshot: dict[str, Any],
+        rows: Optional[Rows] = None,
+        include_summary: bool = True,
+    ) -> AsyncIterator[bytes]:
+        """
+        Stream snapshot as CSV chunks
+
+        Args:
+            snapshot: Snapshot document
+            rows: Row source; defaults to the snapshot's row_data
+            include_summary: Include summary at top
+        """
+        return stream_csv(
+            snapshot.get("row_data", []) if rows is None else rows,
+            preamble=self._snapshot_preamble(snapshot, include_summary),
+        )
+
+    def stream_xlsx(
+        self,
+        snapshot: dict[str, Any],
+        rows: Optional[Rows] = None,
+        include_summary: bool = True,
+    ) -> AsyncIterator[bytes]:
+        """
+        Stream snapshot as XLSX (write-only workbook)
+
+        Requires: openpyxl
+        """
+        return stream_xlsx(
+            snapshot.get("row_data", []) if rows is None else rows,
+            title="Report",
+            preamble=self._snapshot_preamble(snapshot, include_summary),
+        )
+
     def export_to_json(self, snapshot: dict[str, Any]) -> bytes:
         """
         Export snapshot to JSON
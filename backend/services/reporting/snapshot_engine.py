@@ -5,12 +5,61 @@ Enables point-in-time reporting and comparisons
 
 import logging
 import time
+import uuid
+from collections.abc import AsyncIterator
 from typing import Any, Optional, cast
 
 from backend.services.reporting.query_builder import QueryBuilder
 
 logger = logging.getLogger(__name__)
 
+# Rows per report_snapshot_rows page document
+SNAPSHOT_PAGE_SIZE = 500
+
+
+def snapshot_row_key(row: dict[str, Any], group_by: Optional[list[str]]) -> str:
+    """Key identifying a snapshot row across snapshots of the same query."""
+    if not group_by:
+        # No grouping, use entire row as key
+        return str(row)
+    if "_id" in row and isinstance(row["_id"], dict):
+        # Grouped data
+        return "|".join(str(row["_id"].get(field, "")) for field in group_by)
+    # Ungrouped data
+    return "|".join(str(row.get(field, "")) for field in group_by)
+
+
+class _SummaryAccumulator:
+    """Running summary statistics, fed one row at a time."""
+
+    def __init__(self, aggregations: Optional[dict] = None):
+        self.aggregations = aggregations or {}
+        self.total_rows = 0
+        self._sums: dict[str, float] = {}
+        self._counts: dict[str, int] = {}
+
+    def add(self, row: dict[str, Any]) -> None:
+        self.total_rows += 1
+        for field, func in self.aggregations.items():
+            agg_field = f"{field}_{func}"
+            if func == "avg" and agg_field not in row:
+                continue
+            self._sums[field] = self._sums.get(field, 0) + row.get(agg_field, 0)
+            self._counts[field] = self._counts.get(field, 0) + 1
+
+    def result(self) -> dict[str, Any]:
+        if not self.total_rows:
+            return {"total_rows": 0}
+
+        summary: dict[str, Any] = {"total_rows": self.total_rows}
+        for field, func in self.aggregations.items():
+            if func in ("sum", "count"):
+                summary[f"total_{field}"] = self._sums.get(field, 0)
+            elif func == "avg":
+                count = self._counts.get(field, 0)
+                summary[f"avg_{field}"] = self._sums.get(field, 0) / count if count else 0
+        return summary
+
 
 class SnapshotEngine:
     """
@@ -61,19 +110,39 @@ class SnapshotEngine:
             limit=limit,
         )
 
-        # Execute query
-        start_time = time.time()
-        cursor = self.db[collection].aggregate(pipeline)
-        results = await cursor.to_list(length=10000)
-        execution_time = (time.time() - start_time) * 1000
-
-        # Calculate summary statistics
-        summary = self._calculate_summary(results, aggregations)
-
         # Generate snapshot ID and hash
-        snapshot_id = f"snapshot_{int(time.time())}_{created_by}"
+        # The random suffix keeps snapshots created in the same second apart
+        snapshot_id = f"snapshot_{int(time.time())}_{created_by}_{uuid.uuid4().hex}"
         query_hash = self.query_builder.generate_query_hash(query_spec)
 
+        # Execute query, writing rows to report_snapshot_rows page by page
+        start_time = time.time()
+        summary = _SummaryAccumulator(aggregations)
+        page: list[dict[str, Any]] = []
+        page_count = 0
+
+        cursor = self.db[collection].aggregate(pipeline, allowDiskUse=True)
+        try:
+            async for row in cursor:
+                summary.add(row)
+                page.append({"key": snapshot_row_key(row, group_by), "row": row})
+                if len(page) >= SNAPSHOT_PAGE_SIZE:
+                    await self._write_page(snapshot_id, page_count, page)
+                    page_count += 1
+                    page = []
+            if page:
+                await self._write_page(snapshot_id, page_count, page)
+                page_count += 1
+        except BaseException:
+            # Only remove the pages this run managed to insert
+            if page_count:
+                await self.db.report_snapshot_rows.delete_many(
+                    {"snapshot_id": snapshot_id, "page": {"$lt": page_count}}
+                )
+            raise
+        execution_time = (time.time() - start_time) * 1000
+        row_count = summary.total_rows
+
         # Create snapshot document
         snapshot = {
             "snapshot_id": snapshot_id,
@@ -83,9 +152,10 @@ class SnapshotEngine:
             "query_spec": query_spec,
             "query_hash": query_hash,
             "collection": collection,
-            "summary": summary,
-            "row_count": len(results),
-            "row_data": results,
+            "summary": summary.result(),
+            "row_count": row_count,
+            "page_size": SNAPSHOT_PAGE_SIZE,
+            "page_count": page_count,
             "execution_time_ms": execution_time,
             "created_by": created_by,
             "created_at": time.time(),
@@ -95,18 +165,68 @@ class SnapshotEngine:
         # Save to database
         await self.db.report_snapshots.insert_one(snapshot)
 
-        logger.info(
-            f"✓ Snapshot created: {snapshot_id} ({len(results)} rows, {execution_time:.2f}ms)"
-        )
+        logger.info(f"✓ Snapshot created: {snapshot_id} ({row_count} rows, {execution_time:.2f}ms)")
 
         # Return without row_data for response (too large)
         snapshot_response = {**snapshot}
-        snapshot_response["row_data"] = f"[{len(results)} rows]"
+        snapshot_response["row_data"] = f"[{row_count} rows]"
 
         return snapshot_response
 
+    async def _write_page(self, snapshot_id: str, page: int, entries: list[dict[str, Any]]) -> None:
+        """Store one page of keyed snapshot rows"""
+        await self.db.report_snapshot_rows.insert_one(
+            {"snapshot_id": snapshot_id, "page": page, "rows": entries}
+        )
+
+    async def iter_rows(self, snapshot: dict[str, Any]) -> AsyncIterator[dict[str, Any]]:
+        """
+        Yield snapshot rows in query order, one page in memory at a time
+
+        Snapshots created before paged storage still embed row_data.
+        """
+        if "row_data" in snapshot:
+            for row in snapshot["row_data"]:
+                yield row
+            return
+
+        cursor = self.db.report_snapshot_rows.find(
+            {"snapshot_id": snapshot["snapshot_id"]}, {"rows": 1}
+        ).sort("page", 1)
+        async for page in cursor:
+            for entry in page["rows"]:
+                yield entry["row"]
+
+    async def iter_rows_by_key(
+        self, snapshot: dict[str, Any]
+    ) -> AsyncIterator[tuple[str, dict[str, Any]]]:
+        """
+        Yield (key, row) pairs ordered by row key, for merge-joining snapshots
+
+        Rows sharing a key come out in query order. Sorting happens
+        server-side, spilling to disk if needed.
+        """
+        group_by = (snapshot.get("query_spec") or {}).get("group_by")
+
+        if "row_data" in snapshot:
+            keyed = [(snapshot_row_key(row, group_by), row) for row in snapshot["row_data"]]
+            keyed.sort(key=lambda pair: pair[0])
+            for pair in keyed:
+                yield pair
+            return
+
+        pipeline = [
+            {"$match": {"snapshot_id": snapshot["snapshot_id"]}},
+            {"$unwind": {"path": "$rows", "includeArrayIndex": "position"}},
+            {"$sort": {"rows.key": 1, "page": 1, "position": 1}},
+            {"$project": {"_id": 0, "key": "$rows.key", "row": "$rows.row"}},
+        ]
+        cursor = self.db.report_snapshot_rows.aggregate(pipeline, allowDiskUse=True)
+        async for entry in cursor:
+            yield entry["key"], entry["row"]
+
     async def get_snapshot(self, snapshot_id: str) -> dict[str, Optional[Any]]:
-        """Get snapshot by ID"""
+        """Get snapshot metadata by ID (rows are read via iter_rows)"""
         snapshot = await self.db.report_snapshots.find_one({"snapshot_id": snapshot_id})
         return snapshot
 
@@ -164,6 +284,7 @@ class SnapshotEngine:
             raise PermissionError("Only snapshot creator can delete")
 
         result = await self.db.report_snapshots.delete_one({"snapshot_id": snapshot_id})
+        await self.db.report_snapshot_rows.delete_many({"snapshot_id": snapshot_id})
 
         if result.deleted_count > 0:
             logger.info(f"✓ Snapshot deleted: {snapshot_id}")
@@ -177,56 +298,64 @@ class SnapshotEngine:
         """
         Get snapshot data with pagination
         """
-        snapshot = await self.db.report_snapshots.find_one({"snapshot_id": snapshot_id})
+        # Legacy snapshots embed row_data; only fetch the requested slice of it
+        snapshot = await self.db.report_snapshots.find_one(
+            {"snapshot_id": snapshot_id}, {"row_data": {"$slice": [skip, limit]}}
+        )
 
         if not snapshot:
             return None
 
-        # Paginate row_data
-        row_data = snapshot.get("row_data", [])
-        paginated_data = row_data[skip : skip + limit]
+        total = snapshot.get("row_count", 0)
+        if "row_data" in snapshot:
+            paginated_data = snapshot["row_data"]
+        else:
+            paginated_data = await self._read_row_range(snapshot, skip, limit)
 
         return {
             "snapshot_id": snapshot_id,
             "name": snapshot["name"],
             "summary": snapshot["summary"],
-            "row_count": len(row_data),
+            "row_count": total,
             "rows": paginated_data,
             "pagination": {
                 "skip": skip,
                 "limit": limit,
-                "total": len(row_data),
-                "has_more": (skip + limit) < len(row_data),
+                "total": total,
+                "has_more": (skip + limit) < total,
             },
         }
 
+    async def _read_row_range(
+        self, snapshot: dict[str, Any], skip: int, limit: int
+    ) -> list[dict[str, Any]]:
+        """Load only the pages covering rows [skip, skip + limit)"""
+        page_size = snapshot.get("page_size", SNAPSHOT_PAGE_SIZE)
+        first_page = skip // page_size
+        last_page = (skip + limit - 1) // page_size
+
+        cursor = self.db.report_snapshot_rows.find(
+            {
+                "snapshot_id": snapshot["snapshot_id"],
+                "page": {"$gte": first_page, "$lte": last_page},
+            },
+            {"rows": 1},
+        ).sort("page", 1)
+
+        rows = [entry["row"] async for page in cursor for entry in page["rows"]]
+        offset = skip - first_page * page_size
+        return rows[offset : offset + limit]
+
     def _calculate_summary(
         self, results: list[dict], aggregations: Optional[dict] = None
     ) -> dict[str, Any]:
         """
         Calculate summary statistics from results
         """
-        if not results:
-            return {"total_rows": 0}
-
-        summary = {"total_rows": len(results)}
-
-        # If aggregations were used, extract totals
-        if aggregations:
-            for field, func in aggregations.items():
-                agg_field = f"{field}_{func}"
-
-                if func == "sum":
-                    total = sum(r.get(agg_field, 0) for r in results)
-                    summary[f"total_{field}"] = total
-                elif func == "avg":
-                    values = [r.get(agg_field, 0) for r in results if agg_field in r]
-                    summary[f"avg_{field}"] = sum(values) / len(values) if values else 0
-                elif func == "count":
-                    total = sum(r.get(agg_field, 0) for r in results)
-                    summary[f"total_{field}"] = total
-
-        return summary
+        accumulator = _SummaryAccumulator(aggregations)
+        for row in results:
+            accumulator.add(row)
+        return accumulator.result()
 
     async def refresh_snapshot(self, snapshot_id: str) -> dict[str, Any]:
         """
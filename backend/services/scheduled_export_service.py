@@ -4,20 +4,27 @@ Automated periodic exports of data to CSV/Excel
 """
 
 import asyncio
-import csv
-import io
+import json
 import logging
+import zlib
+from collections.abc import AsyncIterator
 from datetime import datetime, timedelta, timezone
 from enum import Enum
 from typing import Any, Optional
 
 from bson import ObjectId
-from motor.motor_asyncio import AsyncIOMotorDatabase
+from motor.motor_asyncio import AsyncIOMotorDatabase, AsyncIOMotorGridFSBucket
+
+from backend.services.reporting.export_engine import gzip_stream, stream_csv
 
 UTC = timezone.utc
 
 logger = logging.getLogger(__name__)
 
+# GridFS bucket holding gzip-compressed export payloads
+EXPORT_FILES_BUCKET = "export_files"
+EXPORT_ROW_LIMIT = 10000
+
 
 class ExportFrequency(str, Enum):
     DAILY = "daily"
@@ -37,6 +44,14 @@ class ScheduledExportService:
         self.db = db
         self._running = False
         self._task: asyncio.Task = None
+        self._fs: Optional[AsyncIOMotorGridFSBucket] = None
+
+    @property
+    def fs(self) -> AsyncIOMotorGridFSBucket:
+        """GridFS bucket for export payloads, created on first use."""
+        if self._fs is None:
+            self._fs = AsyncIOMotorGridFSBucket(self.db, bucket_name=EXPORT_FILES_BUCKET)
+        return self._fs
 
     async def create_export_schedule(
         self,
@@ -110,42 +125,59 @@ class ScheduledExportService:
             filters = schedule.get("filters", {})
             format_type = ExportFormat(schedule["format"])
 
-            # Generate export data based on type
+            # Generate export rows based on type
             if export_type == "sessions":
-                data = await self._export_sessions(filters)
+                rows = self._export_sessions(filters)
             elif export_type == "count_lines":
-                data = await self._export_count_lines(filters)
+                rows = self._export_count_lines(filters)
             elif export_type == "variance_report":
-                data = await self._export_variance_report(filters)
+                rows = self._export_variance_report(filters)
             elif export_type == "activity_logs":
-                data = await self._export_activity_logs(filters)
+                rows = self._export_activity_logs(filters)
             else:
                 raise ValueError(f"Unknown export type: {export_type}")
 
-            # Format data
+            # Stream rows -> encoded file -> gzip -> GridFS
+            counts = {"row_count": 0, "size_bytes": 0}
+            rows = self._count_rows(rows, counts)
             if format_type == ExportFormat.CSV:
-                file_content = self._format_as_csv(data)
+                body = stream_csv(rows)
                 file_extension = "csv"
             else:
-                import json
-
-                file_content = json.dumps(data, indent=2, default=str)
+                body = self._format_as_json(rows)
                 file_extension = "json"
 
+            created_at = datetime.now(UTC)
+            filename = (
+                f"{schedule['name']}_{created_at.strftime('%Y%m%d_%H%M%S')}.{file_extension}.gz"
+            )
+            file_id, stored_bytes = await self._store_export_file(
+                filename,
+                gzip_stream(self._count_bytes(body, counts)),
+                metadata={"export_type": export_type, "format": format_type.value},
+            )
+
             # Store export result
             export_doc = {
                 "schedule_id": schedule.get("_id") or schedule.get("id"),
                 "schedule_name": schedule["name"],
                 "export_type": export_type,
                 "format": format_type.value,
-                "file_content": file_content,
+                "file_id": file_id,
                 "file_extension": file_extension,
-                "row_count": len(data),
-                "created_at": datetime.now(UTC),
-                "size_bytes": len(file_content.encode("utf-8")),
+                "compression": "gzip",
+                "row_count": counts["row_count"],
+                "created_at": created_at,
+                "size_bytes": counts["size_bytes"],
+                "stored_bytes": stored_bytes,
             }
 
-            result = await self.db.export_results.insert_one(export_doc)
+            try:
+                result = await self.db.export_results.insert_one(export_doc)
+            except Exception:
+                # Nothing references the stored file without its result document
+                await self._delete_export_file(file_id)
+                raise
             export_id = str(result.inserted_id)
 
             # Update schedule last_run and next_run
@@ -163,13 +195,13 @@ class ScheduledExportService:
                 },
             )
 
-            logger.info(f"Export completed: {schedule['name']} - {len(data)} rows")
+            logger.info(f"Export completed: {schedule['name']} - {counts['row_count']} rows")
 
             return {
                 "success": True,
                 "export_id": export_id,
-                "row_count": len(data),
-                "size_bytes": export_doc["size_bytes"],
+                "row_count": counts["row_count"],
+                "size_bytes": counts["size_bytes"],
             }
 
         except Exception as e:
@@ -183,7 +215,75 @@ class ScheduledExportService:
 
             return {"success": False, "error": str(e)}
 
-    async def _export_sessions(self, filters: dict[str, Any]) -> list[dict]:
+    async def _store_export_file(
+        self, filename: str, chunks: AsyncIterator[bytes], metadata: dict[str, Any]
+    ) -> tuple[ObjectId, int]:
+        """Write a byte stream to GridFS, returning the file id and stored size"""
+        grid_in = self.fs.open_upload_stream(filename, metadata=metadata)
+        stored_bytes = 0
+        try:
+            async for chunk in chunks:
+                await grid_in.write(chunk)
+                stored_bytes += len(chunk)
+        except BaseException:
+            await grid_in.abort()
+            raise
+        await grid_in.close()
+        return grid_in._id, stored_bytes
+
+    async def _delete_export_file(self, file_id: ObjectId) -> None:
+        """Remove a stored export payload; failures are logged, not raised"""
+        try:
+            await self.fs.delete(file_id)
+        except Exception as e:
+            logger.error(f"Failed to delete orphaned export file {file_id}: {str(e)}")
+
+    async def open_export_result(self, result: dict[str, Any]) -> AsyncIterator[bytes]:
+        """
+        Open an export result's payload as a decompressed chunk stream.
+
+        Results written before GridFS storage keep their payload inline in
+        file_content. Raises gridfs.errors.NoFile if the stored file is gone.
+        """
+        if not result.get("file_id"):
+            return self._iter_inline_content(result.get("file_content", ""))
+
+        grid_out = await self.fs.open_download_stream(result["file_id"])
+        return self._iter_export_file(grid_out)
+
+    @staticmethod
+    async def _iter_inline_content(content: str) -> AsyncIterator[bytes]:
+        if content:
+            yield content.encode("utf-8")
+
+    @staticmethod
+    async def _iter_export_file(grid_out: Any) -> AsyncIterator[bytes]:
+        decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+        while chunk := await grid_out.readchunk():
+            data = decompressor.decompress(chunk)
+            if data:
+                yield data
+        tail = decompressor.flush()
+        if tail:
+            yield tail
+
+    @staticmethod
+    async def _count_rows(
+        rows: AsyncIterator[dict[str, Any]], counts: dict[str, int]
+    ) -> AsyncIterator[dict[str, Any]]:
+        async for row in rows:
+            counts["row_count"] += 1
+            yield row
+
+    @staticmethod
+    async def _count_bytes(
+        chunks: AsyncIterator[bytes], counts: dict[str, int]
+    ) -> AsyncIterator[bytes]:
+        async for chunk in chunks:
+            counts["size_bytes"] += len(chunk)
+            yield chunk
+
+    async def _export_sessions(self, filters: dict[str, Any]) -> AsyncIterator[dict]:
         """Export sessions data"""
         query = {}
 
@@ -195,29 +295,23 @@ class ScheduledExportService:
         if "end_date" in filters:
             query.setdefault("start_time", {})["$lte"] = datetime.fromisoformat(filters["end_date"])
 
-        cursor = self.db.sessions.find(query).sort("start_time", -1)
-        sessions = await cursor.to_list(length=10000)
+        cursor = self.db.sessions.find(query).sort("start_time", -1).limit(EXPORT_ROW_LIMIT)
 
         # Format for export
-        export_data = []
-        for session in sessions:
-            export_data.append(
-                {
-                    "session_id": str(session["_id"]),
-                    "warehouse": session.get("warehouse"),
-                    "staff_user": session.get("staff_user"),
-                    "staff_name": session.get("staff_name"),
-                    "status": session.get("status"),
-                    "start_time": session.get("start_time"),
-                    "end_time": session.get("end_time"),
-                    "items_counted": session.get("items_counted", 0),
-                    "total_variance": session.get("total_variance", 0.0),
-                }
-            )
-
-        return export_data
+        async for session in cursor:
+            yield {
+                "session_id": str(session["_id"]),
+                "warehouse": session.get("warehouse"),
+                "staff_user": session.get("staff_user"),
+                "staff_name": session.get("staff_name"),
+                "status": session.get("status"),
+                "start_time": session.get("start_time"),
+                "end_time": session.get("end_time"),
+                "items_counted": session.get("items_counted", 0),
+                "total_variance": session.get("total_variance", 0.0),
+            }
 
-    async def _export_count_lines(self, filters: dict[str, Any]) -> list[dict]:
+    async def _export_count_lines(self, filters: dict[str, Any]) -> AsyncIterator[dict]:
         """Export count lines data"""
         query = {}
 
@@ -226,30 +320,24 @@ class ScheduledExportService:
         if "has_variance" in filters and filters["has_variance"]:
             query["variance"] = {"$ne": 0}
 
-        cursor = self.db.count_lines.find(query).sort("created_at", -1)
-        lines = await cursor.to_list(length=10000)
-
-        export_data = []
-        for line in lines:
-            export_data.append(
-                {
-                    "line_id": str(line["_id"]),
-                    "session_id": line.get("session_id"),
-                    "item_code": line.get("item_code"),
-                    "item_name": line.get("item_name"),
-                    "barcode": line.get("barcode"),
-                    "system_stock": line.get("system_stock", 0),
-                    "counted_qty": line.get("counted_qty", 0),
-                    "variance": line.get("variance", 0),
-                    "variance_reason": line.get("variance_reason"),
-                    "counted_by": line.get("counted_by"),
-                    "counted_at": line.get("counted_at"),
-                }
-            )
-
-        return export_data
+        cursor = self.db.count_lines.find(query).sort("created_at", -1).limit(EXPORT_ROW_LIMIT)
+
+        async for line in cursor:
+            yield {
+                "line_id": str(line["_id"]),
+                "session_id": line.get("session_id"),
+                "item_code": line.get("item_code"),
+                "item_name": line.get("item_name"),
+                "barcode": line.get("barcode"),
+                "system_stock": line.get("system_stock", 0),
+                "counted_qty": line.get("counted_qty", 0),
+                "variance": line.get("variance", 0),
+                "variance_reason": line.get("variance_reason"),
+                "counted_by": line.get("counted_by"),
+                "counted_at": line.get("counted_at"),
+            }
 
-    async def _export_variance_report(self, filters: dict[str, Any]) -> list[dict]:
+    async def _export_variance_report(self, filters: dict[str, Any]) -> AsyncIterator[dict]:
         """Export variance summary report"""
         # Aggregate variance data
         pipeline = [
@@ -264,25 +352,19 @@ class ScheduledExportService:
                 }
             },
             {"$sort": {"total_variance": -1}},
+            {"$limit": EXPORT_ROW_LIMIT},
         ]
 
-        results = await self.db.count_lines.aggregate(pipeline).to_list(length=10000)
-
-        export_data = []
-        for result in results:
-            export_data.append(
-                {
-                    "item_code": result["_id"],
-                    "item_name": result.get("item_name"),
-                    "total_variance": result.get("total_variance", 0),
-                    "occurrences": result.get("occurrences", 0),
-                    "last_counted": result.get("last_counted"),
-                }
-            )
-
-        return export_data
+        async for result in self.db.count_lines.aggregate(pipeline, allowDiskUse=True):
+            yield {
+                "item_code": result["_id"],
+                "item_name": result.get("item_name"),
+                "total_variance": result.get("total_variance", 0),
+                "occurrences": result.get("occurrences", 0),
+                "last_counted": result.get("last_counted"),
+            }
 
-    async def _export_activity_logs(self, filters: dict[str, Any]) -> list[dict]:
+    async def _export_activity_logs(self, filters: dict[str, Any]) -> AsyncIterator[dict]:
         """Export activity logs"""
         query = {}
 
@@ -293,41 +375,28 @@ class ScheduledExportService:
         if "start_date" in filters:
             query["timestamp"] = {"$gte": datetime.fromisoformat(filters["start_date"])}
 
-        cursor = self.db.activity_logs.find(query).sort("timestamp", -1)
-        logs = await cursor.to_list(length=10000)
-
-        export_data = []
-        for log in logs:
-            export_data.append(
-                {
-                    "timestamp": log.get("timestamp"),
-                    "user": log.get("user"),
-                    "role": log.get("role"),
-                    "action": log.get("action"),
-                    "entity_type": log.get("entity_type"),
-                    "entity_id": log.get("entity_id"),
-                    "details": str(log.get("details", {})),
-                    "ip_address": log.get("ip_address"),
-                }
-            )
-
-        return export_data
-
-    def _format_as_csv(self, data: list[dict]) -> str:
-        """Convert data to CSV format"""
-        if not data:
-            return ""
-
-        output = io.StringIO()
-
-        # Get headers from first row
-        headers = list(data[0].keys())
-        writer = csv.DictWriter(output, fieldnames=headers)
-
-        writer.writeheader()
-        writer.writerows(data)
+        cursor = self.db.activity_logs.find(query).sort("timestamp", -1).limit(EXPORT_ROW_LIMIT)
+
+        async for log in cursor:
+            yield {
+                "timestamp": log.get("timestamp"),
+                "user": log.get("user"),
+                "role": log.get("role"),
+                "action": log.get("action"),
+                "entity_type": log.get("entity_type"),
+                "entity_id": log.get("entity_id"),
+                "details": str(log.get("details", {})),
+                "ip_address": log.get("ip_address"),
+            }
 
-        return output.getvalue()
+    async def _format_as_json(self, rows: AsyncIterator[dict]) -> AsyncIterator[bytes]:
+        """Encode rows as an indented JSON array, one element at a time"""
+        separator = "[\n"
+        async for row in rows:
+            element = json.dumps(row, indent=2, default=str).replace("\n", "\n  ")
+            yield f"{separator}  {element}".encode("utf-8")
+            separator = ",\n"
+        yield b"[]" if separator == "[\n" else b"\n]"
 
     def _calculate_next_run(self, frequency: ExportFrequency) -> datetime:
         """Calculate next run time based on frequency"""
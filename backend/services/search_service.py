@@ -11,6 +11,12 @@ Scoring Algorithm:
   - Item name prefix match: 300 + position bonus
   - Item name contains: 200 + similarity score
   - Fuzzy name match: similarity score (0-100)
+
+Engines:
+  - "index": candidates come from the in-process n-gram/prefix index and are
+    ranked in full before pagination; only the returned page is read from MongoDB
+  - "regex": candidates come from a $regex query capped at MAX_CANDIDATES
+    (used when the index has not been warmed yet)
 """
 
 import logging
@@ -20,8 +26,14 @@ from typing import Any, Optional, Union
 from motor.motor_asyncio import AsyncIOMotorDatabase
 from rapidfuzz import fuzz
 
+from backend.services.item_search_index import ItemSearchIndex, item_search_index
+
 logger = logging.getLogger(__name__)
 
+SEARCH_ENGINE_INDEX = "index"
+SEARCH_ENGINE_REGEX = "regex"
+SEARCH_ENGINES = (SEARCH_ENGINE_INDEX, SEARCH_ENGINE_REGEX)
+
 
 @dataclass
 class SearchResult:
@@ -67,6 +79,7 @@ class SearchService:
     - Fuzzy matching for partial inputs
     - Pagination for large result sets
     - Redis caching for repeat queries (optional)
+    - Selectable candidate engine (n-gram index or MongoDB $regex)
     """
 
     # Scoring weights
@@ -80,9 +93,19 @@ class SearchService:
     MAX_CANDIDATES = 200  # Max items to fetch for scoring
     MIN_QUERY_LENGTH = 2  # Minimum chars before search
 
-    def __init__(self, db: AsyncIOMotorDatabase, cache: Optional[Any] = None):
+    def __init__(
+        self,
+        db: AsyncIOMotorDatabase,
+        cache: Optional[Any] = None,
+        engine: str = SEARCH_ENGINE_REGEX,
+        index: Optional[ItemSearchIndex] = None,
+    ):
+        if engine not in SEARCH_ENGINES:
+            raise ValueError(f"Unknown search engine: {engine}")
         self.db = db
         self.cache = cache  # Optional Redis cache
+        self.engine = engine
+        self.index = index
 
     async def search(
         self,
@@ -90,6 +113,7 @@ class SearchService:
         page: int = 1,
         page_size: int = 20,
         search_fields: Optional[list[str]] = None,
+        engine: Optional[str] = None,
     ) -> SearchResponse:
         """
         Execute optimized search with relevance scoring.
@@ -99,6 +123,7 @@ class SearchService:
             page: Page number (1-indexed)
             page_size: Items per page (max 50)
             search_fields: Optional field filter (default: all)
+            engine: Candidate engine override ("index" or "regex")
 
         Returns:
             SearchResponse with scored and paginated results
@@ -118,9 +143,10 @@ class SearchService:
 
         # Clamp page_size
         page_size = min(max(1, page_size), 50)
+        engine = self._resolve_engine(engine)
 
         # Try cache first (if available)
-        cache_key = f"search:{query}:{page}:{page_size}"
+        cache_key = f"search:{engine}:{query}:{page}:{page_size}"
         if self.cache:
             try:
                 cached = await self.cache.get(cache_key)
@@ -133,20 +159,27 @@ class SearchService:
         # Determine if this looks like a barcode (numeric, 6+ digits)
         is_barcode_query = query.isdigit() and len(query) >= 6
 
-        # Build MongoDB query
-        mongo_query = self._build_query(query, is_barcode_query, search_fields)
+        start_idx = (page - 1) * page_size
+        end_idx = start_idx + page_size
+
+        if engine == SEARCH_ENGINE_INDEX:
+            # Every index candidate is ranked; only the requested page is loaded
+            candidates = self.index.candidates(query, search_fields)
+            scored_items = self._score_candidates(candidates, query, is_barcode_query)
+            page_items = await self._load_page(scored_items[start_idx:end_idx])
+        else:
+            # Build MongoDB query
+            mongo_query = self._build_query(query, is_barcode_query, search_fields)
 
-        # Fetch candidates
-        candidates = await self._fetch_candidates(mongo_query)
+            # Fetch candidates
+            candidates = await self._fetch_candidates(mongo_query)
 
-        # Score and rank candidates
-        scored_items = self._score_candidates(candidates, query, is_barcode_query)
+            # Score and rank candidates
+            scored_items = self._score_candidates(candidates, query, is_barcode_query)
+            page_items = scored_items[start_idx:end_idx]
 
         # Paginate
         total = len(scored_items)
-        start_idx = (page - 1) * page_size
-        end_idx = start_idx + page_size
-        page_items = scored_items[start_idx:end_idx]
 
         response = SearchResponse(
             items=page_items,
@@ -166,6 +199,16 @@ class SearchService:
 
         return response
 
+    def _resolve_engine(self, engine: Optional[str]) -> str:
+        """Pick the candidate engine, falling back to regex while the index is cold"""
+        engine = engine or self.engine
+        if engine not in SEARCH_ENGINES:
+            raise ValueError(f"Unknown search engine: {engine}")
+        if engine == SEARCH_ENGINE_INDEX and (self.index is None or not self.index.is_warm):
+            logger.debug("Search index not warmed yet, using regex engine")
+            return SEARCH_ENGINE_REGEX
+        return engine
+
     def _build_query(
         self,
         query: str,
@@ -244,27 +287,7 @@ class SearchService:
                     continue
                 seen_items.add(dedup_key)
 
-                scored.append(
-                    SearchResult(
-                        id=str(item.get("_id", "")),
-                        item_name=item.get("item_name", ""),
-                        item_code=item.get("item_code"),
-                        barcode=item.get("barcode"),
-                        stock_qty=float(item.get("stock_qty", 0.0)),
-                        mrp=item.get("mrp"),
-                        sale_price=item.get("sale_price"),
-                        category=item.get("category"),
-                        subcategory=item.get("subcategory"),
-                        warehouse=item.get("warehouse"),
-                        uom_name=item.get("uom_name"),
-                        manual_barcode=item.get("manual_barcode"),
-                        unit2_barcode=item.get("unit2_barcode"),
-                        unit_m_barcode=item.get("unit_m_barcode"),
-                        batch_id=item.get("batch_id"),
-                        relevance_score=score,
-                        match_type=match_type,
-                    )
-                )
+                scored.append(self._to_result(item, score, match_type))
 
         # Sort by score descending, then by item_name ascending
         # We use negative score for ascending sort to combine with item_name
@@ -272,6 +295,50 @@ class SearchService:
 
         return scored
 
+    @staticmethod
+    def _to_result(item: dict, score: float, match_type: str) -> SearchResult:
+        return SearchResult(
+            id=str(item.get("_id", "")),
+            item_name=item.get("item_name", ""),
+            item_code=item.get("item_code"),
+            barcode=item.get("barcode"),
+            stock_qty=float(item.get("stock_qty", 0.0)),
+            mrp=item.get("mrp"),
+            sale_price=item.get("sale_price"),
+            category=item.get("category"),
+            subcategory=item.get("subcategory"),
+            warehouse=item.get("warehouse"),
+            uom_name=item.get("uom_name"),
+            manual_barcode=item.get("manual_barcode"),
+            unit2_barcode=item.get("unit2_barcode"),
+            unit_m_barcode=item.get("unit_m_barcode"),
+            batch_id=item.get("batch_id"),
+            relevance_score=score,
+            match_type=match_type,
+        )
+
+    async def _load_page(self, ranked: list[SearchResult]) -> list[SearchResult]:
+        """Replace index-only results with full erp_items documents, keeping rank order"""
+        if not ranked:
+            return []
+
+        item_codes = [result.item_code for result in ranked]
+        try:
+            cursor = self.db.erp_items.find({"item_code": {"$in": item_codes}})
+            items = await cursor.to_list(length=len(item_codes))
+        except Exception as e:
+            logger.error(f"Failed to load search page: {e}")
+            return []
+
+        items_by_code = {item.get("item_code"): item for item in items}
+        return [
+            self._to_result(
+                items_by_code[result.item_code], result.relevance_score, result.match_type
+            )
+            for result in ranked
+            if result.item_code in items_by_code
+        ]
+
     def _calculate_score(
         self,
         item: dict,
@@ -380,7 +447,7 @@ def get_search_service() -> SearchService:
             from backend.db.runtime import get_db
 
             db = get_db()
-            _search_service = SearchService(db)
+            _search_service = SearchService(db, engine=SEARCH_ENGINE_INDEX, index=item_search_index)
             logger.warning("SearchService lazily initialized at runtime")
         except Exception as exc:
             raise RuntimeError(
@@ -390,8 +457,12 @@ def get_search_service() -> SearchService:
     return _search_service
 
 
-def init_search_service(db: AsyncIOMotorDatabase, cache: Optional[Any] = None) -> SearchService:
-    """Initialize the search service singleton"""
+def init_search_service(
+    db: AsyncIOMotorDatabase,
+    cache: Optional[Any] = None,
+    engine: str = SEARCH_ENGINE_INDEX,
+) -> SearchService:
+    """Initialize the search service singleton on the shared item search index"""
     global _search_service
-    _search_service = SearchService(db, cache)
+    _search_service = SearchService(db, cache, engine=engine, index=item_search_index)
     return _search_service
@@ -0,0 +1,203 @@
+"""
+Session Statistics Service
+Keeps per-session count-line counters up to date with atomic $inc updates and
+periodically reconciles them against the count_lines collection to repair drift
+"""
+
+import asyncio
+import logging
+from datetime import datetime
+from typing import Any, Optional
+
+from motor.motor_asyncio import AsyncIOMotorDatabase
+
+logger = logging.getLogger(__name__)
+
+# Counters maintained on each session document
+SESSION_COUNTER_FIELDS = ("total_items", "total_variance", "approved_items", "rejected_items")
+
+# Sessions that can still receive count lines and are reconciled periodically
+ACTIVE_SESSION_STATUSES = ["OPEN", "ACTIVE"]
+
+# Variance sums are floats; smaller differences are rounding, not drift
+VARIANCE_TOLERANCE = 1e-6
+
+
+def count_line_counters(count_line: dict[str, Any]) -> dict[str, Any]:
+    """Counter contribution of a single count line"""
+    approval_status = count_line.get("approval_status")
+    return {
+        "total_items": 1,
+        "total_variance": count_line.get("variance") or 0,
+        "approved_items": 1 if approval_status == "APPROVED" else 0,
+        "rejected_items": 1 if approval_status == "REJECTED" else 0,
+    }
+
+
+def approval_transition_delta(previous_status: Optional[str], new_status: str) -> dict[str, int]:
+    """Counter changes caused by moving a line from one approval status to another"""
+    if previous_status == new_status:
+        return {}
+    delta = {"approved_items": 0, "rejected_items": 0}
+    for status, step in ((previous_status, -1), (new_status, 1)):
+        if status == "APPROVED":
+            delta["approved_items"] += step
+        elif status == "REJECTED":
+            delta["rejected_items"] += step
+    return {field: value for field, value in delta.items() if value}
+
+
+async def increment_session_counters(
+    db: AsyncIOMotorDatabase, session_id: str, delta: dict[str, Any]
+) -> None:
+    """Apply a counter delta to a session with a single atomic $inc"""
+    inc = {field: value for field, value in delta.items() if value}
+    if not inc:
+        return
+    try:
+        await db.sessions.update_one({"id": session_id}, {"$inc": inc})
+    except Exception as e:
+        # Non-critical: the reconciliation job repairs any drift
+        logger.error(f"Failed to update session stats for {session_id}: {str(e)}")
+
+
+class SessionStatsService:
+    """
+    Reconciles incrementally maintained session counters
+
+    Counters are updated in O(1) on every scan; this service re-aggregates
+    count_lines on demand or in the background and repairs any sessions
+    whose counters have drifted (e.g. after a failed $inc).
+    """
+
+    def __init__(self, db: AsyncIOMotorDatabase, reconcile_interval: int = 900):
+        self.db = db
+        self.reconcile_interval = reconcile_interval
+        self._running = False
+        self._task: asyncio.Task = None
+        self._stats = {
+            "runs": 0,
+            "sessions_checked": 0,
+            "sessions_repaired": 0,
+            "last_run": None,
+        }
+
+    async def _aggregate_counters(self, session_ids: list[str]) -> dict[str, dict[str, Any]]:
+        pipeline: list[dict[str, Any]] = [
+            {"$match": {"session_id": {"$in": session_ids}}},
+            {
+                "$group": {
+                    "_id": "$session_id",
+                    "total_items": {"$sum": 1},
+                    "total_variance": {"$sum": "$variance"},
+                    "approved_items": {
+                        "$sum": {"$cond": [{"$eq": ["$approval_status", "APPROVED"]}, 1, 0]}
+                    },
+                    "rejected_items": {
+                        "$sum": {"$cond": [{"$eq": ["$approval_status", "REJECTED"]}, 1, 0]}
+                    },
+                }
+            },
+        ]
+        rows = await self.db.count_lines.aggregate(pipeline).to_list(None)
+        return {row["_id"]: row for row in rows}
+
+    @staticmethod
+    def _find_drift(session: dict[str, Any], actual: dict[str, Any]) -> dict[str, Any]:
+        drift = {}
+        for field in SESSION_COUNTER_FIELDS:
+            expected = actual.get(field) or 0
+            current = session.get(field) or 0
+            if field == "total_variance":
+                if abs(current - expected) > VARIANCE_TOLERANCE:
+                    drift[field] = expected
+            elif current != expected:
+                drift[field] = expected
+        return drift
+
+    async def _reconcile(self, sessions: list[dict[str, Any]]) -> list[dict[str, Any]]:
+        if not sessions:
+            return []
+        actual_by_session = await self._aggregate_counters([s["id"] for s in sessions])
+
+        repaired = []
+        for session in sessions:
+            drift = self._find_drift(session, actual_by_session.get(session["id"], {}))
+            if not drift:
+                continue
+            await self.db.sessions.update_one({"id": session["id"]}, {"$set": drift})
+            logger.warning(f"Repaired session stats drift for {session['id']}: {drift}")
+            repaired.append({"session_id": session["id"], "corrected": drift})
+
+        self._stats["sessions_checked"] += len(sessions)
+        self._stats["sessions_repaired"] += len(repaired)
+        return repaired
+
+    async def reconcile_session(self, session_id: str) -> Optional[dict[str, Any]]:
+        """
+        Re-aggregate one session's counters and repair them if they drifted
+
+        Returns:
+            Reconciliation result, or None if the session does not exist
+        """
+        projection = {"_id": 0, "id": 1, **dict.fromkeys(SESSION_COUNTER_FIELDS, 1)}
+        session = await self.db.sessions.find_one({"id": session_id}, projection)
+        if not session:
+            return None
+        repaired = await self._reconcile([session])
+        return {
+            "session_id": session_id,
+            "repaired": bool(repaired),
+            "corrected": repaired[0]["corrected"] if repaired else {},
+        }
+
+    async def reconcile_active_sessions(self) -> dict[str, Any]:
+        """Reconcile every open/active session"""
+        projection = {"_id": 0, "id": 1, **dict.fromkeys(SESSION_COUNTER_FIELDS, 1)}
+        sessions = await self.db.sessions.find(
+            {"status": {"$in": ACTIVE_SESSION_STATUSES}}, projection
+        ).to_list(None)
+        repaired = await self._reconcile(sessions)
+
+        self._stats["runs"] += 1
+        self._stats["last_run"] = datetime.utcnow().isoformat()
+        return {"sessions_checked": len(sessions), "sessions_repaired": len(repaired)}
+
+    async def _reconcile_loop(self):
+        """Background reconciliation loop"""
+        while self._running:
+            try:
+                result = await self.reconcile_active_sessions()
+                if result["sessions_repaired"]:
+                    logger.info(
+                        f"Session stats reconciliation repaired "
+                        f"{result['sessions_repaired']}/{result['sessions_checked']} sessions"
+                    )
+            except Exception as e:
+                logger.error(f"Session stats reconciliation error: {str(e)}")
+
+            await asyncio.sleep(self.reconcile_interval)
+
+    def start(self):
+        """Start background reconciliation"""
+        if self._running:
+            logger.warning("Session stats reconciliation already running")
+            return
+
+        self._running = True
+        self._task = asyncio.create_task(self._reconcile_loop())
+        logger.info(f"Session stats reconciliation started (interval: {self.reconcile_interval}s)")
+
+    async def stop(self):
+        """Stop background reconciliation"""
+        self._running = False
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        logger.info("Session stats reconciliation stopped")
+
+    def get_stats(self) -> dict[str, Any]:
+        return {**self._stats, "running": self._running}
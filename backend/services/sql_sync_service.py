@@ -4,16 +4,51 @@ CRITICAL: Preserves all enriched data (serial numbers, MRP, HSN codes, etc.)
 """
 
 import asyncio
+import contextlib
 import logging
+import time
+from collections.abc import AsyncIterator, Awaitable, Callable
 from datetime import date, datetime, timedelta
-from typing import Any, Optional
+from functools import wraps
+from typing import Any, Optional, Union
 
 from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import InsertOne, UpdateMany, UpdateOne
+from pymongo.errors import BulkWriteError
 
-from backend.sql_server_connector import SQLServerConnector
+from backend.services.item_lookup_index import ItemLookupIndex, item_lookup_index
+from backend.services.item_search_index import ItemSearchIndex, item_search_index
+from backend.services.item_vector_index import ItemVectorIndex, item_vector_index
+from backend.services.kpi_store import increment_kpis, merge_deltas
+from backend.sql_server_connector import DEFAULT_FETCH_CHUNK_SIZE, SQLServerConnector, sql_executor
+from backend.utils.async_utils import EventLoopBlockingMonitor
 
 logger = logging.getLogger(__name__)
 
+# Number of write operations sent to MongoDB per unordered bulk_write call
+DEFAULT_BULK_CHUNK_SIZE = 1000
+
+# Event-loop stalls longer than this (seconds) during a sync are logged
+DEFAULT_LOOP_BLOCK_THRESHOLD = 0.25
+
+BulkOperation = Union[InsertOne, UpdateOne, UpdateMany]
+
+# A queued write with the index document and KPI delta to apply once it succeeds
+PlannedWrite = tuple[BulkOperation, dict[str, Any], dict[str, Any]]
+
+
+def _watch_event_loop(
+    func: Callable[..., Awaitable[Any]],
+) -> Callable[..., Awaitable[Any]]:
+    """Run a sync entry point under the service's event-loop blocking monitor"""
+
+    @wraps(func)
+    async def wrapper(self: "SQLSyncService", *args: Any, **kwargs: Any) -> Any:
+        async with self._loop_monitor.watch(func.__name__):
+            return await func(self, *args, **kwargs)
+
+    return wrapper
+
 
 # ---------------------------------------------------------------------------
 # Helpers for building item dicts - reduces cyclomatic complexity
@@ -111,6 +146,17 @@ _NEW_ITEM_FIELDS: list[tuple[str, str, str]] = [
 ]
 
 
+# erp_items fields needed to compare a SQL row in memory (qty + backfill metadata)
+_SYNC_PROJECTION: dict[str, int] = {
+    "_id": 0,
+    "item_code": 1,
+    "stock_qty": 1,
+    # Prices the stock-value delta reported to the dashboard KPIs
+    "price": 1,
+    **{target_key: 1 for _, target_key, _ in _NEW_ITEM_FIELDS},
+}
+
+
 def _apply_field_conversion(value: Any, converter: str) -> Any:
     """Apply the appropriate converter to a value."""
     if converter == "raw":
@@ -221,12 +267,24 @@ class SQLSyncService:
         sync_interval: int = 900,  # 15 minutes default (was 1 hour)
         enabled: bool = True,
         nightly_sync_hour: int = 2,  # Run full sync at 2 AM
+        bulk_chunk_size: int = DEFAULT_BULK_CHUNK_SIZE,
+        fetch_chunk_size: int = DEFAULT_FETCH_CHUNK_SIZE,
+        loop_block_threshold: float = DEFAULT_LOOP_BLOCK_THRESHOLD,
+        lookup_index: Optional[ItemLookupIndex] = None,
+        search_index: Optional[ItemSearchIndex] = None,
+        vector_index: Optional[ItemVectorIndex] = None,
     ):
         self.sql_connector = sql_connector
         self.mongo_db = mongo_db
         self.sync_interval = sync_interval
         self.enabled = enabled
         self.nightly_sync_hour = nightly_sync_hour
+        self.bulk_chunk_size = max(1, bulk_chunk_size)
+        self.fetch_chunk_size = max(1, fetch_chunk_size)
+        self.lookup_index = lookup_index if lookup_index is not None else item_lookup_index
+        self.search_index = search_index if search_index is not None else item_search_index
+        self.vector_index = vector_index if vector_index is not None else item_vector_index
+        self._loop_monitor = EventLoopBlockingMonitor("sql_sync", threshold=loop_block_threshold)
         self._running = False
         self._task: asyncio.Task = None
         self._last_sync: Optional[datetime] = None
@@ -244,18 +302,21 @@ class SQLSyncService:
             "new_items_discovered": 0,
         }
 
+    @_watch_event_loop
     async def sync_single_item_by_barcode(self, barcode: str) -> Optional[dict[str, Any]]:
         """
         Sync a single item from SQL Server to MongoDB by barcode.
         Returns the updated item if found, None otherwise.
         """
-        if not self.sql_connector.test_connection():
+        if not await sql_executor.run_realtime(self.sql_connector.test_connection):
             logger.warning("SQL Server not connected, skipping single item sync")
             return None
 
         try:
-            # Run synchronous SQL query in thread pool
-            sql_item = await asyncio.to_thread(self.sql_connector.get_item_by_barcode, barcode)
+            # Run synchronous SQL query on the realtime (scanner) lane
+            sql_item = await sql_executor.run_realtime(
+                self.sql_connector.get_item_by_barcode, barcode
+            )
 
             if not sql_item:
                 return None
@@ -279,6 +340,7 @@ class SQLSyncService:
             logger.error(f"Error syncing single item {barcode}: {e}")
             return None
 
+    @_watch_event_loop
     async def sync_variance_only(self) -> dict[str, Any]:
         """
         Sync ONLY items with quantity variances from SQL Server to MongoDB.
@@ -290,7 +352,7 @@ class SQLSyncService:
         Returns:
             Sync statistics
         """
-        if not self.sql_connector.test_connection():
+        if not await self._check_sql_connection():
             from backend.exceptions import SQLServerConnectionError
 
             raise SQLServerConnectionError("SQL Server connection not available")
@@ -305,18 +367,25 @@ class SQLSyncService:
             "errors": 0,
             "duration": 0,
             "sql_queries": 0,
+            "bulk_chunks": [],
+            "bulk_write_ms": 0.0,
         }
 
         try:
             logger.info("Starting variance-only sync from SQL Server...")
 
             # Step 1: Get all item codes from MongoDB (fast local query)
-            mongo_items_cursor = self.mongo_db.erp_items.find({}, {"item_code": 1, "stock_qty": 1})
+            mongo_items_cursor = self.mongo_db.erp_items.find(
+                {}, {"item_code": 1, "stock_qty": 1, "price": 1}
+            )
             mongo_items = {}
             async for item in mongo_items_cursor:
                 item_code = item.get("item_code")
                 if item_code:
-                    mongo_items[item_code] = float(item.get("stock_qty", 0.0))
+                    mongo_items[item_code] = (
+                        float(item.get("stock_qty", 0.0)),
+                        float(item.get("price") or 0),
+                    )
 
             if not mongo_items:
                 logger.info("No items in MongoDB to sync")
@@ -329,41 +398,44 @@ class SQLSyncService:
             # Step 2: Batch fetch quantities from SQL Server (minimal load)
             item_codes = list(mongo_items.keys())
             batch_size = 500  # SQL Server handles this well with IN clause
+            pending_ops: list[BulkOperation] = []
+            pending_value_deltas: list[float] = []
 
             for i in range(0, len(item_codes), batch_size):
                 batch_codes = item_codes[i : i + batch_size]
 
                 try:
                     # Fetch only quantities - minimal SQL load
-                    sql_quantities = await asyncio.to_thread(
+                    sql_quantities = await sql_executor.run_bulk(
                         self.sql_connector.get_item_quantities_only, batch_codes
                     )
                     stats["sql_queries"] += 1
 
-                    # Step 3: Compare and update only variances
+                    # Step 3: Compare in memory and queue updates only for variances
+                    now = datetime.utcnow()
                     for item_code, sql_qty in sql_quantities.items():
-                        mongo_qty = mongo_items.get(item_code, 0.0)
+                        mongo_qty, price = mongo_items.get(item_code, (0.0, 0.0))
 
                         if sql_qty != mongo_qty:
-                            # Variance found - update MongoDB
                             stats["variances_found"] += 1
                             stats["qty_changes_detected"] += 1  # Backwards-compatible
-                            now = datetime.utcnow()
-
-                            await self.mongo_db.erp_items.update_one(
-                                {"item_code": item_code},
-                                {
-                                    "$set": {
-                                        "stock_qty": sql_qty,
-                                        "sql_server_qty": sql_qty,
-                                        "last_synced": now,
-                                        "qty_changed_at": now,
-                                        "qty_change_delta": sql_qty - mongo_qty,
-                                        "updated_at": now,
-                                    }
-                                },
+                            pending_ops.append(
+                                UpdateOne(
+                                    {"item_code": item_code},
+                                    {
+                                        "$set": {
+                                            "stock_qty": sql_qty,
+                                            "sql_server_qty": sql_qty,
+                                            "last_synced": now,
+                                            "qty_changed_at": now,
+                                            "qty_change_delta": sql_qty - mongo_qty,
+                                            "updated_at": now,
+                                        }
+                                    },
+                                )
                             )
                             stats["qty_updated"] += 1
+                            pending_value_deltas.append((sql_qty - mongo_qty) * price)
 
                             logger.debug(
                                 f"Variance sync: {item_code}: {mongo_qty} → {sql_qty} "
@@ -374,6 +446,12 @@ class SQLSyncService:
                     logger.error(f"Error syncing batch starting at index {i}: {e}")
                     stats["errors"] += 1
 
+                if len(pending_ops) >= self.bulk_chunk_size:
+                    await self._flush_variance_ops(pending_ops, pending_value_deltas, stats)
+                    pending_ops, pending_value_deltas = [], []
+
+            await self._flush_variance_ops(pending_ops, pending_value_deltas, stats)
+
             stats["duration"] = (datetime.utcnow() - start_time).total_seconds()
             self._finalize_sync_stats(stats)
 
@@ -394,6 +472,21 @@ class SQLSyncService:
             stats["errors"] = 1
             raise
 
+    async def _flush_variance_ops(
+        self, operations: list[BulkOperation], value_deltas: list[float], stats: dict[str, Any]
+    ) -> None:
+        """Write queued qty updates; only the ones that succeeded move the stock value KPI."""
+        failed = await self._flush_bulk_ops(operations, stats)
+        await increment_kpis(
+            self.mongo_db,
+            {
+                "total_stock_value": sum(
+                    delta for index, delta in enumerate(value_deltas) if index not in failed
+                )
+            },
+        )
+
+    @_watch_event_loop
     async def discover_new_items(self, limit: int = 100) -> dict[str, Any]:
         """
         Discover and create NEW items from SQL Server that don't exist in MongoDB.
@@ -405,7 +498,7 @@ class SQLSyncService:
         Returns:
             Discovery statistics
         """
-        if not self.sql_connector.test_connection():
+        if not await self._check_sql_connection():
             logger.warning("SQL Server not connected, skipping new item discovery")
             return {"items_discovered": 0, "error": "SQL Server not connected"}
 
@@ -429,17 +522,19 @@ class SQLSyncService:
 
             logger.debug(f"Found {len(mongo_codes)} existing items in MongoDB")
 
-            # Step 2: Fetch all items from SQL Server (this is the heavy query)
-            # Only run this periodically
-            sql_items = await asyncio.to_thread(self.sql_connector.get_all_items)
-            stats["items_checked"] = len(sql_items)
-
-            # Step 3: Find items that exist in SQL but not in MongoDB
+            # Step 2: Stream items from SQL Server (this is the heavy query) and
+            # Step 3: keep those that exist in SQL but not in MongoDB.
+            # Reading stops as soon as the limit is reached.
             new_items = []
-            for sql_item in sql_items:
-                item_code = sql_item.get("item_code")
-                if item_code and item_code not in mongo_codes:
-                    new_items.append(sql_item)
+            async with contextlib.aclosing(self._stream_sql_items()) as sql_chunks:
+                async for chunk in sql_chunks:
+                    for sql_item in chunk:
+                        stats["items_checked"] += 1
+                        item_code = sql_item.get("item_code")
+                        if item_code and item_code not in mongo_codes:
+                            new_items.append(sql_item)
+                            if len(new_items) >= limit:
+                                break
                     if len(new_items) >= limit:
                         break
 
@@ -458,7 +553,15 @@ class SQLSyncService:
                     sql_qty = float(sql_item.get("stock_qty", 0.0))
                     new_item = _build_new_item_dict(sql_item, sql_qty, now)
                     await self.mongo_db.erp_items.insert_one(new_item)
+                    self._index_item(new_item)
                     stats["items_discovered"] += 1
+                    await increment_kpis(
+                        self.mongo_db,
+                        {
+                            "total_items": 1,
+                            "total_stock_value": sql_qty * float(new_item.get("price") or 0),
+                        },
+                    )
                     logger.debug(f"Created new item: {sql_item.get('item_code')}")
                 except Exception as e:
                     logger.error(f"Error creating item {sql_item.get('item_code')}: {e}")
@@ -506,6 +609,7 @@ class SQLSyncService:
 
         return True
 
+    @_watch_event_loop
     async def nightly_full_sync(self) -> dict[str, Any]:
         """
         Full data verification sync - runs every night.
@@ -515,7 +619,7 @@ class SQLSyncService:
         Returns:
             Sync statistics
         """
-        if not self.sql_connector.test_connection():
+        if not await self._check_sql_connection():
             logger.warning("SQL Server not connected, skipping nightly sync")
             return {"error": "SQL Server not connected", "items_synced": 0}
 
@@ -525,37 +629,21 @@ class SQLSyncService:
             "qty_updated": 0,
             "items_created": 0,
             "variances_found": 0,
+            "qty_changes_detected": 0,
             "errors": 0,
             "duration": 0,
+            "bulk_chunks": [],
+            "bulk_write_ms": 0.0,
         }
 
         try:
             logger.info("🌙 Starting nightly full data verification sync...")
 
-            # Fetch ALL items from SQL Server
-            sql_items = await asyncio.to_thread(self.sql_connector.get_all_items)
-            stats["items_checked"] = len(sql_items)
-            logger.info(f"Retrieved {len(sql_items)} items from SQL Server for verification")
-
-            # Get all MongoDB item codes for comparison
-            mongo_items_cursor = self.mongo_db.erp_items.find({}, {"item_code": 1, "stock_qty": 1})
-            mongo_items = {}
-            async for item in mongo_items_cursor:
-                item_code = item.get("item_code")
-                if item_code:
-                    mongo_items[item_code] = float(item.get("stock_qty", 0.0))
-
-            # Process each SQL item
-            batch_size = 100
-            for i in range(0, len(sql_items), batch_size):
-                batch = sql_items[i : i + batch_size]
-
-                for sql_item in batch:
-                    try:
-                        await self._sync_single_item(sql_item, stats)
-                    except Exception as e:
-                        logger.error(f"Error syncing item {sql_item.get('item_code')}: {e}")
-                        stats["errors"] += 1
+            # Compare against a bulk-loaded projection, then stream ALL items from
+            # SQL Server chunk by chunk and write each chunk as it arrives
+            await self._sync_streamed_items(stats)
+            logger.info(f"Streamed {stats['items_checked']} items from SQL Server for verification")
+            stats["variances_found"] = stats["qty_changes_detected"]
 
             stats["duration"] = (datetime.utcnow() - start_time).total_seconds()
             self._last_nightly_sync = datetime.utcnow()
@@ -576,6 +664,7 @@ class SQLSyncService:
             stats["errors"] = 1
             return stats
 
+    @_watch_event_loop
     async def sync_quantities_only(self) -> dict[str, Any]:
         """
         Sync ONLY quantity changes from SQL Server to MongoDB
@@ -584,7 +673,7 @@ class SQLSyncService:
         Returns:
             Sync statistics
         """
-        if not self.sql_connector.test_connection():
+        if not await self._check_sql_connection():
             from backend.exceptions import SQLServerConnectionError
 
             raise SQLServerConnectionError("SQL Server connection not available")
@@ -597,24 +686,13 @@ class SQLSyncService:
             "qty_changes_detected": 0,
             "errors": 0,
             "duration": 0,
+            "bulk_chunks": [],
+            "bulk_write_ms": 0.0,
         }
 
         try:
-            # Fetch all items from SQL Server
             logger.info("Starting SQL Server quantity sync...")
-            sql_items = self.sql_connector.get_all_items()
-
-            # Batch process items
-            batch_size = 100
-            for i in range(0, len(sql_items), batch_size):
-                batch = sql_items[i : i + batch_size]
-
-                for sql_item in batch:
-                    try:
-                        await self._sync_single_item(sql_item, stats)
-                    except Exception as e:
-                        logger.error(f"Error syncing item {sql_item.get('item_code')}: {str(e)}")
-                        stats["errors"] += 1
+            await self._sync_streamed_items(stats)
 
             stats["duration"] = (datetime.utcnow() - start_time).total_seconds()
             self._finalize_sync_stats(stats)
@@ -648,11 +726,24 @@ class SQLSyncService:
             # New item - create with basic data
             new_item = _build_new_item_dict(sql_item, sql_qty, now)
             await self.mongo_db.erp_items.insert_one(new_item)
+            self._index_item(new_item)
             stats["items_created"] += 1
+            await increment_kpis(
+                self.mongo_db,
+                {
+                    "total_items": 1,
+                    "total_stock_value": sql_qty * float(new_item.get("price") or 0),
+                },
+            )
             logger.debug(f"Created new item: {item_code}")
         else:
             # Existing item - update ONLY quantity if changed
-            await self._update_existing_item(item_code, sql_item, sql_qty, mongo_item, stats)
+            stock_value_delta = stats.get("stock_value_delta", 0.0)
+            if await self._update_existing_item(item_code, sql_item, sql_qty, mongo_item, stats):
+                await increment_kpis(
+                    self.mongo_db,
+                    {"total_stock_value": stats.get("stock_value_delta", 0.0) - stock_value_delta},
+                )
 
         stats["items_checked"] += 1
 
@@ -663,10 +754,31 @@ class SQLSyncService:
         sql_qty: float,
         mongo_item: dict[str, Any],
         stats: dict[str, Any],
-    ) -> None:
-        """Update an existing MongoDB item with SQL data."""
+    ) -> bool:
+        """Update an existing MongoDB item with SQL data; False if no document was modified."""
+        update_fields = self._build_existing_item_update(
+            item_code, sql_item, sql_qty, mongo_item, stats, datetime.utcnow()
+        )
+        result = await self.mongo_db.erp_items.update_one(
+            {"item_code": item_code},
+            {"$set": update_fields},
+        )
+        if not result.modified_count:
+            return False
+        self._index_item({"item_code": item_code, **update_fields})
+        return True
+
+    def _build_existing_item_update(
+        self,
+        item_code: str,
+        sql_item: dict[str, Any],
+        sql_qty: float,
+        mongo_item: dict[str, Any],
+        stats: dict[str, Any],
+        now: datetime,
+    ) -> dict[str, Any]:
+        """Build the $set document for an existing item (qty + metadata backfill)."""
         mongo_qty = float(mongo_item.get("stock_qty", 0.0))
-        now = datetime.utcnow()
 
         # Prepare backfill for optional metadata
         metadata_candidates = _build_metadata_candidates(sql_item)
@@ -688,6 +800,9 @@ class SQLSyncService:
             )
             stats["qty_changes_detected"] += 1
             stats["qty_updated"] += 1
+            stats["stock_value_delta"] = stats.get("stock_value_delta", 0.0) + (
+                sql_qty - mongo_qty
+            ) * float(mongo_item.get("price") or 0)
 
             logger.info(
                 f"Qty updated for {item_code}: {mongo_qty} → {sql_qty} (Δ {sql_qty - mongo_qty})"
@@ -696,10 +811,193 @@ class SQLSyncService:
         if metadata_updates:
             update_fields.update(metadata_updates)
 
-        await self.mongo_db.erp_items.update_one(
-            {"item_code": item_code},
-            {"$set": update_fields},
+        return update_fields
+
+    def _index_item(self, item: dict[str, Any]) -> None:
+        """Keep the in-process item indexes in step with an erp_items write"""
+        self.lookup_index.index_item(item)
+        self.search_index.index_item(item)
+        # Queues re-embedding when the name or category changed
+        self.vector_index.index_item(item)
+
+    async def _check_sql_connection(self) -> bool:
+        """Probe the SQL Server connection without blocking the event loop"""
+        return await sql_executor.run_bulk(self.sql_connector.test_connection)
+
+    async def _sync_streamed_items(self, stats: dict[str, Any]) -> None:
+        """Stream every SQL Server item and apply each chunk to MongoDB as it arrives"""
+        mongo_items = await self._load_sync_projection()
+        async with contextlib.aclosing(self._stream_sql_items()) as sql_chunks:
+            async for chunk in sql_chunks:
+                await self._apply_sql_items(chunk, mongo_items, stats)
+
+    async def _stream_sql_items(self) -> AsyncIterator[list[dict[str, Any]]]:
+        """
+        Stream item chunks from SQL Server without blocking the event loop.
+
+        Each fetchmany runs on the bulk SQL lane, and the next chunk is read
+        while the caller is still writing the current one to MongoDB.
+        """
+        chunks = self.sql_connector.iter_all_items(chunk_size=self.fetch_chunk_size)
+        pending = asyncio.ensure_future(sql_executor.run_bulk(next, chunks, None))
+        try:
+            while True:
+                chunk = await pending
+                if chunk is None:
+                    break
+                pending = asyncio.ensure_future(sql_executor.run_bulk(next, chunks, None))
+                yield chunk
+        finally:
+            # The generator cannot be closed while a worker thread is resuming it
+            if not pending.done():
+                with contextlib.suppress(Exception):
+                    await pending
+            await sql_executor.run_bulk(chunks.close)
+
+    async def _load_sync_projection(self) -> dict[str, dict[str, Any]]:
+        """Bulk-load the erp_items fields needed for in-memory comparison."""
+        mongo_items: dict[str, dict[str, Any]] = {}
+        async for item in self.mongo_db.erp_items.find({}, _SYNC_PROJECTION):
+            item_code = item.get("item_code")
+            if item_code:
+                mongo_items[item_code] = item
+        return mongo_items
+
+    def _plan_item_sync(
+        self,
+        sql_item: dict[str, Any],
+        mongo_items: dict[str, dict[str, Any]],
+        stats: dict[str, Any],
+        now: datetime,
+    ) -> Optional[PlannedWrite]:
+        """
+        Compare one SQL row with the in-memory projection.
+
+        Returns the write to queue with its index document and KPI delta, or
+        None when only the sync timestamps need to be touched. The projection
+        is updated in place so duplicate rows later in the same run see the
+        pending state.
+        """
+        item_code = sql_item.get("item_code", "")
+        sql_qty = float(sql_item.get("stock_qty", 0.0))
+        stats["items_checked"] += 1
+
+        mongo_item = mongo_items.get(item_code)
+        if mongo_item is None:
+            new_item = _build_new_item_dict(sql_item, sql_qty, now)
+            mongo_items[item_code] = {
+                key: new_item.get(key) for key in _SYNC_PROJECTION if key != "_id"
+            }
+            stats["items_created"] += 1
+            value_delta = sql_qty * float(new_item.get("price") or 0)
+            stats["stock_value_delta"] = stats.get("stock_value_delta", 0.0) + value_delta
+            return (
+                InsertOne(new_item),
+                new_item,
+                {"total_items": 1, "total_stock_value": value_delta},
+            )
+
+        stock_value_delta = stats.get("stock_value_delta", 0.0)
+        update_fields = self._build_existing_item_update(
+            item_code, sql_item, sql_qty, mongo_item, stats, now
         )
+        if update_fields.keys() <= {"last_synced", "updated_at"}:
+            return None
+
+        mongo_item.update(update_fields)
+        return (
+            UpdateOne({"item_code": item_code}, {"$set": update_fields}),
+            {"item_code": item_code, **update_fields},
+            {"total_stock_value": stats.get("stock_value_delta", 0.0) - stock_value_delta},
+        )
+
+    async def _apply_sql_items(
+        self,
+        sql_items: list[dict[str, Any]],
+        mongo_items: dict[str, dict[str, Any]],
+        stats: dict[str, Any],
+    ) -> None:
+        """
+        Diff SQL rows against the projection and flush writes chunk by chunk.
+
+        Index updates and KPI deltas are applied only for the writes the bulk
+        write reports as successful.
+        """
+        for i in range(0, len(sql_items), self.bulk_chunk_size):
+            chunk = sql_items[i : i + self.bulk_chunk_size]
+            now = datetime.utcnow()
+            planned: list[PlannedWrite] = []
+            unchanged_codes: list[str] = []
+
+            for sql_item in chunk:
+                try:
+                    write = self._plan_item_sync(sql_item, mongo_items, stats, now)
+                except Exception as e:
+                    logger.error(f"Error syncing item {sql_item.get('item_code')}: {e}")
+                    stats["errors"] += 1
+                    continue
+
+                if write is not None:
+                    planned.append(write)
+                else:
+                    unchanged_codes.append(sql_item.get("item_code", ""))
+
+            operations = [operation for operation, _, _ in planned]
+
+            if unchanged_codes:
+                # One statement refreshes the sync timestamps of all unchanged rows
+                operations.append(
+                    UpdateMany(
+                        {"item_code": {"$in": unchanged_codes}},
+                        {"$set": {"last_synced": now, "updated_at": now}},
+                    )
+                )
+
+            failed = await self._flush_bulk_ops(operations, stats)
+            succeeded = [write for index, write in enumerate(planned) if index not in failed]
+            for _, index_doc, _ in succeeded:
+                self._index_item(index_doc)
+            await increment_kpis(self.mongo_db, merge_deltas([delta for _, _, delta in succeeded]))
+
+    async def _flush_bulk_ops(
+        self, operations: list[BulkOperation], stats: dict[str, Any]
+    ) -> set[int]:
+        """
+        Send queued operations as one unordered bulk_write and record its timing.
+
+        Returns the positions in ``operations`` that were not written.
+        """
+        if not operations:
+            return set()
+
+        chunks = stats.setdefault("bulk_chunks", [])
+        chunk_stats: dict[str, Any] = {"chunk": len(chunks) + 1, "operations": len(operations)}
+        started = time.perf_counter()
+        failed: set[int] = set()
+
+        try:
+            await self.mongo_db.erp_items.bulk_write(operations, ordered=False)
+        except BulkWriteError as e:
+            write_errors = e.details.get("writeErrors", [])
+            failed = {error["index"] for error in write_errors}
+            chunk_stats["write_errors"] = len(write_errors)
+            stats["errors"] += len(write_errors)
+            logger.error(
+                f"Bulk write chunk {chunk_stats['chunk']} had {len(write_errors)} failed "
+                f"operations out of {len(operations)}"
+            )
+        except Exception as e:
+            failed = set(range(len(operations)))
+            chunk_stats["write_errors"] = len(operations)
+            stats["errors"] += 1
+            logger.error(f"Bulk write chunk {chunk_stats['chunk']} failed: {e}")
+
+        chunk_stats["duration_ms"] = round((time.perf_counter() - started) * 1000, 2)
+        chunks.append(chunk_stats)
+        stats["bulk_write_ms"] = round(
+            stats.get("bulk_write_ms", 0.0) + chunk_stats["duration_ms"], 2
+        )
+        return failed
 
     def _finalize_sync_stats(self, stats: dict[str, Any]) -> None:
         """Update backwards-compatible stats and internal tracking."""
@@ -746,6 +1044,7 @@ class SQLSyncService:
                 "MongoDB sync_metadata collection not configured; skipping metadata update",
             )
 
+    @_watch_event_loop
     async def check_item_qty_realtime(self, item_code: str) -> dict[str, Any]:
         """
         Real-time quantity check for a specific item
@@ -757,7 +1056,7 @@ class SQLSyncService:
         Returns:
             Dictionary with qty info and update status
         """
-        if not self.sql_connector.test_connection():
+        if not await sql_executor.run_realtime(self.sql_connector.test_connection):
             logger.warning("SQL Server not available for real-time check")
             # Return MongoDB data without update
             mongo_item = await self.mongo_db.erp_items.find_one({"item_code": item_code})
@@ -774,7 +1073,9 @@ class SQLSyncService:
 
         try:
             # Fetch latest qty from SQL Server
-            sql_item = self.sql_connector.get_item_by_code(item_code)
+            sql_item = await sql_executor.run_realtime(
+                self.sql_connector.get_item_by_code, item_code
+            )
             if not sql_item:
                 raise ValueError(f"Item {item_code} not found in SQL Server")
 
@@ -798,7 +1099,7 @@ class SQLSyncService:
             # Check if qty changed
             if sql_qty != mongo_qty:
                 # Update MongoDB with new qty (preserve enrichments!)
-                await self.mongo_db.erp_items.update_one(
+                result = await self.mongo_db.erp_items.update_one(
                     {"item_code": item_code},
                     {
                         "$set": {
@@ -810,6 +1111,14 @@ class SQLSyncService:
                         }
                     },
                 )
+                if result.modified_count:
+                    await increment_kpis(
+                        self.mongo_db,
+                        {
+                            "total_stock_value": (sql_qty - mongo_qty)
+                            * float(mongo_item.get("price") or 0)
+                        },
+                    )
 
                 logger.info(f"Real-time qty update for {item_code}: {mongo_qty} → {sql_qty}")
 
@@ -851,7 +1160,7 @@ class SQLSyncService:
         while self._running and self.enabled:
             try:
                 # Check connection before attempting sync
-                if not self.sql_connector.test_connection():
+                if not await self._check_sql_connection():
                     logger.warning(
                         "SQL Server connection not available, skipping sync. "
                         "Will retry in next interval."
@@ -941,6 +1250,7 @@ class SQLSyncService:
                 if self._last_sync
                 else None
             ),
+            "event_loop": self._loop_monitor.get_stats(),
         }
 
     def set_interval(self, interval: int):
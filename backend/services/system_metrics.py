@@ -0,0 +1,89 @@
+"""
+System Metrics Sampler - CPU and memory readings off the event loop
+A daemon thread measures CPU over its sampling window and records the latest
+readings; request handlers read the cached snapshot instead of measuring inline
+"""
+
+import logging
+import os
+import threading
+import time
+from typing import Any, Optional
+
+import psutil
+
+logger = logging.getLogger(__name__)
+
+
+class SystemMetricsSampler:
+    """
+    Samples host and process resource usage in a background thread
+
+    ``psutil.cpu_percent(interval=...)`` sleeps for the whole interval, so it
+    runs here rather than in an async handler where it would stall the loop.
+    """
+
+    def __init__(self, interval: float = 5.0):
+        self.interval = interval
+        self._process = psutil.Process(os.getpid())
+        self._snapshot: dict[str, Any] = {
+            "cpu_percent": 0.0,
+            "process_cpu_percent": 0.0,
+            "memory_percent": 0.0,
+            "memory_mb": 0.0,
+            "sampled_at": None,
+        }
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def sample(self) -> dict[str, Any]:
+        """Take one reading; blocks for ``interval`` seconds while CPU is measured"""
+        # Prime the per-process counter so its reading covers the same window
+        self._process.cpu_percent(None)
+        cpu_percent = psutil.cpu_percent(interval=self.interval)
+        snapshot = {
+            "cpu_percent": cpu_percent,
+            "process_cpu_percent": round(self._process.cpu_percent(None), 2),
+            "memory_percent": psutil.virtual_memory().percent,
+            "memory_mb": round(self._process.memory_info().rss / 1024 / 1024, 2),
+            "sampled_at": time.time(),
+        }
+        # Replacing the dict is atomic, so readers never see a half-written sample
+        self._snapshot = snapshot
+        return snapshot
+
+    def _run(self, stop: threading.Event) -> None:
+        while not stop.is_set():
+            try:
+                self.sample()
+            except Exception as e:
+                logger.warning(f"System metrics sampling failed: {str(e)}")
+                stop.wait(self.interval)
+
+    def start(self) -> None:
+        """Start the sampling thread (no-op if already running)"""
+        if self.running:
+            return
+        # A fresh event per thread, so a thread still finishing its last sample exits
+        self._stop = threading.Event()
+        self._thread = threading.Thread(
+            target=self._run, args=(self._stop,), name="system-metrics-sampler", daemon=True
+        )
+        self._thread.start()
+        logger.info(f"System metrics sampler started (interval: {self.interval}s)")
+
+    def stop(self) -> None:
+        """Signal the thread to stop; it exits after the sample in progress, without a join"""
+        self._stop.set()
+        self._thread = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def snapshot(self) -> dict[str, Any]:
+        """Latest readings; zeros until the first sample completes"""
+        return dict(self._snapshot)
+
+
+system_metrics_sampler = SystemMetricsSampler()
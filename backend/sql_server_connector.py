@@ -1,13 +1,20 @@
 # ruff: noqa: E402
+import asyncio
+import functools
 import logging
 import sys
+import threading
+from collections.abc import Callable, Iterator, Sequence
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Any, Optional
+from typing import Any, Optional, TypeVar
 
 import pyodbc
 from tenacity import retry, stop_after_attempt, wait_exponential
 
 from backend.db_mapping_config import SQL_TEMPLATES, get_active_mapping
+from backend.services.enhanced_connection_pool import EnhancedSQLServerConnectionPool
 from backend.utils.db_connection import SQLServerConnectionBuilder
 
 # Add project root to path for direct execution (debugging)
@@ -18,6 +25,8 @@ if str(project_root) not in sys.path:
 
 logger = logging.getLogger(__name__)
 
+T = TypeVar("T")
+
 
 class DatabaseConnectionError(Exception):
     """Raised when database connection fails after all retry attempts."""
@@ -39,11 +48,91 @@ class ItemNotFoundError(Exception):
 
 # Constants
 DB_NOT_CONNECTED_MSG = "Not connected to database"
+DEFAULT_FETCH_CHUNK_SIZE = 1000
+DEFAULT_REALTIME_WORKERS = 4  # Scanner-facing lookups (barcode, item code, search)
+DEFAULT_BULK_WORKERS = 2  # Sync jobs (full catalogue streams, quantity batches)
+DEFAULT_POOL_OVERFLOW = 4  # Extra connections for callers outside the executor lanes
+
+
+class SQLWorkloadExecutor:
+    """
+    Bounded thread pools for blocking SQL Server calls.
+
+    Realtime lookups and bulk sync reads run on separate lanes, so a nightly
+    catalogue fetch can occupy at most ``bulk_workers`` threads (and pooled
+    connections) and never starves the scanner-facing lookups.
+    """
+
+    def __init__(
+        self,
+        realtime_workers: int = DEFAULT_REALTIME_WORKERS,
+        bulk_workers: int = DEFAULT_BULK_WORKERS,
+    ):
+        self.realtime_workers = realtime_workers
+        self.bulk_workers = bulk_workers
+        self._workers = {"realtime": realtime_workers, "bulk": bulk_workers}
+        self._executors: dict[str, Optional[ThreadPoolExecutor]] = dict.fromkeys(self._workers)
+        self._lock = threading.Lock()
+        self._stats = {lane: {"submitted": 0, "pending": 0} for lane in self._workers}
+
+    async def run_realtime(self, func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """Run a blocking SQL call on the realtime (scanner) lane."""
+        return await self._run("realtime", func, *args, **kwargs)
+
+    async def run_bulk(self, func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """Run a blocking SQL call on the bulk (sync job) lane."""
+        return await self._run("bulk", func, *args, **kwargs)
+
+    def _get_executor(self, lane: str) -> ThreadPoolExecutor:
+        # Created lazily so the lanes come back after a shutdown/restart cycle
+        executor = self._executors[lane]
+        if executor is None:
+            executor = ThreadPoolExecutor(
+                max_workers=self._workers[lane], thread_name_prefix=f"sql-{lane}"
+            )
+            self._executors[lane] = executor
+        return executor
+
+    async def _run(self, lane: str, func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            executor = self._get_executor(lane)
+            self._stats[lane]["submitted"] += 1
+            self._stats[lane]["pending"] += 1
+        try:
+            return await loop.run_in_executor(executor, functools.partial(func, *args, **kwargs))
+        finally:
+            with self._lock:
+                self._stats[lane]["pending"] -= 1
+
+    def get_stats(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "realtime": {**self._stats["realtime"], "workers": self.realtime_workers},
+                "bulk": {**self._stats["bulk"], "workers": self.bulk_workers},
+            }
+
+    def shutdown(self, wait: bool = False) -> None:
+        with self._lock:
+            executors = [e for e in self._executors.values() if e is not None]
+            self._executors = dict.fromkeys(self._workers)
+        for executor in executors:
+            executor.shutdown(wait=wait, cancel_futures=True)
 
 
 class SQLServerConnector:
-    def __init__(self):
+    def __init__(
+        self,
+        pool_size: int = DEFAULT_REALTIME_WORKERS + DEFAULT_BULK_WORKERS,
+        pool_max_overflow: int = DEFAULT_POOL_OVERFLOW,
+    ):
         self.connection = None
+        self.pool_size = pool_size
+        self.pool_max_overflow = pool_max_overflow
+        self._pool: Optional[EnhancedSQLServerConnectionPool] = None
+        self._connection_lock = threading.Lock()
+        self._pool_lock = threading.Lock()
+        self._metadata_lock = threading.Lock()
         self.config = None
         self.mapping = get_active_mapping()
         self.connection_methods = []  # Store tested connection methods
@@ -103,37 +192,43 @@ class SQLServerConnector:
         self._table_columns = {}
         self._enabled_optional_fields = []
 
-    def _ensure_dynamic_sql_fragments(self) -> None:
-        """Detect optional tables/columns once per connection for richer item metadata."""
-        if self._dynamic_sql_ready or not self.connection:
+    def _ensure_dynamic_sql_fragments(self, conn) -> None:
+        """Detect optional tables/columns once per connector for richer item metadata.
+
+        Every pooled connection points at the same database, so the schema
+        snapshot taken on the first borrowed connection is shared by all of them.
+        """
+        if self._dynamic_sql_ready or conn is None:
             return
 
-        try:
-            self._load_schema_metadata()
-            columns_clause, joins_clause, enabled_fields = self._build_optional_selects_and_joins()
-            self.optional_columns_clause = columns_clause
-            self.optional_joins_clause = joins_clause
-            self._enabled_optional_fields = enabled_fields
-            self._dynamic_sql_ready = True
-
-            if enabled_fields:
-                logger.info(
-                    "Enriched ERP queries with optional fields: %s",
-                    ", ".join(sorted(set(enabled_fields))),
+        with self._metadata_lock:
+            if self._dynamic_sql_ready:
+                return
+            try:
+                self._load_schema_metadata(conn)
+                columns_clause, joins_clause, enabled_fields = (
+                    self._build_optional_selects_and_joins()
                 )
-        except Exception as exc:
-            logger.debug(f"Dynamic SQL preparation failed: {str(exc)[:120]}")
-            # Avoid blocking queries – continue without optional columns
-            self.optional_columns_clause = ""
-            self.optional_joins_clause = ""
-            self._dynamic_sql_ready = True
-
-    def _load_schema_metadata(self) -> None:
+                self.optional_columns_clause = columns_clause
+                self.optional_joins_clause = joins_clause
+                self._enabled_optional_fields = enabled_fields
+                self._dynamic_sql_ready = True
+
+                if enabled_fields:
+                    logger.info(
+                        "Enriched ERP queries with optional fields: %s",
+                        ", ".join(sorted(set(enabled_fields))),
+                    )
+            except Exception as exc:
+                logger.debug(f"Dynamic SQL preparation failed: {str(exc)[:120]}")
+                # Avoid blocking queries – continue without optional columns
+                self.optional_columns_clause = ""
+                self.optional_joins_clause = ""
+                self._dynamic_sql_ready = True
+
+    def _load_schema_metadata(self, conn) -> None:
         """Snapshot available tables for optional joins."""
-        if not self.connection:
-            return
-
-        cursor = self.connection.cursor()
+        cursor = conn.cursor()
         cursor.execute(
             """
             SELECT TABLE_NAME
@@ -145,15 +240,15 @@ class SQLServerConnector:
         cursor.close()
         self._table_columns = {}
 
-    def _get_table_columns(self, table_name: Optional[str]) -> dict[str, str]:
+    def _get_table_columns(self, conn, table_name: Optional[str]) -> dict[str, str]:
         """Return column map for table (lowercase -> actual)."""
-        if not table_name or not self.connection:
+        if not table_name or conn is None:
             return {}
 
         if table_name in self._table_columns:
             return self._table_columns[table_name]
 
-        cursor = self.connection.cursor()
+        cursor = conn.cursor()
         cursor.execute(
             """
             SELECT COLUMN_NAME
@@ -276,8 +371,8 @@ class SQLServerConnector:
         except KeyError:
             return template
 
-    def _get_formatted_query(self, template_name: str) -> str:
-        self._ensure_dynamic_sql_fragments()
+    def _get_formatted_query(self, conn, template_name: str) -> str:
+        self._ensure_dynamic_sql_fragments(conn)
         template = SQL_TEMPLATES[template_name]
         return self._apply_optional_sections(template)
 
@@ -415,7 +510,7 @@ class SQLServerConnector:
         try:
             port_param = self._normalize_port_value(method.get("port"))
 
-            self.connection = SQLServerConnectionBuilder.create_optimized_connection(
+            connection = SQLServerConnectionBuilder.create_optimized_connection(
                 host=str(method["host"]),
                 database=str(method["database"]),
                 port=port_param,
@@ -425,12 +520,17 @@ class SQLServerConnector:
             )
 
             # Verify connection using shared utility
-            if not SQLServerConnectionBuilder.is_connection_valid(self.connection):
+            if not SQLServerConnectionBuilder.is_connection_valid(connection):
                 raise pyodbc.Error("Connection validation failed")
 
+            # Swap only once no thread is using the shared connection
+            with self._connection_lock:
+                self.connection = connection
+
             # Success - store config and log
             self._reset_dynamic_metadata()
             self._store_successful_config(method)
+            self._init_pool(method, port_param)
             return True
 
         except Exception as e:
@@ -481,10 +581,110 @@ class SQLServerConnector:
                 return str(error) if error is not None else None
         return None
 
+    def _init_pool(self, method: dict[str, Any], port: Optional[int]) -> None:
+        """
+        Open a bounded connection pool with the connection method that just worked
+
+        The new pool is built before it replaces the old one, so threads
+        querying during a reconnect keep a working pool; the old pool is
+        drained once it is out of circulation.
+        """
+        try:
+            pool = EnhancedSQLServerConnectionPool(
+                host=str(method["host"]),
+                port=port,
+                database=str(method["database"]),
+                user=str(method["user"]) if method.get("user") else None,
+                password=str(method["password"]) if method.get("password") else None,
+                pool_size=self.pool_size,
+                max_overflow=self.pool_max_overflow,
+                timeout=15,
+                retry_attempts=1,
+            )
+        except Exception as e:
+            logger.warning(f"SQL Server connection pool unavailable, using shared connection: {e}")
+            pool = None
+        self._replace_pool(pool)
+
+    def _close_pool(self) -> None:
+        self._replace_pool(None)
+
+    def _replace_pool(self, pool: Optional[EnhancedSQLServerConnectionPool]) -> None:
+        """Swap in ``pool`` and close the previous one; borrowed connections close on return"""
+        with self._pool_lock:
+            old_pool, self._pool = self._pool, pool
+        if old_pool is not None:
+            try:
+                old_pool.close_all()
+            except Exception as e:
+                logger.debug(f"Error closing SQL Server connection pool: {e}")
+
+    @contextmanager
+    def _borrow_connection(self):
+        """
+        Check out a connection for one query.
+
+        Uses the pool when one is open; otherwise falls back to the single
+        shared connection, serialized so concurrent threads never interleave
+        statements on it.
+        """
+        pool = self._pool
+        if pool is not None:
+            with pool.get_connection() as conn:
+                yield conn
+            return
+
+        if not self.connection:
+            raise DatabaseConnectionError(DB_NOT_CONNECTED_MSG)
+        with self._connection_lock:
+            yield self.connection
+
+    @contextmanager
+    def _borrow_stream_connection(self):
+        """
+        Check out a connection for a long-running streamed read.
+
+        Uses the pool when one is open; otherwise opens a dedicated connection
+        for the stream, so it never holds the shared connection (and with it
+        every realtime lookup) for the length of the read.
+        """
+        pool = self._pool
+        if pool is not None:
+            with pool.get_connection() as conn:
+                yield conn
+            return
+
+        if not self.connection or not self.config:
+            raise DatabaseConnectionError(DB_NOT_CONNECTED_MSG)
+        try:
+            conn = SQLServerConnectionBuilder.create_optimized_connection(
+                host=str(self.config["host"]),
+                database=str(self.config["database"]),
+                port=self._normalize_port_value(self.config.get("port")),
+                user=str(self.config["user"]) if self.config.get("user") else None,
+                password=str(self.config["password"]) if self.config.get("password") else None,
+                timeout=15,
+            )
+        except Exception as e:
+            raise DatabaseConnectionError(f"Failed to open streaming connection: {str(e)}")
+        try:
+            yield conn
+        finally:
+            try:
+                conn.close()
+            except Exception as e:
+                logger.debug(f"Error closing streaming connection: {e}")
+
+    def get_pool_stats(self) -> Optional[dict[str, Any]]:
+        """Connection pool statistics, or None when running on the shared connection"""
+        return self._pool.get_stats() if self._pool is not None else None
+
     def disconnect(self):
-        if self.connection:
-            self.connection.close()
-            self.connection = None
+        self._close_pool()
+        with self._connection_lock:
+            connection, self.connection = self.connection, None
+        if connection:
+            connection.close()
             logger.info("Disconnected from SQL Server")
         self._reset_dynamic_metadata()
 
@@ -515,16 +715,17 @@ class SQLServerConnector:
 
     def _validate_connection(self) -> bool:
         """Validate if current connection is working"""
-        if not self.connection:
-            return False
-        try:
-            cursor = self.connection.cursor()
-            cursor.execute("SELECT 1")
-            cursor.fetchone()
-            cursor.close()
-            return True
-        except Exception:
-            return False
+        with self._connection_lock:
+            if not self.connection:
+                return False
+            try:
+                cursor = self.connection.cursor()
+                cursor.execute("SELECT 1")
+                cursor.fetchone()
+                cursor.close()
+                return True
+            except Exception:
+                return False
 
     def _attempt_reconnect_on_failure(self) -> bool:
         """Attempt to reconnect when connection validation fails"""
@@ -559,6 +760,17 @@ class SQLServerConnector:
         if not cursor.description or not row:
             return {}
         columns = [column[0] for column in cursor.description]
+        return self._row_to_dict(columns, row)
+
+    def _rows_to_dicts(self, cursor, rows) -> list[dict[str, Any]]:
+        """Convert a batch of pyodbc rows, reading the column list only once"""
+        if not cursor.description:
+            return []
+        columns = [column[0] for column in cursor.description]
+        return [self._row_to_dict(columns, row) for row in rows if row]
+
+    @staticmethod
+    def _row_to_dict(columns: list[str], row) -> dict[str, Any]:
         result = dict(zip(columns, row))
 
         # Synthesize image URL if item_name exists
@@ -578,26 +790,27 @@ class SQLServerConnector:
             raise DatabaseConnectionError(DB_NOT_CONNECTED_MSG)
 
         try:
-            cursor = self.connection.cursor()
+            with self._borrow_connection() as conn:
+                cursor = conn.cursor()
 
-            # Use the predefined query template with optional metadata
-            query = self._get_formatted_query("get_item_by_barcode")
+                # Use the predefined query template with optional metadata
+                query = self._get_formatted_query(conn, "get_item_by_barcode")
 
-            logger.info(f"Searching for barcode: {barcode}")
+                logger.info(f"Searching for barcode: {barcode}")
 
-            # Execute with barcode - query template has single %s placeholder
-            cursor.execute(query, (barcode,))
-            row = cursor.fetchone()
+                # Execute with barcode - query template has single %s placeholder
+                cursor.execute(query, (barcode,))
+                row = cursor.fetchone()
 
-            if row:
-                result = self._cursor_to_dict(cursor, row)
-                cursor.close()
-                logger.info(f"Found item: {result.get('item_name')}")
-                return result
-            else:
-                cursor.close()
-                logger.warning(f"No item found for barcode: {barcode}")
-                return None
+                if row:
+                    result = self._cursor_to_dict(cursor, row)
+                    cursor.close()
+                    logger.info(f"Found item: {result.get('item_name')}")
+                    return result
+                else:
+                    cursor.close()
+                    logger.warning(f"No item found for barcode: {barcode}")
+                    return None
 
         except Exception as e:
             logger.error(f"Error fetching item by barcode: {str(e)}")
@@ -606,28 +819,54 @@ class SQLServerConnector:
     def get_all_items(self) -> list[dict[str, Any]]:
         """
         Fetch all active items from E_MART_KITCHEN_CARE ERP
-        Limited to 1000 items for performance
-        """
-        if not self.connection:
-            raise DatabaseConnectionError(DB_NOT_CONNECTED_MSG)
 
-        try:
-            cursor = self.connection.cursor()
-            query = self._get_formatted_query("get_all_items")
+        Materializes the whole catalogue; prefer iter_all_items() for sync jobs.
+        """
+        results: list[dict[str, Any]] = []
+        for chunk in self.iter_all_items():
+            results.extend(chunk)
 
-            cursor.execute(query)
-            rows = cursor.fetchall()
+        logger.info(f"Retrieved {len(results)} items from ERP")
+        return results
 
-            # Convert rows to dictionaries (before closing cursor)
-            results = [self._cursor_to_dict(cursor, row) for row in rows]
-            cursor.close()
+    def iter_all_items(
+        self, chunk_size: int = DEFAULT_FETCH_CHUNK_SIZE
+    ) -> Iterator[list[dict[str, Any]]]:
+        """
+        Stream all active items from the ERP in chunks using fetchmany.
 
-            logger.info(f"Retrieved {len(results)} items from ERP")
-            return results
+        Only one chunk of rows is held in memory at a time. The cursor and its
+        connection stay checked out until the generator is exhausted or
+        closed, so consume it from a single thread at a time. Without a pool
+        the stream runs on its own connection rather than the shared one.
+        """
+        if not self.connection:
+            raise DatabaseConnectionError(DB_NOT_CONNECTED_MSG)
 
-        except Exception as e:
-            logger.error(f"Error fetching all items: {str(e)}")
-            raise DatabaseQueryError(f"Failed to fetch all items: {str(e)}")
+        with self._borrow_stream_connection() as conn:
+            try:
+                cursor = conn.cursor()
+                query = self._get_formatted_query(conn, "get_all_items")
+                cursor.execute(query)
+            except Exception as e:
+                logger.error(f"Error fetching all items: {str(e)}")
+                raise DatabaseQueryError(f"Failed to fetch all items: {str(e)}")
+
+            total = 0
+            try:
+                while True:
+                    try:
+                        rows = cursor.fetchmany(chunk_size)
+                    except Exception as e:
+                        logger.error(f"Error fetching all items after {total} rows: {str(e)}")
+                        raise DatabaseQueryError(f"Failed to fetch all items: {str(e)}")
+                    if not rows:
+                        break
+                    total += len(rows)
+                    yield self._rows_to_dicts(cursor, rows)
+            finally:
+                cursor.close()
+                logger.debug(f"Streamed {total} items from ERP")
 
     def search_items(self, search_term: str) -> list[dict[str, Any]]:
         """
@@ -638,38 +877,39 @@ class SQLServerConnector:
             raise DatabaseConnectionError(DB_NOT_CONNECTED_MSG)
 
         try:
-            cursor = self.connection.cursor()
-
-            # Get the query template
-            query = self._get_formatted_query("search_items")
-            search_pattern = f"%{search_term}%"
-
-            # Execute with all 10 parameters:
-            # - 7 for WHERE clause
-            # - 3 for ORDER BY CASE expressions
-            cursor.execute(
-                query,
-                (
-                    search_pattern,  # WHERE: ProductName LIKE
-                    search_pattern,  # WHERE: ProductCode LIKE
-                    search_pattern,  # WHERE: ItemAlias LIKE
-                    search_pattern,  # WHERE: MannualBarcode LIKE
-                    search_pattern,  # WHERE: PBC.Barcode LIKE
-                    search_pattern,  # WHERE: AutoBarcode LIKE
-                    search_pattern,  # WHERE: GroupName LIKE
-                    search_pattern,  # ORDER BY: ProductName LIKE
-                    search_pattern,  # ORDER BY: ProductCode LIKE
-                    search_pattern,  # ORDER BY: ItemAlias LIKE
-                ),
-            )
-            rows = cursor.fetchall()
+            with self._borrow_connection() as conn:
+                cursor = conn.cursor()
+
+                # Get the query template
+                query = self._get_formatted_query(conn, "search_items")
+                search_pattern = f"%{search_term}%"
+
+                # Execute with all 10 parameters:
+                # - 7 for WHERE clause
+                # - 3 for ORDER BY CASE expressions
+                cursor.execute(
+                    query,
+                    (
+                        search_pattern,  # WHERE: ProductName LIKE
+                        search_pattern,  # WHERE: ProductCode LIKE
+                        search_pattern,  # WHERE: ItemAlias LIKE
+                        search_pattern,  # WHERE: MannualBarcode LIKE
+                        search_pattern,  # WHERE: PBC.Barcode LIKE
+                        search_pattern,  # WHERE: AutoBarcode LIKE
+                        search_pattern,  # WHERE: GroupName LIKE
+                        search_pattern,  # ORDER BY: ProductName LIKE
+                        search_pattern,  # ORDER BY: ProductCode LIKE
+                        search_pattern,  # ORDER BY: ItemAlias LIKE
+                    ),
+                )
+                rows = cursor.fetchall()
 
-            # Convert rows to dictionaries (before closing cursor)
-            results = [self._cursor_to_dict(cursor, row) for row in rows]
-            cursor.close()
+                # Convert rows to dictionaries (before closing cursor)
+                results = [self._cursor_to_dict(cursor, row) for row in rows]
+                cursor.close()
 
-            logger.info(f"Found {len(results)} items matching '{search_term}'")
-            return results
+                logger.info(f"Found {len(results)} items matching '{search_term}'")
+                return results
 
         except Exception as e:
             logger.error(f"Error searching items: {str(e)}")
@@ -684,18 +924,19 @@ class SQLServerConnector:
             raise DatabaseConnectionError(DB_NOT_CONNECTED_MSG)
 
         try:
-            cursor = self.connection.cursor()
-            query = self._get_formatted_query("get_item_batches")
+            with self._borrow_connection() as conn:
+                cursor = conn.cursor()
+                query = self._get_formatted_query(conn, "get_item_batches")
 
-            cursor.execute(query, (item_identifier, item_identifier))
-            rows = cursor.fetchall()
+                cursor.execute(query, (item_identifier, item_identifier))
+                rows = cursor.fetchall()
 
-            # Convert rows to dictionaries (before closing cursor)
-            results = [self._cursor_to_dict(cursor, row) for row in rows]
-            cursor.close()
+                # Convert rows to dictionaries (before closing cursor)
+                results = [self._cursor_to_dict(cursor, row) for row in rows]
+                cursor.close()
 
-            logger.info(f"Found {len(results)} batches for item '{item_identifier}'")
-            return results
+                logger.info(f"Found {len(results)} batches for item '{item_identifier}'")
+                return results
 
         except Exception as e:
             logger.error(f"Error fetching item batches: {str(e)}")
@@ -709,25 +950,26 @@ class SQLServerConnector:
             raise DatabaseConnectionError(DB_NOT_CONNECTED_MSG)
 
         try:
-            cursor = self.connection.cursor()
+            with self._borrow_connection() as conn:
+                cursor = conn.cursor()
 
-            # Use the predefined query template
-            query = self._get_formatted_query("get_item_by_code")
+                # Use the predefined query template
+                query = self._get_formatted_query(conn, "get_item_by_code")
 
-            logger.info(f"Searching for item code: {item_code}")
+                logger.info(f"Searching for item code: {item_code}")
 
-            cursor.execute(query, (item_code,))
-            row = cursor.fetchone()
+                cursor.execute(query, (item_code,))
+                row = cursor.fetchone()
 
-            if row:
-                result = self._cursor_to_dict(cursor, row)
-                cursor.close()
-                logger.info(f"Found item: {result.get('item_name')}")
-                return result
-            else:
-                cursor.close()
-                logger.warning(f"No item found for item code: {item_code}")
-                return None
+                if row:
+                    result = self._cursor_to_dict(cursor, row)
+                    cursor.close()
+                    logger.info(f"Found item: {result.get('item_name')}")
+                    return result
+                else:
+                    cursor.close()
+                    logger.warning(f"No item found for item code: {item_code}")
+                    return None
 
         except Exception as e:
             logger.error(f"Error fetching item by code: {str(e)}")
@@ -739,13 +981,14 @@ class SQLServerConnector:
             raise DatabaseConnectionError(DB_NOT_CONNECTED_MSG)
 
         try:
-            cursor = self.connection.cursor()
-            query = self._get_formatted_query("get_all_warehouses")
-            cursor.execute(query)
-            rows = cursor.fetchall()
-            results = [self._cursor_to_dict(cursor, row) for row in rows]
-            cursor.close()
-            return results
+            with self._borrow_connection() as conn:
+                cursor = conn.cursor()
+                query = self._get_formatted_query(conn, "get_all_warehouses")
+                cursor.execute(query)
+                rows = cursor.fetchall()
+                results = [self._cursor_to_dict(cursor, row) for row in rows]
+                cursor.close()
+                return results
         except Exception as e:
             logger.error(f"Error fetching warehouses: {str(e)}")
             raise DatabaseQueryError(f"Failed to fetch warehouses: {str(e)}")
@@ -756,13 +999,14 @@ class SQLServerConnector:
             raise DatabaseConnectionError(DB_NOT_CONNECTED_MSG)
 
         try:
-            cursor = self.connection.cursor()
-            query = self._get_formatted_query("get_all_zones")
-            cursor.execute(query)
-            rows = cursor.fetchall()
-            results = [self._cursor_to_dict(cursor, row) for row in rows]
-            cursor.close()
-            return results
+            with self._borrow_connection() as conn:
+                cursor = conn.cursor()
+                query = self._get_formatted_query(conn, "get_all_zones")
+                cursor.execute(query)
+                rows = cursor.fetchall()
+                results = [self._cursor_to_dict(cursor, row) for row in rows]
+                cursor.close()
+                return results
         except Exception as e:
             logger.error(f"Error fetching zones: {str(e)}")
             raise DatabaseQueryError(f"Failed to fetch zones: {str(e)}")
@@ -788,41 +1032,71 @@ class SQLServerConnector:
         item_codes = item_codes[:500]
 
         try:
-            cursor = self.connection.cursor()
-            mapping = self.mapping
-            schema = mapping["query_options"].get("schema_name", "dbo")
-            table_name = mapping["tables"]["items"]
-            joins = "\n".join(mapping["query_options"].get("join_tables", []))
-            additional_where = mapping["query_options"].get("where_clause_additions", "")
-            code_column = mapping["items_columns"]["item_code"]
-            columns = self._build_column_list()
-
-            # Build IN clause with parameterized placeholders
-            placeholders = ", ".join("?" for _ in item_codes)
-
-            # Build query with IN clause
-            query = f"""
-                SELECT {columns}
-                    {self.optional_columns_clause}
-                FROM [{schema}].[{table_name}] I
-                {joins}
-                {self.optional_joins_clause}
-                WHERE {code_column} IN ({placeholders})
-                {additional_where}
-            """
-
-            cursor.execute(query, item_codes)
-            rows = cursor.fetchall()
-            results = [self._cursor_to_dict(cursor, row) for row in rows]
-            cursor.close()
+            with self._borrow_connection() as conn:
+                cursor = conn.cursor()
+                mapping = self.mapping
+                schema = mapping["query_options"].get("schema_name", "dbo")
+                table_name = mapping["tables"]["items"]
+                joins = "\n".join(mapping["query_options"].get("join_tables", []))
+                additional_where = mapping["query_options"].get("where_clause_additions", "")
+                code_column = mapping["items_columns"]["item_code"]
+                columns = self._build_column_list()
+
+                # Build IN clause with parameterized placeholders
+                placeholders = ", ".join("?" for _ in item_codes)
+
+                # Build query with IN clause
+                query = f"""
+                    SELECT {columns}
+                        {self.optional_columns_clause}
+                    FROM [{schema}].[{table_name}] I
+                    {joins}
+                    {self.optional_joins_clause}
+                    WHERE {code_column} IN ({placeholders})
+                    {additional_where}
+                """
+
+                cursor.execute(query, item_codes)
+                rows = cursor.fetchall()
+                results = [self._cursor_to_dict(cursor, row) for row in rows]
+                cursor.close()
 
-            logger.info(f"Retrieved {len(results)} items by codes (requested: {len(item_codes)})")
-            return results
+                logger.info(
+                    f"Retrieved {len(results)} items by codes (requested: {len(item_codes)})"
+                )
+                return results
 
         except Exception as e:
             logger.error(f"Error fetching items by codes: {str(e)}")
             raise DatabaseQueryError(f"Failed to fetch items by codes: {str(e)}")
 
+    def execute_query(
+        self, query: str, params: Optional[Sequence[Any]] = None
+    ) -> list[dict[str, Any]]:
+        """
+        Run a parameterized read query and return its rows as dictionaries.
+
+        Args:
+            query: SQL text with ``?`` placeholders
+            params: Values for the placeholders
+
+        Returns:
+            List of row dictionaries keyed by column alias
+        """
+        if not self.connection:
+            raise DatabaseConnectionError(DB_NOT_CONNECTED_MSG)
+
+        try:
+            with self._borrow_connection() as conn:
+                cursor = conn.cursor()
+                cursor.execute(query, list(params or []))
+                results = self._rows_to_dicts(cursor, cursor.fetchall())
+                cursor.close()
+                return results
+        except Exception as e:
+            logger.error(f"Error executing query: {str(e)}")
+            raise DatabaseQueryError(f"Failed to execute query: {str(e)}")
+
     def get_item_quantities_only(self, item_codes: list[str]) -> dict[str, float]:
         """
         Fetch ONLY quantities for multiple items - minimal SQL load.
@@ -844,35 +1118,36 @@ class SQLServerConnector:
         item_codes = item_codes[:1000]
 
         try:
-            cursor = self.connection.cursor()
-            mapping = self.mapping
-            schema = mapping["query_options"].get("schema_name", "dbo")
-            table_name = mapping["tables"]["items"]
-            code_column = mapping["items_columns"]["item_code"]
-            qty_column = mapping["items_columns"]["stock_qty"]
-
-            # Build minimal query - only fetch code and qty
-            placeholders = ", ".join("?" for _ in item_codes)
-
-            query = f"""
-                SELECT {code_column} as item_code, {qty_column} as stock_qty
-                FROM [{schema}].[{table_name}]
-                WHERE {code_column} IN ({placeholders})
-            """
-
-            cursor.execute(query, item_codes)
-            rows = cursor.fetchall()
+            with self._borrow_connection() as conn:
+                cursor = conn.cursor()
+                mapping = self.mapping
+                schema = mapping["query_options"].get("schema_name", "dbo")
+                table_name = mapping["tables"]["items"]
+                code_column = mapping["items_columns"]["item_code"]
+                qty_column = mapping["items_columns"]["stock_qty"]
+
+                # Build minimal query - only fetch code and qty
+                placeholders = ", ".join("?" for _ in item_codes)
+
+                query = f"""
+                    SELECT {code_column} as item_code, {qty_column} as stock_qty
+                    FROM [{schema}].[{table_name}]
+                    WHERE {code_column} IN ({placeholders})
+                """
+
+                cursor.execute(query, item_codes)
+                rows = cursor.fetchall()
+
+                # Build result dict
+                results = {}
+                for row in rows:
+                    item_code = row[0]
+                    stock_qty = float(row[1]) if row[1] is not None else 0.0
+                    results[item_code] = stock_qty
 
-            # Build result dict
-            results = {}
-            for row in rows:
-                item_code = row[0]
-                stock_qty = float(row[1]) if row[1] is not None else 0.0
-                results[item_code] = stock_qty
-
-            cursor.close()
-            logger.debug(f"Retrieved quantities for {len(results)} items")
-            return results
+                cursor.close()
+                logger.debug(f"Retrieved quantities for {len(results)} items")
+                return results
 
         except Exception as e:
             logger.error(f"Error fetching item quantities: {str(e)}")
@@ -881,3 +1156,6 @@ class SQLServerConnector:
 
 # Global connector instance
 sql_connector = SQLServerConnector()
+
+# Shared executor lanes for blocking connector calls made from async code
+sql_executor = SQLWorkloadExecutor()
@@ -4,6 +4,8 @@ import pytest
 
 from backend.api.auth import (
     UserRegister,
+    _find_user_by_legacy_scan,
+    _find_user_by_pin,
     check_rate_limit,
     find_user_by_username,
     generate_auth_tokens,
@@ -130,7 +132,7 @@ async def test_register_success(mock_db, mock_refresh_token_service, mock_settin
     )
 
     with (
-        patch("backend.api.auth.get_password_hash") as mock_hash,
+        patch("backend.services.hashing_service.get_password_hash") as mock_hash,
         patch("backend.api.auth.create_access_token") as mock_create_token,
     ):
         mock_hash.return_value = "hashed_password"
@@ -148,3 +150,88 @@ async def test_register_success(mock_db, mock_refresh_token_service, mock_settin
         assert inserted_user["username"] == "newuser"
         assert inserted_user["hashed_password"] == "hashed_password"
         assert inserted_user["role"] == "staff"
+
+
+class _UserPages:
+    """users.find stand-in serving unmigrated users page by page in _id order"""
+
+    def __init__(self, users):
+        self.users = users
+        self.queries = []
+
+    def find(self, query, projection=None):
+        self.queries.append(query)
+        after = query.get("_id", {}).get("$gt", -1)
+        cursor = MagicMock()
+        cursor.sort.return_value = cursor
+
+        async def to_list(length):
+            return [
+                {"_id": user["_id"], "pin_hash": user["pin_hash"]}
+                for user in self.users
+                if user["_id"] > after
+            ][:length]
+
+        cursor.to_list = to_list
+        return cursor
+
+
+@pytest.mark.asyncio
+async def test_legacy_pin_scan_pages_through_every_unmigrated_user(mock_settings):
+    mock_settings.PIN_LEGACY_SCAN_BATCH_SIZE = 4
+    users = [{"_id": i, "username": f"user{i}", "pin_hash": f"hash{i}"} for i in range(10)]
+    pages = _UserPages(users)
+    db = MagicMock()
+    db.users.find.side_effect = pages.find
+    db.users.find_one = AsyncMock(side_effect=lambda query: users[query["_id"]])
+    db.users.update_one = AsyncMock()
+
+    with patch(
+        "backend.services.hashing_service.verify_password",
+        side_effect=lambda pin, hashed: hashed == "hash9",
+    ):
+        found = await _find_user_by_legacy_scan(db, "1234", "lookup")
+
+    assert found is users[9]
+    assert pages.queries[0] == {"pin_hash": {"$exists": True}, "pin_lookup_hash": None}
+    assert [query.get("_id") for query in pages.queries] == [None, {"$gt": 3}, {"$gt": 7}]
+    db.users.update_one.assert_awaited_once_with(
+        {"_id": 9}, {"$set": {"pin_lookup_hash": "lookup"}}
+    )
+
+
+@pytest.mark.asyncio
+async def test_legacy_pin_scan_miss_stops_after_last_page(mock_settings):
+    mock_settings.PIN_LEGACY_SCAN_BATCH_SIZE = 5
+    pages = _UserPages([{"_id": i, "pin_hash": f"hash{i}"} for i in range(5)])
+    db = MagicMock()
+    db.users.find.side_effect = pages.find
+
+    with patch("backend.services.hashing_service.verify_password", return_value=False):
+        assert await _find_user_by_legacy_scan(db, "1234", "lookup") is None
+
+    assert len(pages.queries) == 2
+
+
+@pytest.mark.asyncio
+async def test_legacy_pin_scan_disabled_by_zero_batch_size(mock_settings):
+    mock_settings.PIN_LEGACY_SCAN_BATCH_SIZE = 0
+    db = MagicMock()
+
+    assert await _find_user_by_legacy_scan(db, "1234", "lookup") is None
+    db.users.find.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_legacy_pin_scans_are_rate_limited_per_ip(mock_cache_service, mock_settings):
+    mock_settings.PIN_LEGACY_SCAN_MAX_ATTEMPTS = 3
+    mock_cache_service.get.return_value = 3
+    db = MagicMock()
+    db.users.find_one = AsyncMock(return_value=None)
+
+    result = await _find_user_by_pin(db, "1234", "10.0.0.9")
+
+    assert result.is_err
+    assert isinstance(result._error, RateLimitError)
+    mock_cache_service.get.assert_awaited_once_with("pin_legacy_scans", "10.0.0.9")
+    db.users.find.assert_not_called()
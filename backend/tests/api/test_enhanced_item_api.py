@@ -8,12 +8,14 @@ import pytest
 from fastapi import HTTPException
 
 from backend.api.enhanced_item_api import (
+    _find_item_in_mongo,
     _validate_barcode_format,
     advanced_item_search,
     get_item_by_barcode_enhanced,
     get_unique_locations,
     init_enhanced_api,
 )
+from backend.services.item_lookup_index import item_lookup_index
 
 
 @pytest.fixture(autouse=True)
@@ -229,3 +231,39 @@ async def test_get_unique_locations(setup_mocks):
 
     assert response["floors"] == ["Floor 1", "Floor 2"]
     assert response["racks"] == ["Rack A", "Rack B"]
+
+
+@pytest.mark.asyncio
+async def test_find_item_in_mongo_evicts_stale_index_hit(setup_mocks):
+    mock_db, _, _ = setup_mocks
+    item_lookup_index.clear()
+    item_lookup_index.index_item({"item_code": "ITEM-OLD", "barcode": "510001"})
+
+    # The barcode has since moved to another item
+    moved_item = {"item_code": "ITEM-NEW", "barcode": "510001"}
+    mock_db.erp_items.find_one.side_effect = [
+        {"item_code": "ITEM-OLD", "barcode": "510099"},
+        moved_item,
+    ]
+
+    item = await _find_item_in_mongo("510001")
+
+    assert item == moved_item
+    assert "$or" in mock_db.erp_items.find_one.await_args_list[1].args[0]
+    assert item_lookup_index.resolve("510001") == "ITEM-NEW"
+    assert item_lookup_index.resolve("510099") is None
+    item_lookup_index.clear()
+
+
+@pytest.mark.asyncio
+async def test_find_item_in_mongo_remembers_codes_with_no_item(setup_mocks):
+    mock_db, _, _ = setup_mocks
+    item_lookup_index.clear()
+    mock_db.erp_items.find_one.return_value = None
+
+    assert await _find_item_in_mongo("519999") is None
+    assert await _find_item_in_mongo("519999") is None
+
+    # The second scan is answered without another $regex lookup
+    assert mock_db.erp_items.find_one.await_count == 1
+    item_lookup_index.clear()
@@ -37,7 +37,7 @@ async def test_change_pin_success():
 
     with (
         patch("backend.api.pin_auth_api.PINAuthService") as MockService,
-        patch("backend.api.pin_auth_api.verify_password", return_value=True),
+        patch("backend.services.hashing_service.verify_password", return_value=True),
     ):
         mock_instance = MockService.return_value
         mock_instance.set_pin = AsyncMock(return_value=True)
@@ -151,7 +151,7 @@ async def test_change_pin_service_failure():
 
     with (
         patch("backend.api.pin_auth_api.PINAuthService") as MockService,
-        patch("backend.api.pin_auth_api.verify_password", return_value=True),
+        patch("backend.services.hashing_service.verify_password", return_value=True),
     ):
         mock_instance = MockService.return_value
         mock_instance.set_pin = AsyncMock(return_value=False)
@@ -515,8 +515,8 @@ class TestCompleteSessionEndpoint:
         mock_db = MagicMock()
         mock_db.verification_sessions = MagicMock()
         mock_db.verification_sessions.find_one = AsyncMock(return_value=sample_verification_session)
-        mock_db.verification_sessions.update_one = AsyncMock(
-            return_value=MagicMock(modified_count=1)
+        mock_db.verification_sessions.find_one_and_update = AsyncMock(
+            return_value=mock_db.verification_sessions.find_one.return_value
         )
         mock_db.rack_registry = MagicMock()
 
@@ -616,8 +616,8 @@ class TestUpdateSessionStatusEndpoint:
         mock_db = MagicMock()
         mock_db.verification_sessions = MagicMock()
         mock_db.verification_sessions.find_one = AsyncMock(return_value=sample_verification_session)
-        mock_db.verification_sessions.update_one = AsyncMock(
-            return_value=MagicMock(modified_count=1)
+        mock_db.verification_sessions.find_one_and_update = AsyncMock(
+            return_value=mock_db.verification_sessions.find_one.return_value
         )
 
         async def override_get_db():
@@ -659,8 +659,8 @@ class TestUpdateSessionStatusEndpoint:
         mock_db = MagicMock()
         mock_db.verification_sessions = MagicMock()
         mock_db.verification_sessions.find_one = AsyncMock(return_value=session)
-        mock_db.verification_sessions.update_one = AsyncMock(
-            return_value=MagicMock(modified_count=1)
+        mock_db.verification_sessions.find_one_and_update = AsyncMock(
+            return_value=mock_db.verification_sessions.find_one.return_value
         )
 
         async def override_get_db():
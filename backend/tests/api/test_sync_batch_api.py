@@ -0,0 +1,137 @@
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from bson import ObjectId
+from pymongo.errors import BulkWriteError
+
+from backend.api.sync_batch_api import BatchSyncRequest, SyncRecord, sync_batch, write_records
+from backend.tests.utils.in_memory_db import InMemoryCursor
+
+
+def _record(client_record_id, **overrides):
+    data = {
+        "client_record_id": client_record_id,
+        "session_id": "session-1",
+        "item_code": "ITEM001",
+        "verified_qty": 5,
+        "created_at": "2025-01-01T00:00:00",
+        "updated_at": "2025-01-01T00:00:00",
+    }
+    data.update(overrides)
+    return SyncRecord(**data)
+
+
+@pytest.fixture
+def mock_db():
+    db = MagicMock()
+    db.item_serials.find = MagicMock(return_value=InMemoryCursor([]))
+    db.item_serials.insert_many = AsyncMock()
+    db.verification_records.bulk_write = AsyncMock()
+    return db
+
+
+@pytest.fixture
+def lock_manager():
+    manager = MagicMock()
+    manager.get_rack_lock_owners = AsyncMock(return_value={})
+    return manager
+
+
+@pytest.fixture
+def patched_batch_env(mock_db, lock_manager):
+    breaker = MagicMock()
+    breaker.acquire = AsyncMock(return_value=True)
+    breaker.record_success = AsyncMock()
+    breaker.record_failure = AsyncMock()
+    with (
+        patch("backend.api.sync_batch_api.get_db", return_value=mock_db),
+        patch("backend.api.sync_batch_api.get_lock_manager", return_value=lock_manager),
+        patch("backend.api.sync_batch_api.get_circuit_breaker", AsyncMock(return_value=breaker)),
+        patch("backend.api.sync_batch_api.SyncConflictsService", return_value=None),
+        patch("backend.api.sync_batch_api.batch_rate_limiter.is_allowed", return_value=(True, {})),
+    ):
+        yield
+
+
+@pytest.mark.asyncio
+async def test_sync_batch_resolves_serials_and_locks_in_one_round_trip(
+    patched_batch_env, mock_db, lock_manager
+):
+    existing_id = ObjectId()
+    mock_db.item_serials.find.return_value = InMemoryCursor(
+        [{"_id": existing_id, "serial_number": "S1", "client_record_id": "other"}]
+    )
+    lock_manager.get_rack_lock_owners.return_value = {"R1": "session-1", "R2": "session-9"}
+
+    request = BatchSyncRequest(
+        records=[
+            _record("r1", serial_numbers=["S1"]),
+            _record("r2", serial_numbers=["S2"], rack_id="R1"),
+            _record("r3", serial_numbers=["S2"]),
+            _record("r4", rack_id="R2"),
+            _record("r5", verified_qty=1, damage_qty=2),
+            _record("r6", rack_id="R1"),
+        ]
+    )
+
+    response = await sync_batch(request, current_user={"username": "staff1"}, redis_service=None)
+
+    mock_db.item_serials.find.assert_called_once_with({"serial_number": {"$in": ["S1", "S2"]}})
+    lock_manager.get_rack_lock_owners.assert_awaited_once_with(["R1", "R2", "R1"])
+    mock_db.verification_records.bulk_write.assert_awaited_once()
+    operations = mock_db.verification_records.bulk_write.await_args.args[0]
+    assert len(operations) == 2
+    assert mock_db.verification_records.bulk_write.await_args.kwargs["ordered"] is False
+
+    assert response.ok == ["r2", "r6"]
+    assert [(c.client_record_id, c.conflict_type) for c in response.conflicts] == [
+        ("r1", "duplicate_serial"),
+        ("r3", "duplicate_serial"),
+        ("r4", "rack_locked"),
+        ("r5", "invalid_quantity"),
+    ]
+    assert response.conflicts[0].details["existing_record"] == str(existing_id)
+    # r3 conflicts with the serial r2 claimed earlier in the same batch
+    inserted_serials = mock_db.item_serials.insert_many.await_args.args[0]
+    assert response.conflicts[1].details["existing_record"] == str(inserted_serials[0]["_id"])
+
+
+@pytest.mark.asyncio
+async def test_write_records_maps_bulk_write_errors_to_records(mock_db):
+    mock_db.verification_records.bulk_write.side_effect = BulkWriteError(
+        {"writeErrors": [{"index": 1, "code": 121, "errmsg": "validation failed"}]}
+    )
+    records = [_record("r1"), _record("r2"), _record("r3")]
+
+    failed = await write_records(records, {}, mock_db, "staff1")
+
+    assert failed == {"r2": "validation failed"}
+
+
+@pytest.mark.asyncio
+async def test_write_records_ignores_duplicate_serials(mock_db):
+    mock_db.item_serials.insert_many.side_effect = BulkWriteError(
+        {"writeErrors": [{"index": 0, "code": 11000, "errmsg": "E11000 duplicate key"}]}
+    )
+    records = [_record("r1", serial_numbers=["S1"])]
+    serial_docs = {"r1": [{"serial_number": "S1", "client_record_id": "r1"}]}
+
+    failed = await write_records(records, serial_docs, mock_db, "staff1")
+
+    assert failed == {}
+
+
+@pytest.mark.asyncio
+async def test_write_records_increments_dashboard_kpis_from_previous_state(mock_db):
+    mock_db.verification_records.find = MagicMock(
+        return_value=InMemoryCursor([{"client_record_id": "r1", "status": "verified"}])
+    )
+    mock_db.dashboard_kpis.update_one = AsyncMock()
+    records = [_record("r1", status="partial"), _record("r2", status="pending_review")]
+
+    await write_records(records, {}, mock_db, "staff1")
+
+    mock_db.verification_records.find.assert_called_once()
+    update = mock_db.dashboard_kpis.update_one.await_args.args[1]
+    # r1 was overwritten and left "verified"; r2 is new and awaits review
+    assert update["$inc"] == {"verified_items": -1, "pending_variances": 1}
@@ -91,6 +91,7 @@ def test_websocket_connect_wrong_role(client):
 def test_websocket_manager_broadcast():
     """Test WebSocketManager broadcast logic (unit test without full client)."""
     import asyncio
+    import json
     from unittest.mock import AsyncMock
 
     # Mock websockets
@@ -104,11 +105,17 @@ def test_websocket_manager_broadcast():
     # Test broadcast_to_session
     message = {"type": "update", "data": "test"}
 
-    # We need to run the async method
+    # We need to run the async method; flush waits for the queued sends
+    async def broadcast():
+        await manager.broadcast_to_session(message, "session1")
+        await manager.flush()
+        manager.disconnect(ws1, "user1", "session1")
+        manager.disconnect(ws2, "user2", "session1")
+
     loop = asyncio.new_event_loop()
-    loop.run_until_complete(manager.broadcast_to_session(message, "session1"))
+    loop.run_until_complete(broadcast())
     loop.close()
 
-    # Verify send_json called
-    ws1.send_json.assert_called_with(message)
-    ws2.send_json.assert_called_with(message)
+    # Verify the message was sent, serialized once as JSON text
+    assert json.loads(ws1.send_text.call_args.args[0]) == message
+    assert json.loads(ws2.send_text.call_args.args[0]) == message
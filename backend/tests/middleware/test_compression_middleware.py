@@ -0,0 +1,91 @@
+import gzip
+
+import pytest
+from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse, StreamingResponse
+from fastapi.testclient import TestClient
+
+from backend.middleware import compression_middleware
+from backend.middleware.compression_middleware import CompressionMiddleware
+
+BODY = "stock count line\n" * 500
+
+
+@pytest.fixture
+def client():
+    app = FastAPI()
+    app.add_middleware(CompressionMiddleware)
+
+    @app.get("/json")
+    async def large_json():
+        return {"rows": [BODY]}
+
+    @app.get("/small")
+    async def small():
+        return {"ok": True}
+
+    @app.get("/stream")
+    async def stream():
+        async def chunks():
+            for _ in range(5):
+                yield BODY
+
+        return StreamingResponse(chunks(), media_type="text/csv")
+
+    @app.get("/events")
+    async def events():
+        return StreamingResponse(iter(["data: 1\n\n"]), media_type="text/event-stream")
+
+    @app.get("/precompressed")
+    async def precompressed():
+        return PlainTextResponse(gzip.compress(BODY.encode()), headers={"Content-Encoding": "gzip"})
+
+    return TestClient(app)
+
+
+def test_gzip_when_only_gzip_accepted(client):
+    response = client.get("/json", headers={"Accept-Encoding": "gzip"})
+
+    assert response.headers["content-encoding"] == "gzip"
+    assert "Accept-Encoding" in response.headers["vary"]
+    assert response.json() == {"rows": [BODY]}
+
+
+@pytest.mark.skipif(compression_middleware.brotli is None, reason="brotli not installed")
+def test_brotli_preferred_when_accepted(client):
+    response = client.get("/json", headers={"Accept-Encoding": "gzip, br"})
+
+    assert response.headers["content-encoding"] == "br"
+    assert response.json() == {"rows": [BODY]}
+
+
+def test_rejected_encoding_is_not_used(client):
+    response = client.get("/json", headers={"Accept-Encoding": "br;q=0, zstd;q=0, gzip"})
+    assert response.headers["content-encoding"] == "gzip"
+
+    response = client.get("/json", headers={"Accept-Encoding": "identity"})
+    assert "content-encoding" not in response.headers
+
+
+def test_small_and_precompressed_bodies_untouched(client):
+    small = client.get("/small", headers={"Accept-Encoding": "gzip"})
+    assert "content-encoding" not in small.headers
+
+    precompressed = client.get("/precompressed", headers={"Accept-Encoding": "gzip"})
+    assert precompressed.headers["content-encoding"] == "gzip"
+    assert precompressed.text == BODY
+
+
+def test_streaming_body_compressed_without_buffering(client):
+    response = client.get("/stream", headers={"Accept-Encoding": "gzip"})
+
+    assert response.headers["content-encoding"] == "gzip"
+    assert "content-length" not in response.headers
+    assert response.text == BODY * 5
+
+
+def test_event_stream_never_compressed(client):
+    response = client.get("/events", headers={"Accept-Encoding": "gzip"})
+
+    assert "content-encoding" not in response.headers
+    assert response.text == "data: 1\n\n"
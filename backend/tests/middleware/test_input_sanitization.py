@@ -0,0 +1,35 @@
+from fastapi import Body, FastAPI
+from fastapi.testclient import TestClient
+
+from backend.middleware.input_sanitization import InputSanitizationMiddleware
+
+app = FastAPI()
+app.add_middleware(InputSanitizationMiddleware)
+
+
+@app.post("/echo")
+async def echo(payload: dict = Body(...)):
+    return payload
+
+
+client = TestClient(app)
+
+
+def test_clean_body_reaches_endpoint_intact():
+    response = client.post("/echo", json={"item_code": "A-100", "qty": 3})
+
+    assert response.status_code == 200
+    assert response.json() == {"item_code": "A-100", "qty": 3}
+
+
+def test_dangerous_body_is_blocked():
+    response = client.post("/echo", json={"remark": "<script>alert(1)</script>"})
+
+    assert response.status_code == 400
+    assert response.json()["error"] == "Invalid input detected"
+
+
+def test_dangerous_query_is_blocked():
+    response = client.post("/echo?q=1%20or%201=1", json={})
+
+    assert response.status_code == 400
@@ -4,13 +4,14 @@ Tests caching functionality with both Redis and fallback in-memory cache
 """
 
 import json
+import time
 from datetime import datetime
 from unittest.mock import AsyncMock, patch
 
 import pytest
 from bson import ObjectId
 
-from backend.services.cache_service import CacheService, CustomJSONEncoder
+from backend.services.cache_service import CacheService, CustomJSONEncoder, MemoryCacheTier
 
 
 class TestCustomJSONEncoder:
@@ -118,3 +119,61 @@ class TestCacheServiceWithRedis:
             # Should not raise, should fallback gracefully
             # The important thing is it doesn't crash the app
             _ = await service.get("test", "any_key")
+
+
+class TestMemoryCacheTier:
+    """Tests for the in-memory LRU/TTL tier"""
+
+    def test_evicts_least_recently_used(self):
+        tier = MemoryCacheTier(max_items=2)
+        tier.set("a", 1, ttl=60)
+        tier.set("b", 2, ttl=60)
+        assert tier.get("a") == 1  # "b" is now least recently used
+        tier.set("c", 3, ttl=60)
+
+        assert tier.get("b") is None
+        assert tier.get("a") == 1
+        assert tier.get("c") == 3
+        assert tier.get_stats()["evictions"] == 1
+
+    def test_respects_byte_budget(self):
+        tier = MemoryCacheTier(max_items=100, max_bytes=200)
+        for i in range(10):
+            tier.set(f"k{i}", "x" * 50, ttl=60)
+
+        stats = tier.get_stats()
+        assert stats["memory_bytes"] <= 200
+        assert stats["evictions"] > 0
+        assert tier.get("k9") == "x" * 50
+        assert tier.set("huge", "x" * 500, ttl=60) is False
+
+    def test_expired_entries_count_as_misses(self):
+        tier = MemoryCacheTier()
+        tier.set("a", {"n": 1}, ttl=60)
+        with patch("backend.services.cache_service.time.time", return_value=time.time() + 61):
+            assert tier.get("a") is None
+
+        stats = tier.get_stats()
+        assert stats["expirations"] == 1
+        assert stats["misses"] == 1
+        assert stats["items"] == 0
+        assert stats["memory_bytes"] == 0
+
+    @pytest.mark.asyncio
+    async def test_cache_service_returns_independent_json_normalized_copies(self):
+        with patch("backend.services.cache_service.REDIS_AVAILABLE", False):
+            service = CacheService()
+        oid = ObjectId()
+        await service.set("items", "1", {"_id": oid, "tags": ["a"]}, ttl=60)
+
+        first = await service.get("items", "1")
+        first["tags"].append("mutated")
+        second = await service.get("items", "1")
+        await service.get("items", "missing")
+
+        assert second == {"_id": str(oid), "tags": ["a"]}
+        stats = await service.get_stats()
+        assert stats["backend"] == "memory"
+        assert stats["hits"] == 2
+        assert stats["misses"] == 1
+        assert stats["hit_rate"] == pytest.approx(66.67)
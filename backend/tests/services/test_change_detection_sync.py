@@ -0,0 +1,134 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+from services.change_detection_sync import (
+    CAPTURE_HASH,
+    CAPTURE_ROWVERSION,
+    ChangeDetectionSyncService,
+)
+
+from backend.tests.utils.in_memory_db import InMemoryCursor
+
+
+def _mapping(**query_options) -> dict:
+    return {
+        "tables": {"items": "Products"},
+        "items_columns": {"item_code": "ProductCode", "item_name": "ProductName"},
+        "query_options": {"schema_name": "dbo", **query_options},
+    }
+
+
+def _make_service(mapping: dict, watermark: dict | None = None, stored_hashes=()):
+    sql_connector = Mock()
+    sql_connector.mapping = mapping
+    bulk_result = SimpleNamespace(matched_count=0, modified_count=0, upserted_count=1)
+    mongo_db = SimpleNamespace(
+        products=SimpleNamespace(bulk_write=AsyncMock(return_value=bulk_result)),
+        sync_watermarks=SimpleNamespace(
+            find_one=AsyncMock(return_value=watermark), update_one=AsyncMock()
+        ),
+        sync_row_hashes=SimpleNamespace(
+            find=Mock(return_value=InMemoryCursor(list(stored_hashes))), bulk_write=AsyncMock()
+        ),
+    )
+    service = ChangeDetectionSyncService(sql_connector, mongo_db, batch_size=2)
+    return service, sql_connector, mongo_db
+
+
+def _saved_watermarks(mongo_db) -> list[dict]:
+    return [call.args[1]["$set"] for call in mongo_db.sync_watermarks.update_one.await_args_list]
+
+
+@pytest.mark.asyncio
+async def test_rowversion_capture_reads_keyset_chunks_below_the_active_rowversion():
+    service, sql_connector, mongo_db = _make_service(
+        _mapping(rowversion_column="RowVer"),
+        watermark={"_id": "Products", "mode": CAPTURE_ROWVERSION, "rowversion": 2},
+    )
+    sql_connector.execute_query.side_effect = [
+        [{"upper_bound": 10}],
+        [
+            {"item_code": "A", "item_name": "Apple", "row_version": 3},
+            {"item_code": "B", "item_name": "Bread", "row_version": 5},
+        ],
+        [{"item_code": "C", "item_name": "Cheese", "row_version": 9}],
+    ]
+
+    result = await service.sync_changed_items()
+
+    assert result["status"] == "success"
+    assert result["items_checked"] == 3
+    params = [call.args[1] for call in sql_connector.execute_query.call_args_list[1:]]
+    assert params == [[2, 2, 10], [2, 5, 10]]
+    assert mongo_db.products.bulk_write.await_count == 2
+    upsert = mongo_db.products.bulk_write.await_args_list[0].args[0][0]
+    assert upsert._filter == {"item_code": "A"}
+    assert upsert._upsert is True
+
+    saved = _saved_watermarks(mongo_db)
+    assert [w.get("rowversion") for w in saved[:2]] == [5, 9]
+    assert "synced_through" in saved[-1]
+    assert service.get_stats()["capture_mode"] == CAPTURE_ROWVERSION
+
+
+@pytest.mark.asyncio
+async def test_hash_capture_pulls_only_rows_whose_hash_changed():
+    service, sql_connector, mongo_db = _make_service(
+        _mapping(), stored_hashes=[{"_id": "Products:A", "hash": "aa"}]
+    )
+    sql_connector.execute_query.side_effect = [
+        [
+            {"item_code": "A", "row_hash": bytes.fromhex("aa")},
+            {"item_code": "B", "row_hash": b"\x01"},
+        ],
+        [{"item_code": "B", "item_name": "Bread"}],
+        [],
+    ]
+
+    await service.sync_changed_items()
+
+    keys_query, keys = sql_connector.execute_query.call_args_list[1].args
+    assert "IN (?)" in keys_query
+    assert keys == ["B"]
+    hash_ops = mongo_db.sync_row_hashes.bulk_write.await_args.args[0]
+    assert [op._filter for op in hash_ops] == [{"_id": "Products:B"}]
+    saved = _saved_watermarks(mongo_db)
+    assert saved[0]["mode"] == CAPTURE_HASH
+    assert saved[0]["resume_key"] == "B"
+    assert saved[-1]["resume_key"] is None
+
+
+@pytest.mark.asyncio
+async def test_lag_is_measured_from_the_previous_capture_snapshot():
+    synced_through = datetime.utcnow() - timedelta(seconds=90)
+    service, sql_connector, _ = _make_service(
+        _mapping(rowversion_column="RowVer"),
+        watermark={"mode": CAPTURE_ROWVERSION, "rowversion": 0, "synced_through": synced_through},
+    )
+    sql_connector.execute_query.side_effect = [
+        [{"upper_bound": 4}],
+        [{"item_code": "A", "item_name": "Apple", "row_version": 4}],
+    ]
+
+    result = await service.sync_changed_items()
+
+    assert result["lag_seconds"] >= 90
+    stats = service.get_stats()
+    assert stats["last_lag_seconds"] >= 90
+    assert stats["watermark_age_seconds"] < 90
+
+
+@pytest.mark.asyncio
+async def test_failed_capture_keeps_watermark_and_counts_failure():
+    service, sql_connector, mongo_db = _make_service(_mapping(rowversion_column="RowVer"))
+    sql_connector.execute_query.side_effect = RuntimeError("connection reset")
+
+    result = await service.sync_changed_items()
+
+    assert result["status"] == "error"
+    mongo_db.sync_watermarks.update_one.assert_not_awaited()
+    assert service.get_stats()["failed_syncs"] == 1
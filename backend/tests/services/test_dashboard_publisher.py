@@ -0,0 +1,116 @@
+"""
+Tests for the shared dashboard SSE publisher
+"""
+
+import asyncio
+import json
+
+import pytest
+
+from backend.services.dashboard_publisher import DashboardPublisher, diff_payload
+
+
+def _event(text: str) -> dict:
+    assert text.startswith("data: ")
+    return json.loads(text[len("data: ") :])
+
+
+class _Source:
+    """Fake report source: payload and write counter are set by the test."""
+
+    def __init__(self):
+        self.payload = {"data": [{"id": "1", "qty": 1}], "summary": {"total": 1}}
+        self.writes = 0
+        self.computed = 0
+
+    async def compute(self, params):
+        self.computed += 1
+        return {**self.payload, "summary": {**self.payload["summary"], "generated_at": "now"}}
+
+    async def probe(self):
+        return self.writes
+
+
+def test_diff_payload_reports_changed_and_removed_fields():
+    old = {"summary": {"total": 1, "verified": 0, "generated_at": "a"}, "data": [1], "x": 1}
+    new = {"summary": {"total": 2, "verified": 0, "generated_at": "b"}, "data": [1]}
+
+    changes, removed = diff_payload(old, new)
+
+    assert changes == {"summary": {"total": 2}}
+    assert removed == ["x"]
+    assert diff_payload(new, {**new, "summary": {**new["summary"], "generated_at": "c"}}) == (
+        {},
+        [],
+    )
+
+
+@pytest.mark.asyncio
+async def test_subscribers_share_one_computation_and_receive_deltas():
+    source = _Source()
+    publisher = DashboardPublisher(source.compute, source.probe)
+    params = {"page": 1, "page_size": 50}
+
+    stream_a = publisher.subscribe(params, interval=0.01)
+    stream_b = publisher.subscribe(params, interval=0.01)
+    first_a = _event(await stream_a.__anext__())
+    first_b = _event(await stream_b.__anext__())
+
+    assert first_a["type"] == first_b["type"] == "data"
+    assert first_a["payload"]["summary"]["total"] == 1
+    assert publisher.get_stats()["feeds"] == 1
+
+    # Nothing written: ticks are skipped without recomputing
+    await asyncio.sleep(0.05)
+    assert source.computed == 1
+    assert publisher.get_stats()["skipped_ticks"] > 0
+
+    source.payload = {"data": [{"id": "1", "qty": 1}], "summary": {"total": 2}}
+    source.writes += 1
+    delta_a = _event(await stream_a.__anext__())
+    delta_b = _event(await stream_b.__anext__())
+
+    assert delta_a["type"] == "delta"
+    assert delta_a["changes"] == {"summary": {"total": 2}}
+    assert delta_b["changes"] == delta_a["changes"]
+    assert source.computed == 2
+
+    await stream_a.aclose()
+    await stream_b.aclose()
+    assert publisher.get_stats()["feeds"] == 0
+
+
+@pytest.mark.asyncio
+async def test_late_joiner_starts_from_current_snapshot():
+    source = _Source()
+    publisher = DashboardPublisher(source.compute, source.probe)
+    params = {"page": 1, "page_size": 50}
+
+    first = publisher.subscribe(params, interval=0.01)
+    await first.__anext__()
+    late = publisher.subscribe(params, interval=0.01)
+    snapshot = _event(await late.__anext__())
+
+    assert snapshot["type"] == "data"
+    assert snapshot["payload"]["data"] == [{"id": "1", "qty": 1}]
+    assert source.computed == 1
+
+    await first.aclose()
+    await late.aclose()
+
+
+@pytest.mark.asyncio
+async def test_distinct_configs_get_separate_feeds():
+    source = _Source()
+    publisher = DashboardPublisher(source.compute, source.probe)
+
+    page_1 = publisher.subscribe({"page": 1}, interval=0.01)
+    page_2 = publisher.subscribe({"page": 2}, interval=0.01)
+    await page_1.__anext__()
+    await page_2.__anext__()
+
+    assert publisher.get_stats()["feeds"] == 2
+    assert source.computed == 2
+
+    await page_1.aclose()
+    await page_2.aclose()
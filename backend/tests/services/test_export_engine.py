@@ -0,0 +1,52 @@
+from __future__ import annotations
+
+import csv
+import gzip
+import io
+
+import pytest
+
+from backend.services.reporting.export_engine import ExportEngine, gzip_stream, stream_csv
+
+
+async def _collect(chunks) -> bytes:
+    return b"".join([chunk async for chunk in chunks])
+
+
+async def _rows(count: int):
+    for i in range(count):
+        yield {"item_code": f"ITEM{i:04d}", "qty": i}
+
+
+@pytest.mark.asyncio
+async def test_stream_csv_yields_bounded_chunks_from_async_rows() -> None:
+    chunks = [chunk async for chunk in stream_csv(_rows(500), chunk_size=1024)]
+
+    assert len(chunks) > 1
+    assert all(len(chunk) < 2048 for chunk in chunks)
+    parsed = list(csv.reader(io.StringIO(b"".join(chunks).decode("utf-8"))))
+    assert parsed[0] == ["item_code", "qty"]
+    assert parsed[1] == ["ITEM0000", "0"]
+    assert len(parsed) == 501
+
+
+@pytest.mark.asyncio
+async def test_gzip_stream_round_trips() -> None:
+    plain = await _collect(stream_csv(_rows(200)))
+    compressed = await _collect(gzip_stream(stream_csv(_rows(200))))
+
+    assert gzip.decompress(compressed) == plain
+
+
+@pytest.mark.asyncio
+async def test_snapshot_stream_matches_buffered_csv_export() -> None:
+    snapshot = {
+        "name": "Floor 1",
+        "created_at": 1_700_000_000,
+        "created_by": "admin",
+        "summary": {"total": 2},
+        "row_data": [{"item_code": "A", "qty": 1}, {"item_code": "B", "qty": 2}],
+    }
+    engine = ExportEngine()
+
+    assert await _collect(engine.stream_csv(snapshot)) == engine.export_to_csv(snapshot)
@@ -0,0 +1,52 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+
+import pytest
+from services.hashing_service import HashingService
+
+from backend.exceptions import ServiceOverloadedError
+
+
+@pytest.mark.asyncio
+async def test_hashing_runs_off_the_event_loop() -> None:
+    service = HashingService(max_workers=2)
+    loop_thread = threading.get_ident()
+
+    hashed = await service.hash("1234")
+    worker_thread = await service.run(threading.get_ident)
+
+    assert worker_thread != loop_thread
+    assert await service.verify("1234", hashed) is True
+    assert await service.verify("9999", hashed) is False
+    stats = service.get_stats()
+    assert stats["completed"] == 4
+    assert stats["queue_depth"] == 0
+    service.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_login_storm_is_shed_once_queue_is_full() -> None:
+    service = HashingService(max_workers=1, max_queue=2)
+    release = threading.Event()
+
+    # One call occupies the only worker and two more fill the queue
+    blocked = [asyncio.create_task(service.run(release.wait, 5)) for _ in range(3)]
+    await asyncio.sleep(0.05)
+    assert service.get_stats()["queue_depth"] == 2
+
+    with pytest.raises(ServiceOverloadedError) as exc:
+        await service.run(release.wait, 5, shed=True)
+    assert exc.value.status_code == 503
+    assert exc.value.retry_after
+
+    # Non-sheddable callers still queue up behind the storm
+    waiting = asyncio.create_task(service.run(release.wait, 5))
+    release.set()
+    assert await asyncio.gather(*blocked, waiting) == [True] * 4
+
+    stats = service.get_stats()
+    assert stats["shed"] == 1
+    assert stats["peak_queue_depth"] == 3
+    service.shutdown()
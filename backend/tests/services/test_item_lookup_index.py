@@ -0,0 +1,89 @@
+from __future__ import annotations
+
+import time
+
+import pytest
+from services.item_lookup_index import ItemLookupIndex
+
+from backend.tests.utils.in_memory_db import InMemoryCursor
+
+
+def test_resolves_all_barcode_fields_case_insensitively() -> None:
+    index = ItemLookupIndex()
+    index.index_item(
+        {
+            "item_code": "itm-1",
+            "barcode": " 510001 ",
+            "manual_barcode": "abc123",
+            "unit2_barcode": "510002",
+            "unit_m_barcode": None,
+        }
+    )
+
+    assert index.resolve("ITM-1") == "itm-1"
+    assert index.resolve("510001") == "itm-1"
+    assert index.resolve("ABC123") == "itm-1"
+    assert index.resolve("510002 ") == "itm-1"
+    assert index.resolve("999999") is None
+    assert index.get_stats()["misses"] == 1
+
+
+def test_partial_update_replaces_only_changed_codes() -> None:
+    index = ItemLookupIndex()
+    index.index_item({"item_code": "A", "barcode": "111", "manual_barcode": "M1"})
+
+    index.index_item({"item_code": "A", "barcode": "222"})
+
+    assert index.resolve("111") is None
+    assert index.resolve("222") == "A"
+    assert index.resolve("M1") == "A"
+
+    index.remove_item("A")
+    assert index.resolve("222") is None
+    assert index.get_stats()["keys"] == 0
+
+
+def test_item_code_takes_precedence_over_other_items_barcodes() -> None:
+    index = ItemLookupIndex()
+    index.index_item({"item_code": "B", "barcode": "X1"})
+    index.index_item({"item_code": "X1", "barcode": "555"})
+
+    assert index.resolve("x1") == "X1"
+
+
+def test_remembered_misses_expire_and_are_cleared_by_indexing() -> None:
+    index = ItemLookupIndex(miss_ttl=60)
+    index.record_miss(" 999 ")
+    index.record_miss("888")
+
+    assert index.is_known_miss("999")
+    index.index_item({"item_code": "N", "barcode": "999"})
+    assert not index.is_known_miss("999")
+
+    index._misses["888"] = time.monotonic() - 1
+    assert not index.is_known_miss("888")
+    assert index.get_stats()["remembered_misses"] == 0
+
+
+@pytest.mark.asyncio
+async def test_warm_builds_index_from_erp_items() -> None:
+    items = [{"item_code": f"I{n}", "barcode": f"51{n:04d}"} for n in range(50_000)]
+
+    class _Collection:
+        def find(self, _query, _projection):
+            return InMemoryCursor(items)
+
+    class _Db:
+        erp_items = _Collection()
+
+    index = ItemLookupIndex()
+    assert await index.warm(_Db()) == 50_000
+    assert index.is_warm
+
+    timings = []
+    for n in range(0, 50_000, 50):
+        start = time.perf_counter()
+        assert index.resolve(f"51{n:04d}") == f"I{n}"
+        timings.append(time.perf_counter() - start)
+    timings.sort()
+    assert timings[int(len(timings) * 0.99)] < 0.002
@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+import pytest
+from services.item_search_index import ItemSearchIndex
+
+from backend.tests.utils.in_memory_db import InMemoryCursor
+
+
+def _codes(docs: list[dict]) -> list[str]:
+    return [doc["item_code"] for doc in docs]
+
+
+def test_candidates_match_substrings_and_typos_ranked_by_overlap() -> None:
+    index = ItemSearchIndex()
+    index.index_items(
+        [
+            {"item_code": "A1", "item_name": "Basmati Rice 5kg", "barcode": "890100"},
+            {"item_code": "A2", "item_name": "Brown Rice", "barcode": "890200"},
+            {"item_code": "A3", "item_name": "Sunflower Oil", "barcode": "890300"},
+        ]
+    )
+
+    assert _codes(index.candidates("rice")) == ["A1", "A2"]
+    # "basmti" only shares "bas" and "asm" with "basmati", which is half its grams
+    assert _codes(index.candidates("basmti")) == ["A1"]
+    assert _codes(index.candidates("0100")) == ["A1"]
+    assert _codes(index.candidates("0100", fields=["item_name"])) == []
+
+
+def test_short_queries_use_word_prefixes() -> None:
+    index = ItemSearchIndex()
+    index.index_items(
+        [
+            {"item_code": "A1", "item_name": "Sunflower Oil"},
+            {"item_code": "A2", "item_name": "Coil Spring"},
+        ]
+    )
+
+    assert _codes(index.candidates("oi")) == ["A1"]
+
+
+def test_partial_update_reindexes_only_changed_fields() -> None:
+    index = ItemSearchIndex()
+    index.index_item({"item_code": "A1", "item_name": "Green Tea", "barcode": "111222"})
+
+    index.index_item({"item_code": "A1", "item_name": "Black Coffee", "stock_qty": 4})
+
+    assert index.candidates("tea") == []
+    assert _codes(index.candidates("coffee")) == ["A1"]
+    assert _codes(index.candidates("111222")) == ["A1"]
+
+    index.remove_item("A1")
+    assert index.candidates("coffee") == []
+    assert index.get_stats()["grams"] == 0
+
+
+@pytest.mark.asyncio
+async def test_warm_builds_index_from_erp_items() -> None:
+    items = [{"item_code": f"I{n}", "item_name": f"Item {n}"} for n in range(100)]
+
+    class _Collection:
+        def find(self, _query, _projection):
+            return InMemoryCursor(items)
+
+    class _Db:
+        erp_items = _Collection()
+
+    index = ItemSearchIndex()
+    assert await index.warm(_Db()) == 100
+    assert index.is_warm
+    assert _codes(index.candidates("item 42"))[0] == "I42"
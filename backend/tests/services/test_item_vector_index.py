@@ -0,0 +1,154 @@
+from __future__ import annotations
+
+import zlib
+from unittest.mock import AsyncMock, MagicMock
+
+import numpy as np
+import pytest
+from services.item_vector_index import ItemVectorIndex, text_hash
+
+from backend.tests.utils.in_memory_db import InMemoryCursor
+
+DIM = 32
+
+
+def _encode(texts: list[str]) -> np.ndarray:
+    """Bag-of-words embedding: one stable bucket per word, L2-normalized"""
+    vectors = np.zeros((len(texts), DIM), dtype=np.float32)
+    for row, text in enumerate(texts):
+        for word in text.lower().split():
+            vectors[row, sum(word.encode()) % DIM] += 1.0
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    return vectors / np.where(norms == 0, 1, norms)
+
+
+def _mock_db(items: list[dict], embeddings: list[dict]) -> MagicMock:
+    db = MagicMock()
+    db.erp_items.find = MagicMock(return_value=InMemoryCursor(items))
+    embeddings_collection = MagicMock()
+    embeddings_collection.find = MagicMock(return_value=InMemoryCursor(embeddings))
+    embeddings_collection.bulk_write = AsyncMock()
+    embeddings_collection.delete_many = AsyncMock()
+    db.__getitem__.return_value = embeddings_collection
+    return db
+
+
+@pytest.mark.asyncio
+async def test_load_restores_current_embeddings_and_encodes_the_rest() -> None:
+    items = [
+        {"item_code": "A", "item_name": "Green Tea", "category": "Beverages"},
+        {"item_code": "B", "item_name": "Wheat Flour", "category": "Grocery"},
+        {"item_code": "C", "item_name": "Dish Soap", "category": "Cleaning"},
+    ]
+    stale_text = "Old Name Grocery "
+    embeddings = [
+        {
+            "item_code": "A",
+            "text_hash": text_hash("Green Tea Beverages "),
+            "embedding": _encode(["Green Tea Beverages "])[0].tobytes(),
+        },
+        {
+            "item_code": "B",
+            "text_hash": text_hash(stale_text),
+            "embedding": _encode([stale_text])[0].tobytes(),
+        },
+    ]
+    db = _mock_db(items, embeddings)
+    encoder = MagicMock(side_effect=_encode)
+    index = ItemVectorIndex(encoder=encoder)
+
+    assert await index.load(db) == 1
+    assert index.get_stats()["pending"] == 2
+
+    assert await index.refresh_pending() == 2
+    encoder.assert_called_once_with(["Wheat Flour Grocery ", "Dish Soap Cleaning "])
+    operations = db["item_embeddings"].bulk_write.await_args.args[0]
+    assert len(operations) == 2
+
+    results = await index.search("soap", top_k=2)
+    assert results[0][0] == "C"
+    assert index._matrix.dtype == np.float32
+    assert index._matrix[: index._size].flags["C_CONTIGUOUS"]
+
+
+@pytest.mark.asyncio
+async def test_sync_updates_requeue_only_changed_text() -> None:
+    items = [{"item_code": "A", "item_name": "Green Tea", "category": "Beverages"}]
+    index = ItemVectorIndex(encoder=_encode)
+    await index.load(_mock_db(items, []))
+    await index.refresh_pending()
+
+    index.index_item({"item_code": "A", "stock_qty": 5})
+    index.index_item({"item_code": "A", "category": "Beverages"})
+    assert index.get_stats()["pending"] == 0
+
+    index.index_item({"item_code": "A", "category": "Snacks", "subcategory": "Chips"})
+    index.index_item({"item_code": "N", "item_name": "Potato Chips", "category": "Snacks"})
+    assert index.get_stats()["pending"] == 2
+
+    await index.refresh_pending()
+    assert index.get_stats()["items"] == 2
+    assert [code for code, _ in await index.search("potato chips", top_k=1)] == ["N"]
+
+
+@pytest.mark.asyncio
+async def test_prune_drops_items_removed_from_erp_items() -> None:
+    items = [
+        {"item_code": "A", "item_name": "Green Tea", "category": "Beverages"},
+        {"item_code": "B", "item_name": "Wheat Flour", "category": "Grocery"},
+        {"item_code": "C", "item_name": "Dish Soap", "category": "Cleaning"},
+    ]
+    orphan = {
+        "item_code": "Z",
+        "text_hash": text_hash("Gone Item "),
+        "embedding": _encode(["Gone Item "])[0].tobytes(),
+    }
+    db = _mock_db(items, [orphan])
+    index = ItemVectorIndex(encoder=_encode)
+    await index.load(db)
+    embeddings = db["item_embeddings"]
+    embeddings.delete_many.assert_awaited_once_with({"item_code": {"$in": ["Z"]}})
+    await index.refresh_pending()
+    embeddings.delete_many.reset_mock()
+
+    db.erp_items.find = MagicMock(return_value=InMemoryCursor([items[1]]))
+    assert await index.prune() == 2
+
+    assert index.get_stats()["items"] == 1
+    assert [code for code, _ in await index.search("soap", top_k=3)] == ["B"]
+    (query,) = embeddings.delete_many.await_args.args
+    assert sorted(query["item_code"]["$in"]) == ["A", "C"]
+
+    # Rows appended after a prune land after the compacted rows
+    new_item = {"item_code": "N", "item_name": "Dish Soap", "category": "Cleaning"}
+    index.index_item(new_item)
+    await index.refresh_pending()
+    db.erp_items.find = MagicMock(return_value=InMemoryCursor([items[1], new_item]))
+    assert [code for code, _ in await index.search("soap", top_k=1)] == ["N"]
+    assert await index.prune() == 0
+
+
+def _random_encode(texts: list[str]) -> np.ndarray:
+    """A distinct, deterministic unit vector per text"""
+    vectors = np.stack(
+        [np.random.default_rng(zlib.crc32(text.encode())).standard_normal(DIM) for text in texts]
+    ).astype(np.float32)
+    return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+
+@pytest.mark.asyncio
+async def test_search_covers_the_full_catalogue() -> None:
+    items = [
+        {"item_code": f"I{n}", "item_name": f"Product {n}", "category": "General"}
+        for n in range(5000)
+    ]
+    index = ItemVectorIndex(encoder=_random_encode, batch_size=1000)
+    await index.load(_mock_db(items, []))
+    await index.refresh_pending()
+
+    assert index.get_stats()["items"] == 5000
+    results = await index.search("Product 4999 General ", top_k=5)
+    assert len(results) == 5
+    assert results[0][0] == "I4999"
+    assert results[0][1] == pytest.approx(1.0, abs=1e-5)
+    assert [score for _, score in results] == sorted((score for _, score in results), reverse=True)
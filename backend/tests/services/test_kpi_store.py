@@ -0,0 +1,146 @@
+from __future__ import annotations
+
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+from services.kpi_store import (
+    KPI_DOCUMENT_ID,
+    KPIStore,
+    merge_deltas,
+    session_status_delta,
+    set_session_status,
+    verification_record_delta,
+)
+
+
+def _cursor(rows: list[dict]) -> Mock:
+    cursor = Mock()
+    cursor.to_list = AsyncMock(return_value=rows)
+    return cursor
+
+
+def _make_db(current: dict | None = None) -> SimpleNamespace:
+    return SimpleNamespace(
+        erp_items=SimpleNamespace(
+            aggregate=Mock(return_value=_cursor([{"total_value": 1500.0}])),
+            count_documents=AsyncMock(return_value=40),
+        ),
+        verification_records=SimpleNamespace(
+            aggregate=Mock(
+                return_value=_cursor(
+                    [{"verified_items": 10, "verified_stock_value": 300.0, "pending_variances": 2}]
+                )
+            ),
+            count_documents=AsyncMock(return_value=4),
+        ),
+        verification_sessions=SimpleNamespace(count_documents=AsyncMock(return_value=3)),
+        user_presence=SimpleNamespace(count_documents=AsyncMock(return_value=5)),
+        dashboard_kpis=SimpleNamespace(
+            find_one=AsyncMock(return_value=current), update_one=AsyncMock()
+        ),
+    )
+
+
+def test_verification_record_delta_moves_record_between_kpis() -> None:
+    previous = {"status": "pending_review", "verified_qty": 4, "price": 2.5}
+    current = {**previous, "status": "verified"}
+
+    assert verification_record_delta(previous, current) == {
+        "verified_items": 1,
+        "verified_stock_value": 10.0,
+        "pending_variances": -1,
+    }
+    assert verification_record_delta(None, {"status": "finalized"}) == {
+        "verified_items": 0,
+        "verified_stock_value": 0,
+        "pending_variances": 0,
+    }
+
+
+@pytest.mark.parametrize(
+    ("previous", "new", "expected"),
+    [
+        (None, "active", {"active_sessions": 1}),
+        ("active", "paused", {"active_sessions": -1}),
+        ("paused", "completed", {}),
+        ("in_progress", "active", {}),
+    ],
+)
+def test_session_status_delta(previous: str | None, new: str, expected: dict) -> None:
+    assert session_status_delta(previous, new) == expected
+
+
+@pytest.mark.asyncio
+async def test_set_session_status_counts_only_the_transition_it_made() -> None:
+    stored = {"status": "active"}
+
+    async def find_one_and_update(query, update, projection, return_document):
+        previous = dict(stored)
+        stored.update(update["$set"])
+        return previous
+
+    db = SimpleNamespace(
+        verification_sessions=SimpleNamespace(find_one_and_update=find_one_and_update),
+        dashboard_kpis=SimpleNamespace(update_one=AsyncMock()),
+    )
+
+    # Two requests completing the same session: only the first one moves the count
+    await set_session_status(db, "s1", {"status": "completed"})
+    await set_session_status(db, "s1", {"status": "completed"})
+
+    db.dashboard_kpis.update_one.assert_awaited_once()
+    assert db.dashboard_kpis.update_one.await_args.args[1]["$inc"] == {"active_sessions": -1}
+
+
+def test_merge_deltas_sums_fields() -> None:
+    assert merge_deltas(
+        [{"verified_items": 1}, {"verified_items": 1, "pending_variances": -1}]
+    ) == {
+        "verified_items": 2,
+        "pending_variances": -1,
+    }
+
+
+@pytest.mark.asyncio
+async def test_recompute_overwrites_document_and_counts_drift() -> None:
+    db = _make_db(current={"_id": KPI_DOCUMENT_ID, "total_items": 39, "total_stock_value": 1500.0})
+    store = KPIStore(db)
+
+    kpis = await store.recompute()
+
+    assert kpis["total_items"] == 40
+    assert kpis["verified_items"] == 10
+    assert kpis["active_sessions"] == 3
+    assert kpis["active_users"] == 5
+    assert kpis["items_verified_today"] == 4
+    db.dashboard_kpis.update_one.assert_awaited_once()
+    assert db.dashboard_kpis.update_one.await_args.args[0] == {"_id": KPI_DOCUMENT_ID}
+    assert db.dashboard_kpis.update_one.await_args.kwargs == {"upsert": True}
+    assert store.get_stats()["drift_repairs"] == 1
+
+
+@pytest.mark.asyncio
+async def test_get_kpis_is_a_single_read_once_materialized() -> None:
+    materialized = {"_id": KPI_DOCUMENT_ID, "total_items": 40, "recomputed_at": "earlier"}
+    db = _make_db(current=materialized)
+    store = KPIStore(db)
+
+    assert await store.get_kpis() == materialized
+    db.erp_items.aggregate.assert_not_called()
+    db.dashboard_kpis.update_one.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_run_once_refreshes_windowed_counts_between_recomputes() -> None:
+    db = _make_db()
+    store = KPIStore(db, recompute_interval=600)
+
+    await store._run_once()
+    await store._run_once()
+
+    assert store.get_stats()["recomputes"] == 1
+    assert store.get_stats()["refreshes"] == 1
+    refresh = db.dashboard_kpis.update_one.await_args.args[1]["$set"]
+    assert refresh["active_users"] == 5
+    assert "total_items" not in refresh
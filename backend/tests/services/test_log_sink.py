@@ -0,0 +1,140 @@
+from __future__ import annotations
+
+import asyncio
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from backend.services.activity_log import ActivityLogService
+from backend.services.log_sink import LogSink, write_log
+
+
+def _collection(name: str) -> SimpleNamespace:
+    return SimpleNamespace(
+        name=name,
+        insert_one=AsyncMock(return_value=SimpleNamespace(inserted_id="direct-id")),
+        insert_many=AsyncMock(),
+    )
+
+
+@pytest.fixture
+def sink():
+    sink = LogSink(batch_size=2, flush_interval=60, max_buffer_size=3)
+    with patch("backend.services.log_sink.log_sink", sink):
+        yield sink
+
+
+@pytest.mark.asyncio
+async def test_write_log_inserts_directly_when_sink_is_not_running(sink) -> None:
+    logs = _collection("activity_logs")
+
+    assert await write_log(logs, {"action": "login"}) == "direct-id"
+    logs.insert_one.assert_awaited_once()
+    assert sink.get_stats()["enqueued"] == 0
+
+
+@pytest.mark.asyncio
+async def test_flush_batches_per_collection_with_insert_many(sink) -> None:
+    activity, audit = _collection("activity_logs"), _collection("audit_logs")
+    sink._running = True
+
+    ids = [await write_log(activity, {"n": n}) for n in range(3)]
+    ids.append(await write_log(audit, {"n": 3}))
+    written = await sink.flush()
+
+    assert all(ids[:3]) and ids[3] == ""
+    activity.insert_one.assert_not_awaited()
+    batches = [call.args[0] for call in activity.insert_many.await_args_list]
+    assert [[doc["n"] for doc in batch] for batch in batches] == [[0, 1], [2]]
+    assert str(batches[0][0]["_id"]) == ids[0]
+    assert activity.insert_many.await_args.kwargs == {"ordered": False}
+    audit.insert_many.assert_not_awaited()
+    stats = sink.get_stats()
+    assert written == 3
+    assert stats["dropped"] == 1
+    assert stats["dropped_by_collection"] == {"audit_logs": 1}
+    assert stats["buffered"] == 0
+
+
+@pytest.mark.asyncio
+async def test_full_batch_is_flushed_before_the_interval_and_stop_drains(sink) -> None:
+    logs = _collection("error_logs")
+    sink.start()
+
+    sink.enqueue(logs, {"n": 0})
+    sink.enqueue(logs, {"n": 1})
+    await asyncio.sleep(0.01)
+    assert logs.insert_many.await_count == 1
+
+    sink.enqueue(logs, {"n": 2})
+    await sink.stop()
+
+    assert logs.insert_many.await_count == 2
+    assert sink.get_stats()["written"] == 3
+    assert not sink.running
+
+
+@pytest.mark.asyncio
+async def test_failed_batch_is_counted_and_not_requeued(sink) -> None:
+    logs = _collection("audit_logs")
+    logs.insert_many.side_effect = RuntimeError("not primary")
+    sink.enqueue(logs, {"n": 0})
+
+    await sink.flush()
+
+    assert sink.get_stats()["failed"] == 1
+    assert sink.get_stats()["buffered"] == 0
+
+
+@pytest.mark.asyncio
+async def test_activity_log_goes_through_running_sink(sink) -> None:
+    db = SimpleNamespace(activity_logs=_collection("activity_logs"))
+    sink._running = True
+
+    log_id = await ActivityLogService(db).log_activity(
+        user="staff1", role="staff", action="high_risk_correction"
+    )
+
+    assert log_id
+    db.activity_logs.insert_one.assert_not_awaited()
+    assert sink.get_stats()["buffered"] == 1
+
+
+@pytest.mark.asyncio
+async def test_stop_waits_for_the_batch_in_flight(sink) -> None:
+    logs = _collection("audit_logs")
+    release = asyncio.Event()
+
+    async def slow_insert(batch, ordered):
+        await release.wait()
+
+    logs.insert_many.side_effect = slow_insert
+    sink.start()
+    sink.enqueue(logs, {"n": 0})
+    sink.enqueue(logs, {"n": 1})
+    await asyncio.sleep(0.01)
+
+    stopping = asyncio.create_task(sink.stop())
+    await asyncio.sleep(0.01)
+    release.set()
+    await stopping
+
+    assert sink.get_stats()["written"] == 2
+
+
+@pytest.mark.asyncio
+async def test_dropped_enterprise_audit_entry_does_not_advance_hash_chain(sink) -> None:
+    from backend.services.enterprise_audit import AuditEventType, EnterpriseAuditService
+
+    db = SimpleNamespace(enterprise_audit_logs=_collection("enterprise_audit_logs"))
+    service = EnterpriseAuditService(db)
+    sink._running = True
+    sink.max_buffer_size = 1
+    event_type = next(iter(AuditEventType))
+
+    assert await service.log(event_type, "first")
+    chained_hash = service._last_hash
+    assert await service.log(event_type, "dropped") == ""
+
+    assert service._last_hash == chained_hash
@@ -0,0 +1,116 @@
+"""
+Tests for MonitoringService latency histograms
+"""
+
+import threading
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from backend.middleware.performance_middleware import PerformanceMiddleware
+from backend.services.monitoring_service import (
+    HISTOGRAM_BUCKETS,
+    HISTOGRAM_GROWTH,
+    LatencyHistogram,
+    MonitoringService,
+)
+
+
+def test_histogram_percentiles_within_bucket_error():
+    histogram = LatencyHistogram()
+    durations = [i / 1000 for i in range(1, 1001)]  # 1ms .. 1s
+    for duration in durations:
+        histogram.record(duration)
+
+    for q, exact in ((0.5, 0.5), (0.95, 0.95), (0.99, 0.99)):
+        estimate = histogram.percentile(q)
+        assert exact <= estimate <= exact * HISTOGRAM_GROWTH
+    assert histogram.max == 1.0
+    assert histogram.percentile(1.0) == 1.0
+
+
+def test_histogram_memory_is_fixed():
+    histogram = LatencyHistogram()
+    for duration in (0.0, 1e-9, 5.0, 10_000.0):
+        histogram.record(duration)
+    assert len(histogram.counts) == HISTOGRAM_BUCKETS
+    assert histogram.count == 4
+
+
+def test_requests_are_keyed_by_route_and_merged_across_threads():
+    monitoring = MonitoringService()
+
+    def worker():
+        for _ in range(100):
+            monitoring.track_request("/api/count-lines/{line_id}", "GET", 200, 0.01)
+
+    threads = [threading.Thread(target=worker) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    monitoring.track_request("/api/count-lines/{line_id}", "GET", 500, 0.2)
+
+    endpoints = monitoring.get_endpoint_metrics()
+    assert list(endpoints) == ["GET /api/count-lines/{line_id}"]
+    route = endpoints["GET /api/count-lines/{line_id}"]
+    assert route["count"] == 401
+    assert route["errors"] == 1
+    assert route["max"] == pytest.approx(0.2)
+    assert monitoring.get_stats()["shards"] == 5
+
+    metrics = monitoring.get_metrics()
+    assert metrics["requests"]["total"] == 401
+    assert metrics["requests"]["errors"] == 1
+
+    monitoring.reset()
+    assert monitoring.get_metrics()["requests"]["total"] == 0
+
+
+def test_prometheus_export_has_route_quantiles():
+    monitoring = MonitoringService()
+    monitoring.track_request("/api/sessions/{session_id}", "GET", 200, 0.05)
+
+    text = monitoring.get_prometheus_metrics()
+
+    labels = 'method="GET",route="/api/sessions/{session_id}"'
+    assert "# TYPE http_request_latency_seconds summary" in text
+    assert f'http_request_latency_seconds{{{labels},quantile="0.99"}}' in text
+    assert f"http_request_latency_seconds_count{{{labels}}} 1" in text
+    assert f"http_request_latency_max_seconds{{{labels}}} 0.050000" in text
+    assert "http_requests_total 1" in text
+
+
+def test_middleware_records_route_template_not_raw_path():
+    monitoring = MonitoringService()
+    app = FastAPI()
+    app.add_middleware(PerformanceMiddleware, monitoring=monitoring)
+
+    @app.get("/api/count-lines/{line_id}")
+    async def get_line(line_id: str):
+        return {"id": line_id}
+
+    client = TestClient(app)
+    for line_id in ("a", "b", "c"):
+        client.get(f"/api/count-lines/{line_id}")
+    client.get("/nowhere/1")
+    client.get("/nowhere/2")
+
+    endpoints = monitoring.get_endpoint_metrics()
+    assert endpoints["GET /api/count-lines/{line_id}"]["count"] == 3
+    assert endpoints["GET <unmatched>"]["count"] == 2
+    assert len(endpoints) == 2
+
+
+def test_middleware_echoes_request_id_only_when_present():
+    app = FastAPI()
+    app.add_middleware(PerformanceMiddleware, monitoring=MonitoringService())
+
+    @app.get("/ping")
+    async def ping():
+        return {}
+
+    client = TestClient(app)
+    assert "x-request-id" not in client.get("/ping").headers
+    assert client.get("/ping", headers={"X-Request-ID": "req-1"}).headers["x-request-id"] == "req-1"
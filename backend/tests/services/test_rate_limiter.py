@@ -0,0 +1,67 @@
+from __future__ import annotations
+
+import pytest
+
+from backend.services.rate_limiter import DistributedRateLimiter
+
+
+class _StubRedis:
+    """Minimal register_script stand-in returning scripted bucket replies."""
+
+    def __init__(self, replies=None, error: Exception | None = None):
+        self.replies = list(replies or [])
+        self.error = error
+        self.calls = 0
+
+    def register_script(self, _source):
+        async def script(keys, args):
+            self.calls += 1
+            if self.error:
+                raise self.error
+            return self.replies.pop(0)
+
+        return script
+
+
+@pytest.mark.asyncio
+async def test_limit_is_shared_between_limiters_on_one_redis() -> None:
+    fakeredis = pytest.importorskip("fakeredis")
+    pytest.importorskip("lupa")
+    redis = fakeredis.aioredis.FakeRedis()
+    worker_a = DistributedRateLimiter(default_rate=6, default_burst=3, redis_client=redis)
+    worker_b = DistributedRateLimiter(default_rate=6, default_burst=3, redis_client=redis)
+
+    results = [
+        (await worker_a.is_allowed("user1"))[0],
+        (await worker_b.is_allowed("user1"))[0],
+        (await worker_a.is_allowed("user1"))[0],
+        (await worker_b.is_allowed("user1"))[0],
+    ]
+
+    assert results == [True, True, True, False]
+    assert (await worker_b.is_allowed("user2"))[0] is True
+
+
+@pytest.mark.asyncio
+async def test_denied_key_is_rejected_locally_until_next_token() -> None:
+    redis = _StubRedis(replies=[[0, "0.5"]])
+    limiter = DistributedRateLimiter(default_rate=60, default_burst=5, redis_client=redis)
+
+    allowed, info = await limiter.is_allowed("user1")
+    again, _ = await limiter.is_allowed("user1")
+
+    assert (allowed, again) == (False, False)
+    assert info["retry_after"] == 1
+    assert redis.calls == 1
+    assert limiter.get_stats()["local_denials"] == 1
+
+
+@pytest.mark.asyncio
+async def test_redis_failure_falls_back_to_local_bucket() -> None:
+    limiter = DistributedRateLimiter(
+        default_rate=60, default_burst=1, redis_client=_StubRedis(error=ConnectionError("down"))
+    )
+
+    assert (await limiter.is_allowed("user1"))[0] is True
+    assert (await limiter.is_allowed("user1"))[0] is False
+    assert limiter.get_stats()["fallbacks"] == 2
@@ -0,0 +1,118 @@
+from __future__ import annotations
+
+import gzip
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from backend.services.scheduled_export_service import ScheduledExportService
+from backend.tests.utils.in_memory_db import InMemoryCursor
+
+
+class _FakeGridIn:
+    def __init__(self, store: dict):
+        self._id = "file-1"
+        self._store = store
+        self._parts: list[bytes] = []
+
+    async def write(self, chunk: bytes) -> None:
+        self._parts.append(chunk)
+
+    async def close(self) -> None:
+        self._store[self._id] = b"".join(self._parts)
+
+    async def abort(self) -> None:
+        self._parts.clear()
+
+
+class _FakeGridOut:
+    def __init__(self, data: bytes, chunk_size: int = 7):
+        self._chunks = [data[i : i + chunk_size] for i in range(0, len(data), chunk_size)]
+
+    async def readchunk(self) -> bytes:
+        return self._chunks.pop(0) if self._chunks else b""
+
+
+class _FakeBucket:
+    def __init__(self):
+        self.files: dict = {}
+
+    def open_upload_stream(self, filename, metadata=None):
+        return _FakeGridIn(self.files)
+
+    async def open_download_stream(self, file_id):
+        return _FakeGridOut(self.files[file_id])
+
+    async def delete(self, file_id):
+        del self.files[file_id]
+
+
+@pytest.mark.asyncio
+async def test_export_streams_compressed_payload_to_gridfs_and_back() -> None:
+    sessions = [
+        {"_id": f"s{i}", "warehouse": "WH1", "status": "closed", "items_counted": i}
+        for i in range(3)
+    ]
+    db = MagicMock()
+    db.sessions.find.return_value = InMemoryCursor(sessions)
+    db.export_results.insert_one = AsyncMock(return_value=MagicMock(inserted_id="r1"))
+    db.export_schedules.update_one = AsyncMock()
+
+    service = ScheduledExportService(db)
+    service._fs = _FakeBucket()
+    schedule = {
+        "_id": "sched",
+        "name": "nightly",
+        "export_type": "sessions",
+        "format": "csv",
+        "frequency": "daily",
+    }
+
+    outcome = await service.execute_export(schedule)
+
+    assert outcome["success"] is True
+    assert outcome["row_count"] == 3
+    export_doc = db.export_results.insert_one.await_args.args[0]
+    assert "file_content" not in export_doc
+    assert export_doc["file_id"] == "file-1"
+    assert export_doc["compression"] == "gzip"
+
+    stored = service._fs.files["file-1"]
+    plain = gzip.decompress(stored)
+    assert export_doc["size_bytes"] == len(plain)
+    assert plain.splitlines()[0].startswith(b"session_id,warehouse")
+
+    stream = await service.open_export_result(export_doc)
+    assert b"".join([chunk async for chunk in stream]) == plain
+
+
+@pytest.mark.asyncio
+async def test_legacy_inline_result_is_still_downloadable() -> None:
+    service = ScheduledExportService(MagicMock())
+
+    stream = await service.open_export_result({"file_content": "a,b\n1,2\n"})
+
+    assert b"".join([chunk async for chunk in stream]) == b"a,b\n1,2\n"
+
+
+@pytest.mark.asyncio
+async def test_stored_file_is_removed_when_result_insert_fails() -> None:
+    db = MagicMock()
+    db.sessions.find.return_value = InMemoryCursor([{"_id": "s1", "warehouse": "WH1"}])
+    db.export_results.insert_one = AsyncMock(side_effect=RuntimeError("not primary"))
+    db.export_schedules.update_one = AsyncMock()
+
+    service = ScheduledExportService(db)
+    service._fs = _FakeBucket()
+    schedule = {
+        "_id": "sched",
+        "name": "nightly",
+        "export_type": "sessions",
+        "format": "json",
+        "frequency": "daily",
+    }
+
+    outcome = await service.execute_export(schedule)
+
+    assert outcome == {"success": False, "error": "not primary"}
+    assert service._fs.files == {}
@@ -0,0 +1,97 @@
+from __future__ import annotations
+
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+from services.session_stats_service import (
+    SessionStatsService,
+    approval_transition_delta,
+    count_line_counters,
+)
+
+
+def _make_db(sessions: list[dict], aggregated: list[dict]) -> SimpleNamespace:
+    sessions_cursor = Mock()
+    sessions_cursor.to_list = AsyncMock(return_value=sessions)
+    agg_cursor = Mock()
+    agg_cursor.to_list = AsyncMock(return_value=aggregated)
+    return SimpleNamespace(
+        sessions=SimpleNamespace(
+            find=Mock(return_value=sessions_cursor),
+            find_one=AsyncMock(return_value=sessions[0] if sessions else None),
+            update_one=AsyncMock(),
+        ),
+        count_lines=SimpleNamespace(aggregate=Mock(return_value=agg_cursor)),
+    )
+
+
+def test_count_line_counters_include_approval_state() -> None:
+    assert count_line_counters({"variance": -2.5, "approval_status": "REJECTED"}) == {
+        "total_items": 1,
+        "total_variance": -2.5,
+        "approved_items": 0,
+        "rejected_items": 1,
+    }
+
+
+@pytest.mark.parametrize(
+    ("previous", "new", "expected"),
+    [
+        ("PENDING", "APPROVED", {"approved_items": 1}),
+        ("REJECTED", "APPROVED", {"approved_items": 1, "rejected_items": -1}),
+        ("APPROVED", "REJECTED", {"approved_items": -1, "rejected_items": 1}),
+        ("APPROVED", "APPROVED", {}),
+    ],
+)
+def test_approval_transition_delta(previous: str, new: str, expected: dict) -> None:
+    assert approval_transition_delta(previous, new) == expected
+
+
+@pytest.mark.asyncio
+async def test_reconcile_active_sessions_repairs_only_drifted_counters() -> None:
+    db = _make_db(
+        sessions=[
+            {"id": "s1", "total_items": 3, "total_variance": 1.0, "approved_items": 1},
+            {"id": "s2", "total_items": 2, "total_variance": 0.0},
+        ],
+        aggregated=[
+            {
+                "_id": "s1",
+                "total_items": 3,
+                "total_variance": 1.0,
+                "approved_items": 1,
+                "rejected_items": 0,
+            },
+            {
+                "_id": "s2",
+                "total_items": 4,
+                "total_variance": -1.5,
+                "approved_items": 0,
+                "rejected_items": 1,
+            },
+        ],
+    )
+    service = SessionStatsService(db)
+
+    result = await service.reconcile_active_sessions()
+
+    assert result == {"sessions_checked": 2, "sessions_repaired": 1}
+    db.sessions.update_one.assert_awaited_once_with(
+        {"id": "s2"},
+        {"$set": {"total_items": 4, "total_variance": -1.5, "rejected_items": 1}},
+    )
+
+
+@pytest.mark.asyncio
+async def test_reconcile_session_resets_counters_of_empty_session() -> None:
+    db = _make_db(sessions=[{"id": "s1", "total_items": 2, "total_variance": 4.0}], aggregated=[])
+    service = SessionStatsService(db)
+
+    result = await service.reconcile_session("s1")
+
+    assert result == {
+        "session_id": "s1",
+        "repaired": True,
+        "corrected": {"total_items": 0, "total_variance": 0},
+    }
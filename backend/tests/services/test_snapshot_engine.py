@@ -0,0 +1,100 @@
+from __future__ import annotations
+
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from backend.services.reporting.compare_engine import CompareEngine
+from backend.services.reporting.snapshot_engine import SnapshotEngine, snapshot_row_key
+
+
+class _PageCursor:
+    def __init__(self, pages):
+        self._pages = pages
+
+    def sort(self, *args, **kwargs):
+        return self
+
+    def __aiter__(self):
+        return self._iter()
+
+    async def _iter(self):
+        for page in self._pages:
+            yield page
+
+
+async def _pairs(rows, group_by):
+    keyed = sorted(((snapshot_row_key(r, group_by), r) for r in rows), key=lambda p: p[0])
+    for pair in keyed:
+        yield pair
+
+
+@pytest.mark.asyncio
+async def test_merge_join_classifies_rows_and_keeps_last_duplicate() -> None:
+    group_by = ["warehouse"]
+    baseline = [
+        {"_id": {"warehouse": "A"}, "qty_sum": 1},
+        {"_id": {"warehouse": "B"}, "qty_sum": 2},
+        {"_id": {"warehouse": "C"}, "qty_sum": 3},
+    ]
+    comparison = [
+        {"_id": {"warehouse": "B"}, "qty_sum": 99},
+        {"_id": {"warehouse": "B"}, "qty_sum": 5},
+        {"_id": {"warehouse": "C"}, "qty_sum": 3},
+        {"_id": {"warehouse": "D"}, "qty_sum": 4},
+    ]
+    engine = CompareEngine(MagicMock())
+
+    diff = await engine._compare_rows(_pairs(baseline, group_by), _pairs(comparison, group_by))
+
+    assert diff["added_count"] == 1
+    assert diff["removed_count"] == 1
+    assert diff["changed_count"] == 1
+    assert diff["unchanged_count"] == 1
+    assert diff["added"] == [comparison[3]]
+    assert diff["removed"] == [baseline[0]]
+    assert diff["changed"][0]["diff"] == {"qty_sum": {"from": 2, "to": 5, "change": 3}}
+
+
+@pytest.mark.asyncio
+async def test_row_range_reads_only_covering_pages() -> None:
+    page_size = 3
+    pages = [
+        {"rows": [{"key": str(i), "row": {"n": i}} for i in range(p * 3, p * 3 + 3)]}
+        for p in (1, 2)
+    ]
+    db = MagicMock()
+    db.report_snapshot_rows.find.return_value = _PageCursor(pages)
+    engine = SnapshotEngine(db)
+
+    rows = await engine._read_row_range(
+        {"snapshot_id": "s1", "page_size": page_size}, skip=4, limit=4
+    )
+
+    assert rows == [{"n": 4}, {"n": 5}, {"n": 6}, {"n": 7}]
+    query = db.report_snapshot_rows.find.call_args.args[0]
+    assert query == {"snapshot_id": "s1", "page": {"$gte": 1, "$lte": 2}}
+
+
+@pytest.mark.asyncio
+async def test_failed_snapshot_removes_only_its_own_pages(monkeypatch) -> None:
+    monkeypatch.setattr("backend.services.reporting.snapshot_engine.SNAPSHOT_PAGE_SIZE", 1)
+    db = MagicMock()
+    db.__getitem__.return_value.aggregate.side_effect = lambda *a, **k: _PageCursor(
+        [{"n": 0}, {"n": 1}]
+    )
+    # Each run stores its first page and fails on the second
+    db.report_snapshot_rows.insert_one = AsyncMock(
+        side_effect=[None, RuntimeError("duplicate")] * 2
+    )
+    db.report_snapshot_rows.delete_many = AsyncMock()
+    engine = SnapshotEngine(db)
+
+    with pytest.raises(RuntimeError):
+        await engine.create_snapshot("s", "", {"collection": "items"}, created_by="alice")
+    with pytest.raises(RuntimeError):
+        await engine.create_snapshot("s", "", {"collection": "items"}, created_by="alice")
+
+    first, second = (call.args[0] for call in db.report_snapshot_rows.delete_many.await_args_list)
+    assert first["page"] == {"$lt": 1}
+    assert first["snapshot_id"] != second["snapshot_id"]
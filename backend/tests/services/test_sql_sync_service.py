@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import time
 from datetime import datetime, timedelta
 from types import SimpleNamespace
 from unittest.mock import AsyncMock, Mock
@@ -7,6 +8,8 @@ from unittest.mock import AsyncMock, Mock
 import pytest
 from services.sql_sync_service import SQLSyncService
 
+from backend.tests.utils.in_memory_db import InMemoryCursor
+
 
 def _make_service(
     *, sql_connector: Mock | None = None, mongo_db: object | None = None
@@ -191,16 +194,18 @@ async def test_check_item_qty_realtime_updates_when_qty_changed() -> None:
     sql_connector.get_item_by_code.return_value = {"item_code": "ABC", "stock_qty": 9}
 
     erp_items = SimpleNamespace(
-        find_one=AsyncMock(return_value={"item_code": "ABC", "stock_qty": 7}),
+        find_one=AsyncMock(return_value={"item_code": "ABC", "stock_qty": 7, "price": 10.0}),
         insert_one=AsyncMock(),
         update_one=AsyncMock(),
     )
-    mongo_db = SimpleNamespace(erp_items=erp_items)
+    dashboard_kpis = SimpleNamespace(update_one=AsyncMock())
+    mongo_db = SimpleNamespace(erp_items=erp_items, dashboard_kpis=dashboard_kpis)
 
     service = _make_service(sql_connector=sql_connector, mongo_db=mongo_db)
 
     result = await service.check_item_qty_realtime("ABC")
 
+    assert dashboard_kpis.update_one.await_args.args[1]["$inc"] == {"total_stock_value": 20.0}
     assert result["updated"] is True
     assert result["previous_qty"] == 7.0
     assert result["sql_qty"] == 9.0
@@ -210,3 +215,207 @@ async def test_check_item_qty_realtime_updates_when_qty_changed() -> None:
     _filter, update_doc = erp_items.update_one.await_args.args
     assert _filter == {"item_code": "ABC"}
     assert update_doc["$set"]["stock_qty"] == 9.0
+
+
+@pytest.mark.asyncio
+async def test_nightly_full_sync_batches_writes_through_bulk_write() -> None:
+    sql_connector = Mock()
+    sql_connector.test_connection.return_value = True
+    sql_rows = [
+        {"item_code": "A", "item_name": "Item A", "stock_qty": 5},  # qty changed
+        {"item_code": "B", "item_name": "Item B", "stock_qty": 3},  # unchanged
+        {"item_code": "C", "item_name": "Item C", "stock_qty": 1},  # new
+    ]
+    sql_connector.iter_all_items.return_value = (chunk for chunk in [sql_rows])
+
+    erp_items = SimpleNamespace(
+        find=Mock(
+            return_value=InMemoryCursor(
+                [{"item_code": "A", "stock_qty": 2}, {"item_code": "B", "stock_qty": 3}]
+            )
+        ),
+        find_one=AsyncMock(),
+        insert_one=AsyncMock(),
+        update_one=AsyncMock(),
+        bulk_write=AsyncMock(),
+    )
+    mongo_db = SimpleNamespace(erp_items=erp_items)
+    service = SQLSyncService(sql_connector=sql_connector, mongo_db=mongo_db, bulk_chunk_size=2)
+
+    stats = await service.nightly_full_sync()
+
+    # No per-item round-trips: everything goes through bulk_write
+    assert erp_items.find_one.await_count == 0
+    assert erp_items.update_one.await_count == 0
+    assert erp_items.insert_one.await_count == 0
+
+    assert stats["items_checked"] == 3
+    assert stats["items_created"] == 1
+    assert stats["qty_updated"] == 1
+    assert stats["errors"] == 0
+
+    # Chunk 1: update A + timestamp refresh for B; chunk 2: insert C
+    assert erp_items.bulk_write.await_count == 2
+    for call in erp_items.bulk_write.await_args_list:
+        assert call.kwargs["ordered"] is False
+    assert [chunk["operations"] for chunk in stats["bulk_chunks"]] == [2, 1]
+    assert stats["bulk_write_ms"] >= 0
+
+
+@pytest.mark.asyncio
+async def test_sync_variance_only_keeps_stock_value_kpi_in_step() -> None:
+    sql_connector = Mock()
+    sql_connector.test_connection.return_value = True
+    sql_connector.get_item_quantities_only.return_value = {"A": 5.0, "B": 3.0}
+
+    erp_items = SimpleNamespace(
+        find=Mock(
+            return_value=InMemoryCursor(
+                [
+                    {"item_code": "A", "stock_qty": 2, "price": 4.0},
+                    {"item_code": "B", "stock_qty": 3, "price": 9.0},
+                ]
+            )
+        ),
+        bulk_write=AsyncMock(),
+    )
+    dashboard_kpis = SimpleNamespace(update_one=AsyncMock())
+    service = SQLSyncService(
+        sql_connector=sql_connector,
+        mongo_db=SimpleNamespace(erp_items=erp_items, dashboard_kpis=dashboard_kpis),
+    )
+
+    stats = await service.sync_variance_only()
+
+    assert stats["qty_updated"] == 1
+    assert "price" in erp_items.find.call_args.args[1]
+    assert dashboard_kpis.update_one.await_args.args[1]["$inc"] == {"total_stock_value": 12.0}
+
+
+@pytest.mark.asyncio
+async def test_failed_bulk_writes_are_not_indexed_or_counted() -> None:
+    from pymongo.errors import BulkWriteError
+    from services.item_lookup_index import ItemLookupIndex
+
+    sql_connector = Mock()
+    sql_connector.test_connection.return_value = True
+    sql_connector.iter_all_items.return_value = (
+        chunk
+        for chunk in [
+            [
+                {"item_code": "A", "item_name": "Item A", "stock_qty": 5},  # qty changed
+                {"item_code": "C", "item_name": "Item C", "stock_qty": 1},  # new, rejected
+            ]
+        ]
+    )
+    erp_items = SimpleNamespace(
+        find=Mock(return_value=InMemoryCursor([{"item_code": "A", "stock_qty": 2, "price": 3.0}])),
+        bulk_write=AsyncMock(
+            side_effect=BulkWriteError({"writeErrors": [{"index": 1, "code": 11000}]})
+        ),
+    )
+    dashboard_kpis = SimpleNamespace(update_one=AsyncMock())
+    lookup_index = ItemLookupIndex()
+    service = SQLSyncService(
+        sql_connector=sql_connector,
+        mongo_db=SimpleNamespace(erp_items=erp_items, dashboard_kpis=dashboard_kpis),
+        lookup_index=lookup_index,
+        search_index=Mock(),
+        vector_index=Mock(),
+    )
+
+    stats = await service.sync_quantities_only()
+
+    assert stats["errors"] == 1
+    assert lookup_index.resolve("A") == "A"
+    assert lookup_index.resolve("C") is None
+    assert dashboard_kpis.update_one.await_args.args[1]["$inc"] == {"total_stock_value": 9.0}
+
+
+@pytest.mark.asyncio
+async def test_discover_new_items_stops_streaming_at_limit() -> None:
+    fetched_chunks: list[int] = []
+
+    def iter_all_items(chunk_size: int):
+        for start in range(0, 10, chunk_size):
+            fetched_chunks.append(start)
+            yield [
+                {"item_code": f"I{n}", "item_name": f"Item {n}", "stock_qty": n}
+                for n in range(start, start + chunk_size)
+            ]
+
+    sql_connector = Mock()
+    sql_connector.test_connection.return_value = True
+    sql_connector.iter_all_items.side_effect = iter_all_items
+
+    erp_items = SimpleNamespace(
+        find=Mock(return_value=InMemoryCursor([{"item_code": "I0"}])),
+        insert_one=AsyncMock(),
+    )
+    service = SQLSyncService(
+        sql_connector=sql_connector,
+        mongo_db=SimpleNamespace(erp_items=erp_items),
+        fetch_chunk_size=2,
+    )
+
+    stats = await service.discover_new_items(limit=3)
+
+    assert stats["items_discovered"] == 3
+    assert stats["items_checked"] == 4
+    inserted = [call.args[0]["item_code"] for call in erp_items.insert_one.await_args_list]
+    assert inserted == ["I1", "I2", "I3"]
+    # At most one chunk is read ahead of the consumer
+    assert len(fetched_chunks) <= 3
+
+
+@pytest.mark.asyncio
+async def test_sync_quantities_only_streams_off_the_event_loop() -> None:
+    sql_connector = Mock()
+    sql_connector.test_connection.return_value = True
+    sql_connector.iter_all_items.return_value = (
+        chunk
+        for chunk in [
+            [{"item_code": "A", "item_name": "Item A", "stock_qty": 7}],
+            [{"item_code": "B", "item_name": "Item B", "stock_qty": 1}],
+        ]
+    )
+    erp_items = SimpleNamespace(
+        find=Mock(return_value=InMemoryCursor([{"item_code": "A", "stock_qty": 2}])),
+        bulk_write=AsyncMock(),
+    )
+    service = SQLSyncService(
+        sql_connector=sql_connector, mongo_db=SimpleNamespace(erp_items=erp_items)
+    )
+
+    stats = await service.sync_quantities_only()
+
+    sql_connector.get_all_items.assert_not_called()
+    assert stats["items_checked"] == 2
+    assert stats["qty_updated"] == 1
+    assert stats["items_created"] == 1
+    assert erp_items.bulk_write.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_event_loop_blocking_is_detected_during_sync() -> None:
+    sql_connector = Mock()
+    sql_connector.test_connection.return_value = True
+    sql_connector.iter_all_items.return_value = (chunk for chunk in [])
+    service = SQLSyncService(
+        sql_connector=sql_connector,
+        mongo_db=SimpleNamespace(erp_items=SimpleNamespace(bulk_write=AsyncMock())),
+        loop_block_threshold=0.05,
+    )
+
+    async def blocking_projection() -> dict:
+        time.sleep(0.2)  # simulates a synchronous call made on the loop
+        return {}
+
+    service._load_sync_projection = blocking_projection
+
+    await service.sync_quantities_only()
+
+    loop_stats = service.get_stats()["event_loop"]
+    assert loop_stats["blocking_events"] == 1
+    assert loop_stats["max_lag_ms"] >= 50
+    assert loop_stats["last_blocked_by"] == "sync_quantities_only"
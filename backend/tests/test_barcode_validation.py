@@ -4,7 +4,11 @@ import pytest
 from fastapi.testclient import TestClient
 
 from backend.api import enhanced_item_api, erp_api
-from backend.auth.dependencies import get_current_user, get_current_user_async
+from backend.auth.dependencies import (
+    get_current_user,
+    get_current_user_async,
+    get_current_user_from_claims,
+)
 from backend.server import app
 
 client = TestClient(app)
@@ -41,10 +45,12 @@ async def mock_get_current_user():
 def override_auth():
     app.dependency_overrides[get_current_user] = mock_get_current_user
     app.dependency_overrides[get_current_user_async] = mock_get_current_user
+    app.dependency_overrides[get_current_user_from_claims] = mock_get_current_user
     yield
     # Clean up overrides
     app.dependency_overrides.pop(get_current_user, None)
     app.dependency_overrides.pop(get_current_user_async, None)
+    app.dependency_overrides.pop(get_current_user_from_claims, None)
 
 
 @pytest.mark.parametrize(
@@ -246,7 +246,7 @@ async def test_separation_of_sql_and_mongo(mock_db):
     )
 
     # Mock MongoDB writes
-    mock_db.erp_items.update_one = AsyncMock(return_value=MagicMock(modified_count=1))
+    mock_db.erp_items.bulk_write = AsyncMock(return_value=MagicMock(modified_count=1))
 
     service = SQLSyncService(
         sql_connector=mock_sql_connector,
@@ -262,7 +262,7 @@ async def test_separation_of_sql_and_mongo(mock_db):
     mock_sql_connector.get_item_quantities_only.assert_called()
 
     # Verify MongoDB is used for writing
-    mock_db.erp_items.update_one.assert_called()
+    mock_db.erp_items.bulk_write.assert_called()
 
 
 def test_no_sql_writes_in_codebase():
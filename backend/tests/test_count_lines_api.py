@@ -237,6 +237,11 @@ class TestCreateCountLine:
         assert result["counted_by"] == "testuser"
         assert result["approval_status"] == "PENDING"
 
+        # Session counters are bumped with a single $inc, no re-aggregation
+        mock_db.sessions.update_one.assert_awaited_once_with(
+            {"id": "session123"}, {"$inc": {"total_items": 1, "total_variance": 10}}
+        )
+
     @pytest.mark.asyncio
     async def test_create_count_line_session_not_found(self, mock_db, line_data):
         """Test count line creation with non-existent session"""
@@ -510,8 +515,7 @@ class TestCountLinesAPIEdgeCases:
         mock_db.count_lines.count_documents = AsyncMock(return_value=0)
         mock_db.count_lines.insert_one = AsyncMock()
         # Simulate error in session stats update
-        mock_db.count_lines.aggregate = AsyncMock(side_effect=Exception("Database error"))
-        mock_db.sessions.update_one = AsyncMock()
+        mock_db.sessions.update_one = AsyncMock(side_effect=Exception("Database error"))
 
         with patch("backend.api.count_lines_api._get_db_client", return_value=mock_db):
             # Should still succeed despite stats update error
@@ -124,6 +124,19 @@ class TestEnhancedConnectionPool:
         stats = pool.get_stats()
         assert stats["available"] == 2
 
+    @patch("backend.services.enhanced_connection_pool.pyodbc.connect")
+    def test_close_all_closes_borrowed_connections_on_return(self, mock_connect, pool_config):
+        """Connections checked out during close_all are closed, not pooled, on return"""
+        mock_connect.side_effect = lambda *args, **kwargs: Mock()
+
+        pool = EnhancedSQLServerConnectionPool(**pool_config)
+        borrowed = pool._get_connection()
+        pool.close_all()
+        pool._return_connection(borrowed)
+
+        borrowed.close.assert_called_once()
+        assert pool.get_stats()["available"] == 0
+
     @patch("backend.services.enhanced_connection_pool.pyodbc.connect")
     def test_connection_validation(self, mock_connect, pool_config, mock_connection):
         """Test that invalid connections are detected and replaced"""
@@ -118,8 +118,11 @@ class TestSQLSyncService:
         assert result["errors"] == 0
         assert result["duration"] > 0
 
-        # Verify MongoDB update was called for variance
-        assert mock_mongo_db.erp_items.update_one.called
+        # Verify the variance was written through a single bulk_write
+        assert mock_mongo_db.erp_items.bulk_write.await_count == 1
+        operations = mock_mongo_db.erp_items.bulk_write.await_args.args[0]
+        assert len(operations) == 1
+        assert result["bulk_chunks"][0]["operations"] == 1
 
     @pytest.mark.asyncio
     async def test_sync_items_no_connection(self, sync_service, mock_sql_connector):
@@ -155,14 +158,14 @@ class TestSQLSyncService:
         # Execute sync
         await sync_service.sync_items()
 
-        # Verify update_one was called
-        assert mock_mongo_db.erp_items.update_one.called
+        # Verify bulk_write was called
+        assert mock_mongo_db.erp_items.bulk_write.called
 
-        # Get the update call arguments
-        call_args = mock_mongo_db.erp_items.update_one.call_args
+        # Get the queued update operation
+        (operation,) = mock_mongo_db.erp_items.bulk_write.call_args.args[0]
 
         # Verify only quantity-related fields are updated
-        update_doc = call_args.args[1]["$set"]
+        update_doc = operation._doc["$set"]
         assert "sql_server_qty" in update_doc
         assert "stock_qty" in update_doc
 
@@ -195,8 +198,8 @@ class TestSQLSyncService:
         # Execute sync
         await sync_service.sync_items()
 
-        # Verify update_one was called
-        assert mock_mongo_db.erp_items.update_one.called
+        # Verify bulk_write was called
+        assert mock_mongo_db.erp_items.bulk_write.called
 
     @pytest.mark.asyncio
     async def test_sync_items_unchanged_quantity(
@@ -225,8 +228,8 @@ class TestSQLSyncService:
         assert result["items_checked"] == 2
         assert result["variances_found"] == 0
 
-        # Verify update_one was NOT called (no variances)
-        assert not mock_mongo_db.erp_items.update_one.called
+        # Verify nothing was written (no variances)
+        assert not mock_mongo_db.erp_items.bulk_write.called
 
     @pytest.mark.asyncio
     async def test_sync_items_handles_errors_gracefully(
@@ -279,6 +282,31 @@ class TestSQLSyncService:
         assert result["items_checked"] == 250
         assert result["variances_found"] == 250
         assert result["errors"] == 0
+        assert mock_mongo_db.erp_items.bulk_write.await_count == 1
+
+    @pytest.mark.asyncio
+    async def test_sync_items_flushes_in_configured_chunks(self, mock_sql_connector, mock_mongo_db):
+        """Test variance writes are split into bulk_write chunks of the configured size"""
+        service = SQLSyncService(
+            sql_connector=mock_sql_connector,
+            mongo_db=mock_mongo_db,
+            bulk_chunk_size=100,
+        )
+        mongo_items = [{"item_code": f"ITEM{i:03d}", "stock_qty": 0.0} for i in range(250)]
+        mock_mongo_db.erp_items.find = Mock(return_value=AsyncIterator(mongo_items))
+        mock_sql_connector.get_item_quantities_only = Mock(
+            side_effect=lambda codes: {code: 1.0 for code in codes}
+        )
+
+        result = await service.sync_items()
+
+        chunk_sizes = [
+            len(call.args[0]) for call in mock_mongo_db.erp_items.bulk_write.await_args_list
+        ]
+        assert sum(chunk_sizes) == 250
+        assert all(size >= 100 for size in chunk_sizes[:-1])
+        assert [chunk["operations"] for chunk in result["bulk_chunks"]] == chunk_sizes
+        assert all("duration_ms" in chunk for chunk in result["bulk_chunks"])
 
     @pytest.mark.asyncio
     async def test_sync_now_triggers_immediate_sync(
@@ -1,7 +1,9 @@
+from datetime import datetime
 from unittest.mock import AsyncMock, MagicMock
 
 import pytest
 
+from backend.services.item_search_index import ItemSearchIndex
 from backend.services.search_service import SearchService
 
 
@@ -109,3 +111,41 @@ async def test_search_scoring_logic(search_service, mock_db):
     assert "1" in scored_ids
     assert "3" in scored_ids
     # "Banana" might have a very low fuzzy score or 0
+
+
+@pytest.mark.asyncio
+async def test_index_engine_ranks_all_candidates_before_paginating(mock_db):
+    index = ItemSearchIndex()
+    index.index_items(
+        [{"item_code": f"C{i}", "item_name": f"Tomato Sauce {i}"} for i in range(300)]
+        + [{"item_code": "TOP", "item_name": "Sauce Pan"}]
+    )
+    index._warmed_at = datetime.utcnow()
+    mock_cursor = MagicMock()
+    mock_cursor.to_list = AsyncMock(
+        return_value=[{"_id": "t", "item_code": "TOP", "item_name": "Sauce Pan", "stock_qty": 3}]
+    )
+    mock_db.erp_items.find.return_value = mock_cursor
+    service = SearchService(db=mock_db, engine="index", index=index)
+
+    response = await service.search(query="sauce", page_size=1)
+
+    # The best match is found even though 300 weaker matches come first in the catalogue
+    assert response.total == 301
+    assert response.items[0].item_code == "TOP"
+    assert response.items[0].match_type == "name_prefix"
+    assert response.items[0].stock_qty == 3
+    mock_db.erp_items.find.assert_called_once_with({"item_code": {"$in": ["TOP"]}})
+
+
+@pytest.mark.asyncio
+async def test_index_engine_falls_back_to_regex_until_warm(mock_db):
+    mock_cursor = MagicMock()
+    mock_cursor.limit.return_value = mock_cursor
+    mock_cursor.to_list = AsyncMock(return_value=[])
+    mock_db.erp_items.find.return_value = mock_cursor
+    service = SearchService(db=mock_db, engine="index", index=ItemSearchIndex())
+
+    await service.search(query="sauce")
+
+    assert "$or" in mock_db.erp_items.find.call_args.args[0]
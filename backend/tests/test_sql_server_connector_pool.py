@@ -0,0 +1,139 @@
+"""
+Tests for pooled SQL Server access and the bounded executor lanes
+"""
+
+import asyncio
+import threading
+import time
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from backend.sql_server_connector import (
+    DatabaseConnectionError,
+    SQLServerConnector,
+    SQLWorkloadExecutor,
+)
+
+
+@pytest.mark.asyncio
+async def test_bulk_lane_is_bounded_and_does_not_block_realtime():
+    executor = SQLWorkloadExecutor(realtime_workers=1, bulk_workers=1)
+    release = threading.Event()
+    try:
+        bulk_jobs = [asyncio.ensure_future(executor.run_bulk(release.wait, 5)) for _ in range(3)]
+        await asyncio.sleep(0.05)
+
+        # Realtime lookups still complete while the bulk lane is saturated
+        assert await executor.run_realtime(lambda code: code.upper(), "abc") == "ABC"
+        stats = executor.get_stats()
+        assert stats["bulk"]["pending"] == 3
+        assert stats["bulk"]["workers"] == 1
+
+        release.set()
+        await asyncio.gather(*bulk_jobs)
+        assert executor.get_stats()["bulk"]["pending"] == 0
+    finally:
+        release.set()
+        executor.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_executor_lanes_recover_after_shutdown():
+    executor = SQLWorkloadExecutor(realtime_workers=1, bulk_workers=1)
+    assert await executor.run_bulk(sum, [1, 2]) == 3
+    executor.shutdown()
+    assert await executor.run_bulk(sum, [3, 4]) == 7
+    executor.shutdown()
+
+
+def test_borrow_connection_requires_connection():
+    connector = SQLServerConnector()
+    with pytest.raises(DatabaseConnectionError):
+        with connector._borrow_connection():
+            pass
+
+
+def test_shared_connection_is_serialized_without_pool():
+    connector = SQLServerConnector()
+    connector.connection = MagicMock()
+    active = []
+    overlaps = []
+
+    def use_connection():
+        with connector._borrow_connection():
+            active.append(1)
+            if len(active) > 1:
+                overlaps.append(True)
+            time.sleep(0.01)
+            active.pop()
+
+    threads = [threading.Thread(target=use_connection) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert overlaps == []
+    assert connector.get_pool_stats() is None
+
+
+def test_borrow_connection_uses_pool_when_available():
+    connector = SQLServerConnector()
+    pooled_conn = MagicMock()
+    pool = MagicMock()
+    pool.get_connection.return_value.__enter__.return_value = pooled_conn
+    connector._pool = pool
+
+    with connector._borrow_connection() as conn:
+        assert conn is pooled_conn
+    pool.get_connection.assert_called_once()
+
+
+def test_item_stream_without_pool_uses_its_own_connection():
+    connector = SQLServerConnector()
+    connector.connection = MagicMock()
+    connector.config = {"host": "erp", "port": 1433, "database": "ERP"}
+    stream_conn = MagicMock()
+    cursor = stream_conn.cursor.return_value
+    cursor.description = [("item_code",)]
+    cursor.fetchmany.side_effect = [[("A",)], [("B",)], []]
+
+    with (
+        patch(
+            "backend.sql_server_connector.SQLServerConnectionBuilder.create_optimized_connection",
+            return_value=stream_conn,
+        ),
+        patch.object(connector, "_get_formatted_query", return_value="SELECT 1"),
+    ):
+        chunks = connector.iter_all_items(chunk_size=1)
+        assert next(chunks) == [{"item_code": "A"}]
+
+        # Realtime lookups can use the shared connection while the stream is paused
+        with connector._borrow_connection() as conn:
+            assert conn is connector.connection
+
+        assert list(chunks) == [[{"item_code": "B"}]]
+
+    stream_conn.close.assert_called_once()
+    connector.connection.cursor.assert_not_called()
+
+
+def test_reconnect_swaps_in_new_pool_before_closing_old():
+    connector = SQLServerConnector()
+    old_pool, new_pool = MagicMock(), MagicMock()
+    connector._pool = old_pool
+    swapped_before_close = []
+    old_pool.close_all.side_effect = lambda: swapped_before_close.append(
+        connector._pool is new_pool
+    )
+
+    with patch(
+        "backend.sql_server_connector.EnhancedSQLServerConnectionPool", return_value=new_pool
+    ):
+        connector._init_pool(
+            {"host": "erp", "database": "ERP", "user": None, "password": None}, 1433
+        )
+
+    assert connector._pool is new_pool
+    assert swapped_before_close == [True]
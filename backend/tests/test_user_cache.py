@@ -0,0 +1,118 @@
+from __future__ import annotations
+
+import time
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+
+import pytest
+from fastapi import HTTPException
+from fastapi.security import HTTPAuthorizationCredentials
+from starlette.requests import Request
+
+from backend.auth.dependencies import auth_deps, get_current_user, get_current_user_from_claims
+from backend.auth.jwt_provider import jwt
+from backend.auth.user_cache import UserCache, invalidate_user, user_cache
+from backend.utils.auth_utils import create_access_token
+
+SECRET = "user-cache-test-secret"
+
+
+@pytest.fixture
+def users():
+    users = SimpleNamespace(
+        find_one=AsyncMock(
+            return_value={"_id": "u1", "username": "alice", "role": "staff", "token_version": 1}
+        )
+    )
+    auth_deps.initialize(SimpleNamespace(users=users), SECRET, "HS256")
+    user_cache.clear()
+    yield users
+    user_cache.clear()
+
+
+def _credentials(token_version: int = 1) -> HTTPAuthorizationCredentials:
+    token = create_access_token(
+        {"sub": "alice", "role": "staff", "tv": token_version}, secret_key=SECRET, algorithm="HS256"
+    )
+    return HTTPAuthorizationCredentials(scheme="Bearer", credentials=token)
+
+
+def _request() -> Request:
+    return Request({"type": "http", "headers": []})
+
+
+@pytest.mark.asyncio
+async def test_repeat_requests_are_served_from_the_cache(users) -> None:
+    first = await get_current_user(_request(), _credentials())
+    first["role"] = "mutated by handler"
+    second = await get_current_user(_request(), _credentials())
+
+    assert users.find_one.await_count == 1
+    assert second["role"] == "staff"
+
+
+@pytest.mark.asyncio
+async def test_token_with_stale_version_is_rejected(users) -> None:
+    with pytest.raises(HTTPException) as exc:
+        await get_current_user(_request(), _credentials(token_version=0))
+
+    assert exc.value.status_code == 401
+    assert user_cache.get("alice", 0) is None
+
+
+@pytest.mark.asyncio
+async def test_invalidation_forces_a_fresh_lookup(users) -> None:
+    await get_current_user(_request(), _credentials())
+    users.find_one.return_value = {"username": "alice", "role": "admin", "token_version": 1}
+
+    invalidate_user("alice")
+    user = await get_current_user(_request(), _credentials())
+
+    assert users.find_one.await_count == 2
+    assert user["role"] == "admin"
+
+
+@pytest.mark.asyncio
+async def test_claims_path_trusts_only_fresh_tokens_issued_after_changes(users) -> None:
+    old_token = _credentials()
+    user = await get_current_user_from_claims(_request(), old_token)
+    assert user == {"username": "alice", "role": "staff", "token_version": 1}
+    users.find_one.assert_not_awaited()
+
+    invalidate_user("alice")
+    await get_current_user_from_claims(_request(), old_token)
+    assert users.find_one.await_count == 1
+
+    # Issued longer ago than the trust window: resolved from the database
+    user_cache.clear()
+    issued_at = datetime.utcnow() - timedelta(seconds=user_cache.claims_max_age + 5)
+    aged_token = jwt.encode(
+        {
+            "sub": "alice",
+            "role": "staff",
+            "tv": 1,
+            "iat": issued_at,
+            "exp": issued_at + timedelta(minutes=15),
+        },
+        SECRET,
+        algorithm="HS256",
+    )
+    await get_current_user_from_claims(
+        _request(), HTTPAuthorizationCredentials(scheme="Bearer", credentials=aged_token)
+    )
+    assert users.find_one.await_count == 2
+
+
+def test_cache_entries_expire_and_are_bounded() -> None:
+    cache = UserCache(ttl=30, max_size=2)
+    cache.set("a", 0, {"username": "a"})
+    cache.set("b", 0, {"username": "b"})
+    cache.set("c", 0, {"username": "c"})
+
+    assert cache.get("a", 0) is None
+    assert cache.get("c", 0) == {"username": "c"}
+
+    cache._entries[("c", 0)] = (time.monotonic() - 1, {"username": "c"})
+    assert cache.get("c", 0) is None
+    assert cache.get_stats()["size"] == 1
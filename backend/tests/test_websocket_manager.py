@@ -2,6 +2,8 @@
 Unit tests for WebSocket Manager (Core)
 """
 
+import asyncio
+import json
 from unittest.mock import AsyncMock
 
 import pytest
@@ -54,8 +56,9 @@ async def test_send_personal_message(manager, mock_websocket):
 
     message = {"type": "test", "data": "hello"}
     await manager.send_personal_message(message, user_id)
+    await manager.flush()
 
-    mock_websocket.send_json.assert_called_with(message)
+    assert json.loads(mock_websocket.send_text.call_args.args[0]) == message
 
 
 @pytest.mark.asyncio
@@ -69,6 +72,90 @@ async def test_broadcast_to_session(manager):
 
     message = {"type": "update", "data": "new_count"}
     await manager.broadcast_to_session(message, session_id)
+    await manager.flush()
 
-    ws1.send_json.assert_called_with(message)
-    ws2.send_json.assert_called_with(message)
+    assert json.loads(ws1.send_text.call_args.args[0]) == message
+    assert json.loads(ws2.send_text.call_args.args[0]) == message
+    # Serialized once, shared by every connection
+    assert ws1.send_text.call_args.args[0] is ws2.send_text.call_args.args[0]
+
+
+@pytest.mark.asyncio
+async def test_slow_consumer_does_not_stall_others_and_is_evicted():
+    manager = WebSocketManager(send_queue_size=10, send_timeout=0.05)
+    fast = AsyncMock(spec=WebSocket)
+    slow = AsyncMock(spec=WebSocket)
+    blocked = asyncio.Event()
+
+    async def hang(_text):
+        await blocked.wait()
+
+    slow.send_text.side_effect = hang
+    await manager.connect(fast, "fast", "session1")
+    await manager.connect(slow, "slow", "session1")
+
+    await manager.broadcast_to_session({"type": "update"}, "session1")
+    await manager.flush()
+
+    fast.send_text.assert_awaited_once()
+    assert "slow" not in manager.active_connections
+    assert manager.session_connections["session1"] == [fast]
+    assert manager.get_stats()["evicted"] == 1
+
+
+@pytest.mark.asyncio
+async def test_full_send_queue_evicts_consumer():
+    manager = WebSocketManager(send_queue_size=2)
+    ws = AsyncMock(spec=WebSocket)
+    await manager.connect(ws, "user1")
+
+    for i in range(3):
+        await manager.broadcast_all({"n": i})
+
+    assert "user1" not in manager.active_connections
+    assert manager.get_stats()["connections"] == 0
+
+
+@pytest.mark.asyncio
+async def test_dead_connection_does_not_abort_broadcast():
+    manager = WebSocketManager()
+    dead = AsyncMock(spec=WebSocket)
+    dead.send_text.side_effect = RuntimeError("connection reset")
+    alive = AsyncMock(spec=WebSocket)
+    await manager.connect(dead, "user1")
+    await manager.connect(alive, "user2")
+
+    await manager.broadcast_all({"type": "ping"})
+    await manager.flush()
+
+    alive.send_text.assert_awaited_once()
+    assert list(manager.active_connections) == ["user2"]
+
+
+@pytest.mark.asyncio
+async def test_broadcasts_reach_connections_on_other_workers():
+    from backend.services.broadcast_bus import LocalBroadcastBus
+
+    bus = LocalBroadcastBus()
+    worker_a = WebSocketManager()
+    worker_b = WebSocketManager()
+    await worker_a.attach_bus(bus)
+    await worker_b.attach_bus(bus)
+
+    on_a = AsyncMock(spec=WebSocket)
+    on_b = AsyncMock(spec=WebSocket)
+    await worker_a.connect(on_a, "user1", "session1")
+    await worker_b.connect(on_b, "user2", "session1")
+
+    message = {"type": "count_line", "qty": 3}
+    await worker_a.broadcast_to_session(message, "session1")
+    await worker_b.send_personal_message({"type": "direct"}, "user1")
+    await worker_a.flush()
+    await worker_b.flush()
+
+    # Each worker delivers exactly once to its own connections
+    on_b.send_text.assert_awaited_once()
+    assert json.loads(on_b.send_text.call_args.args[0]) == message
+    assert on_a.send_text.await_count == 2
+    assert json.loads(on_a.send_text.call_args.args[0]) == {"type": "direct"}
+    assert worker_b.get_stats()["remote_messages"] == 1
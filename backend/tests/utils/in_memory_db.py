@@ -7,7 +7,7 @@ from __future__ import annotations
 
 import copy
 import os
-from collections.abc import Iterable
+from collections.abc import AsyncIterator, Iterable
 from dataclasses import dataclass
 from datetime import datetime
 from typing import Any, Optional
@@ -164,6 +164,10 @@ class InMemoryCursor:
     async def to_list(self, length: int) -> list[dict[str, Any]]:
         return [copy.deepcopy(doc) for doc in self._documents[:length]]
 
+    async def __aiter__(self) -> AsyncIterator[dict[str, Any]]:
+        for doc in self._documents:
+            yield copy.deepcopy(doc)
+
 
 class InMemoryCollection:
     def __init__(self):
@@ -487,6 +491,9 @@ def _setup_auth_and_seed_users(monkeypatch, fake_db, server_module) -> None:
     server_module.app.dependency_overrides[auth_deps_module.get_current_user] = (
         mock_get_current_user
     )
+    server_module.app.dependency_overrides[auth_deps_module.get_current_user_from_claims] = (
+        mock_get_current_user
+    )
 
     # Initialize Auth Dependencies
     init_auth_dependencies(
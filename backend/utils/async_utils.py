@@ -223,6 +223,70 @@ async def async_connection_pool(pool_size: int = 10):
                     pass
 
 
+class EventLoopBlockingMonitor:
+    """
+    Detects event-loop stalls while watched operations are running
+
+    A heartbeat task sleeps for ``interval`` seconds and measures how late it
+    wakes up; any lag above ``threshold`` means something ran synchronously
+    on the loop and is logged with the operations active at the time.
+    """
+
+    def __init__(self, name: str, threshold: float = 0.25, interval: float = 0.05):
+        self.name = name
+        self.threshold = threshold
+        self.interval = interval
+        self._active: list[str] = []
+        self._task: Optional[asyncio.Task] = None
+        self._expected_wake: Optional[float] = None
+        self._stats = {"blocking_events": 0, "max_lag_ms": 0.0, "last_blocked_by": None}
+
+    @asynccontextmanager
+    async def watch(self, label: str):
+        """Monitor the event loop for as long as the block runs"""
+        self._active.append(label)
+        if self._task is None or self._task.done():
+            self._expected_wake = asyncio.get_running_loop().time() + self.interval
+            self._task = asyncio.create_task(self._heartbeat())
+        try:
+            yield
+        finally:
+            # A stall right before exit would otherwise go unseen by the heartbeat
+            self._check_lag(asyncio.get_running_loop().time())
+            self._active.remove(label)
+            if not self._active and self._task is not None:
+                self._task.cancel()
+                self._task = None
+
+    async def _heartbeat(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            self._expected_wake = loop.time() + self.interval
+            await asyncio.sleep(self.interval)
+            self._check_lag(loop.time())
+
+    def _check_lag(self, now: float) -> None:
+        if self._expected_wake is None:
+            return
+        lag = now - self._expected_wake
+        if lag < self.threshold:
+            return
+        # Count each stall once, even if both the heartbeat and watch exit see it
+        self._expected_wake = now
+        lag_ms = lag * 1000
+        blocked_by = ", ".join(self._active) or "unknown"
+        self._stats["blocking_events"] += 1
+        self._stats["max_lag_ms"] = max(self._stats["max_lag_ms"], round(lag_ms, 2))
+        self._stats["last_blocked_by"] = blocked_by
+        logger.warning(
+            f"Event loop blocked for {lag_ms:.0f}ms during {self.name} "
+            f"({blocked_by}); threshold is {self.threshold * 1000:.0f}ms"
+        )
+
+    def get_stats(self) -> dict[str, Any]:
+        return {**self._stats, "threshold_ms": self.threshold * 1000}
+
+
 class AsyncCache:
     """
     High-performance async cache with TTL and LRU eviction
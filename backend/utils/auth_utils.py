@@ -114,12 +114,11 @@ def create_access_token(
     algo = algorithm if algorithm else str(settings.JWT_ALGORITHM)
 
     to_encode = data.copy()
+    issued_at = datetime.utcnow()
     if expires_delta:
-        expire = datetime.utcnow() + expires_delta
+        expire = issued_at + expires_delta
     else:
-        expire = datetime.utcnow() + timedelta(
-            minutes=getattr(settings, "ACCESS_TOKEN_EXPIRE_MINUTES", 15)
-        )
+        expire = issued_at + timedelta(minutes=getattr(settings, "ACCESS_TOKEN_EXPIRE_MINUTES", 15))
 
-    to_encode.update({"exp": expire, "type": "access"})
+    to_encode.update({"exp": expire, "iat": issued_at, "type": "access"})
     return str(jwt.encode(to_encode, key, algorithm=algo))
@@ -7,6 +7,7 @@ from fastapi import HTTPException
 
 from backend.api.schemas import ERPItem
 from backend.error_messages import get_error_message
+from backend.sql_server_connector import sql_executor
 
 logger = logging.getLogger(__name__)
 
@@ -251,7 +252,9 @@ async def fetch_item_from_erp(
 
             for barcode_variant in barcode_variations:
                 tried_barcodes.append(barcode_variant)
-                item = sql_connector.get_item_by_barcode(barcode_variant)
+                item = await sql_executor.run_realtime(
+                    sql_connector.get_item_by_barcode, barcode_variant
+                )
                 if item:
                     logger.info(
                         f"Found item with barcode variant: {barcode_variant} (original: {barcode})"
@@ -314,13 +317,15 @@ async def refresh_stock_from_erp(
     if is_connected:
         try:
             # Try by item code first
-            item = sql_connector.get_item_by_code(item_code)
+            item = await sql_executor.run_realtime(sql_connector.get_item_by_code, item_code)
 
             # If not found by code, try to get from MongoDB first to get barcode
             if not item:
                 mongo_item = await db.erp_items.find_one({"item_code": item_code})
                 if mongo_item and mongo_item.get("barcode"):
-                    item = sql_connector.get_item_by_barcode(mongo_item.get("barcode"))
+                    item = await sql_executor.run_realtime(
+                        sql_connector.get_item_by_barcode, mongo_item.get("barcode")
+                    )
 
             if not item:
                 error = get_error_message("ERP_ITEM_NOT_FOUND", {"item_code": item_code})
@@ -399,7 +404,7 @@ async def search_items_in_erp(search_term: str, sql_connector: Any, db: Any) ->
     if is_connected:
         # Search in SQL Server (Polosys ERP)
         try:
-            items = sql_connector.search_items(search_term)
+            items = await sql_executor.run_realtime(sql_connector.search_items, search_term)
             result_items = [_map_erp_item_to_schema(item) for item in items]
 
             logger.info(f"Search in ERP returned {len(result_items)} items for '{search_term}'")